@@ -2,18 +2,16 @@ from typing import Dict, List, Optional, Any, TypedDict, Literal
 from enum import Enum
 import logging
 import os
-from langsmith import Client, traceable
+import threading
+from langsmith import traceable
 from config.langsmith_config import LangSmithConfig, initialize_langsmith
-from langchain.memory import ConversationBufferWindowMemory
+from core.tracing import get_tracer
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 from agentic_layer.fleet_integrator import FleetIntegrator
 from config.llm_config import llm_manager
 import json
 from datetime import datetime
-import io
-import base64
-from PIL import Image
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -166,9 +164,18 @@ class ConversationManager:
     """Manages conversation context and memory"""
 
     def __init__(self):
-        self.memory = ConversationBufferWindowMemory(k=10)
+        self._memory = None
         self.session_contexts: Dict[str, Dict] = {}
 
+    @property
+    def memory(self):
+        """Conversation memory, created on first use (slow to import)"""
+        if self._memory is None:
+            from langchain.memory import ConversationBufferWindowMemory
+
+            self._memory = ConversationBufferWindowMemory(k=10)
+        return self._memory
+
     def initialize_session(self, session_id: str, vertical: str) -> Dict[str, Any]:
         """Initialize a new session context"""
         context = {
@@ -209,22 +216,49 @@ class MainOrchestrator:
         self.validator = VerticalValidator()
         self.conversation_manager = ConversationManager()
 
-        # Agent fleet placeholders - will be implemented with actual agents
-        self.agent_fleets = {
-            Vertical.SCHOOL_STUDENTS: self._create_school_student_agents(),
-            Vertical.COLLEGE_UPSKILLING: self._create_college_student_agents(),
-            # Vertical.CAREER_TRANSITION: self._create_career_transition_agents()
+        # Agent fleets are built on first use of their vertical, so startup
+        # does not import or construct agents that may never be needed
+        self._fleet_factories = {
+            Vertical.SCHOOL_STUDENTS: self._create_school_student_agents,
+            Vertical.COLLEGE_UPSKILLING: self._create_college_student_agents,
+            # Vertical.CAREER_TRANSITION: self._create_career_transition_agents
         }
+        self.agent_fleets = {}
+        self._fleets_lock = threading.Lock()
 
         # Initialize workflow
         self.workflow = self._build_workflow_graph()
-        initialize_langsmith()
+
+    def get_agent_fleet(self, vertical: Vertical):
+        """The vertical's agent fleet, built on first use; None if unsupported"""
+        fleet = self.agent_fleets.get(vertical)
+        if fleet is None and vertical in self._fleet_factories:
+            with self._fleets_lock:
+                fleet = self.agent_fleets.get(vertical)
+                if fleet is None:
+                    logger.info(f"Building agent fleet for {vertical.value}")
+                    fleet = self._fleet_factories[vertical]()
+                    self.agent_fleets[vertical] = fleet
+        return fleet
+
+    def warm_up(self):
+        """Build every vertical's fleet now instead of on first use"""
+        for vertical in self._fleet_factories:
+            self.get_agent_fleet(vertical)
 
     def _setup_orchestrator_langsmith(self):
-        """Setup orchestrator-specific LangSmith components"""
+        """
+        Setup orchestrator-specific LangSmith components
+
+        Run records go through the shared tracer (core.tracing); the graph's
+        LangChain callback tracer is only attached when that tracer exports
+        to LangSmith, so offline tracing stays offline.
+        """
+        self.tracer = None
+        self.langsmith_config = {}
+        if get_tracer().exporter_name != "langsmith":
+            return
         try:
-            # Create orchestrator-specific client and tracer
-            self.langsmith_client = LangSmithConfig.create_client()
             self.tracer = LangSmithConfig.create_tracer("orchestrator-main")
 
             # Get standard config for orchestrator
@@ -235,7 +269,6 @@ class MainOrchestrator:
             logger.info("Orchestrator LangSmith setup completed successfully")
         except Exception as e:
             logger.warning(f"Orchestrator LangSmith setup failed: {e}")
-            self.langsmith_client = None
             self.tracer = None
             self.langsmith_config = {}
 
@@ -363,7 +396,7 @@ class MainOrchestrator:
         logger.info(f"Executing workflow for vertical: {vertical}")
 
         # Get the agent fleet for this vertical
-        agent_fleet = self.agent_fleets.get(Vertical(vertical))
+        agent_fleet = self.get_agent_fleet(Vertical(vertical))
 
         if not agent_fleet:
             logger.error(f"No agent fleet found for vertical: {vertical}")
@@ -621,22 +654,6 @@ class MainOrchestrator:
             },
             "callbacks": [self.tracer] if self.tracer else [],
         }
-        if self.langsmith_client:
-            try:
-                run_id = self.langsmith_client.create_run(
-                    name="career_counseling_session",
-                    run_type="chain",
-                    inputs={
-                        "vertical": vertical,
-                        "user_id": user_data.get("user_id", "unknown"),
-                        "session_id": user_data.get("session_id", "unknown"),
-                    },
-                    tags=["orchestrator", "main_workflow", vertical],
-                )
-                config["run_id"] = run_id
-                logger.info(f"Created LangSmith run: {run_id}")
-            except Exception as e:
-                logger.error(f"Failed to create LangSmith run: {e}")
 
         messages = []
         if initial_message:
@@ -655,25 +672,34 @@ class MainOrchestrator:
             "final_response": None,  # Initialize this explicitly
         }
 
+        with get_tracer().span(
+            "career_counseling_session",
+            inputs={
+                "vertical": vertical,
+                "user_id": user_data.get("user_id", "unknown"),
+                "session_id": user_data.get("session_id", "unknown"),
+            },
+            tags=["orchestrator", "main_workflow", vertical],
+        ) as span:
+            response = self._run_counseling_workflow(initial_state, config)
+            span.set_outputs(success=response.get("success", False))
+            if not response.get("success"):
+                span.error = response.get("error")
+            return response
+
+    def _run_counseling_workflow(
+        self, initial_state: WorkflowState, config: Dict[str, Any]
+    ) -> Dict[str, Any]:
         try:
-            logger.info(f"Starting workflow execution for vertical: {vertical}")
+            logger.info(
+                f"Starting workflow execution for vertical: "
+                f"{initial_state['selected_vertical']}"
+            )
             result = self.workflow.invoke(initial_state, config=config)
             logger.info("Workflow execution completed")
             logger.info(f"Result keys: {list(result.keys())}")
             logger.info(f"Final response present: {bool(result.get('final_response'))}")
 
-            # Log successful completion to LangSmith
-            if self.langsmith_client and config.get("run_id"):
-                self.langsmith_client.update_run(
-                    config["run_id"],
-                    outputs={
-                        "success": result.get("final_response", {}).get(
-                            "success", False
-                        )
-                    },
-                    end_time=datetime.now(),
-                )
-
             final_response = result.get("final_response")
             if not final_response:
                 logger.error("No final_response in workflow result")
@@ -699,12 +725,6 @@ class MainOrchestrator:
             return final_response
 
         except Exception as e:
-            # Log errors to LangSmith
-            if self.langsmith_client and config.get("run_id"):
-                self.langsmith_client.update_run(
-                    config["run_id"], error=str(e), end_time=datetime.now()
-                )
-
             logger.error(f"Workflow execution failed: {str(e)}", exc_info=True)
             return {
                 "success": False,
@@ -746,6 +766,91 @@ class MainOrchestrator:
                 "timestamp": datetime.now().isoformat(),
             }
 
+    def preprocess_resume(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Warm the college fleet's resume analysis for an uploaded resume"""
+        return self.get_agent_fleet(Vertical.COLLEGE_UPSKILLING).preprocess_resume(
+            resume_data
+        )
+
+    def dry_run(self, vertical: str, user_data: UserData) -> Dict[str, Any]:
+        """
+        Walk a session's agent plan without calling the LLM
+
+        The vertical's fleet runs as usual, so agents and optional chains
+        are selected from ``user_data`` exactly as in a real session, but
+        every LLM call is answered with synthetic schema-valid output and
+        collected instead (see core.dry_run). Returns, per agent, its status,
+        dependencies and the calls it would make, each with the agent and
+        sub-agent that makes it and the prompt tokens of the real prompt;
+        cache hits are listed with ``cached`` set.
+        """
+        from core.dry_run import DryRunLog
+        from core.request_context import bind_context
+
+        is_valid, missing_required, available_optional = (
+            self.validator.validate_user_data(vertical, user_data)
+        )
+        if not is_valid:
+            return {
+                "success": False,
+                "error": f"Missing required data for {vertical}: "
+                f"{', '.join(missing_required)}",
+            }
+        agent_fleet = self.get_agent_fleet(Vertical(vertical))
+        if not agent_fleet:
+            return {
+                "success": False,
+                "error": f"Agent fleet not available for vertical: {vertical}",
+            }
+
+        log = DryRunLog()
+        with bind_context(
+            session_id=user_data.get("session_id"), vertical=vertical, dry_run=log
+        ):
+            fleet_result = agent_fleet.execute_workflow(
+                user_data,
+                {
+                    "validation_status": "passed",
+                    "available_optional_data": available_optional,
+                    "vertical_info": self.validator.get_vertical_info(vertical),
+                },
+            )
+
+        calls = [
+            {
+                "sub_agent": record.sub_agent,
+                "model": record.model,
+                "prompt_tokens": record.prompt_tokens,
+                "completion_tokens": record.completion_tokens,
+                "cached": record.cached,
+            }
+            for record in log.calls
+        ]
+        return {
+            "success": True,
+            "vertical": vertical,
+            "fleet_status": fleet_result.status.value,
+            "agents": {
+                agent_id: {
+                    "status": result.status.value,
+                    "depends_on": list(
+                        agent_fleet.agent_dependencies[agent_id].depends_on
+                        if agent_id in agent_fleet.agent_dependencies
+                        else []
+                    ),
+                    "calls": [
+                        call
+                        for call, record in zip(calls, log.calls)
+                        if record.agent == agent_id
+                    ],
+                }
+                for agent_id, result in fleet_result.agent_results.items()
+            },
+            "unattributed_calls": [
+                call for call, record in zip(calls, log.calls) if record.agent is None
+            ],
+        }
+
     def get_available_verticals(self) -> Dict[str, Any]:
         """Get information about available verticals"""
         return self.validator.get_vertical_info()
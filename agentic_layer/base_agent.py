@@ -1,18 +1,41 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional
 import logging
 from datetime import datetime
-import os
-from dataclasses import dataclass
-from langsmith import Client, traceable
-from langchain_core.tracers.langchain import LangChainTracer
+from dataclasses import dataclass, field
+from langsmith import traceable
 from config.agent_config import AgentType, AgentInput, AgentResult, ProcessingStatus
+from core.cancellation import OperationCancelled, raise_if_cancelled
+from core.request_context import bind_context
+from core.tracing import Span, get_tracer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class AgentRun:
+    """
+    State of one execute() call
+
+    Agent instances are shared by every job the scheduler runs at the same
+    time, so the start time and notes of a call live in a context variable
+    rather than on the instance.
+    """
+
+    started_at: datetime = field(default_factory=datetime.now)
+    notes: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return (datetime.now() - self.started_at).total_seconds()
+
+
+_current_run: ContextVar[Optional[AgentRun]] = ContextVar("agent_run", default=None)
+
+
 class BaseAgent(ABC):
     """
     Base class for all agents in the Virtual Career Counselor system.
@@ -47,7 +70,6 @@ class BaseAgent(ABC):
         self.logger = logging.getLogger(f"agent.{agent_id}")
 
         # Processing metadata
-        self.processing_start_time = None
         self.processing_history: List[Dict[str, Any]] = []
 
         # Agent capabilities and requirements
@@ -57,28 +79,6 @@ class BaseAgent(ABC):
 
         # Initialize agent-specific components
         self._initialize_agent()
-        self._setup_langsmith_tracing()
-
-    def _setup_langsmith_tracing(self):
-        """Setup LangSmith tracing for this agent"""
-        try:
-            # Ensure environment variables are set
-            os.environ.setdefault("LANGCHAIN_TRACING_V2", "true")
-            os.environ.setdefault("LANGCHAIN_PROJECT", f"agent-{self.agent_id}")
-
-            # Initialize LangSmith client
-            self.langsmith_client = Client()
-            self.tracer = LangChainTracer(project_name=f"agent-{self.agent_id}")
-
-            self.logger.info(
-                f"LangSmith tracing initialized for agent: {self.agent_id}"
-            )
-        except Exception as e:
-            self.logger.warning(
-                f"LangSmith setup failed for agent {self.agent_id}: {e}"
-            )
-            self.langsmith_client = None
-            self.tracer = None
 
     @abstractmethod
     def _define_required_inputs(self) -> List[str]:
@@ -174,7 +174,7 @@ class BaseAgent(ABC):
     @traceable(name="agent_execution", tags=["agent", "main_execution"])
     def execute(self, agent_input: AgentInput) -> AgentResult:
         """Main execution method with tracing"""
-        self.processing_start_time = datetime.now()
+        run_token = _current_run.set(AgentRun())
 
         # Create run metadata
         run_metadata = {
@@ -184,23 +184,20 @@ class BaseAgent(ABC):
             "input_keys": list(agent_input.keys()) if agent_input else [],
         }
 
-        if self.langsmith_client:
+        # Runs are recorded on the shared tracer, which exports them in the
+        # background; nothing here waits on the tracing backend. LLM calls
+        # made inside are accounted to this agent.
+        with bind_context(agent=self.agent_id, sub_agent=None), get_tracer().span(
+            f"execute_{self.agent_id}",
+            inputs=run_metadata,
+            tags=["agent_execution", self.agent_id, self.agent_type.value],
+        ) as span:
             try:
-                run_id = self.langsmith_client.create_run(
-                    name=f"execute_{self.agent_id}",
-                    run_type="chain",
-                    inputs=run_metadata,
-                    tags=["agent_execution", self.agent_id, self.agent_type.value],
-                )
-                self.logger.info(
-                    f"Created LangSmith run: {run_id} for agent: {self.agent_id}"
-                )
-            except Exception as e:
-                self.logger.error(f"Failed to create LangSmith run: {e}")
-                run_id = None
-        else:
-            run_id = None
+                return self._execute_in_span(agent_input, span)
+            finally:
+                _current_run.reset(run_token)
 
+    def _execute_in_span(self, agent_input: AgentInput, span: Span) -> AgentResult:
         try:
             # Validate input with tracing
             is_valid, missing_requirements, validated_data = (
@@ -211,16 +208,15 @@ class BaseAgent(ABC):
                 result = self._create_failed_result(
                     f"Missing required inputs: {', '.join(missing_requirements)}"
                 )
-                self._log_to_langsmith(run_id, result, error=result.error_message)
+                self._log_to_span(span, result, error=result.error_message)
                 return result
 
             # Execute core processing logic with tracing
             output_data = self._process_core_logic_with_tracing(validated_data)
 
             # Calculate processing metrics
-            processing_time = (
-                datetime.now() - self.processing_start_time
-            ).total_seconds()
+            run = _current_run.get()
+            processing_time = run.elapsed_seconds
             confidence_score = self._calculate_confidence_score(
                 validated_data, output_data
             )
@@ -235,31 +231,34 @@ class BaseAgent(ABC):
                 processing_time=processing_time,
                 metadata={
                     "input_summary": self._create_input_summary(validated_data),
-                    "processing_notes": getattr(self, "_processing_notes", []),
+                    "processing_notes": run.notes,
                     "data_quality_assessment": self._assess_data_quality(
                         validated_data
                     ),
                 },
             )
 
-            self._log_to_langsmith(run_id, result)
+            self._log_to_span(span, result)
             self._update_processing_history(result)
 
             return result
 
+        except OperationCancelled as e:
+            self._log_to_span(
+                span, self._create_failed_result(e.reason), error=e.reason
+            )
+            raise
+
         except Exception as e:
             self.logger.error(f"Error in {self.agent_name}: {str(e)}", exc_info=True)
             result = self._create_failed_result(f"Processing error: {str(e)}")
-            self._log_to_langsmith(run_id, result, error=str(e))
+            self._log_to_span(span, result, error=str(e))
             return result
 
     def _create_failed_result(self, error_message: str) -> AgentResult:
         """Create a failed result with error information"""
-        processing_time = 0
-        if self.processing_start_time:
-            processing_time = (
-                datetime.now() - self.processing_start_time
-            ).total_seconds()
+        run = _current_run.get()
+        processing_time = run.elapsed_seconds if run else 0
 
         return AgentResult(
             agent_id=self.agent_id,
@@ -402,16 +401,11 @@ Guidelines:
 
     def _add_processing_note(self, note: str):
         """Add a processing note for metadata"""
-        if not hasattr(self, "_processing_notes"):
-            self._processing_notes = []
-        self._processing_notes.append(
-            {"timestamp": datetime.now().isoformat(), "note": note}
-        )
-
-    def reset_processing_state(self):
-        """Reset processing state for reuse"""
-        self.processing_start_time = None
-        self._processing_notes = []
+        # Notes mark step boundaries, which makes them a natural cancellation point
+        raise_if_cancelled()
+        run = _current_run.get()
+        if run is not None:  # notes made outside execute() have no result
+            run.notes.append({"timestamp": datetime.now().isoformat(), "note": note})
 
     @traceable(name="input_validation", tags=["validation"])
     def _validate_input_with_tracing(self, agent_input: AgentInput):
@@ -423,28 +417,13 @@ Guidelines:
         """Process core logic with tracing"""
         return self._process_core_logic(validated_data)
 
-    def _log_to_langsmith(self, run_id: str, result: AgentResult, error: str = None):
-        """Log execution results to LangSmith"""
-        if not self.langsmith_client or not run_id:
-            return
-
-        try:
-            outputs = {
-                "status": result.status.value,
-                "confidence_score": result.confidence_score,
-                "processing_time": result.processing_time,
-                "output_keys": (
-                    list(result.output_data.keys()) if result.output_data else []
-                ),
-            }
-
-            if error:
-                self.langsmith_client.update_run(
-                    run_id, outputs=outputs, error=error, end_time=datetime.now()
-                )
-            else:
-                self.langsmith_client.update_run(
-                    run_id, outputs=outputs, end_time=datetime.now()
-                )
-        except Exception as e:
-            self.logger.error(f"Failed to log to LangSmith: {e}")
+    def _log_to_span(self, span: Span, result: AgentResult, error: str = None):
+        """Attach execution results to the agent's trace span"""
+        span.set_outputs(
+            status=result.status.value,
+            confidence_score=result.confidence_score,
+            processing_time=result.processing_time,
+            output_keys=list(result.output_data.keys()) if result.output_data else [],
+        )
+        if error:
+            span.error = error
@@ -14,9 +14,11 @@ from config.agent_config import (
     ProcessingStatus,
 )
 from agentic_layer.base_agent import BaseAgent
-from langsmith import Client, traceable
-from langchain_core.tracers.langchain import LangChainTracer
-import os
+from core.cancellation import OperationCancelled, raise_if_cancelled
+from core.metrics import AGENT_FAILURES, AGENT_SECONDS
+from core.timing import timed
+from core.tracing import Span, get_tracer
+from langsmith import traceable
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -43,26 +45,6 @@ class BaseFleetManager(ABC):
 
         # Initialize fleet-specific components
         self._initialize_fleet()
-        self._setup_fleet_tracing()
-
-    def _setup_fleet_tracing(self):
-        """Setup LangSmith tracing for this fleet"""
-        try:
-            os.environ.setdefault("LANGCHAIN_TRACING_V2", "true")
-            os.environ.setdefault("LANGCHAIN_PROJECT", f"fleet-{self.fleet_id}")
-
-            self.langsmith_client = Client()
-            self.tracer = LangChainTracer(project_name=f"fleet-{self.fleet_id}")
-
-            self.logger.info(
-                f"LangSmith tracing initialized for fleet: {self.fleet_id}"
-            )
-        except Exception as e:
-            self.logger.warning(
-                f"LangSmith setup failed for fleet {self.fleet_id}: {e}"
-            )
-            self.langsmith_client = None
-            self.tracer = None
 
     @abstractmethod
     def _initialize_fleet(self):
@@ -110,19 +92,21 @@ class BaseFleetManager(ABC):
             "user_data_keys": list(user_data.keys()) if user_data else [],
         }
 
-        fleet_run_id = None
-        if self.langsmith_client:
-            try:
-                fleet_run_id = self.langsmith_client.create_run(
-                    name=f"fleet_execution_{self.fleet_id}",
-                    run_type="chain",
-                    inputs=fleet_metadata,
-                    tags=["fleet_execution", self.fleet_id],
-                )
-                self.logger.info(f"Created fleet LangSmith run: {fleet_run_id}")
-            except Exception as e:
-                self.logger.error(f"Failed to create fleet LangSmith run: {e}")
+        with get_tracer().span(
+            f"fleet_execution_{self.fleet_id}",
+            inputs=fleet_metadata,
+            tags=["fleet_execution", self.fleet_id],
+        ) as span, timed("fleet", self.fleet_id):
+            return self._execute_workflow_in_span(
+                user_data, conversation_context, span
+            )
 
+    def _execute_workflow_in_span(
+        self,
+        user_data: Dict[str, Any],
+        conversation_context: Optional[Dict[str, Any]],
+        span: Span,
+    ) -> FleetResult:
         try:
             # Validate input with tracing
             is_valid, missing_data = self._validate_fleet_input_with_tracing(user_data)
@@ -130,8 +114,8 @@ class BaseFleetManager(ABC):
                 result = self._create_failed_result(
                     f"Missing required data: {', '.join(missing_data)}"
                 )
-                self._log_fleet_to_langsmith(
-                    fleet_run_id, result, error=result.metadata.get("failure_reason")
+                self._log_fleet_to_span(
+                    span, result, error=result.metadata.get("failure_reason")
                 )
                 return result
 
@@ -140,7 +124,7 @@ class BaseFleetManager(ABC):
 
             # Execute agents with tracing
             agent_results = self._execute_agents_with_tracing(
-                execution_plan, user_data, conversation_context or {}, fleet_run_id
+                execution_plan, user_data, conversation_context or {}, span.id
             )
 
             # Calculate metrics and create result
@@ -176,14 +160,21 @@ class BaseFleetManager(ABC):
                 },
             )
 
-            self._log_fleet_to_langsmith(fleet_run_id, result)
+            self._log_fleet_to_span(span, result)
             self._update_execution_history(result)
             return result
 
+        except OperationCancelled as e:
+            self.logger.info(f"Fleet execution cancelled: {e.reason}")
+            self._log_fleet_to_span(
+                span, self._create_failed_result(e.reason), error=e.reason
+            )
+            raise
+
         except Exception as e:
             self.logger.error(f"Fleet execution failed: {str(e)}", exc_info=True)
             result = self._create_failed_result(f"Fleet execution error: {str(e)}")
-            self._log_fleet_to_langsmith(fleet_run_id, result, error=str(e))
+            self._log_fleet_to_span(span, result, error=str(e))
             return result
 
     @traceable(name="agents_execution", tags=["agents", "fleet"])
@@ -199,77 +190,66 @@ class BaseFleetManager(ABC):
         previous_outputs = {}
 
         for i, agent_id in enumerate(execution_plan):
+            # Stop before spending more LLM calls on a cancelled session
+            raise_if_cancelled()
+
             if agent_id not in self.agents:
                 self.logger.warning(f"Agent {agent_id} not found in fleet")
                 continue
 
             agent = self.agents[agent_id]
 
-            # Create agent-specific run as child of fleet run
-            agent_run_id = None
-            if self.langsmith_client and parent_run_id:
-                try:
-                    agent_run_id = self.langsmith_client.create_run(
-                        name=f"agent_{agent_id}",
-                        run_type="tool",
-                        inputs={
-                            "agent_id": agent_id,
-                            "agent_name": agent.agent_name,
-                            "execution_order": i + 1,
-                            "dependencies_met": True,  # Could add dependency checking here
-                        },
-                        parent_run_id=parent_run_id,
-                        tags=["agent_execution", agent_id, self.fleet_id],
-                    )
-                except Exception as e:
-                    self.logger.error(f"Failed to create agent run: {e}")
-
-            self.logger.info(
-                f"Executing agent: {agent.agent_name} (run: {agent_run_id})"
-            )
-
-            # Prepare agent input
-            agent_input = AgentInput(
-                user_data=user_data,
-                conversation_context=conversation_context,
-                previous_agent_outputs=previous_outputs.copy(),
-                session_metadata={
-                    "fleet_id": self.fleet_id,
+            # Agent run as a child of the fleet run
+            with get_tracer().span(
+                f"agent_{agent_id}",
+                run_type="tool",
+                inputs={
+                    "agent_id": agent_id,
+                    "agent_name": agent.agent_name,
                     "execution_order": i + 1,
-                    "parent_run_id": parent_run_id,
-                    "agent_run_id": agent_run_id,
+                    "dependencies_met": True,  # Could add dependency checking here
                 },
-            )
+                tags=["agent_execution", agent_id, self.fleet_id],
+            ) as agent_span:
+                self.logger.info(
+                    f"Executing agent: {agent.agent_name} (run: {agent_span.id})"
+                )
+
+                # Prepare agent input
+                agent_input = AgentInput(
+                    user_data=user_data,
+                    conversation_context=conversation_context,
+                    previous_agent_outputs=previous_outputs.copy(),
+                    session_metadata={
+                        "fleet_id": self.fleet_id,
+                        "execution_order": i + 1,
+                        "parent_run_id": parent_run_id,
+                        "agent_run_id": agent_span.id,
+                    },
+                )
 
-            # Execute agent
-            result = agent.execute(agent_input)
-            agent_results[agent_id] = result
-
-            # Log agent completion to fleet run
-            if self.langsmith_client and agent_run_id:
-                try:
-                    agent_outputs = {
-                        "status": result.status.value,
-                        "confidence": result.confidence_score,
-                        "processing_time": result.processing_time,
-                        "output_size": (
-                            len(result.output_data) if result.output_data else 0
-                        ),
-                    }
-
-                    if result.status == ProcessingStatus.FAILED:
-                        self.langsmith_client.update_run(
-                            agent_run_id,
-                            outputs=agent_outputs,
-                            error=result.error_message or "Agent execution failed",
-                            end_time=datetime.now(),
-                        )
-                    else:
-                        self.langsmith_client.update_run(
-                            agent_run_id, outputs=agent_outputs, end_time=datetime.now()
-                        )
-                except Exception as e:
-                    self.logger.error(f"Failed to update agent run: {e}")
+                # Execute agent
+                dependency = self.agent_dependencies.get(agent_id)
+                with timed(
+                    "agent",
+                    agent_id,
+                    depends_on=dependency.depends_on if dependency else [],
+                ):
+                    result = agent.execute(agent_input)
+                agent_results[agent_id] = result
+                AGENT_SECONDS.observe(result.processing_time, agent_id)
+                if result.status == ProcessingStatus.FAILED:
+                    AGENT_FAILURES.inc(agent_id)
+
+                # Log agent completion to fleet run
+                agent_span.set_outputs(
+                    status=result.status.value,
+                    confidence=result.confidence_score,
+                    processing_time=result.processing_time,
+                    output_size=len(result.output_data) if result.output_data else 0,
+                )
+                if result.status == ProcessingStatus.FAILED:
+                    agent_span.error = result.error_message or "Agent execution failed"
 
             # Add successful outputs to previous_outputs for next agents
             if result.status == ProcessingStatus.COMPLETED:
@@ -281,45 +261,30 @@ class BaseFleetManager(ABC):
 
         return agent_results
 
-    def _log_fleet_to_langsmith(
-        self, run_id: str, result: FleetResult, error: str = None
-    ):
-        """Log fleet execution results to LangSmith"""
-        if not self.langsmith_client or not run_id:
-            return
-
-        try:
-            outputs = {
-                "fleet_status": result.status.value,
-                "overall_confidence": result.overall_confidence,
-                "total_processing_time": result.total_processing_time,
-                "successful_agents": len(
-                    [
-                        r
-                        for r in result.agent_results.values()
-                        if r.status == ProcessingStatus.COMPLETED
-                    ]
-                ),
-                "failed_agents": len(
-                    [
-                        r
-                        for r in result.agent_results.values()
-                        if r.status == ProcessingStatus.FAILED
-                    ]
-                ),
-                "recommendations_count": len(result.recommendations),
-            }
-
-            if error:
-                self.langsmith_client.update_run(
-                    run_id, outputs=outputs, error=error, end_time=datetime.now()
-                )
-            else:
-                self.langsmith_client.update_run(
-                    run_id, outputs=outputs, end_time=datetime.now()
-                )
-        except Exception as e:
-            self.logger.error(f"Failed to log fleet to LangSmith: {e}")
+    def _log_fleet_to_span(self, span: Span, result: FleetResult, error: str = None):
+        """Attach fleet execution results to the fleet's trace span"""
+        span.set_outputs(
+            fleet_status=result.status.value,
+            overall_confidence=result.overall_confidence,
+            total_processing_time=result.total_processing_time,
+            successful_agents=len(
+                [
+                    r
+                    for r in result.agent_results.values()
+                    if r.status == ProcessingStatus.COMPLETED
+                ]
+            ),
+            failed_agents=len(
+                [
+                    r
+                    for r in result.agent_results.values()
+                    if r.status == ProcessingStatus.FAILED
+                ]
+            ),
+            recommendations_count=len(result.recommendations),
+        )
+        if error:
+            span.error = error
 
     def _calculate_fleet_confidence(
         self, agent_results: Dict[str, AgentResult]
@@ -18,6 +18,7 @@ from agentic_layer.college_upskill.agents.sub_agents.salary_benchmarking_sub_age
 from agentic_layer.college_upskill.agents.sub_agents.extraction_sub_agent import (
     SmartDataExtractionAgent,
 )
+from core.timing import timed, timed_step
 
 
 class MarketIntelligenceAgent(BaseAgent):
@@ -195,7 +196,8 @@ Focus on synthesis rather than re-analysis - the specialized sub-agents have pro
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.orchestration_prompt.format(**prompt_inputs)
+        with timed("prompt"):
+            formatted_prompt = self.orchestration_prompt.format(**prompt_inputs)
         response = self.llm_model.invoke(formatted_prompt)
         output_dict = self._parse_llm_response(response)
 
@@ -411,6 +413,7 @@ Focus on synthesis rather than re-analysis - the specialized sub-agents have pro
 
         return min(0.95, quality_score)
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
@@ -6,6 +6,7 @@ from config.agent_config import AgentType, OpportunityMatchingOutput
 from langsmith import traceable
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
+from core.timing import timed, timed_step
 
 
 class OpportunityMatcherAgent(BaseAgent):
@@ -190,7 +191,8 @@ Success Factors Assessment:
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.matching_prompt.format(**prompt_inputs)
+        with timed("prompt"):
+            formatted_prompt = self.matching_prompt.format(**prompt_inputs)
         response = self.llm_model.invoke(formatted_prompt)
         output_dict = self._parse_llm_response(response)
 
@@ -521,6 +523,7 @@ Success Factors Assessment:
 
         return min(0.95, base_confidence + completeness_boost)
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
@@ -17,6 +17,10 @@ from config.agent_config import (
     ProfileAnalysisResult,
 )
 from config.llm_config import llm_manager
+from core.content_cache import content_hash, content_version, get_content_cache
+from core.llm_accounting import get_llm_accountant
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -261,16 +265,22 @@ Provide a comprehensive, strategic analysis that synthesizes all available infor
         resume_data = validated_data["required_data"]["resume_data"]
         self.logger.info("Processing resume data")
 
-        resume_analysis = self._analyze_resume_with_tracing(resume_data)
+        # Each chain is accounted as its own sub-agent
+        with bind_context(sub_agent="resume_analysis"), timed(
+            "sub_agent", "resume_analysis"
+        ):
+            resume_analysis = self._analyze_resume_with_tracing(resume_data)
         individual_analyses["resume"] = resume_analysis
         self._add_processing_note("Resume analysis completed successfully")
 
         # Process optional inputs with tracing
         for input_type in ["linkedin_profile", "github_profile", "academic_status"]:
             if input_type in validated_data["optional_data"]:
-                analysis = self._analyze_optional_input_with_tracing(
-                    input_type, validated_data["optional_data"][input_type]
-                )
+                sub_agent = f"{input_type.split('_')[0]}_analysis"
+                with bind_context(sub_agent=sub_agent), timed("sub_agent", sub_agent):
+                    analysis = self._analyze_optional_input_with_tracing(
+                        input_type, validated_data["optional_data"][input_type]
+                    )
                 individual_analyses[input_type.split("_")[0]] = (
                     analysis  # linkedin_profile -> linkedin
                 )
@@ -287,24 +297,66 @@ Provide a comprehensive, strategic analysis that synthesizes all available infor
             ]
 
         if experience_data:
-            experience_analysis = self._analyze_experience_with_tracing(experience_data)
+            with bind_context(sub_agent="experience_analysis"), timed(
+                "sub_agent", "experience_analysis"
+            ):
+                experience_analysis = self._analyze_experience_with_tracing(
+                    experience_data
+                )
             individual_analyses["experience"] = experience_analysis
 
         return individual_analyses
 
     @traceable(name="resume_analysis", tags=["profile_analysis", "resume", "llm_chain"])
     def _analyze_resume_with_tracing(self, resume_data):
-        """Analyze resume with tracing"""
+        """
+        Analyze resume with tracing
+
+        Results are cached by the hash of the resume text and versioned by
+        the prompt, schema and model, so re-submitting the same resume skips
+        the LLM call.
+        """
+        cache = get_content_cache("resume_analysis")
+        cache_key = content_hash(resume_data.get("content") or resume_data)
+        cache_version = self._resume_analysis_version()
+        cached = cache.get(cache_key, cache_version)
+        if cached is not None:
+            self._add_processing_note("Resume analysis reused from cache")
+            get_llm_accountant().record_cache_hit(
+                getattr(self.llm_model, "model_name", "")
+            )
+            return cached
+
         try:
             resume_chain = self.resume_prompt | self.llm_model | self.resume_parser
             resume_analysis = resume_chain.invoke(
                 {"resume_data": json.dumps(resume_data, indent=2)}
             )
-            return resume_analysis.dict()
+            result = resume_analysis.dict()
+            cache.put(cache_key, cache_version, result)
+            return result
         except Exception as e:
             self.logger.error(f"Resume analysis failed: {e}")
             return {"error": f"Resume analysis failed: {str(e)}"}
 
+    def analyze_resume(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run only the resume step of profile analysis
+
+        Used to pre-process a resume as soon as it is uploaded; the result
+        lands in the resume analysis cache, so the full fleet run later
+        reuses it instead of calling the LLM again.
+        """
+        with bind_context(agent=self.agent_id, sub_agent="resume_analysis"):
+            return self._analyze_resume_with_tracing(resume_data)
+
+    def _resume_analysis_version(self) -> str:
+        return content_version(
+            self.resume_prompt.template,
+            self.resume_parser.get_format_instructions(),
+            getattr(self.llm_model, "model_name", ""),
+        )
+
     @traceable(
         name="optional_input_analysis",
         tags=["profile_analysis", "optional_inputs", "llm_chain"],
@@ -465,6 +517,7 @@ Provide a comprehensive, strategic analysis that synthesizes all available infor
         )
         return round(total_confidence, 2)
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
@@ -7,6 +7,7 @@ from langsmith import traceable
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
+from core.timing import timed, timed_step
 
 
 class SkillDevelopmentStrategistAgent(BaseAgent):
@@ -165,7 +166,8 @@ Learning Methodology Considerations:
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.strategy_prompt.format(**prompt_inputs)
+        with timed("prompt"):
+            formatted_prompt = self.strategy_prompt.format(**prompt_inputs)
         response = self.llm_model.invoke(formatted_prompt)
 
         output_dict = self._parse_llm_response(response)
@@ -451,6 +453,7 @@ Learning Methodology Considerations:
 
         return min(0.95, base_confidence + completeness_boost)
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
@@ -3,6 +3,8 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 import json
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 
 class DomainExtractionOutput(BaseModel):
@@ -86,6 +88,7 @@ Engineering Student:
 Focus on the student's actual background while identifying realistic market connections.""",
         )
 
+    @timed_step("sub_agent", "domain_extraction")
     def extract_domains(
         self,
         student_profile: str,
@@ -105,8 +108,10 @@ Focus on the student's actual background while identifying realistic market conn
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.prompt.format(**prompt_input)
-        llm_response = self.llm_model.invoke(formatted_prompt)
+        with timed("prompt"):
+            formatted_prompt = self.prompt.format(**prompt_input)
+        with bind_context(sub_agent="domain_extraction"):
+            llm_response = self.llm_model.invoke(formatted_prompt)
         result = self._parse_llm_response(llm_response)
 
         # Add semantic analysis
@@ -133,6 +138,7 @@ Focus on the student's actual background while identifying realistic market conn
             },
         }
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Parse LLM response with error handling"""
         content = response.content.strip()
@@ -3,6 +3,10 @@ import json
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
+from core.content_cache import content_hash, content_version, get_content_cache
+from core.llm_accounting import get_llm_accountant
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 
 class ExtractionResult(BaseModel):
@@ -55,6 +59,7 @@ Instructions:
 Return your response as valid JSON only.""",
         )
 
+    @timed_step("sub_agent", "extraction")
     def extract_information(
         self,
         extraction_task: str,
@@ -65,19 +70,37 @@ Return your response as valid JSON only.""",
         """
         Extract specific information using LLM intelligence
 
+        Successful extractions are cached by the task and the hash of the
+        student's source data (resume text, academic, LinkedIn and GitHub
+        profiles), so a re-submitted profile skips the LLM call.
+
         Args:
             extraction_task: What to extract (e.g., "student's primary education field")
             validated_input: The complete validated input data
             output_format: Expected format (string, list, dict, etc.)
             context: Additional context for extraction
         """
+        # Add context if provided
+        full_task = f"{extraction_task}. {context}" if context else extraction_task
+
+        cache = get_content_cache("resume_extraction")
+        cache_key = self._cache_key(full_task, output_format, validated_input)
+        cache_version = content_version(
+            self.extraction_prompt.template,
+            self.output_parser.get_format_instructions(),
+            getattr(self.llm_model, "model_name", ""),
+        )
+        cached = cache.get(cache_key, cache_version)
+        if cached is not None:
+            with bind_context(sub_agent="extraction"):
+                get_llm_accountant().record_cache_hit(
+                    getattr(self.llm_model, "model_name", "")
+                )
+            return ExtractionResult(**cached)
 
         # Prepare data summary for LLM
         available_data = self._prepare_data_summary(validated_input)
 
-        # Add context if provided
-        full_task = f"{extraction_task}. {context}" if context else extraction_task
-
         # Format the prompt
         prompt_inputs = {
             "extraction_task": full_task,
@@ -86,15 +109,19 @@ Return your response as valid JSON only.""",
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.extraction_prompt.format(**prompt_inputs)
+        with timed("prompt"):
+            formatted_prompt = self.extraction_prompt.format(**prompt_inputs)
 
         # Get LLM response
-        response = self.llm_model.invoke(formatted_prompt)
+        with bind_context(sub_agent="extraction"):
+            response = self.llm_model.invoke(formatted_prompt)
 
         # Parse response
         try:
             result_dict = self._parse_llm_response(response)
-            return ExtractionResult(**result_dict)
+            result = ExtractionResult(**result_dict)
+            cache.put(cache_key, cache_version, result.dict())
+            return result
         except Exception as e:
             # Fallback result
             return ExtractionResult(
@@ -104,6 +131,26 @@ Return your response as valid JSON only.""",
                 reasoning=f"Failed to extract: {str(e)}",
             )
 
+    def _cache_key(
+        self, task: str, output_format: str, validated_input: Dict[str, Any]
+    ) -> str:
+        """
+        Hash of the task and the student's own data; previous agent outputs
+        are left out because they are themselves derived from that data
+        """
+        optional_data = validated_input.get("optional_data", {})
+        resume_data = optional_data.get("resume_data") or {}
+        return content_hash(
+            {
+                "task": task,
+                "output_format": output_format,
+                "resume": content_hash(resume_data.get("content", "")),
+                "academic_status": optional_data.get("academic_status"),
+                "linkedin_profile": optional_data.get("linkedin_profile"),
+                "github_profile": optional_data.get("github_profile"),
+            }
+        )
+
     def _prepare_data_summary(self, validated_input: Dict[str, Any]) -> str:
         """Prepare a comprehensive but concise summary of available data"""
         data_summary = []
@@ -192,6 +239,7 @@ Return your response as valid JSON only.""",
             "; ".join(summary_parts) if summary_parts else json.dumps(output_data)[:300]
         )
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Parse LLM response to extract JSON"""
         content = response.content.strip()
@@ -4,6 +4,8 @@ from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 import json
 from datetime import datetime
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 
 class MarketTrendOutput(BaseModel):
@@ -114,6 +116,7 @@ Focus on actionable insights for a college student planning their career develop
 Provide comprehensive multi-level trend analysis connecting specific domains to broader market realities.""",
         )
 
+    @timed_step("sub_agent", "market_trend_analyzer")
     def analyze_trends(
         self,
         specific_domains: List[str],
@@ -132,8 +135,10 @@ Provide comprehensive multi-level trend analysis connecting specific domains to
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.prompt.format(**prompt_input)
-        llm_response = self.llm_model.invoke(formatted_prompt)
+        with timed("prompt"):
+            formatted_prompt = self.prompt.format(**prompt_input)
+        with bind_context(sub_agent="market_trend_analyzer"):
+            llm_response = self.llm_model.invoke(formatted_prompt)
         result = self._parse_llm_response(llm_response)
 
         # Add computational trend scoring
@@ -200,6 +205,7 @@ Provide comprehensive multi-level trend analysis connecting specific domains to
 
         return opportunities[:10]  # Top 10 opportunities
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Parse LLM response with error handling"""
         content = response.content.strip()
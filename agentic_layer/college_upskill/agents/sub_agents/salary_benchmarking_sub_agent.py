@@ -4,6 +4,8 @@ from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 import json
 import re
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 
 class SalaryBenchmarkOutput(BaseModel):
@@ -130,6 +132,7 @@ Focus on actionable insights for college students understanding earning potentia
 Return only valid JSON without any markdown formatting, comments, or explanations.""",
         )
 
+    @timed_step("sub_agent", "salary_benchmarking")
     def analyze_compensation(
         self,
         specific_domains: List[str],
@@ -147,8 +150,10 @@ Return only valid JSON without any markdown formatting, comments, or explanation
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.prompt.format(**prompt_input)
-        llm_response = self.llm_model.invoke(formatted_prompt)
+        with timed("prompt"):
+            formatted_prompt = self.prompt.format(**prompt_input)
+        with bind_context(sub_agent="salary_benchmarking"):
+            llm_response = self.llm_model.invoke(formatted_prompt)
         result = self._parse_llm_response(llm_response)
 
         # Add computational salary analysis
@@ -221,6 +226,7 @@ Return only valid JSON without any markdown formatting, comments, or explanation
 
         return content.strip()
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Parse LLM response with error handling and comment removal"""
         content = response.content.strip()
@@ -288,6 +288,13 @@ class CollegeStudentFleetManager(BaseFleetManager):
             "execution_history_count": len(self.execution_history),
         }
 
+    def preprocess_resume(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the resume-only part of profile analysis ahead of a fleet run"""
+        profile_agent = self.agents.get("profile_analysis")
+        if profile_agent is None:
+            return {"error": "Profile analysis agent not available"}
+        return profile_agent.analyze_resume(resume_data)
+
     def register_agent(self, agent: BaseAgent):
         """Register a real agent implementation"""
         if agent.agent_id in self.execution_order:
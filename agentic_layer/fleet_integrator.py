@@ -1,25 +1,36 @@
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
 from agentic_layer.base_fleet_manager import BaseFleetManager
-from agentic_layer.college_upskill.college_student_fleet_manager import (
-    CollegeStudentFleetManager,
-)
-from agentic_layer.school_students.school_student_fleet_manager import (
-    SchoolStudentFleetManager,
-)
+
+if TYPE_CHECKING:
+    # Imported where the fleet is built: each pulls in its whole agent tree
+    from agentic_layer.college_upskill.college_student_fleet_manager import (
+        CollegeStudentFleetManager,
+    )
+    from agentic_layer.school_students.school_student_fleet_manager import (
+        SchoolStudentFleetManager,
+    )
 
 
 class FleetIntegrator:
     """Helper class for integrating fleet managers with the main orchestrator"""
 
     @staticmethod
-    def create_college_fleet(llm_model=None) -> CollegeStudentFleetManager:
+    def create_college_fleet(llm_model=None) -> "CollegeStudentFleetManager":
         """Create and return configured college student fleet"""
+        from agentic_layer.college_upskill.college_student_fleet_manager import (
+            CollegeStudentFleetManager,
+        )
+
         fleet = CollegeStudentFleetManager(llm_model)
         return fleet
 
     @staticmethod
-    def create_school_student_fleet(llm_model=None) -> SchoolStudentFleetManager:
+    def create_school_student_fleet(llm_model=None) -> "SchoolStudentFleetManager":
         """Create and return configured school student fleet"""
+        from agentic_layer.school_students.school_student_fleet_manager import (
+            SchoolStudentFleetManager,
+        )
+
         fleet = SchoolStudentFleetManager(llm_model)
         return fleet
 
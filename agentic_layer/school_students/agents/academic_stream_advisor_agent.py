@@ -13,6 +13,7 @@ from agentic_layer.school_students.agents.sub_agents.parental_alignment_sub_agen
     ParentalAlignmentSubAgent,
 )
 from config.agent_config import AgentType, ProcessingStatus
+from core.timing import timed, timed_step
 
 
 class StreamType(Enum):
@@ -361,7 +362,8 @@ Remember: This recommendation will significantly impact the student's academic j
                 "format_instructions": self.output_parser.get_format_instructions(),
             }
 
-            formatted_prompt = self.advisory_prompt.format(**prompt_input)
+            with timed("prompt"):
+                formatted_prompt = self.advisory_prompt.format(**prompt_input)
 
             # Get LLM response
             llm_response = self.llm_model.invoke(formatted_prompt)
@@ -787,6 +789,7 @@ Remember: This recommendation will significantly impact the student's academic j
         else:
             return "Not Recommended"
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
@@ -13,6 +13,7 @@ from agentic_layer.school_students.agents.sub_agents.career_readiness_sub_agent
     CareerReadinessSubAgent,
 )
 from config.agent_config import AgentType, ProcessingStatus
+from core.timing import timed, timed_step
 
 
 class CareerField(Enum):
@@ -591,7 +592,8 @@ Remember: This exploration should inspire the student while providing practical,
                 "format_instructions": self.output_parser.get_format_instructions(),
             }
 
-            formatted_prompt = self.exploration_prompt.format(**prompt_input)
+            with timed("prompt"):
+                formatted_prompt = self.exploration_prompt.format(**prompt_input)
 
             # Get LLM response
             llm_response = self.llm_model.invoke(formatted_prompt)
@@ -1340,6 +1342,7 @@ Career Exploration Framework for School Students:
         scores = [cii_results.get(interest, 5) for interest in relevant_interests]
         return sum(scores) / (len(scores) * 10)
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
@@ -16,6 +16,7 @@ from agentic_layer.school_students.agents.sub_agents.financial_aid_planning_sub_
     FinancialAidPlanningSubAgent,
 )
 from config.agent_config import AgentType, ProcessingStatus
+from core.timing import timed, timed_step
 
 
 class CollegeType(Enum):
@@ -581,7 +582,8 @@ Remember: This guidance will influence major life decisions and financial commit
                 "format_instructions": self.output_parser.get_format_instructions(),
             }
 
-            formatted_prompt = self.navigation_prompt.format(**prompt_input)
+            with timed("prompt"):
+                formatted_prompt = self.navigation_prompt.format(**prompt_input)
 
             # Get LLM response
             llm_response = self.llm_model.invoke(formatted_prompt)
@@ -1017,6 +1019,7 @@ Remember: This guidance will influence major life decisions and financial commit
             "Plan for regular family meetings to track progress",
         ]
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
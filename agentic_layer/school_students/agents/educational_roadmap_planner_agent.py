@@ -13,6 +13,7 @@ from agentic_layer.school_students.agents.sub_agents.resource_planning_sub_agent
     ResourcePlanningSubAgent,
 )
 from config.agent_config import AgentType, ProcessingStatus
+from core.timing import timed, timed_step
 
 
 class EducationLevel(Enum):
@@ -597,7 +598,8 @@ Remember: This roadmap will guide critical educational decisions. Provide practi
                 "format_instructions": self.output_parser.get_format_instructions(),
             }
 
-            formatted_prompt = self.planning_prompt.format(**prompt_input)
+            with timed("prompt"):
+                formatted_prompt = self.planning_prompt.format(**prompt_input)
 
             # Get LLM response
             llm_response = self.llm_model.invoke(formatted_prompt)
@@ -1322,6 +1324,7 @@ Remember: This roadmap will guide critical educational decisions. Provide practi
 
         return decisions
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
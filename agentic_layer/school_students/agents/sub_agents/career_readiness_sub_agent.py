@@ -3,6 +3,8 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 import json
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 
 class CareerReadinessOutput(BaseModel):
@@ -79,6 +81,7 @@ Be honest about challenges while maintaining encouragement and optimism.
 {format_instructions}""",
         )
 
+    @timed_step("sub_agent", "career_readiness")
     def assess_readiness(
         self, student_data: Dict, career_pathways: List[Dict], assessment_scores: Dict
     ) -> Dict[str, Any]:
@@ -96,10 +99,13 @@ Be honest about challenges while maintaining encouragement and optimism.
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.prompt.format(**prompt_input)
-        llm_response = self.llm_model.invoke(formatted_prompt)
+        with timed("prompt"):
+            formatted_prompt = self.prompt.format(**prompt_input)
+        with bind_context(sub_agent="career_readiness"):
+            llm_response = self.llm_model.invoke(formatted_prompt)
         return self._parse_llm_response(llm_response)
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
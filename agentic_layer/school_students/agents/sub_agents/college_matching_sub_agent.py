@@ -3,6 +3,8 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 import json
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 
 class CollegeMatchingOutput(BaseModel):
@@ -164,6 +166,7 @@ Focus on specific, actionable recommendations with realistic admission probabili
 {format_instructions}""",
         )
 
+    @timed_step("sub_agent", "college_matching")
     def match_colleges(
         self,
         student_profile: str,
@@ -183,8 +186,10 @@ Focus on specific, actionable recommendations with realistic admission probabili
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.prompt.format(**prompt_input)
-        llm_response = self.llm_model.invoke(formatted_prompt)
+        with timed("prompt"):
+            formatted_prompt = self.prompt.format(**prompt_input)
+        with bind_context(sub_agent="college_matching"):
+            llm_response = self.llm_model.invoke(formatted_prompt)
         result = self._parse_llm_response(llm_response)
 
         # Add computational analysis
@@ -224,6 +229,7 @@ Focus on specific, actionable recommendations with realistic admission probabili
 
         return metrics
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
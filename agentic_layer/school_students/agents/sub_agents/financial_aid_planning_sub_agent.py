@@ -3,6 +3,8 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 import json
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 
 class FinancialAidPlanningOutput(BaseModel):
@@ -141,6 +143,7 @@ Consider Indian banking regulations, tax implications, and family financial dyna
 {format_instructions}""",
         )
 
+    @timed_step("sub_agent", "financial_aid_planning")
     def create_financial_plan(
         self,
         student_profile: str,
@@ -160,8 +163,10 @@ Consider Indian banking regulations, tax implications, and family financial dyna
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.prompt.format(**prompt_input)
-        llm_response = self.llm_model.invoke(formatted_prompt)
+        with timed("prompt"):
+            formatted_prompt = self.prompt.format(**prompt_input)
+        with bind_context(sub_agent="financial_aid_planning"):
+            llm_response = self.llm_model.invoke(formatted_prompt)
         result = self._parse_llm_response(llm_response)
 
         # Add computational financial analysis
@@ -235,6 +240,7 @@ Consider Indian banking regulations, tax implications, and family financial dyna
             },
         }
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
@@ -3,6 +3,8 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 import json
+from core.request_context import bind_context
+from core.timing import timed, timed_step
 
 
 class StreamDecisionSupportOutput(BaseModel):
@@ -97,6 +99,7 @@ Make everything specific to this student's situation, not generic advice.
 {format_instructions}""",
         )
 
+    @timed_step("sub_agent", "stream_decision_support")
     def generate_support(
         self,
         student_profile: str,
@@ -123,10 +126,13 @@ Make everything specific to this student's situation, not generic advice.
             "format_instructions": self.output_parser.get_format_instructions(),
         }
 
-        formatted_prompt = self.prompt.format(**prompt_input)
-        llm_response = self.llm_model.invoke(formatted_prompt)
+        with timed("prompt"):
+            formatted_prompt = self.prompt.format(**prompt_input)
+        with bind_context(sub_agent="stream_decision_support"):
+            llm_response = self.llm_model.invoke(formatted_prompt)
         return self._parse_llm_response(llm_response)
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
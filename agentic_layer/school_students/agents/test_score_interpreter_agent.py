@@ -6,6 +6,7 @@ from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 from agentic_layer.base_agent import BaseAgent
 from config.agent_config import AgentType
+from core.timing import timed, timed_step
 
 
 class ScoreLevel(Enum):
@@ -256,7 +257,8 @@ Remember: This student is at a crucial stage of identity and career development.
                 "format_instructions": self.output_parser.get_format_instructions(),
             }
 
-            formatted_prompt = self.interpretation_prompt.format(**prompt_input)
+            with timed("prompt"):
+                formatted_prompt = self.interpretation_prompt.format(**prompt_input)
 
             # Get LLM response
             llm_response = self.llm_model.invoke(formatted_prompt)
@@ -609,6 +611,7 @@ Remember: This student is at a crucial stage of identity and career development.
             else ["Aptitude-interest patterns require individual analysis"]
         )
 
+    @timed_step("parse")
     def _parse_llm_response(self, response) -> Dict[str, Any]:
         """Strict JSON parsing without fallback - raises exceptions on failure"""
         content = response.content.strip()
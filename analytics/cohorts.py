@@ -0,0 +1,231 @@
+import os
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from analytics.session_facts import SessionFacts
+
+# Dimensions a cohort can be filtered on, besides the tenant
+DIMENSIONS = ("vertical", "period", "grade", "gender", "program", "year_of_study")
+STEN_LEVELS = 10
+# Free-text facts beyond a cell's distinct-value cap are counted under this
+OTHER = "(other)"
+MAX_VALUE_LENGTH = 120
+
+
+@dataclass
+class CohortCell:
+    """
+    Running aggregates for every session sharing one combination of
+    dimension values
+
+    Each fact is kept as a column of counts (value -> sessions) and stens
+    as per-ability histograms, so merging cells never revisits sessions.
+    Careers, streams and skill gaps are free text from the model, so each
+    column holds at most ``max_values`` distinct values and folds the rest
+    into ``OTHER``.
+    """
+
+    sessions: int = 0
+    streams: Counter = field(default_factory=Counter)
+    careers: Counter = field(default_factory=Counter)
+    skill_gaps: Counter = field(default_factory=Counter)
+    salary_bands: Counter = field(default_factory=Counter)
+    sten_histograms: Dict[str, List[int]] = field(default_factory=dict)
+
+    def add(self, facts: SessionFacts, max_values: int) -> List[str]:
+        """Count one session; returns the normalized values it kept"""
+        self.sessions += 1
+        streams = [facts.recommended_stream] if facts.recommended_stream else []
+        kept = _count(self.streams, streams, max_values)
+        kept += _count(self.careers, facts.top_careers, max_values)
+        kept += _count(self.skill_gaps, facts.skill_gaps, max_values)
+        self.salary_bands.update(set(facts.salary_bands))
+        for ability, sten in facts.stens.items():
+            histogram = self.sten_histograms.setdefault(ability, [0] * STEN_LEVELS)
+            histogram[min(max(sten, 1), STEN_LEVELS) - 1] += 1
+        return kept
+
+    def merge(self, other: "CohortCell"):
+        self.sessions += other.sessions
+        self.streams.update(other.streams)
+        self.careers.update(other.careers)
+        self.skill_gaps.update(other.skill_gaps)
+        self.salary_bands.update(other.salary_bands)
+        for ability, histogram in other.sten_histograms.items():
+            totals = self.sten_histograms.setdefault(ability, [0] * STEN_LEVELS)
+            for level, count in enumerate(histogram):
+                totals[level] += count
+
+
+class CohortAnalytics:
+    """
+    Cohort aggregates maintained as sessions complete
+
+    Sessions are folded into the cell for their (vertical, period, grade,
+    gender, program, year_of_study) combination when they land. A query
+    merges the matching cells of one tenant, so its cost depends on how
+    many distinct cohorts exist, not on how many sessions they hold.
+    Aggregates live in memory and reset with the process.
+
+    Only the last ``max_recorded`` session ids are remembered to drop
+    repeat deliveries; each cell keeps ``max_values_per_cell`` distinct
+    values per free-text fact.
+    """
+
+    def __init__(self, max_recorded: int = 100_000, max_values_per_cell: int = 200):
+        self.max_recorded = max_recorded
+        self.max_values_per_cell = max_values_per_cell
+        self._cells: Dict[str, Dict[Tuple[Optional[str], ...], CohortCell]] = {}
+        self._labels: Dict[str, str] = {}  # normalized value -> display spelling
+        self._recorded: "OrderedDict[str, None]" = OrderedDict()
+        self._sessions = 0
+        self._lock = threading.Lock()
+
+    def record(self, facts: SessionFacts) -> bool:
+        """
+        Fold one session into the aggregates
+
+        Returns:
+            False if the session was already recorded
+        """
+        dimensions = facts.dimensions()
+        key = tuple(_normalize(dimensions[name]) for name in DIMENSIONS)
+        with self._lock:
+            if facts.session_id in self._recorded:
+                self._recorded.move_to_end(facts.session_id)
+                return False
+            self._recorded[facts.session_id] = None
+            if len(self._recorded) > self.max_recorded:
+                self._recorded.popitem(last=False)
+            self._sessions += 1
+
+            cells = self._cells.setdefault(facts.tenant_id, {})
+            kept = set(
+                cells.setdefault(key, CohortCell()).add(
+                    facts, self.max_values_per_cell
+                )
+            )
+            for value in (
+                [facts.recommended_stream] + facts.top_careers + facts.skill_gaps
+            ):
+                if value and _key(value) in kept:
+                    self._labels.setdefault(_key(value), _label(value))
+        return True
+
+    def query(
+        self,
+        tenant_id: str,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        period_from: Optional[str] = None,
+        period_to: Optional[str] = None,
+        top: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Aggregate report for the tenant's sessions matching ``filters``
+        (dimension -> value, compared case-insensitively) and the
+        inclusive "YYYY-MM" period range
+        """
+        wanted = {
+            DIMENSIONS.index(name): _normalize(value)
+            for name, value in (filters or {}).items()
+            if value is not None
+        }
+        period_index = DIMENSIONS.index("period")
+        total = CohortCell()
+        with self._lock:
+            for key, cell in self._cells.get(tenant_id, {}).items():
+                if any(key[index] != value for index, value in wanted.items()):
+                    continue
+                period = key[period_index] or ""
+                if (period_from and period < period_from) or (
+                    period_to and period > period_to
+                ):
+                    continue
+                total.merge(cell)
+            labels = dict(self._labels)
+
+        def ranked(counter: Counter) -> List[Dict[str, Any]]:
+            return [
+                {
+                    "value": labels.get(value, value),
+                    "sessions": count,
+                    "share": round(count / total.sessions, 3),
+                }
+                for value, count in counter.most_common(top)
+            ]
+
+        return {
+            "sessions": total.sessions,
+            "recommended_streams": ranked(total.streams),
+            "top_careers": ranked(total.careers),
+            "skill_gaps": ranked(total.skill_gaps),
+            "salary_bands": ranked(total.salary_bands),
+            "sten_profile": {
+                ability: _sten_summary(histogram)
+                for ability, histogram in sorted(total.sten_histograms.items())
+            },
+        }
+
+    def dimension_values(self, tenant_id: str) -> Dict[str, Dict[str, int]]:
+        """Sessions per value of each dimension, to populate query filters"""
+        values: Dict[str, Counter] = {name: Counter() for name in DIMENSIONS}
+        with self._lock:
+            for key, cell in self._cells.get(tenant_id, {}).items():
+                for name, value in zip(DIMENSIONS, key):
+                    if value is not None:
+                        values[name][value] += cell.sessions
+        return {name: dict(sorted(counts.items())) for name, counts in values.items()}
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": self._sessions,
+                "cells": sum(len(cells) for cells in self._cells.values()),
+            }
+
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+
+def _key(value: str) -> str:
+    """Case- and spacing-insensitive form of a free-text value"""
+    return _label(value).lower()
+
+
+def _label(value: str) -> str:
+    """Display spelling: single-spaced, trimmed and length-capped"""
+    return " ".join(value.split()).strip(" .,;:-")[:MAX_VALUE_LENGTH]
+
+
+def _count(counter: Counter, values: List[str], max_values: int) -> List[str]:
+    """Count each value once; new values past ``max_values`` go to OTHER"""
+    distinct = len(counter) - (OTHER in counter)
+    kept: List[str] = []
+    for value in dict.fromkeys(_key(value) for value in values if value):
+        if not value:
+            continue
+        if value not in counter:
+            if distinct >= max_values:
+                value = OTHER
+            else:
+                distinct += 1
+        if value not in kept:
+            kept.append(value)
+    counter.update(kept)
+    return kept
+
+
+def _sten_summary(histogram: List[int]) -> Dict[str, Any]:
+    count = sum(histogram)
+    mean = sum((level + 1) * n for level, n in enumerate(histogram)) / count
+    return {"sessions": count, "mean": round(mean, 2), "histogram": histogram}
+
+
+# Process-wide aggregates fed by completed analyses
+cohort_analytics = CohortAnalytics(
+    max_recorded=int(os.getenv("COHORT_MAX_RECORDED_SESSIONS", "100000")),
+    max_values_per_cell=int(os.getenv("COHORT_MAX_VALUES_PER_CELL", "200")),
+)
@@ -0,0 +1,518 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from analytics.session_facts import (
+    _agent_data,
+    _dicts,
+    _number,
+    _strings,
+    _text,
+    extract_session_facts,
+)
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional, only the Parquet exporter needs it
+    pyarrow = None
+
+# Bump when a column is added or changes meaning. Columns are only ever
+# appended, so older exports are upgraded in place (see SqliteExporter).
+SCHEMA_VERSION = 1
+
+# table -> ordered (column, SQLite type); every child table keys on session_id
+TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "sessions": [
+        ("session_id", "TEXT"),
+        ("vertical", "TEXT"),
+        ("tenant_id", "TEXT"),
+        ("user_id", "TEXT"),
+        ("status", "TEXT"),
+        ("error", "TEXT"),
+        ("completed_at", "TEXT"),
+        ("fleet_status", "TEXT"),
+        ("confidence", "REAL"),
+        ("processing_time", "REAL"),
+        ("agents_completed", "INTEGER"),
+        ("grade", "TEXT"),
+        ("gender", "TEXT"),
+        ("program", "TEXT"),
+        ("year_of_study", "TEXT"),
+        ("exported_at", "TEXT"),
+    ],
+    "agent_results": [
+        ("session_id", "TEXT"),
+        ("agent_id", "TEXT"),
+        ("status", "TEXT"),
+        ("confidence", "REAL"),
+        ("warnings", "INTEGER"),
+        ("output_json", "TEXT"),
+    ],
+    "recommendations": [
+        ("session_id", "TEXT"),
+        ("source", "TEXT"),  # agent id, or "fleet" for the fleet summary
+        ("kind", "TEXT"),  # stream, career, opportunity, career_goal, ...
+        ("rank", "INTEGER"),
+        ("title", "TEXT"),
+        ("score", "REAL"),
+        ("detail_json", "TEXT"),
+    ],
+    "skills": [
+        ("session_id", "TEXT"),
+        ("source", "TEXT"),
+        ("kind", "TEXT"),  # current, required, gap or priority
+        ("skill", "TEXT"),
+        ("level", "TEXT"),  # proficiency or priority, when the agent gave one
+    ],
+    "colleges": [
+        ("session_id", "TEXT"),
+        ("rank", "INTEGER"),
+        ("college_name", "TEXT"),
+        ("college_type", "TEXT"),
+        ("location", "TEXT"),
+        ("suitability_score", "REAL"),
+        ("programs", "TEXT"),  # "; "-joined
+        ("detail_json", "TEXT"),
+    ],
+    "scholarships": [
+        ("session_id", "TEXT"),
+        ("rank", "INTEGER"),
+        ("scholarship_name", "TEXT"),
+        ("provider", "TEXT"),
+        ("scholarship_type", "TEXT"),
+        ("benefit_amount", "TEXT"),
+        ("compatibility_score", "REAL"),
+        ("detail_json", "TEXT"),
+    ],
+}
+
+_TITLE_KEYS = ("title", "role", "job_title", "position", "opportunity", "name")
+_SCORE_KEYS = ("suitability_score", "match_score", "compatibility_score", "score")
+
+
+class ExportSchemaError(Exception):
+    """An existing export was written by a newer schema than this code knows"""
+
+
+@dataclass
+class ExportSession:
+    """One finished session, as handed to an exporter"""
+
+    session_id: str
+    vertical: str
+    status: str  # completed or failed
+    result: Optional[Dict[str, Any]] = None
+    user_data: Dict[str, Any] = field(default_factory=dict)
+    tenant_id: Optional[str] = None
+    error: Optional[str] = None
+    completed_at: Optional[str] = None  # ISO timestamp
+
+
+def flatten_session(session: ExportSession) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Flatten a session's fleet result into rows for every table in TABLES
+
+    Agent outputs are LLM generated, so each field is looked up
+    defensively; the raw output of every agent is also kept in
+    ``agent_results.output_json`` for anything the tables leave out.
+    """
+    result = session.result or {}
+    outputs = result.get("outputs") or {}
+    summary = outputs.get("fleet_summary") or {}
+    agents = _agent_data(result)
+    completed_at = session.completed_at or datetime.now().isoformat()
+    facts = extract_session_facts(
+        session.session_id,
+        session.vertical,
+        session.tenant_id,
+        session.user_data,
+        result,
+        completed_at=_parse_timestamp(completed_at),
+    )
+
+    rows: Dict[str, List[Dict[str, Any]]] = {table: [] for table in TABLES}
+    rows["sessions"].append(
+        {
+            "session_id": session.session_id,
+            "vertical": session.vertical,
+            "tenant_id": session.tenant_id,
+            "user_id": _text(session.user_data.get("user_id")),
+            "status": session.status,
+            "error": session.error,
+            "completed_at": completed_at,
+            "fleet_status": _text(summary.get("status")),
+            "confidence": _number(summary.get("confidence")),
+            "processing_time": _number(summary.get("processing_time")),
+            "agents_completed": len(result.get("completed_agents") or []),
+            "grade": facts.grade,
+            "gender": facts.gender,
+            "program": facts.program,
+            "year_of_study": facts.year_of_study,
+            "exported_at": datetime.now().isoformat(),
+        }
+    )
+
+    for agent_id, output in (outputs.get("agent_outputs") or {}).items():
+        if not isinstance(output, dict):
+            continue
+        rows["agent_results"].append(
+            {
+                "session_id": session.session_id,
+                "agent_id": agent_id,
+                "status": _text(output.get("status")),
+                "confidence": _number(output.get("confidence")),
+                "warnings": len(output.get("warnings") or []),
+                "output_json": _json(output.get("data")),
+            }
+        )
+
+    def recommend(source: str, kind: str, items: List[Any], title_keys):
+        for rank, item in enumerate(items, start=1):
+            detail = item if isinstance(item, dict) else {}
+            title = (
+                next((detail[key] for key in title_keys if detail.get(key)), None)
+                if detail
+                else item
+            )
+            rows["recommendations"].append(
+                {
+                    "session_id": session.session_id,
+                    "source": source,
+                    "kind": kind,
+                    "rank": rank,
+                    "title": _text(title),
+                    "score": next(
+                        (
+                            _number(detail[key])
+                            for key in _SCORE_KEYS
+                            if _number(detail.get(key)) is not None
+                        ),
+                        None,
+                    ),
+                    "detail_json": _json(detail) if detail else None,
+                }
+            )
+
+    def skill(source: str, kind: str, name: Any, level: Any = None):
+        if _text(name):
+            rows["skills"].append(
+                {
+                    "session_id": session.session_id,
+                    "source": source,
+                    "kind": kind,
+                    "skill": _text(name),
+                    "level": _text(level) if not isinstance(level, dict) else None,
+                }
+            )
+
+    recommend("fleet", "recommendation", _list(summary.get("recommendations")), ())
+    recommend("fleet", "next_action", _list(summary.get("next_actions")), ())
+
+    # School students
+    advisor = agents.get("academic_stream_advisor", {})
+    recommend(
+        "academic_stream_advisor",
+        "stream",
+        _dicts(advisor.get("recommended_streams")),
+        ("stream_type",),
+    )
+
+    explorer = agents.get("career_pathway_explorer", {})
+    pathways = _dicts(explorer.get("recommended_career_pathways"))
+    recommend("career_pathway_explorer", "career", pathways, ("career_title",))
+    for pathway in pathways:
+        for name in _strings(pathway.get("skill_requirements")):
+            skill("career_pathway_explorer", "required", name)
+    insights = explorer.get("career_exploration_insights")
+    if isinstance(insights, dict):
+        for name in _strings(insights.get("skill_development_priorities")):
+            skill("career_pathway_explorer", "priority", name)
+
+    navigator = agents.get("college_scholarship_navigator", {})
+    for rank, college in enumerate(
+        _dicts(navigator.get("recommended_colleges")), start=1
+    ):
+        rows["colleges"].append(
+            {
+                "session_id": session.session_id,
+                "rank": rank,
+                "college_name": _text(college.get("college_name")),
+                "college_type": _text(college.get("college_type")),
+                "location": _text(college.get("location")),
+                "suitability_score": _number(college.get("suitability_score")),
+                "programs": "; ".join(
+                    name for name in _strings(college.get("programs_offered")) if name
+                )
+                or None,
+                "detail_json": _json(college),
+            }
+        )
+    for rank, scholarship in enumerate(
+        _dicts(navigator.get("scholarship_opportunities")), start=1
+    ):
+        rows["scholarships"].append(
+            {
+                "session_id": session.session_id,
+                "rank": rank,
+                "scholarship_name": _text(scholarship.get("scholarship_name")),
+                "provider": _text(scholarship.get("provider")),
+                "scholarship_type": _text(scholarship.get("scholarship_type")),
+                "benefit_amount": _text(scholarship.get("benefit_amount")),
+                "compatibility_score": _number(scholarship.get("compatibility_score")),
+                "detail_json": _json(scholarship),
+            }
+        )
+
+    # College students
+    strategist = agents.get("skill_development_strategist", {})
+    gap_analysis = strategist.get("skill_gap_analysis")
+    if isinstance(gap_analysis, dict):
+        for key, kind in (
+            ("current_skills", "current"),
+            ("market_required_skills", "required"),
+            ("skill_gaps", "gap"),
+        ):
+            skills = gap_analysis.get(key)
+            if isinstance(skills, dict):
+                for name, level in skills.items():
+                    skill("skill_development_strategist", kind, name, level)
+            else:
+                for name in _strings(skills):
+                    skill("skill_development_strategist", kind, name)
+    roadmap = strategist.get("development_roadmap")
+    if isinstance(roadmap, dict):
+        for item in _list(roadmap.get("priority_skills")):
+            if isinstance(item, dict):
+                skill(
+                    "skill_development_strategist",
+                    "priority",
+                    item.get("skill") or item.get("name"),
+                    item.get("priority") or item.get("level"),
+                )
+            else:
+                skill("skill_development_strategist", "priority", item)
+
+    matcher = agents.get("opportunity_matcher", {})
+    recommend(
+        "opportunity_matcher",
+        "opportunity",
+        _dicts(matcher.get("matched_opportunities")),
+        _TITLE_KEYS,
+    )
+    planner = agents.get("career_optimization_planner", {})
+    recommend(
+        "career_optimization_planner",
+        "career_goal",
+        _dicts(planner.get("career_goals")),
+        ("goal_title",),
+    )
+    return rows
+
+
+class SqliteExporter:
+    """
+    Appends flattened sessions to a SQLite database
+
+    Exports are incremental: a session already exported is skipped unless
+    the new copy finished later (e.g. a failed record that was replayed),
+    in which case its rows are replaced. The schema version is kept in
+    ``export_meta``; opening an export written by an older version adds
+    the missing columns, and one written by a newer version is refused.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        with self._lock, self.connection:
+            self._migrate()
+
+    def _migrate(self):
+        execute = self.connection.execute
+        execute(
+            "CREATE TABLE IF NOT EXISTS export_meta "
+            "(key TEXT PRIMARY KEY, value TEXT)"
+        )
+        row = execute(
+            "SELECT value FROM export_meta WHERE key = 'schema_version'"
+        ).fetchone()
+        version = int(row[0]) if row else SCHEMA_VERSION
+        if version > SCHEMA_VERSION:
+            raise ExportSchemaError(
+                f"{self.path} uses export schema v{version}, "
+                f"this code only knows v{SCHEMA_VERSION}"
+            )
+
+        for table, columns in TABLES.items():
+            key = " PRIMARY KEY" if table == "sessions" else ""
+            definitions = [f"{columns[0][0]} {columns[0][1]}{key}"] + [
+                f"{name} {sql_type}" for name, sql_type in columns[1:]
+            ]
+            execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(definitions)})")
+            existing = {info[1] for info in execute(f"PRAGMA table_info({table})")}
+            for name, sql_type in columns:
+                if name not in existing:
+                    execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+            if table != "sessions":
+                execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_session "
+                    f"ON {table} (session_id)"
+                )
+        execute(
+            "INSERT OR REPLACE INTO export_meta VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
+        )
+
+    def write(self, sessions: Iterable[ExportSession], refresh: bool = False) -> int:
+        """
+        Export sessions in one transaction
+
+        Args:
+            refresh: re-export sessions even if the export is up to date
+
+        Returns:
+            How many sessions were written
+        """
+        count = 0
+        with self._lock, self.connection:
+            for session in sessions:
+                row = self.connection.execute(
+                    "SELECT completed_at FROM sessions WHERE session_id = ?",
+                    (session.session_id,),
+                ).fetchone()
+                if (
+                    row
+                    and not refresh
+                    and (row[0] or "") >= (session.completed_at or "")
+                ):
+                    continue
+                for table, table_rows in flatten_session(session).items():
+                    self.connection.execute(
+                        f"DELETE FROM {table} WHERE session_id = ?",
+                        (session.session_id,),
+                    )
+                    columns = [name for name, _ in TABLES[table]]
+                    self.connection.executemany(
+                        f"INSERT INTO {table} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join('?' * len(columns))})",
+                        [[row[name] for name in columns] for row in table_rows],
+                    )
+                count += 1
+        return count
+
+    def close(self):
+        self.connection.close()
+
+
+class ParquetExporter:
+    """
+    Appends flattened sessions to a directory of Parquet datasets
+
+    Each table is a folder (``<directory>/<table>/``) and every ``write``
+    adds one part file per table, so the folders can be read as a whole
+    with ``pyarrow.dataset`` or ``pandas.read_parquet``. Parquet files
+    cannot be updated, so a session already in the export is always
+    skipped, even when a newer copy comes along. Every part records the
+    schema version in its metadata. Needs pyarrow.
+    """
+
+    _TYPES = {"TEXT": "string", "REAL": "float64", "INTEGER": "int64"}
+
+    def __init__(self, directory: str):
+        if pyarrow is None:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+        self.directory = directory
+        self.schemas = {
+            table: pyarrow.schema(
+                [(name, self._TYPES[sql_type]) for name, sql_type in columns],
+                metadata={"export_schema_version": str(SCHEMA_VERSION)},
+            )
+            for table, columns in TABLES.items()
+        }
+        for table in TABLES:
+            os.makedirs(os.path.join(directory, table), exist_ok=True)
+        self._exported = self._load_exported()
+
+    def _load_exported(self) -> Set[str]:
+        exported: Set[str] = set()
+        folder = os.path.join(self.directory, "sessions")
+        for name in sorted(os.listdir(folder)):
+            if not name.endswith(".parquet"):
+                continue
+            path = os.path.join(folder, name)
+            metadata = pyarrow.parquet.read_schema(path).metadata or {}
+            version = int(metadata.get(b"export_schema_version", b"1"))
+            if version > SCHEMA_VERSION:
+                raise ExportSchemaError(
+                    f"{path} uses export schema v{version}, "
+                    f"this code only knows v{SCHEMA_VERSION}"
+                )
+            table = pyarrow.parquet.read_table(path, columns=["session_id"])
+            exported.update(table.column("session_id").to_pylist())
+        return exported
+
+    def write(self, sessions: Iterable[ExportSession], refresh: bool = False) -> int:
+        """
+        Export the sessions not in the export yet as one new part per table
+
+        ``refresh`` is accepted for symmetry with SqliteExporter, but
+        Parquet parts are immutable, so exported sessions are never
+        rewritten.
+        """
+        rows: Dict[str, List[Dict[str, Any]]] = {table: [] for table in TABLES}
+        written: List[str] = []
+        for session in sessions:
+            if session.session_id in self._exported or session.session_id in written:
+                continue
+            for table, table_rows in flatten_session(session).items():
+                rows[table].extend(table_rows)
+            written.append(session.session_id)
+        if not written:
+            return 0
+
+        part = f"part-{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        for table, table_rows in rows.items():
+            path = os.path.join(self.directory, table, part)
+            pyarrow.parquet.write_table(
+                pyarrow.Table.from_pylist(table_rows, schema=self.schemas[table]),
+                path + ".tmp",
+            )
+            os.replace(path + ".tmp", path)
+        self._exported.update(written)
+        return len(written)
+
+    def close(self):
+        pass
+
+
+def open_exporter(path: str):
+    """A Parquet exporter for a directory path, else a SQLite one"""
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        return SqliteExporter(path)
+    return ParquetExporter(path)
+
+
+# ========================== helpers ==========================
+
+
+def _list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
+
+
+def _json(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,226 @@
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# Salary bands in lakhs per annum (LPA); the upper bound is exclusive
+SALARY_BANDS = [(0, 3), (3, 6), (6, 10), (10, 20), (20, None)]
+
+_AMOUNT = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(lpa|lakh|lac|l\b|k\b|cr|crore)?", re.IGNORECASE
+)
+
+
+@dataclass
+class SessionFacts:
+    """Key facts pulled out of one completed session, for cohort analytics"""
+
+    session_id: str
+    vertical: str
+    tenant_id: str
+    period: str  # "YYYY-MM" the session completed in
+    grade: Optional[str] = None
+    gender: Optional[str] = None
+    program: Optional[str] = None  # college major / field of study
+    year_of_study: Optional[str] = None
+    recommended_stream: Optional[str] = None
+    top_careers: List[str] = field(default_factory=list)
+    skill_gaps: List[str] = field(default_factory=list)
+    salary_bands: List[str] = field(default_factory=list)
+    stens: Dict[str, int] = field(default_factory=dict)
+
+    def dimensions(self) -> Dict[str, Optional[str]]:
+        """The values this session can be filtered on"""
+        return {
+            "tenant_id": self.tenant_id,
+            "vertical": self.vertical,
+            "period": self.period,
+            "grade": self.grade,
+            "gender": self.gender,
+            "program": self.program,
+            "year_of_study": self.year_of_study,
+        }
+
+
+def extract_session_facts(
+    session_id: str,
+    vertical: str,
+    tenant_id: str,
+    user_data: Dict[str, Any],
+    result: Dict[str, Any],
+    completed_at: Optional[datetime] = None,
+) -> SessionFacts:
+    """
+    Pull cohort facts from a completed session's user data and fleet result
+
+    Agent outputs come from the LLM, so every lookup is defensive: a
+    missing or oddly shaped field just leaves that fact empty.
+    """
+    agents = _agent_data(result)
+    demographic = user_data.get("demographic_info") or {}
+    academic = user_data.get("academic_status") or {}
+
+    facts = SessionFacts(
+        session_id=session_id,
+        vertical=vertical,
+        tenant_id=tenant_id,
+        period=(completed_at or datetime.now()).strftime("%Y-%m"),
+        grade=_text(demographic.get("current_grade")),
+        gender=_text(demographic.get("gender")),
+        program=_text(
+            academic.get("major")
+            or next(iter(academic.get("major_subjects") or []), None)
+        ),
+        year_of_study=_text(academic.get("current_year")),
+        stens={
+            ability: int(sten)
+            for ability, sten in (user_data.get("dbda_scores") or {}).items()
+            if isinstance(sten, (int, float))
+        },
+    )
+
+    # School students
+    advisor = agents.get("academic_stream_advisor", {})
+    streams = _dicts(advisor.get("recommended_streams"))
+    if streams:
+        best = max(streams, key=lambda s: _number(s.get("suitability_score")) or 0)
+        facts.recommended_stream = _text(best.get("stream_type"))
+
+    explorer = agents.get("career_pathway_explorer", {})
+    pathways = _dicts(explorer.get("recommended_career_pathways"))
+    facts.top_careers += [_text(p.get("career_title")) for p in pathways[:3]]
+    for pathway in pathways[:3]:
+        band = _salary_band(_entry_salary(pathway.get("salary_outlook")))
+        if band:
+            facts.salary_bands.append(band)
+    insights = explorer.get("career_exploration_insights") or {}
+    if isinstance(insights, dict):
+        facts.skill_gaps += _strings(insights.get("skill_development_priorities"))[:5]
+
+    # College students
+    strategist = agents.get("skill_development_strategist", {})
+    gap_analysis = strategist.get("skill_gap_analysis")
+    if isinstance(gap_analysis, dict):
+        gaps = gap_analysis.get("skill_gaps")
+        # {"skill": "priority"} per the schema, but accept a plain list too
+        gaps = list(gaps) if isinstance(gaps, dict) else _strings(gaps)
+        facts.skill_gaps += gaps[:5]
+
+    matcher = agents.get("opportunity_matcher", {})
+    opportunities = _dicts(matcher.get("matched_opportunities"))
+    for opportunity in opportunities[:3]:
+        title = next(
+            (
+                opportunity.get(key)
+                for key in ("title", "role", "job_title", "position", "opportunity")
+                if opportunity.get(key)
+            ),
+            None,
+        )
+        facts.top_careers.append(_text(title))
+        band = _salary_band(
+            opportunity.get("salary_range") or opportunity.get("salary")
+        )
+        if band:
+            facts.salary_bands.append(band)
+
+    salary_insights = agents.get("market_intelligence", {}).get("salary_insights")
+    if isinstance(salary_insights, dict) and not facts.salary_bands:
+        band = _salary_band(_entry_salary(salary_insights))
+        if band:
+            facts.salary_bands.append(band)
+
+    facts.top_careers = _unique(facts.top_careers)
+    facts.skill_gaps = _unique(facts.skill_gaps)
+    return facts
+
+
+# ========================== helpers ==========================
+
+
+def _agent_data(result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    agent_outputs = (result.get("outputs") or {}).get("agent_outputs") or {}
+    return {
+        agent_id: output.get("data") or {}
+        for agent_id, output in agent_outputs.items()
+        if isinstance(output, dict) and isinstance(output.get("data"), dict)
+    }
+
+
+def _dicts(value: Any) -> List[Dict[str, Any]]:
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, dict)]
+
+
+def _strings(value: Any) -> List[Optional[str]]:
+    if not isinstance(value, list):
+        return []
+    strings = []
+    for item in value:
+        if isinstance(item, dict):
+            item = item.get("skill") or item.get("name")
+        strings.append(_text(item))
+    return strings
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    return " ".join(str(value).split())
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _unique(values: Iterable[Optional[str]]) -> List[str]:
+    """Drop empties and case-insensitive repeats, keeping the first spelling"""
+    seen, unique = set(), []
+    for value in values:
+        if value and value.lower() not in seen:
+            seen.add(value.lower())
+            unique.append(value)
+    return unique
+
+
+def _entry_salary(outlook: Any) -> Any:
+    """The entry-level figure from a salary outlook dict, else its first value"""
+    if not isinstance(outlook, dict) or not outlook:
+        return outlook
+    for key, value in outlook.items():
+        if any(word in key.lower() for word in ("entry", "fresher", "starting")):
+            return value
+    return next(iter(outlook.values()))
+
+
+def _salary_band(value: Any) -> Optional[str]:
+    """
+    Bucket a salary such as "₹4-6 LPA", "8 lakh", "1.2 Cr" or 450000 into
+    an LPA band (the lower figure of a range is used)
+    """
+    if isinstance(value, (int, float)):
+        lpa = value / 100000 if value >= 1000 else float(value)
+    elif isinstance(value, str):
+        match = _AMOUNT.search(value.replace(",", ""))
+        if not match:
+            return None
+        amount, unit = float(match.group(1)), (match.group(2) or "").lower()
+        if unit in ("cr", "crore"):
+            lpa = amount * 100
+        elif unit == "k":
+            lpa = amount * 1000 / 100000
+        elif unit or amount < 1000:
+            lpa = amount
+        else:
+            lpa = amount / 100000
+    else:
+        return None
+
+    for low, high in SALARY_BANDS:
+        if high is None or lpa < high:
+            return f"{low}+ LPA" if high is None else f"{low}-{high} LPA"
+    return None
@@ -0,0 +1,219 @@
+"""
+Cold-start benchmark: how long a fresh process takes to import a module and
+run its startup hooks, and which imports that time goes to
+
+Each run is a new interpreter started with ``-X importtime``. The
+module's FastAPI startup handlers, if it has an ``app``, are run after the
+import. An audit hook counts socket connections, since nothing should
+touch the network before the first request. Medians over the runs are
+reported, with the heaviest imports by cumulative time.
+
+    python -m benchmarks.cold_start                       # server.run, 5 runs
+    python -m benchmarks.cold_start --budget 1.0 --json cold_start.json
+    python -m benchmarks.cold_start --module agentic_layer.agent_orchestrator
+    python -m benchmarks.cold_start --store results.sqlite  # benchmarks/results.py
+
+Exits 1 when the median total exceeds ``--budget`` or any run connected
+to the network, so it can gate CI.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+from benchmarks.results import metric, store_run
+
+# Runs inside the child interpreter; prints one JSON line on stdout
+_CHILD = """
+import asyncio, importlib, json, sys, time
+connections = []
+sys.addaudithook(
+    lambda event, args: connections.append(repr(args[1]))
+    if event == "socket.connect" else None
+)
+started = time.perf_counter()
+module = importlib.import_module({module!r})
+imported = time.perf_counter()
+app = getattr(module, "app", None)
+finished = imported
+if app is not None and hasattr(app, "router"):
+    async def start():
+        async with app.router.lifespan_context(app):
+            return time.perf_counter()
+    finished = asyncio.run(start())
+print(json.dumps({{
+    "import_seconds": imported - started,
+    "startup_seconds": finished - imported,
+    "connections": connections,
+}}))
+"""
+
+
+def run_once(module: str, env: Dict[str, str]) -> Dict[str, Any]:
+    """One cold start in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD.format(module=module)],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if completed.returncode != 0:
+        errors = [
+            line
+            for line in completed.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        raise RuntimeError(f"importing {module} failed:\n" + "\n".join(errors[-30:]))
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["imports"] = parse_importtime(completed.stderr)
+    return result
+
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, float]]:
+    """
+    ``-X importtime`` lines -> module -> {"self", "cumulative"} in seconds,
+    plus "depth" (0 for modules the entry point imported directly)
+    """
+    imports: Dict[str, Dict[str, float]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        imports[name.strip()] = {
+            "self": int(self_us) / 1e6,
+            "cumulative": int(cumulative_us) / 1e6,
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        }
+    return imports
+
+
+def summarize(module: str, runs: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """Medians over the runs, with the ``top`` heaviest imports"""
+    totals = [run["import_seconds"] + run["startup_seconds"] for run in runs]
+    modules: Dict[str, List[float]] = {}
+    depths: Dict[str, int] = {}
+    for run in runs:
+        for name, timing in run["imports"].items():
+            modules.setdefault(name, []).append(timing["cumulative"])
+            depths[name] = timing["depth"]
+    heaviest = sorted(
+        ((statistics.median(times), name) for name, times in modules.items()),
+        reverse=True,
+    )
+    return {
+        "module": module,
+        "runs": len(runs),
+        "import_seconds": statistics.median(run["import_seconds"] for run in runs),
+        "startup_seconds": statistics.median(run["startup_seconds"] for run in runs),
+        "total_seconds": statistics.median(totals),
+        "max_total_seconds": max(totals),
+        "modules_imported": statistics.median(len(run["imports"]) for run in runs),
+        "connections": sorted({c for run in runs for c in run["connections"]}),
+        "heaviest_imports": [
+            {"module": name, "cumulative_seconds": seconds, "depth": depths[name]}
+            for seconds, name in heaviest[:top]
+        ],
+    }
+
+
+def print_report(summary: Dict[str, Any]):
+    print(f"Cold start of {summary['module']} ({summary['runs']} runs, medians)")
+    print(f"  import   {summary['import_seconds'] * 1000:8.1f} ms")
+    print(f"  startup  {summary['startup_seconds'] * 1000:8.1f} ms")
+    print(
+        f"  total    {summary['total_seconds'] * 1000:8.1f} ms "
+        f"(worst {summary['max_total_seconds'] * 1000:.1f} ms, "
+        f"{summary['modules_imported']:.0f} modules)"
+    )
+    print(f"  network connections before first request: {len(summary['connections'])}")
+    for connection in summary["connections"]:
+        print(f"    {connection}")
+    print("\n  cumulative ms  module")
+    for entry in summary["heaviest_imports"]:
+        indent = "  " * min(entry["depth"], 6)
+        print(
+            f"  {entry['cumulative_seconds'] * 1000:13.1f}  {indent}{entry['module']}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure cold-start import and startup time of a module"
+    )
+    parser.add_argument(
+        "--module", default="server.run", help="module to import (default server.run)"
+    )
+    parser.add_argument(
+        "-n", "--runs", type=int, default=5, help="timed runs (default 5)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=25, help="heaviest imports to list (default 25)"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        help="fail if the median total exceeds this many seconds",
+    )
+    parser.add_argument("--json", help="also write the summary to this file")
+    parser.add_argument(
+        "--store",
+        help="keep the run in this results store (default BENCHMARK_RESULTS_PATH, "
+        "see benchmarks/results.py)",
+    )
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (root, env.get("PYTHONPATH")) if path
+    )
+
+    try:
+        # Untimed run first, so bytecode compilation is not counted
+        run_once(args.module, env)
+        runs = [run_once(args.module, env) for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    summary = summarize(args.module, runs, args.top)
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    store_run(
+        args.store,
+        "cold_start",
+        {"module": args.module, "runs": args.runs},
+        {
+            "import_seconds": metric([run["import_seconds"] for run in runs]),
+            "startup_seconds": metric([run["startup_seconds"] for run in runs]),
+            "total_seconds": metric(
+                [run["import_seconds"] + run["startup_seconds"] for run in runs]
+            ),
+            "modules_imported": metric(
+                [len(run["imports"]) for run in runs], unit="modules"
+            ),
+        },
+    )
+
+    failed = False
+    if summary["connections"]:
+        print("\nFAIL: network I/O during startup", file=sys.stderr)
+        failed = True
+    if args.budget is not None and summary["total_seconds"] > args.budget:
+        print(
+            f"\nFAIL: cold start {summary['total_seconds']:.3f}s is over the "
+            f"{args.budget:.3f}s budget",
+            file=sys.stderr,
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,513 @@
+"""
+End-to-end fleet benchmark: full counselling sessions against the synthetic
+LLM backend with injected latency, at several concurrency levels
+
+Each (fleet, concurrency) level runs in a fresh interpreter, so peak RSS is
+the level's own. Inside it, sessions run on worker threads through
+``MainOrchestrator.start_counseling_session`` exactly as the batch runner
+drives them, with LLM_BACKEND=synthetic standing in for Gemini. Per-agent
+times come from the tracer's agent spans (JSONL exporter) and LLM call
+counts from the LLM accountant, both written to a scratch directory.
+
+Reported per level: session wall time, critical-path time (the longest
+chain of agent times through the fleet's declared dependencies, i.e. the
+session time if independent agents ran in parallel), per-agent time, LLM
+calls, CPU time per session and peak RSS.
+
+    python -m benchmarks.fleets                         # both fleets, 1/8/64
+    python -m benchmarks.fleets --fleets school -c 1,8 --latency-ms 50
+    python -m benchmarks.fleets --json fleets.json      # keep for comparison
+    python -m benchmarks.fleets --store results.sqlite  # see benchmarks/results.py
+
+The JSON output carries the commit and settings, so runs on different
+commits can be compared.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from benchmarks.results import metric, store_run
+from config.agent_config import critical_path
+
+FLEETS = {"school": "school_students", "college": "college_upskilling"}
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ---------------------------------------------------------------- session inputs
+
+
+def school_user_data(index: int) -> Dict[str, Any]:
+    """A school student; scores vary with ``index`` so prompts differ"""
+    shift = (index % 7) * 0.3
+    return {
+        "user_id": f"bench_school_{index}",
+        "session_id": f"bench_school_{index}",
+        "demographic_info": {
+            "name": f"Student {index}",
+            "age": 15 + index % 3,
+            "current_grade": ["9th Grade", "10th Grade", "11th Grade"][index % 3],
+            "school_name": "Benchmark Public School",
+        },
+        "dbda_scores": {
+            "technical": 8.0 - shift,
+            "computational": 7.5,
+            "creative": 6.0 + shift,
+            "medical": 5.5,
+            "humanitarian": 7.0,
+            "administrative": 6.5,
+        },
+        "cii_results": {
+            "scientific": 8,
+            "artistic": 5 + index % 4,
+            "social": 6,
+            "enterprising": 7,
+            "conventional": 5,
+            "realistic": 6,
+        },
+        "resume_data": None,
+        "github_profile": None,
+        "linkedin_profile": None,
+        "academic_status": {"GPA": 3.5},
+        "current_profession": None,
+        "financial_constraints": {"max_annual_tuition": 15000},
+        "timeline_flexibility": None,
+        "family_obligations": None,
+    }
+
+
+def college_user_data(index: int) -> Dict[str, Any]:
+    """A college student; the resume is made unique per session so the
+    resume caches do not turn every session after the first into a hit"""
+    with open(
+        os.path.join(_ROOT, "tests", "btech_resume.txt"), "r", encoding="utf-8"
+    ) as f:
+        resume = f.read()
+    return {
+        "user_id": f"bench_college_{index}",
+        "session_id": f"bench_college_{index}",
+        "resume_data": {
+            "content": f"{resume}\nReference: benchmark applicant {index}",
+            "source": "benchmark",
+        },
+        "demographic_info": None,
+        "dbda_scores": None,
+        "cii_results": None,
+        "github_profile": {"repos": 4 + index % 5, "languages": ["Python"]},
+        "linkedin_profile": {"connections": 100 + index},
+        "academic_status": {"current_year": 3 + index % 2, "gpa": 8.0},
+        "current_profession": None,
+        "financial_constraints": None,
+        "timeline_flexibility": None,
+        "family_obligations": None,
+    }
+
+
+_USER_DATA = {"school": school_user_data, "college": college_user_data}
+
+
+# ---------------------------------------------------------------- worker side
+
+
+def run_level(fleet: str, concurrency: int, sessions: int) -> Dict[str, Any]:
+    """
+    Run one level in this process and return its raw measurements; expects
+    the environment set up by ``level_env``
+    """
+    import resource
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from agentic_layer.agent_orchestrator import MainOrchestrator, Vertical
+    from config.llm_config import llm_manager
+    from core.llm_accounting import get_llm_accountant
+    from core.request_context import bind_context
+    from core.tracing import get_tracer
+
+    vertical = FLEETS[fleet]
+    started = time.perf_counter()
+    orchestrator = MainOrchestrator(llm_model=llm_manager.initialize_gemini())
+    agent_fleet = orchestrator.get_agent_fleet(Vertical(vertical))
+    setup_seconds = time.perf_counter() - started
+
+    inputs = [_USER_DATA[fleet](index) for index in range(sessions)]
+    walls: Dict[str, float] = {}
+    failures: List[str] = []
+    lock = threading.Lock()
+
+    def run_session(user_data: Dict[str, Any]):
+        session_started = time.perf_counter()
+        with bind_context(session_id=user_data["session_id"], vertical=vertical):
+            try:
+                result = orchestrator.start_counseling_session(
+                    vertical=vertical, user_data=user_data, initial_message="Help"
+                )
+                error = None if result.get("success") else result.get("error")
+            except Exception as e:
+                error = str(e)
+        with lock:
+            walls[user_data["session_id"]] = time.perf_counter() - session_started
+            if error:
+                failures.append(f"{user_data['session_id']}: {error}")
+
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run_session, inputs))
+    wall_seconds = time.perf_counter() - wall_started
+    cpu_seconds = time.process_time() - cpu_started
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    get_tracer().shutdown()
+    get_llm_accountant().close()
+
+    return {
+        "setup_seconds": setup_seconds,
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        # kilobytes on Linux, bytes on macOS
+        "peak_rss_mb": peak_rss / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "session_walls": walls,
+        "failures": failures,
+        "dependencies": {
+            agent_id: list(dependency.depends_on)
+            for agent_id, dependency in agent_fleet.agent_dependencies.items()
+        },
+    }
+
+
+# ---------------------------------------------------------------- parent side
+
+
+def level_env(scratch: str, args: argparse.Namespace) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "PYTHONPATH": os.pathsep.join(
+                path for path in (_ROOT, env.get("PYTHONPATH")) if path
+            ),
+            "LLM_BACKEND": "synthetic",
+            "LLM_FAKE_LATENCY_MS": str(args.latency_ms),
+            "LLM_FAKE_LATENCY_JITTER_MS": str(args.jitter_ms),
+            "LLM_FAKE_ERROR_RATE": "0",
+            "LLM_FAKE_SEED": "0",
+            "LLM_ACCOUNTING_PATH": os.path.join(scratch, "llm_calls.jsonl"),
+            "TRACING_EXPORTER": "jsonl",
+            "TRACING_JSONL_PATH": os.path.join(scratch, "traces.jsonl"),
+            "TRACE_SAMPLE_RATE": "1.0",
+            "TRACE_QUEUE_SIZE": "1000000",
+            "PREWARM_ON_STARTUP": "",
+        }
+    )
+    env.pop("CONTENT_CACHE_DIR", None)  # every level starts with cold caches
+    return env
+
+
+def measure_level(
+    fleet: str, concurrency: int, sessions: int, args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Run one level in a fresh interpreter and summarize it"""
+    with tempfile.TemporaryDirectory(prefix="fleet-bench-") as scratch:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.fleets",
+                "--worker",
+                f"{fleet}:{concurrency}:{sessions}",
+            ],
+            capture_output=True,
+            text=True,
+            env=level_env(scratch, args),
+            cwd=scratch,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(
+                f"{fleet} at concurrency {concurrency} failed:\n"
+                + "\n".join(completed.stderr.splitlines()[-30:])
+            )
+        raw = json.loads(completed.stdout.strip().splitlines()[-1])
+        agent_times = _agent_times(os.path.join(scratch, "traces.jsonl"))
+        llm_calls = _llm_calls(os.path.join(scratch, "llm_calls.jsonl"))
+    return summarize_level(fleet, concurrency, sessions, raw, agent_times, llm_calls)
+
+
+def _read_jsonl(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _agent_times(path: str) -> Dict[str, Dict[str, float]]:
+    """session -> agent -> seconds, from the fleet's ``agent_<id>`` spans"""
+    starts: Dict[str, Dict[str, Any]] = {}
+    times: Dict[str, Dict[str, float]] = {}
+    for event in _read_jsonl(path):
+        if event["event"] == "start":
+            if event["name"].startswith("agent_"):
+                starts[event["id"]] = event
+            continue
+        start = starts.pop(event["id"], None)
+        if start is None:
+            continue
+        seconds = (
+            datetime.fromisoformat(event["time"])
+            - datetime.fromisoformat(start["time"])
+        ).total_seconds()
+        session = start["metadata"]["session_id"]
+        times.setdefault(session, {})[start["name"][len("agent_") :]] = seconds
+    return times
+
+
+def _llm_calls(path: str) -> Dict[str, int]:
+    calls: Dict[str, int] = {}
+    for record in _read_jsonl(path):
+        if not record.get("cached"):
+            calls[record["session_id"]] = calls.get(record["session_id"], 0) + 1
+    return calls
+
+
+def _distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "mean": None}
+    ordered = sorted(values)
+    return {
+        "p50": statistics.median(ordered),
+        "p95": ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def summarize_level(
+    fleet: str,
+    concurrency: int,
+    sessions: int,
+    raw: Dict[str, Any],
+    agent_times: Dict[str, Dict[str, float]],
+    llm_calls: Dict[str, int],
+) -> Dict[str, Any]:
+    per_agent: Dict[str, List[float]] = {}
+    for times in agent_times.values():
+        for agent_id, seconds in times.items():
+            per_agent.setdefault(agent_id, []).append(seconds)
+    session_seconds = list(raw["session_walls"].values())
+    critical_paths = [
+        critical_path(times, raw["dependencies"]) for times in agent_times.values()
+    ]
+    llm_calls_per_session = [
+        float(llm_calls.get(session, 0)) for session in raw["session_walls"]
+    ]
+    return {
+        "fleet": fleet,
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "failures": len(raw["failures"]),
+        "failure_samples": raw["failures"][:5],
+        "setup_seconds": raw["setup_seconds"],
+        "wall_seconds": raw["wall_seconds"],
+        "sessions_per_second": sessions / raw["wall_seconds"],
+        "session_seconds": _distribution(session_seconds),
+        "critical_path_seconds": _distribution(critical_paths),
+        "agent_seconds": {
+            agent_id: _distribution(values)
+            for agent_id, values in sorted(per_agent.items())
+        },
+        "llm_calls_per_session": _distribution(llm_calls_per_session),
+        "cpu_seconds_per_session": raw["cpu_seconds"] / sessions,
+        "peak_rss_mb": raw["peak_rss_mb"],
+        # Raw observations, for the results store's bootstrap comparison
+        "samples": {
+            "session_seconds": session_seconds,
+            "critical_path_seconds": critical_paths,
+            "llm_calls_per_session": llm_calls_per_session,
+            "agent_seconds": per_agent,
+        },
+    }
+
+
+def level_metrics(levels: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Results-store metrics, named ``<fleet>.c<concurrency>.<metric>``"""
+    metrics = {}
+    for level in levels:
+        prefix = f"{level['fleet']}.c{level['concurrency']}"
+        samples = level["samples"]
+        metrics[f"{prefix}.session_seconds"] = metric(samples["session_seconds"])
+        metrics[f"{prefix}.critical_path_seconds"] = metric(
+            samples["critical_path_seconds"]
+        )
+        for agent_id, seconds in sorted(samples["agent_seconds"].items()):
+            metrics[f"{prefix}.agent.{agent_id}_seconds"] = metric(seconds)
+        metrics[f"{prefix}.llm_calls_per_session"] = metric(
+            samples["llm_calls_per_session"], unit="calls"
+        )
+        metrics[f"{prefix}.sessions_per_second"] = metric(
+            [level["sessions_per_second"]], unit="/s", better="higher"
+        )
+        metrics[f"{prefix}.cpu_seconds_per_session"] = metric(
+            [level["cpu_seconds_per_session"]]
+        )
+        metrics[f"{prefix}.peak_rss_mb"] = metric([level["peak_rss_mb"]], unit="MB")
+    return metrics
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=_ROOT,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(levels: List[Dict[str, Any]]):
+    def ms(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value * 1000:.0f}"
+
+    print(
+        f"{'fleet':8} {'conc':>4} {'sess':>5} {'fail':>4} {'sess/s':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'crit ms':>8} {'llm/sess':>8} "
+        f"{'cpu ms/sess':>11} {'rss MB':>7}"
+    )
+    for level in levels:
+        print(
+            f"{level['fleet']:8} {level['concurrency']:>4} {level['sessions']:>5} "
+            f"{level['failures']:>4} {level['sessions_per_second']:>7.2f} "
+            f"{ms(level['session_seconds']['p50']):>8} "
+            f"{ms(level['session_seconds']['p95']):>8} "
+            f"{ms(level['critical_path_seconds']['p50']):>8} "
+            f"{level['llm_calls_per_session']['mean'] or 0:>8.1f} "
+            f"{ms(level['cpu_seconds_per_session']):>11} "
+            f"{level['peak_rss_mb']:>7.0f}"
+        )
+
+    for fleet in dict.fromkeys(level["fleet"] for level in levels):
+        fleet_levels = [level for level in levels if level["fleet"] == fleet]
+        agents = list(
+            dict.fromkeys(a for level in fleet_levels for a in level["agent_seconds"])
+        )
+        print(f"\n{fleet}: p50 agent time (ms) by concurrency")
+        print(
+            f"  {'agent':32}"
+            + "".join(f"{level['concurrency']:>8}" for level in fleet_levels)
+        )
+        for agent_id in agents:
+            print(
+                f"  {agent_id:32}"
+                + "".join(
+                    f"{ms(level['agent_seconds'].get(agent_id, {}).get('p50')):>8}"
+                    for level in fleet_levels
+                )
+            )
+    for level in levels:
+        for sample in level["failure_samples"]:
+            print(f"\n{level['fleet']} x{level['concurrency']} failed: {sample}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the agent fleets end to end against a fake LLM"
+    )
+    parser.add_argument(
+        "--fleets",
+        default="school,college",
+        help="comma-separated: school, college (default both)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        default="1,8,64",
+        help="comma-separated concurrency levels (default 1,8,64)",
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        help="sessions per level (default: the concurrency, at least 8)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=200.0,
+        help="injected latency per LLM call (default 200)",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=50.0,
+        help="uniform +/- jitter on that latency (default 50)",
+    )
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument(
+        "--store",
+        help="keep the run in this results store (default BENCHMARK_RESULTS_PATH, "
+        "see benchmarks/results.py)",
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        fleet, concurrency, sessions = args.worker.split(":")
+        print(json.dumps(run_level(fleet, int(concurrency), int(sessions))))
+        return 0
+
+    fleets = [name.strip() for name in args.fleets.split(",") if name.strip()]
+    unknown = set(fleets) - set(FLEETS)
+    if unknown:
+        parser.error(f"unknown fleet(s): {', '.join(sorted(unknown))}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    results = []
+    try:
+        for fleet in fleets:
+            for concurrency in levels:
+                sessions = args.sessions or max(concurrency, 8)
+                print(
+                    f"[fleets] {fleet}: {sessions} sessions at concurrency "
+                    f"{concurrency}",
+                    file=sys.stderr,
+                    flush=True,
+                )
+                results.append(measure_level(fleet, concurrency, sessions, args))
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    print_report(results)
+    settings = {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "llm_max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "benchmark": "fleets",
+                    "commit": _commit(),
+                    "timestamp": datetime.now().isoformat(),
+                    "python": platform.python_version(),
+                    "settings": settings,
+                    "levels": results,
+                },
+                f,
+                indent=2,
+            )
+    store_run(args.store, "fleets", settings, level_metrics(results))
+    return 1 if any(level["failures"] for level in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,850 @@
+"""
+HTTP load test: the API under realistic client traffic, with a stub
+orchestrator in place of the agent fleets so no LLM quota is spent
+
+The server runs in a child process (uvicorn, one worker) whose
+``server.run.orchestrator`` is a ``StubOrchestrator``: analyses and chat
+answers take a configurable time and produce results of a configurable
+size, in the same shape the fleets return. Everything else is the real
+server: tenant resolution, idempotency, admission control and the job
+scheduler, the session store, resume uploads and parsing, the completed
+response cache, cohort analytics.
+
+Each virtual user loops over counselling sessions like the frontend does:
+submit one of the three verticals (college students upload their resume
+through POST /resumes first, or send it with the form), poll
+/status/{session_id} every couple of seconds until the analysis finishes,
+then ask a few /chat follow-ups, then think before starting the next one.
+
+Reported: requests and sessions per second, per-endpoint latency
+percentiles and error rates (429 admission rejections are counted
+separately from errors), session completion times, and the server's RSS
+sampled over the run.
+
+    python -m benchmarks.load_test                         # 20 users, 60 s
+    python -m benchmarks.load_test --users 100 --duration 300 --latency-ms 5000
+    python -m benchmarks.load_test --result-kb 200 --json load.json
+    python -m benchmarks.load_test --store results.sqlite  # benchmarks/results.py
+
+Scheduler, tenant and cache limits are read from the environment as in
+production, so export them before running to test other settings.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.fleets import _commit
+from benchmarks.results import metric, store_run
+from tools.llm_usage import percentile
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VERTICALS = ("school", "college", "career")
+
+_AGENTS = {
+    "school_students": [
+        "academic_stream_advisor",
+        "career_explorer",
+        "timeline_planning",
+    ],
+    "college_upskilling": [
+        "profile_analysis",
+        "skill_gap_analysis",
+        "career_path_recommendation",
+    ],
+    "career_transition": ["transition_feasibility", "transition_planning"],
+}
+
+
+# ---------------------------------------------------------------- server side
+
+
+class StubOrchestrator:
+    """
+    Stands in for MainOrchestrator in the server: sleeps instead of running
+    the fleets and returns results shaped like theirs, padded to
+    ``result_kb`` kilobytes
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 2000.0,
+        jitter_ms: float = 500.0,
+        chat_latency_ms: float = 500.0,
+        result_kb: float = 20.0,
+        failure_rate: float = 0.0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.chat_latency_ms = chat_latency_ms
+        self.result_kb = result_kb
+        self.failure_rate = failure_rate
+        self._random = random.Random(0)
+        self._lock = threading.Lock()
+
+    def _sleep(self, milliseconds: float) -> bool:
+        """Sleep about ``milliseconds``; returns whether this call should fail"""
+        with self._lock:
+            delay = milliseconds + self._random.uniform(-1, 1) * self.jitter_ms
+            fail = self._random.random() < self.failure_rate
+        time.sleep(max(delay, 0.0) / 1000)
+        return fail
+
+    def start_counseling_session(
+        self, vertical: str, user_data: Dict[str, Any], initial_message: str = None
+    ) -> Dict[str, Any]:
+        if self._sleep(self.latency_ms):
+            return {
+                "success": False,
+                "error": "Stub orchestrator failure",
+                "timestamp": datetime.now().isoformat(),
+            }
+
+        agents = _AGENTS.get(vertical, ["analysis"])
+        padding = "x" * int(self.result_kb * 1024 / len(agents))
+        return {
+            "success": True,
+            "vertical": vertical,
+            "session_id": user_data.get("session_id"),
+            "timestamp": datetime.now().isoformat(),
+            "outputs": {
+                "fleet_summary": {
+                    "status": "completed",
+                    "confidence": 0.8,
+                    "processing_time": self.latency_ms / 1000,
+                    "recommendations": ["Stub recommendation"],
+                    "next_actions": ["Stub next action"],
+                },
+                "agent_outputs": {
+                    agent_id: {
+                        "status": "completed",
+                        "confidence": 0.8,
+                        "data": {"summary": f"Stub {agent_id}", "details": padding},
+                        "warnings": [],
+                    }
+                    for agent_id in agents
+                },
+            },
+            "summary": f"Stub analysis for {vertical}",
+            "next_actions": ["Ask a follow-up question"],
+            "conversation_context": {
+                "can_ask_follow_up": True,
+                "vertical_workflow_complete": True,
+            },
+        }
+
+    def ask_follow_up_question(
+        self, session_id: str, question: str, user_id: str = None
+    ) -> Dict[str, Any]:
+        if self._sleep(self.chat_latency_ms):
+            return {"success": False, "error": "Stub orchestrator failure"}
+        return {
+            "success": True,
+            "response": f"Stub answer to: {question}",
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def preprocess_resume(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        self._sleep(self.chat_latency_ms)
+        return {"status": "completed"}
+
+    def get_available_verticals(self) -> Dict[str, Any]:
+        return {vertical: {"name": vertical} for vertical in _AGENTS}
+
+    def warm_up(self):
+        pass
+
+
+def serve(port: int, args: argparse.Namespace):
+    """Run the API on ``port`` with a stub orchestrator (child process)"""
+    import uvicorn
+
+    import server.run as api
+
+    api.orchestrator = StubOrchestrator(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        chat_latency_ms=args.chat_latency_ms,
+        result_kb=args.result_kb,
+        failure_rate=args.failure_rate,
+    )
+    uvicorn.run(
+        api.app, host="127.0.0.1", port=port, log_level="warning", access_log=False
+    )
+
+
+# ---------------------------------------------------------------- client side
+
+
+class Recorder:
+    """Latency and outcome of every request, grouped by endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[str, List[Tuple[float, int, bool]]] = {}
+        self.sessions: List[Tuple[str, str, float]] = []
+
+    def request(self, endpoint: str, seconds: float, status: int, ok: bool):
+        with self._lock:
+            self.requests.setdefault(endpoint, []).append((seconds, status, ok))
+
+    def session(self, vertical: str, outcome: str, seconds: float):
+        with self._lock:
+            self.sessions.append((vertical, outcome, seconds))
+
+
+def school_payload(index: int) -> Dict[str, Any]:
+    return {
+        "demographic_info": {
+            "name": f"Load Student {index}",
+            "age": 15 + index % 3,
+            "current_grade": 9 + index % 3,
+            "gender": ["male", "female"][index % 2],
+            "location": "Pune, Maharashtra",
+        },
+        "dbda_scores": {
+            "CA": f"{8 + index % 10}/20",
+            "CL": "44/72",
+            "MA": f"{5 + index % 15}/25",
+            "NA": "11/20",
+            "PM": "",
+            "RA": "8/12",
+            "SA": "58/72",
+            "VA": f"{10 + index % 12}/24",
+        },
+        "cii_results": {
+            "artistic": index % 11,
+            "scientific": 7,
+            "social": 5,
+            "conventional": 4,
+            "enterprising": 6,
+            "realistic": 3,
+        },
+        "academic_status": {"GPA": 8.1, "major_subjects": ["Mathematics"]},
+        "initial_message": "What stream should I choose after 10th?",
+        "user_id": f"load_school_{index}",
+    }
+
+
+def career_payload(index: int) -> Dict[str, Any]:
+    return {
+        **school_payload(index),
+        # The sten norms are per grade and gender; career changers use grade 12
+        "demographic_info": {
+            "name": f"Load Professional {index}",
+            "age": 30,
+            "current_grade": 12,
+            "gender": ["male", "female"][index % 2],
+        },
+        "current_profession": "Accountant",
+        "timeline_flexibility": "12 months",
+        "initial_message": "Can I move into data analytics?",
+        "user_id": f"load_career_{index}",
+    }
+
+
+def college_form(index: int) -> Dict[str, str]:
+    return {
+        "academic_status": json.dumps({"current_year": 3, "GPA": 8.0}),
+        "github_profile": json.dumps({"repos": index % 20, "languages": ["Python"]}),
+        # Form fields other than the IDs are JSON-encoded, the message too
+        "initial_message": json.dumps("Which skills should I build for a data role?"),
+        "user_id": f"load_college_{index}",
+    }
+
+
+def resume_file(index: int) -> bytes:
+    """The sample resume, made unique per session so uploads do not dedupe"""
+    with open(os.path.join(_ROOT, "tests", "btech_resume.txt"), "rb") as f:
+        return f.read() + f"\nReference: load test applicant {index}\n".encode()
+
+
+class VirtualUser:
+    """One client going through sessions back to back until ``deadline``"""
+
+    def __init__(
+        self,
+        base_url: str,
+        recorder: Recorder,
+        args: argparse.Namespace,
+        seed: int,
+        next_index: Callable[[], int],
+    ):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.args = args
+        self.random = random.Random(seed)
+        self.next_index = next_index
+        self.http = requests.Session()
+        if args.api_key:
+            self.http.headers["X-API-Key"] = args.api_key
+
+    def call(
+        self, method: str, endpoint: str, path: str, **kwargs
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """One request; returns the status and JSON body (None on failure)"""
+        started = time.perf_counter()
+        try:
+            response = self.http.request(
+                method, self.base_url + path, timeout=self.args.timeout, **kwargs
+            )
+            status = response.status_code
+            body = response.json() if response.content else None
+        except Exception:
+            status, body = 0, None
+        ok = (status < 400 and status != 0) and (
+            status == 304 or (body is not None and body.get("success", True))
+        )
+        self.recorder.request(endpoint, time.perf_counter() - started, status, ok)
+        return status, body
+
+    def run(self, start_delay: float, deadline: float):
+        time.sleep(start_delay)
+        while time.time() < deadline:
+            self.session(deadline)
+            self.pause(self.args.think_seconds)
+
+    def pause(self, seconds: float):
+        """Sleep ``seconds`` +/- 25%, like a person would"""
+        time.sleep(max(seconds * self.random.uniform(0.75, 1.25), 0.0))
+
+    def session(self, deadline: float):
+        index = self.next_index()
+        vertical = self.random.choices(VERTICALS, weights=self.args.mix)[0]
+        started = time.perf_counter()
+
+        if vertical == "school":
+            status, body = self.call(
+                "POST",
+                "POST /school-students",
+                "/school-students",
+                json=school_payload(index),
+            )
+        elif vertical == "career":
+            status, body = self.call(
+                "POST",
+                "POST /career-transition",
+                "/career-transition",
+                json=career_payload(index),
+            )
+        else:
+            status, body = self.submit_college(index)
+
+        session_id = (body or {}).get("session_id")
+        if status == 429:
+            self.recorder.session(vertical, "rejected", time.perf_counter() - started)
+            return
+        if not session_id:
+            self.recorder.session(vertical, "error", time.perf_counter() - started)
+            return
+
+        outcome = self.poll(session_id, deadline + self.args.drain_seconds)
+        self.recorder.session(vertical, outcome, time.perf_counter() - started)
+        if outcome != "completed":
+            return
+        for question in range(self.args.chats):
+            self.pause(self.args.chat_think_seconds)
+            if time.time() >= deadline:
+                return
+            self.call(
+                "POST",
+                "POST /chat",
+                "/chat",
+                json={
+                    "session_id": session_id,
+                    "message": f"Follow-up question {question + 1}",
+                },
+            )
+
+    def submit_college(self, index: int) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Half upload the resume ahead of the form, half attach it to it"""
+        upload = (f"resume_{index}.txt", resume_file(index), "text/plain")
+        form = college_form(index)
+        if self.random.random() < 0.5:
+            status, body = self.call(
+                "POST", "POST /resumes", "/resumes", files={"resume": upload}
+            )
+            resume_id = ((body or {}).get("data") or {}).get("resume_id")
+            if resume_id is None:
+                return status, body
+            # Filling in the rest of the form
+            self.pause(self.args.chat_think_seconds)
+            form["resume_id"] = resume_id
+            return self.call(
+                "POST", "POST /college-upskilling", "/college-upskilling", data=form
+            )
+        return self.call(
+            "POST",
+            "POST /college-upskilling",
+            "/college-upskilling",
+            data=form,
+            files={"resume": upload},
+        )
+
+    def poll(self, session_id: str, give_up_at: float) -> str:
+        """Poll /status until the analysis finishes; returns its final status"""
+        while time.time() < give_up_at:
+            self.pause(self.args.poll_seconds)
+            _, body = self.call(
+                "GET", "GET /status/{session_id}", f"/status/{session_id}"
+            )
+            status = ((body or {}).get("data") or {}).get("status")
+            if status in ("completed", "failed", "cancelled"):
+                return status
+        return "timed_out"
+
+
+# ---------------------------------------------------------------- parent side
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of ``pid`` from /proc; None where that is unavailable"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def server_env(scratch: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "PYTHONPATH": os.pathsep.join(
+                path for path in (_ROOT, env.get("PYTHONPATH")) if path
+            ),
+            # The stub never calls a model; keep any stray call offline too
+            "LLM_BACKEND": "synthetic",
+            "TRACING_EXPORTER": env.get("TRACING_EXPORTER", "none"),
+            "PREWARM_ON_STARTUP": "",
+        }
+    )
+    env.pop("LLM_ACCOUNTING_PATH", None)
+    env.pop("CONTENT_CACHE_DIR", None)
+    return env
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen, timeout: float):
+    give_up_at = time.time() + timeout
+    while time.time() < give_up_at:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            if requests.get(base_url + "/health", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server not ready after {timeout:.0f}s")
+
+
+def run_load(
+    args: argparse.Namespace,
+) -> Tuple[Recorder, List[Tuple[float, float]], float]:
+    """
+    Start the server and drive it for ``args.duration`` seconds; returns the
+    recorded requests, RSS samples and the elapsed time
+    """
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    recorder = Recorder()
+    memory: List[Tuple[float, float]] = []
+
+    with tempfile.TemporaryDirectory(prefix="load-test-") as scratch:
+        log_path = os.path.join(scratch, "server.log")
+        with open(log_path, "w") as log:
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.load_test",
+                    "--serve",
+                    str(port),
+                    *_stub_flags(args),
+                ],
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=server_env(scratch),
+                cwd=scratch,
+            )
+        try:
+            wait_until_ready(base_url, server, args.startup_timeout)
+            started = time.time()
+            deadline = started + args.duration
+
+            counter = iter(range(10**9))
+            counter_lock = threading.Lock()
+
+            def next_index() -> int:
+                with counter_lock:
+                    return next(counter)
+
+            stop_sampling = threading.Event()
+
+            def sample_memory():
+                while not stop_sampling.is_set():
+                    value = rss_mb(server.pid)
+                    if value is not None:
+                        memory.append((round(time.time() - started, 1), value))
+                    stop_sampling.wait(args.memory_interval)
+
+            sampler = threading.Thread(target=sample_memory, daemon=True)
+            sampler.start()
+
+            users = []
+            for number in range(args.users):
+                user = VirtualUser(base_url, recorder, args, number, next_index)
+                # Ramp up instead of submitting everything in the same instant
+                delay = args.ramp_seconds * number / args.users
+                thread = threading.Thread(target=user.run, args=(delay, deadline))
+                thread.start()
+                users.append(thread)
+
+            for thread in users:
+                thread.join()
+            elapsed = time.time() - started
+            stop_sampling.set()
+            sampler.join()
+        except BaseException:
+            with open(log_path, "r") as log:
+                print(log.read()[-4000:], file=sys.stderr)
+            raise
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    return recorder, memory, elapsed
+
+
+def _stub_flags(args: argparse.Namespace) -> List[str]:
+    return [
+        f"--latency-ms={args.latency_ms}",
+        f"--jitter-ms={args.jitter_ms}",
+        f"--chat-latency-ms={args.chat_latency_ms}",
+        f"--result-kb={args.result_kb}",
+        f"--failure-rate={args.failure_rate}",
+    ]
+
+
+def _latencies(seconds: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "p50": percentile(seconds, 0.5),
+        "p95": percentile(seconds, 0.95),
+        "p99": percentile(seconds, 0.99),
+        "max": max(seconds, default=None),
+    }
+
+
+def summarize(
+    recorder: Recorder,
+    memory: List[Tuple[float, float]],
+    elapsed: float,
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    endpoints = {}
+    for endpoint, calls in sorted(recorder.requests.items()):
+        rejected = sum(1 for _, status, _ in calls if status == 429)
+        errors = sum(1 for _, status, ok in calls if not ok and status != 429)
+        endpoints[endpoint] = {
+            "requests": len(calls),
+            "per_second": len(calls) / elapsed,
+            "errors": errors,
+            "rejected": rejected,
+            "error_rate": errors / len(calls),
+            "statuses": {
+                str(status): sum(1 for _, s, _ in calls if s == status)
+                for status in sorted({status for _, status, _ in calls})
+            },
+            "latency_seconds": _latencies([seconds for seconds, _, _ in calls]),
+        }
+
+    total = sum(endpoint["requests"] for endpoint in endpoints.values())
+    outcomes: Dict[str, int] = {}
+    for _, outcome, _ in recorder.sessions:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    completed = [
+        seconds for _, outcome, seconds in recorder.sessions if outcome == "completed"
+    ]
+    rss = [value for _, value in memory]
+
+    return {
+        "commit": _commit(),
+        "settings": {
+            name: getattr(args, name)
+            for name in (
+                "users",
+                "duration",
+                "mix",
+                "poll_seconds",
+                "chats",
+                "think_seconds",
+                "latency_ms",
+                "jitter_ms",
+                "chat_latency_ms",
+                "result_kb",
+                "failure_rate",
+            )
+        },
+        "elapsed_seconds": elapsed,
+        "requests": total,
+        "requests_per_second": total / elapsed,
+        "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        "rejected": sum(endpoint["rejected"] for endpoint in endpoints.values()),
+        "sessions": outcomes,
+        "sessions_completed_per_second": len(completed) / elapsed,
+        "session_seconds": _latencies(completed),
+        "endpoints": endpoints,
+        "memory": {
+            "start_mb": rss[0] if rss else None,
+            "peak_mb": max(rss, default=None),
+            "end_mb": rss[-1] if rss else None,
+            "growth_mb": rss[-1] - rss[0] if rss else None,
+            "samples": memory,
+        },
+    }
+
+
+def load_metrics(
+    recorder: Recorder, report: Dict[str, Any]
+) -> Dict[str, Dict[str, Any]]:
+    """Results-store metrics: raw latencies per endpoint plus run totals"""
+    metrics = {
+        "requests_per_second": metric(
+            [report["requests_per_second"]], unit="/s", better="higher"
+        ),
+        "sessions_completed_per_second": metric(
+            [report["sessions_completed_per_second"]], unit="/s", better="higher"
+        ),
+        "session_seconds": metric(
+            [
+                seconds
+                for _, outcome, seconds in recorder.sessions
+                if outcome == "completed"
+            ]
+        ),
+    }
+    for endpoint, calls in sorted(recorder.requests.items()):
+        metrics[f"{endpoint}.latency_seconds"] = metric(
+            [seconds for seconds, _, _ in calls]
+        )
+        metrics[f"{endpoint}.error_rate"] = metric(
+            [report["endpoints"][endpoint]["error_rate"]], unit=""
+        )
+    memory = report["memory"]
+    if memory["samples"]:
+        metrics["server_rss_mb"] = metric(
+            [value for _, value in memory["samples"]], unit="MB"
+        )
+        metrics["server_rss_growth_mb"] = metric([memory["growth_mb"]], unit="MB")
+    return metrics
+
+
+def print_report(report: Dict[str, Any]):
+    def ms(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value * 1000:.0f}"
+
+    settings = report["settings"]
+    print(
+        f"{settings['users']} users for {report['elapsed_seconds']:.0f}s: "
+        f"{report['requests']} requests ({report['requests_per_second']:.1f}/s), "
+        f"{report['errors']} errors, {report['rejected']} rejected (429)"
+    )
+    sessions = ", ".join(
+        f"{count} {outcome}" for outcome, count in sorted(report["sessions"].items())
+    )
+    print(
+        f"sessions: {sessions or 'none'}; "
+        f"{report['sessions_completed_per_second']:.2f} completed/s, "
+        f"p50 {ms(report['session_seconds']['p50'])} ms, "
+        f"p95 {ms(report['session_seconds']['p95'])} ms\n"
+    )
+
+    print(
+        f"{'endpoint':28} {'reqs':>6} {'req/s':>7} {'err%':>6} {'429':>5} "
+        f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'max ms':>7}"
+    )
+    for endpoint, stats in report["endpoints"].items():
+        latency = stats["latency_seconds"]
+        print(
+            f"{endpoint:28} {stats['requests']:>6} {stats['per_second']:>7.1f} "
+            f"{stats['error_rate'] * 100:>6.1f} {stats['rejected']:>5} "
+            f"{ms(latency['p50']):>7} {ms(latency['p95']):>7} "
+            f"{ms(latency['p99']):>7} {ms(latency['max']):>7}"
+        )
+
+    memory = report["memory"]
+    if memory["samples"]:
+        print(
+            f"\nserver RSS: {memory['start_mb']:.0f} MB at start, "
+            f"{memory['peak_mb']:.0f} MB peak, {memory['end_mb']:.0f} MB at end "
+            f"({memory['growth_mb']:+.1f} MB)"
+        )
+        samples = memory["samples"]
+        step = max(len(samples) // 10, 1)
+        print(
+            "  "
+            + "  ".join(f"{t:.0f}s:{value:.0f}" for t, value in samples[::step])
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Load-test the API with a stub orchestrator"
+    )
+    parser.add_argument(
+        "--users", type=int, default=20, help="virtual users (default 20)"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=60.0,
+        help="seconds to keep starting sessions (default 60)",
+    )
+    parser.add_argument(
+        "--ramp-seconds",
+        type=float,
+        default=5.0,
+        help="spread user start times over this long (default 5)",
+    )
+    parser.add_argument(
+        "--mix",
+        default="2,2,1",
+        help="relative weights of school, college and career sessions "
+        "(default 2,2,1)",
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=2.0,
+        help="interval between /status polls (default 2)",
+    )
+    parser.add_argument(
+        "--chats", type=int, default=2, help="/chat calls per session (default 2)"
+    )
+    parser.add_argument(
+        "--chat-think-seconds",
+        type=float,
+        default=3.0,
+        help="pause before each chat and between resume and form (default 3)",
+    )
+    parser.add_argument(
+        "--think-seconds",
+        type=float,
+        default=5.0,
+        help="pause between one user's sessions (default 5)",
+    )
+    parser.add_argument(
+        "--drain-seconds",
+        type=float,
+        default=60.0,
+        help="how long sessions may keep polling after --duration (default 60)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=2000.0,
+        help="stub analysis time (default 2000)",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=500.0,
+        help="uniform +/- jitter on stub times (default 500)",
+    )
+    parser.add_argument(
+        "--chat-latency-ms",
+        type=float,
+        default=500.0,
+        help="stub chat answer and resume pre-processing time (default 500)",
+    )
+    parser.add_argument(
+        "--result-kb",
+        type=float,
+        default=20.0,
+        help="size of each stub analysis result (default 20)",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="fraction of stub analyses and chats that fail (default 0)",
+    )
+    parser.add_argument("--api-key", help="X-API-Key to send (default: none)")
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="per-request timeout (default 30)"
+    )
+    parser.add_argument(
+        "--memory-interval",
+        type=float,
+        default=1.0,
+        help="seconds between server RSS samples (default 1)",
+    )
+    parser.add_argument(
+        "--startup-timeout",
+        type=float,
+        default=60.0,
+        help="seconds to wait for the server to come up (default 60)",
+    )
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument(
+        "--store",
+        help="keep the run in this results store (default BENCHMARK_RESULTS_PATH, "
+        "see benchmarks/results.py)",
+    )
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args)
+        return 0
+
+    try:
+        args.mix = [float(weight) for weight in args.mix.split(",")]
+    except ValueError:
+        args.mix = []
+    if len(args.mix) != len(VERTICALS) or not any(args.mix):
+        parser.error("--mix takes three weights: school,college,career")
+
+    print(
+        f"[load_test] {args.users} users for {args.duration:.0f}s against a stub "
+        f"orchestrator ({args.latency_ms:.0f} ms, {args.result_kb:.0f} KB results)",
+        file=sys.stderr,
+    )
+    recorder, memory, elapsed = run_load(args)
+    report = summarize(recorder, memory, elapsed, args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    store_run(
+        args.store, "load_test", report["settings"], load_metrics(recorder, report)
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,506 @@
+"""
+Micro-benchmarks for the CPU-bound helpers that run on every request
+
+Each case builds realistic inputs once (student scores, a class roster, LLM
+responses shaped by the agents' own output schemas, resume data) and times
+one call of the helper. Like pytest-benchmark, a case runs for ``--rounds``
+rounds of enough loops to fill ``--min-time``, and per-call min, median,
+mean and spread are reported.
+
+    python -m benchmarks.micro                     # every case
+    python -m benchmarks.micro -k sten -k parse    # name filters
+    python -m benchmarks.micro --save micro.json   # keep a baseline
+    python -m benchmarks.micro --compare micro.json --threshold 0.25
+    python -m benchmarks.micro -k prompt --profile # where the time goes
+    python -m benchmarks.micro --store results.sqlite  # see benchmarks/results.py
+
+With ``--compare``, a case whose median is more than ``--threshold`` (a
+fraction) slower than the baseline is a regression and the exit status is
+1. Baselines only compare meaningfully on the same machine.
+"""
+
+import argparse
+import cProfile
+import fnmatch
+import importlib
+import json
+import logging
+import platform
+import pstats
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.fleets import _commit, college_user_data, school_user_data
+from benchmarks.results import metric, store_run
+
+# name -> setup; a setup builds the inputs and returns the call to time
+CASES: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def case(name: str):
+    def register(setup: Callable[[], Callable[[], Any]]):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+# ---------------------------------------------------------------- fixtures
+
+
+def _llm():
+    from core.llm_backends import SyntheticChatModel
+
+    # Never called by these cases; agents only need a model to construct
+    return SyntheticChatModel(model="micro-benchmark")
+
+
+def _instance(path: str):
+    module, name = path.split(":")
+    cls = getattr(importlib.import_module(module), name)
+    try:
+        return cls(llm_model=_llm())
+    except TypeError:
+        return cls(_llm())
+
+
+def _schema_response(parser) -> str:
+    """An LLM reply as the agents receive it: schema-valid JSON in a fence"""
+    import random
+
+    from core.llm_backends import synthesize
+
+    schema = parser.pydantic_object.model_json_schema()
+    value = synthesize(schema, random.Random(0), schema.get("$defs", {}))
+    return f"```json\n{json.dumps(value, indent=2)}\n```"
+
+
+def _completed_result(agent_id: str, output_data: Dict[str, Any]):
+    from config.agent_config import AgentResult, ProcessingStatus
+
+    return AgentResult(
+        agent_id=agent_id,
+        agent_name=agent_id,
+        status=ProcessingStatus.COMPLETED,
+        output_data=output_data,
+        confidence_score=0.9,
+        processing_time=1.0,
+    )
+
+
+_SCHOOL = school_user_data(0)
+
+
+# ---------------------------------------------------------------- sten scores
+
+
+@case("sten.get_sten_score")
+def _get_sten_score():
+    from utils.sten_calculator import StenCalculator
+
+    calculator = StenCalculator()
+    raw = {"CA": 6, "CL": 31, "MA": 12, "NA": 7, "PM": 20, "RA": 8, "SA": 44, "VA": 15}
+    return lambda: [
+        calculator.get_sten_score(score, ability, 10) for ability, score in raw.items()
+    ]
+
+
+def _student_scores(index: int) -> Dict[str, str]:
+    return {
+        "CA": f"{4 + index % 5}/20",
+        "CL": f"{25 + index % 15}/100",
+        "MA": f"{9 + index % 8}/20",
+        "NA": f"{5 + index % 6}/20",
+        "PM": f"{15 + index % 12}/40",
+        "RA": f"{6 + index % 5}/20",
+        "SA": f"{30 + index % 25}/70",
+        "VA": f"{10 + index % 10}/25",
+    }
+
+
+@case("sten.calculate_student_stens")
+def _calculate_student_stens():
+    from utils.sten_calculator import StenCalculator
+
+    calculator = StenCalculator()
+    scores = _student_scores(3)
+    return lambda: calculator.calculate_student_stens(scores, 9, "female")
+
+
+@case("sten.calculate_roster_stens[40]")
+def _calculate_roster_stens():
+    from utils.sten_calculator import StenCalculator
+
+    calculator = StenCalculator()
+    roster = [
+        (_student_scores(index), 9 if index % 3 else 10, "male")
+        for index in range(40)
+    ]
+    return lambda: calculator.calculate_roster_stens(roster)
+
+
+# ---------------------------------------------------------------- scoring helpers
+
+_STREAM_ADVISOR = (
+    "agentic_layer.school_students.agents.academic_stream_advisor_agent"
+    ":AcademicStreamAdvisorAgent"
+)
+_CAREER_EXPLORER = (
+    "agentic_layer.school_students.agents.career_pathway_explorer_agent"
+    ":CareerPathwayExplorerAgent"
+)
+
+
+@case("stream_advisor._calculate_stream_compatibility")
+def _stream_compatibility():
+    agent = _instance(_STREAM_ADVISOR)
+    return lambda: agent._calculate_stream_compatibility(_SCHOOL["dbda_scores"])
+
+
+@case("stream_advisor._calculate_interest_alignment")
+def _interest_alignment():
+    agent = _instance(_STREAM_ADVISOR)
+    return lambda: agent._calculate_interest_alignment(_SCHOOL["cii_results"])
+
+
+@case("career_explorer._calculate_aptitude_career_scores")
+def _aptitude_career_scores():
+    agent = _instance(_CAREER_EXPLORER)
+    return lambda: agent._calculate_aptitude_career_scores(_SCHOOL["dbda_scores"])
+
+
+@case("career_explorer._get_top_career_matches")
+def _top_career_matches():
+    agent = _instance(_CAREER_EXPLORER)
+    return lambda: agent._get_top_career_matches(
+        _SCHOOL["dbda_scores"], _SCHOOL["cii_results"], "Science (PCM)"
+    )
+
+
+# ---------------------------------------------------------------- response parsing
+
+_PARSERS = {
+    "test_score_interpreter": "agentic_layer.school_students.agents"
+    ".test_score_interpreter_agent:TestScoreInterpreterAgent",
+    "academic_stream_advisor": _STREAM_ADVISOR,
+    "career_pathway_explorer": _CAREER_EXPLORER,
+    "educational_roadmap_planner": "agentic_layer.school_students.agents"
+    ".educational_roadmap_planner_agent:EducationalRoadmapPlannerAgent",
+    "college_scholarship_navigator": "agentic_layer.school_students.agents"
+    ".college_and_scholarship_navigator_agent:CollegeScholarshipNavigatorAgent",
+    "timeline_planning": "agentic_layer.school_students.agents.sub_agents"
+    ".timeline_planning_sub_agent:TimelinePlanningSubAgent",
+    "scholarship_discovery": "agentic_layer.school_students.agents.sub_agents"
+    ".scholarship_discovery_sub_agent:ScholarshipDiscoverySubAgent",
+    "profile_analysis": "agentic_layer.college_upskill.agents"
+    ".profile_analysis_agent:ProfileAnalysisAgent",
+    "market_intelligence": "agentic_layer.college_upskill.agents"
+    ".market_intelligence_agent:MarketIntelligenceAgent",
+    "skill_development_strategist": "agentic_layer.college_upskill.agents"
+    ".skill_development_strategist_agent:SkillDevelopmentStrategistAgent",
+    "career_optimization_planner": "agentic_layer.college_upskill.agents"
+    ".career_optimization_planner_agent:CareerOptimizationPlannerAgent",
+    "opportunity_matcher": "agentic_layer.college_upskill.agents"
+    ".opportunity_matcher_agent:OpportunityMatcherAgent",
+    "salary_benchmarking": "agentic_layer.college_upskill.agents.sub_agents"
+    ".salary_benchmarking_sub_agent:SalaryBenchmarkingSubAgent",
+}
+
+
+def _parse_case(path: str):
+    def setup():
+        from langchain_core.messages import AIMessage
+
+        instance = _instance(path)
+        parser = getattr(instance, "output_parser", None) or instance.final_parser
+        response = AIMessage(content=_schema_response(parser))
+        return lambda: instance._parse_llm_response(response)
+
+    return setup
+
+
+for _name, _path in _PARSERS.items():
+    case(f"parse.{_name}")(_parse_case(_path))
+
+
+# ---------------------------------------------------------------- prompt assembly
+
+
+@case("extraction._prepare_data_summary")
+def _prepare_data_summary():
+    agent = _instance(
+        "agentic_layer.college_upskill.agents.sub_agents.extraction_sub_agent"
+        ":SmartDataExtractionAgent"
+    )
+    college = college_user_data(0)
+    validated_input = {
+        "optional_data": {
+            name: college[name]
+            for name in (
+                "resume_data",
+                "academic_status",
+                "linkedin_profile",
+                "github_profile",
+            )
+        },
+        "previous_outputs": {
+            "profile_analysis": _completed_result(
+                "profile_analysis",
+                json.loads(
+                    _schema_response(
+                        _instance(_PARSERS["profile_analysis"]).final_parser
+                    )[len("```json\n") : -len("\n```")]
+                ),
+            )
+        },
+    }
+    return lambda: agent._prepare_data_summary(validated_input)
+
+
+@case("prompt.academic_stream_advisor")
+def _stream_advisor_prompt():
+    agent = _instance(_STREAM_ADVISOR)
+    interpreter = _instance(_PARSERS["test_score_interpreter"])
+    interpretation = _completed_result(
+        "test_score_interpreter",
+        json.loads(
+            _schema_response(interpreter.output_parser)[
+                len("```json\n") : -len("\n```")
+            ]
+        ),
+    )
+    optional_data = {
+        "current_grade": _SCHOOL["demographic_info"]["current_grade"],
+        "academic_performance": _SCHOOL["academic_status"],
+        "financial_considerations": _SCHOOL["financial_constraints"],
+    }
+
+    # The assembly in AcademicStreamAdvisorAgent._process_core_logic
+    def assemble() -> str:
+        return agent.advisory_prompt.format(
+            student_profile=agent._prepare_student_profile(optional_data),
+            test_interpretation=agent._extract_test_interpretation(interpretation),
+            aptitude_strengths=agent._identify_aptitude_strengths(
+                _SCHOOL["dbda_scores"]
+            ),
+            interest_patterns=agent._extract_interest_patterns(
+                _SCHOOL["cii_results"]
+            ),
+            stream_options=agent._format_stream_options(),
+            contextual_factors=agent._prepare_contextual_factors(optional_data),
+            format_instructions=agent.output_parser.get_format_instructions(),
+        )
+
+    return assemble
+
+
+@case("prompt.timeline_planning")
+def _timeline_prompt():
+    agent = _instance(_PARSERS["timeline_planning"])
+    constraints = {
+        "financial_constraints": _SCHOOL["financial_constraints"],
+        "academic_status": _SCHOOL["academic_status"],
+        "stream": "Science (PCM)",
+    }
+
+    # The assembly in TimelinePlanningSubAgent.generate_timeline
+    return lambda: agent.prompt.format(
+        student_profile="Grade 10 student strong in technical and computational",
+        current_grade="10th Grade",
+        career_goals="Software Engineer, Data Scientist",
+        entrance_exams="JEE Main, BITSAT",
+        constraints=json.dumps(constraints, indent=2),
+        format_instructions=agent.output_parser.get_format_instructions(),
+    )
+
+
+@case("prompt.profile_resume")
+def _resume_prompt():
+    agent = _instance(_PARSERS["profile_analysis"])
+    resume_data = college_user_data(0)["resume_data"]
+
+    # The assembly in ProfileAnalysisAgent._analyze_resume_with_tracing
+    return lambda: agent.resume_prompt.format(
+        resume_data=json.dumps(resume_data, indent=2)
+    )
+
+
+# ---------------------------------------------------------------- harness
+
+
+def measure(
+    call: Callable[[], Any], rounds: int, min_time: float
+) -> Dict[str, float]:
+    """Per-call seconds over ``rounds`` rounds of auto-sized loops"""
+    call()  # warm up caches and lazy imports
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            call()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            call()
+        per_call.append((time.perf_counter() - started) / loops)
+    return {
+        "loops": loops,
+        "rounds": rounds,
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "mean": statistics.fmean(per_call),
+        "stdev": statistics.stdev(per_call) if rounds > 1 else 0.0,
+        "samples": per_call,
+    }
+
+
+def profile(name: str, call: Callable[[], Any], top: int):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    started = time.perf_counter()
+    while time.perf_counter() - started < 0.5:
+        call()
+    profiler.disable()
+    print(f"\n--- {name}: top {top} by cumulative time")
+    pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(
+        top
+    )
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark the per-request CPU-bound helpers"
+    )
+    parser.add_argument(
+        "-k",
+        dest="patterns",
+        action="append",
+        help="run cases whose name contains this (or matches it as a glob)",
+    )
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument("--rounds", type=int, default=15, help="rounds (default 15)")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.02,
+        help="minimum seconds per round (default 0.02)",
+    )
+    parser.add_argument("--save", help="write the results as a baseline to this file")
+    parser.add_argument("--compare", help="baseline file to check against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed median slowdown vs the baseline, as a fraction (default 0.25)",
+    )
+    parser.add_argument(
+        "--store",
+        help="keep the run in this results store (default BENCHMARK_RESULTS_PATH, "
+        "see benchmarks/results.py)",
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="also print a cProfile of each case"
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="functions per profile (default 15)"
+    )
+    args = parser.parse_args(argv)
+    # Agents log their construction at INFO; keep the table readable
+    logging.disable(logging.INFO)
+
+    names = [
+        name
+        for name in CASES
+        if not args.patterns
+        or any(
+            pattern in name or fnmatch.fnmatch(name, pattern)
+            for pattern in args.patterns
+        )
+    ]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        parser.error("no case matches")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["cases"]
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    width = max(len(name) for name in names)
+    print(
+        f"{'case':{width}}  {'median':>10}  {'min':>10}  {'stdev':>9}  "
+        f"{'ops/s':>10}" + ("  vs baseline" if baseline else "")
+    )
+    for name in names:
+        call = CASES[name]()
+        stats = measure(call, args.rounds, args.min_time)
+        results[name] = stats
+        line = (
+            f"{name:{width}}  {_format_time(stats['median']):>10}  "
+            f"{_format_time(stats['min']):>10}  "
+            f"{stats['stdev'] / stats['median'] * 100:>8.1f}%  "
+            f"{1 / stats['median']:>10,.0f}"
+        )
+        if name in baseline:
+            change = stats["median"] / baseline[name]["median"] - 1
+            flag = ""
+            if change > args.threshold:
+                regressions.append(name)
+                flag = "  REGRESSION"
+            line += f"  {change * 100:+10.1f}%{flag}"
+        print(line, flush=True)
+        if args.profile:
+            profile(name, call, args.top)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "benchmark": "micro",
+                    "commit": _commit(),
+                    "timestamp": datetime.now().isoformat(),
+                    "python": platform.python_version(),
+                    "cases": results,
+                },
+                f,
+                indent=2,
+            )
+    store_run(
+        args.store,
+        "micro",
+        {"rounds": args.rounds, "min_time": args.min_time},
+        {name: metric(stats["samples"]) for name, stats in results.items()},
+    )
+    if regressions:
+        print(
+            f"\nFAIL: {len(regressions)} case(s) more than "
+            f"{args.threshold * 100:.0f}% slower than {args.compare}: "
+            + ", ".join(regressions),
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,594 @@
+"""
+Benchmark results store, and a comparison of two runs with bootstrap
+confidence intervals
+
+Every benchmark (cold_start, micro, fleets, load_test) can keep its run:
+pass ``--store PATH`` or set BENCHMARK_RESULTS_PATH. A ``.sqlite``/``.db``
+path is a database (``runs`` and ``metrics`` tables), anything else a
+directory with one JSON file per run. A run records the benchmark, its
+settings, the git revision (and whether the tree was dirty), the
+environment (Python, OS, CPU count, key package versions) and, per metric,
+the raw samples with their unit and which direction is better.
+
+    python -m benchmarks.results list --store results.sqlite
+    python -m benchmarks.results show latest --store results.sqlite
+    python -m benchmarks.results compare latest~1 latest --store results.sqlite
+    python -m benchmarks.results compare base.json candidate.json -k school
+
+A run is named by a JSON file, a run id (or unique prefix), or
+``latest``/``latest~N`` (optionally narrowed with ``--benchmark``).
+
+``compare`` resamples each metric's samples in both runs to get a
+confidence interval for the relative change of the median (or mean). A
+metric has regressed or improved only when the whole interval lies on one
+side of zero and the change is at least ``--min-change``; single-valued
+metrics such as throughput are shown without a verdict. Compare runs made
+on the same machine.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+FORMAT_VERSION = 1
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Versions recorded with every run
+_PACKAGES = (
+    "fastapi",
+    "uvicorn",
+    "pydantic",
+    "langchain-core",
+    "langgraph",
+    "requests",
+)
+
+
+@dataclass
+class BenchmarkRun:
+    """One benchmark invocation and its metrics"""
+
+    run_id: str
+    benchmark: str
+    created_at: str
+    git: Dict[str, Any]
+    environment: Dict[str, Any]
+    settings: Dict[str, Any] = field(default_factory=dict)
+    # name -> {"unit", "better": "lower"|"higher", "samples": [...]}
+    metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    format: int = FORMAT_VERSION
+
+    @classmethod
+    def from_dict(cls, document: Dict[str, Any]) -> "BenchmarkRun":
+        return cls(**document)
+
+
+def metric(samples: Sequence[float], unit: str = "s", better: str = "lower"):
+    """A metric entry; ``samples`` are the raw observations, not a summary"""
+    return {"unit": unit, "better": better, "samples": [float(s) for s in samples]}
+
+
+def git_info() -> Dict[str, Any]:
+    def git(*command: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ["git", *command],
+                capture_output=True,
+                text=True,
+                cwd=_ROOT,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    from importlib import metadata
+
+    packages = {}
+    for name in _PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "hostname": socket.gethostname(),
+        "packages": packages,
+    }
+
+
+def new_run(
+    benchmark: str,
+    settings: Dict[str, Any],
+    metrics: Dict[str, Dict[str, Any]],
+) -> BenchmarkRun:
+    git = git_info()
+    now = datetime.now(timezone.utc)
+    return BenchmarkRun(
+        run_id=f"{benchmark}-{now:%Y%m%dT%H%M%S}-{(git['commit'] or 'nogit')[:8]}",
+        benchmark=benchmark,
+        created_at=now.isoformat(),
+        git=git,
+        environment=environment_info(),
+        settings=settings,
+        metrics=metrics,
+    )
+
+
+# ---------------------------------------------------------------- stores
+
+
+class ResultStore:
+    """Where runs are kept"""
+
+    def save(self, run: BenchmarkRun):
+        raise NotImplementedError
+
+    def runs(self, benchmark: Optional[str] = None) -> List[BenchmarkRun]:
+        """Stored runs, oldest first"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JsonResultStore(ResultStore):
+    """A directory with one ``<run_id>.json`` per run"""
+
+    def __init__(self, directory: str):
+        self.path = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, run: BenchmarkRun):
+        with open(
+            os.path.join(self.path, f"{run.run_id}.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(asdict(run), f, indent=2)
+
+    def runs(self, benchmark: Optional[str] = None) -> List[BenchmarkRun]:
+        found = []
+        for name in os.listdir(self.path):
+            if name.endswith(".json"):
+                found.append(load_run_file(os.path.join(self.path, name)))
+        return sorted(
+            (run for run in found if benchmark in (None, run.benchmark)),
+            key=lambda run: run.created_at,
+        )
+
+
+class SqliteResultStore(ResultStore):
+    """
+    ``runs`` holds each run's JSON document; ``metrics`` one row per run and
+    metric with its median, for querying trends without parsing documents
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                benchmark TEXT,
+                created_at TEXT,
+                git_commit TEXT,
+                dirty INTEGER,
+                document TEXT
+            );
+            CREATE TABLE IF NOT EXISTS metrics (
+                run_id TEXT,
+                metric TEXT,
+                unit TEXT,
+                better TEXT,
+                samples INTEGER,
+                median REAL,
+                PRIMARY KEY (run_id, metric)
+            );
+            """
+        )
+
+    def save(self, run: BenchmarkRun):
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    run.run_id,
+                    run.benchmark,
+                    run.created_at,
+                    run.git.get("commit"),
+                    run.git.get("dirty"),
+                    json.dumps(asdict(run)),
+                ),
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run.run_id,
+                        name,
+                        entry["unit"],
+                        entry["better"],
+                        len(entry["samples"]),
+                        statistics.median(entry["samples"])
+                        if entry["samples"]
+                        else None,
+                    )
+                    for name, entry in run.metrics.items()
+                ],
+            )
+
+    def runs(self, benchmark: Optional[str] = None) -> List[BenchmarkRun]:
+        rows = self._connection.execute(
+            "SELECT document FROM runs WHERE ? IS NULL OR benchmark = ? "
+            "ORDER BY created_at",
+            (benchmark, benchmark),
+        )
+        return [BenchmarkRun.from_dict(json.loads(document)) for (document,) in rows]
+
+    def close(self):
+        self._connection.close()
+
+
+def open_store(path: str) -> ResultStore:
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        return SqliteResultStore(path)
+    return JsonResultStore(path)
+
+
+def load_run_file(path: str) -> BenchmarkRun:
+    with open(path, "r", encoding="utf-8") as f:
+        return BenchmarkRun.from_dict(json.load(f))
+
+
+def store_run(
+    path: Optional[str],
+    benchmark: str,
+    settings: Dict[str, Any],
+    metrics: Dict[str, Dict[str, Any]],
+) -> Optional[BenchmarkRun]:
+    """
+    Save a run to ``path``, or BENCHMARK_RESULTS_PATH when ``path`` is
+    None; does nothing when neither is set
+    """
+    path = path or os.getenv("BENCHMARK_RESULTS_PATH")
+    if not path:
+        return None
+    run = new_run(benchmark, settings, metrics)
+    store = open_store(path)
+    try:
+        store.save(run)
+    finally:
+        store.close()
+    print(f"[results] stored {run.run_id} in {path}", file=sys.stderr)
+    return run
+
+
+def resolve_run(
+    reference: str, store: Optional[ResultStore], benchmark: Optional[str] = None
+) -> BenchmarkRun:
+    """
+    A run by JSON file path, run id (or unique prefix), or latest/latest~N
+
+    Raises:
+        LookupError: no run, or more than one, matches
+    """
+    if os.path.isfile(reference):
+        return load_run_file(reference)
+    if store is None:
+        raise LookupError(f"{reference} is not a file and no store was given")
+
+    runs = store.runs(benchmark)
+    if reference == "latest" or reference.startswith("latest~"):
+        back = int(reference.partition("~")[2] or 0)
+        if back >= len(runs):
+            raise LookupError(f"only {len(runs)} stored run(s), no {reference}")
+        return runs[-1 - back]
+
+    matches = [run for run in runs if run.run_id.startswith(reference)]
+    if len(matches) != 1:
+        raise LookupError(
+            f"{len(matches) or 'no'} stored runs match {reference!r}"
+            + (f" ({', '.join(run.run_id for run in matches[:5])})" if matches else "")
+        )
+    return matches[0]
+
+
+# ---------------------------------------------------------------- comparison
+
+
+def _statistic(name: str):
+    return statistics.median if name == "median" else statistics.fmean
+
+
+def bootstrap_change(
+    base: Sequence[float],
+    candidate: Sequence[float],
+    statistic: str = "median",
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    rng: Optional[random.Random] = None,
+) -> Tuple[float, float, float]:
+    """
+    Relative change of ``statistic`` from ``base`` to ``candidate`` with a
+    percentile bootstrap confidence interval: (change, low, high)
+    """
+    rng = rng or random.Random(0)
+    compute = _statistic(statistic)
+    reference = compute(base)
+    change = compute(candidate) / reference - 1 if reference else 0.0
+
+    changes = []
+    for _ in range(resamples):
+        resampled_base = compute(rng.choices(base, k=len(base)))
+        resampled_candidate = compute(rng.choices(candidate, k=len(candidate)))
+        if resampled_base:
+            changes.append(resampled_candidate / resampled_base - 1)
+    if not changes:
+        return change, change, change
+    changes.sort()
+    tail = (1 - confidence) / 2
+    low = changes[int(tail * (len(changes) - 1))]
+    high = changes[int(round((1 - tail) * (len(changes) - 1)))]
+    return change, low, high
+
+
+def compare_runs(
+    base: BenchmarkRun,
+    candidate: BenchmarkRun,
+    statistic: str = "median",
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    min_change: float = 0.02,
+    patterns: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """One row per metric present in both runs, in the candidate's order"""
+    compute = _statistic(statistic)
+    rng = random.Random(0)
+    rows = []
+    for name, entry in candidate.metrics.items():
+        if name not in base.metrics:
+            continue
+        if patterns and not any(pattern in name for pattern in patterns):
+            continue
+        base_samples = base.metrics[name]["samples"]
+        candidate_samples = entry["samples"]
+        if not base_samples or not candidate_samples:
+            continue
+
+        row = {
+            "metric": name,
+            "unit": entry["unit"],
+            "better": entry["better"],
+            "base": compute(base_samples),
+            "candidate": compute(candidate_samples),
+            "samples": (len(base_samples), len(candidate_samples)),
+            "low": None,
+            "high": None,
+        }
+        if len(base_samples) < 2 or len(candidate_samples) < 2:
+            row["change"] = (
+                row["candidate"] / row["base"] - 1 if row["base"] else 0.0
+            )
+            row["verdict"] = "n/a"
+            rows.append(row)
+            continue
+
+        change, low, high = bootstrap_change(
+            base_samples, candidate_samples, statistic, resamples, confidence, rng
+        )
+        row.update({"change": change, "low": low, "high": high})
+        # Positive when the candidate is worse
+        worse = 1 if entry["better"] == "lower" else -1
+        if low > 0 or high < 0:
+            significant = abs(change) >= min_change
+            if not significant:
+                row["verdict"] = "unchanged"
+            elif change * worse > 0:
+                row["verdict"] = "regression"
+            else:
+                row["verdict"] = "improvement"
+        else:
+            row["verdict"] = "unchanged"
+        rows.append(row)
+    return rows
+
+
+def _format_value(value: float, unit: str) -> str:
+    if unit == "s":
+        for suffix, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+            if abs(value) >= scale:
+                return f"{value / scale:.2f} {suffix}"
+        return f"{value / 1e-9:.0f} ns"
+    return f"{value:.3g} {unit}".strip()
+
+
+def print_comparison(
+    base: BenchmarkRun, candidate: BenchmarkRun, rows: List[Dict[str, Any]]
+):
+    for label, run in (("base", base), ("candidate", candidate)):
+        commit = (run.git.get("commit") or "?")[:10]
+        dirty = "+dirty" if run.git.get("dirty") else ""
+        print(f"{label:9}  {run.run_id}  ({commit}{dirty}, {run.created_at[:19]})")
+    if base.environment.get("hostname") != candidate.environment.get("hostname"):
+        print("warning: the runs were made on different machines")
+    if base.settings != candidate.settings:
+        print("warning: the runs used different settings")
+    print()
+
+    width = max([len("metric")] + [len(row["metric"]) for row in rows])
+    print(
+        f"{'metric':{width}}  {'base':>10}  {'candidate':>10}  {'change':>8}  "
+        f"{'confidence interval':>19}  verdict"
+    )
+    for row in rows:
+        interval = (
+            f"[{row['low'] * 100:+.1f}%, {row['high'] * 100:+.1f}%]"
+            if row["low"] is not None
+            else "-"
+        )
+        print(
+            f"{row['metric']:{width}}  "
+            f"{_format_value(row['base'], row['unit']):>10}  "
+            f"{_format_value(row['candidate'], row['unit']):>10}  "
+            f"{row['change'] * 100:>+7.1f}%  {interval:>19}  {row['verdict']}"
+        )
+
+    verdicts = [row["verdict"] for row in rows]
+    print(
+        f"\n{verdicts.count('regression')} regression(s), "
+        f"{verdicts.count('improvement')} improvement(s), "
+        f"{verdicts.count('unchanged')} unchanged, "
+        f"{verdicts.count('n/a')} without enough samples"
+    )
+
+
+def print_run(run: BenchmarkRun):
+    print(f"{run.run_id}  {run.benchmark}  {run.created_at}")
+    print(f"git: {json.dumps(run.git)}")
+    print(f"environment: {json.dumps(run.environment)}")
+    print(f"settings: {json.dumps(run.settings)}\n")
+    width = max([len("metric")] + [len(name) for name in run.metrics])
+    print(f"{'metric':{width}}  {'n':>5}  {'median':>10}  {'min':>10}  {'max':>10}")
+    for name, entry in run.metrics.items():
+        samples = entry["samples"]
+        if not samples:
+            continue
+        print(
+            f"{name:{width}}  {len(samples):>5}  "
+            f"{_format_value(statistics.median(samples), entry['unit']):>10}  "
+            f"{_format_value(min(samples), entry['unit']):>10}  "
+            f"{_format_value(max(samples), entry['unit']):>10}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="List stored benchmark runs and compare two of them"
+    )
+    parser.add_argument(
+        "--store",
+        default=os.getenv("BENCHMARK_RESULTS_PATH"),
+        help="results store (default BENCHMARK_RESULTS_PATH)",
+    )
+    parser.add_argument("--benchmark", help="only runs of this benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list stored runs")
+    show = commands.add_parser("show", help="print one run's metrics")
+    show.add_argument("run")
+
+    compare = commands.add_parser("compare", help="compare two runs")
+    compare.add_argument("base")
+    compare.add_argument("candidate")
+    compare.add_argument(
+        "-k",
+        dest="patterns",
+        action="append",
+        help="only metrics whose name contains this",
+    )
+    compare.add_argument(
+        "--statistic",
+        choices=("median", "mean"),
+        default="median",
+        help="statistic to compare (default median)",
+    )
+    compare.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="confidence level of the intervals (default 0.95)",
+    )
+    compare.add_argument(
+        "--resamples",
+        type=int,
+        default=2000,
+        help="bootstrap resamples per metric (default 2000)",
+    )
+    compare.add_argument(
+        "--min-change",
+        type=float,
+        default=0.02,
+        help="smallest relative change worth reporting (default 0.02)",
+    )
+    compare.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit 1 when any metric regressed",
+    )
+    compare.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args(argv)
+
+    store = open_store(args.store) if args.store else None
+    try:
+        if args.command == "list":
+            if store is None:
+                parser.error("list needs --store or BENCHMARK_RESULTS_PATH")
+            for run in store.runs(args.benchmark):
+                commit = (run.git.get("commit") or "?")[:10]
+                print(
+                    f"{run.run_id:48}  {run.benchmark:10}  {commit}"
+                    f"{'+dirty' if run.git.get('dirty') else '':6}  "
+                    f"{len(run.metrics):>4} metrics"
+                )
+            return 0
+
+        try:
+            if args.command == "show":
+                print_run(resolve_run(args.run, store, args.benchmark))
+                return 0
+            base = resolve_run(args.base, store, args.benchmark)
+            candidate = resolve_run(args.candidate, store, args.benchmark)
+        except LookupError as e:
+            parser.error(str(e))
+    finally:
+        if store is not None:
+            store.close()
+
+    if base.benchmark != candidate.benchmark:
+        parser.error(
+            f"cannot compare a {base.benchmark} run with a {candidate.benchmark} run"
+        )
+    rows = compare_runs(
+        base,
+        candidate,
+        args.statistic,
+        args.resamples,
+        args.confidence,
+        args.min_change,
+        args.patterns,
+    )
+    if not rows:
+        parser.error("the runs have no metrics in common")
+    print_comparison(base, candidate, rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    regressed = any(row["verdict"] == "regression" for row in rows)
+    return 1 if args.fail_on_regression and regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
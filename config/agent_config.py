@@ -1,4 +1,4 @@
-from typing import Dict, List, Any, Optional, TypedDict
+from typing import Dict, List, Any, Optional, Tuple, TypedDict
 from enum import Enum
 from pydantic import BaseModel, Field
 from dataclasses import dataclass
@@ -18,6 +18,40 @@ class AgentDependency:
         self.required_outputs = required_outputs or []
 
 
+def critical_path(
+    agent_times: Dict[str, float], dependencies: Dict[str, List[str]]
+) -> float:
+    """Longest chain of agent times through the declared dependencies"""
+    return critical_chain(agent_times, dependencies)[0]
+
+
+def critical_chain(
+    agent_times: Dict[str, float], dependencies: Dict[str, List[str]]
+) -> Tuple[float, List[str]]:
+    """The critical path's time and its agents, first to last"""
+    finished: Dict[str, Tuple[float, List[str]]] = {}
+
+    def finish(agent_id: str) -> Tuple[float, List[str]]:
+        if agent_id not in finished:
+            seconds, chain = max(
+                (
+                    finish(dependency)
+                    for dependency in dependencies.get(agent_id, [])
+                    if dependency in agent_times
+                ),
+                key=lambda link: link[0],
+                default=(0.0, []),
+            )
+            finished[agent_id] = (seconds + agent_times[agent_id], chain + [agent_id])
+        return finished[agent_id]
+
+    return max(
+        (finish(agent_id) for agent_id in agent_times),
+        key=lambda link: link[0],
+        default=(0.0, []),
+    )
+
+
 class AgentType(Enum):
     """Types of agents in the system"""
 
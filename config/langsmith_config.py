@@ -4,6 +4,8 @@ from langsmith import Client
 from langchain_core.tracers.langchain import LangChainTracer
 from dotenv import load_dotenv
 
+from core.tracing import get_tracer
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -19,6 +21,19 @@ class LangSmithConfig:
         # Load from .env file first
         load_dotenv()
 
+        tracer = get_tracer()
+        if tracer.exporter_name != "langsmith":
+            # Offline or disabled tracing: keep @traceable from reaching out too
+            os.environ["LANGCHAIN_TRACING_V2"] = "false"
+            logger.info(
+                f"LangSmith disabled (tracing exporter: {tracer.exporter_name})"
+            )
+            return False
+        # @traceable runs sample at the same rate as the shared tracer
+        os.environ.setdefault(
+            "LANGCHAIN_TRACING_SAMPLING_RATE", str(tracer.sample_rate)
+        )
+
         # Verify API key is loaded
         api_key = os.getenv("LANGCHAIN_API_KEY")
         if not api_key:
@@ -37,7 +52,12 @@ class LangSmithConfig:
 
     @staticmethod
     def create_client() -> Client:
-        """Create LangSmith client with error handling"""
+        """
+        Create LangSmith client with error handling
+
+        No request is made here: a bad API key shows up as a logged
+        tracing error on the first traced run, not as startup latency.
+        """
         try:
             # Verify API key is available
             api_key = os.getenv("LANGCHAIN_API_KEY")
@@ -48,15 +68,7 @@ class LangSmithConfig:
                 return None
 
             client = Client()
-            # Test the connection
-            try:
-                # This will raise an exception if the API key is invalid
-                client.list_runs(limit=1)
-                logger.info("LangSmith client created and authenticated successfully")
-            except Exception as auth_error:
-                logger.error(f"LangSmith authentication failed: {auth_error}")
-                return None
-
+            logger.info("LangSmith client created")
             return client
         except Exception as e:
             logger.error(f"Failed to create LangSmith client: {e}")
@@ -1,6 +1,8 @@
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from core.managed_llm import ManagedChatModel
 
 
 class LLMManager:
@@ -20,30 +22,49 @@ class LLMManager:
         api_key: Optional[str] = None,
         temperature: float = 0.1,
         max_tokens: Optional[int] = None,
-    ) -> ChatGoogleGenerativeAI:
-        """Initialize Gemini model as the project's LLM"""
+    ) -> "ManagedChatModel":
+        """Initialize Gemini model as the project's LLM
+
+        The model is wrapped in a ManagedChatModel so every call is gated
+        by the process-wide, priority-aware LLM limiter. LLM_BACKEND selects
+        an offline backend instead (see core/llm_backends.py); those need
+        no API key.
+        """
 
         if self._llm_model is None:
-            # Get API key from parameter or environment
-            gemini_api_key = api_key or os.getenv("GOOGLE_API_KEY")
+            # Imported here: langchain and the Gemini client are slow to import
+            from core.llm_backends import build_backend
+            from core.managed_llm import ManagedChatModel
+
+            def make_gemini():
+                # Get API key from parameter or environment
+                gemini_api_key = api_key or os.getenv("GOOGLE_API_KEY")
+
+                if not gemini_api_key:
+                    raise ValueError(
+                        "Google API key not found. Set GOOGLE_API_KEY environment variable or pass api_key parameter"
+                    )
+
+                from langchain_google_genai import ChatGoogleGenerativeAI
 
-            if not gemini_api_key:
-                raise ValueError(
-                    "Google API key not found. Set GOOGLE_API_KEY environment variable or pass api_key parameter"
+                return ChatGoogleGenerativeAI(
+                    model=model_name,
+                    google_api_key=gemini_api_key,
+                    temperature=temperature,
+                    max_output_tokens=max_tokens,
                 )
 
-            self._llm_model = ChatGoogleGenerativeAI(
-                model=model_name,
-                google_api_key=gemini_api_key,
-                temperature=temperature,
-                max_output_tokens=max_tokens,
+            # LLM_BACKEND may swap in a recording, replaying or synthetic
+            # model; it is wrapped the same way as the real one
+            self._llm_model = ManagedChatModel(
+                inner=build_backend(model_name, make_gemini)
             )
 
             print(f"Initialized Gemini model: {model_name}")
 
         return self._llm_model
 
-    def get_llm(self) -> ChatGoogleGenerativeAI:
+    def get_llm(self) -> "ManagedChatModel":
         """Get the initialized LLM instance"""
         if self._llm_model is None:
             return self.initialize_gemini()
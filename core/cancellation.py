@@ -0,0 +1,74 @@
+import threading
+from typing import Callable, List, Optional
+
+from core.request_context import current_context
+
+
+class OperationCancelled(BaseException):
+    """
+    Raised inside a job once its cancellation token has been triggered
+
+    Derives from BaseException (like asyncio.CancelledError) so the
+    ``except Exception`` fallbacks in agents and sub-agents do not swallow
+    it and carry on issuing LLM calls for an abandoned session.
+    """
+
+    def __init__(self, reason: str = "Operation cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancellationToken:
+    """Thread-safe, one-way cancellation flag shared by a job and its canceller"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Operation cancelled"):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Run ``callback`` when the token is cancelled (immediately if it
+        already is); returns a function that unregisters it
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled(self.reason)
+
+    def _unregister(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def current_token() -> Optional[CancellationToken]:
+    return current_context().cancel_token
+
+
+def raise_if_cancelled():
+    """Checkpoint for long-running work: stop if the current job was cancelled"""
+    token = current_context().cancel_token
+    if token is not None:
+        token.raise_if_cancelled()
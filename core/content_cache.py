@@ -0,0 +1,158 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from core.request_context import current_context
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(data: Any) -> str:
+    """SHA-256 of bytes, text, or any JSON-serializable value"""
+    if isinstance(data, bytes):
+        raw = data
+    elif isinstance(data, str):
+        raw = data.encode("utf-8")
+    else:
+        raw = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def content_version(*parts: Any) -> str:
+    """
+    Short version tag for cached derivations, e.g. built from a prompt
+    template and its format instructions: edit either and old entries stop
+    matching
+    """
+    return content_hash([str(part) for part in parts])[:16]
+
+
+class ContentCache:
+    """
+    Content-addressed cache for values derived from uploaded content
+
+    Entries are addressed by (key, version): the key is a hash of the input
+    (e.g. the resume bytes), the version a hash of whatever shapes the
+    output (prompt template, schema, model). Values must be JSON
+    serializable; every get returns a fresh copy, so callers may mutate it.
+    Entries live in an in-memory LRU and, when ``directory`` is set, are
+    also written there so they survive restarts and can be shared by
+    replicas on the same volume.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 1000,
+        directory: Optional[str] = None,
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.directory = os.path.join(directory, namespace) if directory else None
+        self._entries: "OrderedDict[str, str]" = OrderedDict()  # serialized JSON
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, version: str) -> Optional[Any]:
+        entry_key = f"{version}:{key}"
+        with self._lock:
+            serialized = self._entries.get(entry_key)
+            if serialized is not None:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return json.loads(serialized)
+
+        serialized = self._read_disk(key, version)
+        with self._lock:
+            if serialized is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember_locked(entry_key, serialized)
+        return json.loads(serialized)
+
+    def put(self, key: str, version: str, value: Any):
+        if current_context().dry_run is not None:
+            return  # a dry run's synthetic results must never be served
+        serialized = json.dumps(value, default=str)
+        with self._lock:
+            self._remember_locked(f"{version}:{key}", serialized)
+        self._write_disk(key, version, serialized)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    # ------------------------------------------------------------------ internals
+
+    def _remember_locked(self, entry_key: str, serialized: str):
+        self._entries[entry_key] = serialized
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str, version: str) -> str:
+        return os.path.join(self.directory, version, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str, version: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key, version), "r", encoding="utf-8") as f:
+                serialized = f.read()
+            json.loads(serialized)  # reject truncated or corrupt files
+            return serialized
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable {self.namespace} cache entry: {e}")
+            return None
+
+    def _write_disk(self, key: str, version: str, serialized: str):
+        if not self.directory:
+            return
+        path = self._path(key, version)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(serialized)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to persist {self.namespace} cache entry: {e}")
+
+
+_caches: Dict[str, ContentCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_content_cache(namespace: str) -> ContentCache:
+    """
+    Process-wide cache for ``namespace``, sized by CONTENT_CACHE_MAX_ENTRIES
+    and persisted under CONTENT_CACHE_DIR when that is set
+    """
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = ContentCache(
+                namespace,
+                max_entries=int(os.getenv("CONTENT_CACHE_MAX_ENTRIES", "1000")),
+                directory=os.getenv("CONTENT_CACHE_DIR") or None,
+            )
+        return _caches[namespace]
+
+
+def content_cache_snapshot() -> Dict[str, Dict[str, Any]]:
+    with _caches_lock:
+        caches = dict(_caches)
+    return {namespace: cache.snapshot() for namespace, cache in caches.items()}
@@ -0,0 +1,27 @@
+import threading
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from core.llm_accounting import LLMCallRecord
+
+
+class DryRunLog:
+    """
+    The LLM calls a dry-run session would have made
+
+    Bound on the request context as ``dry_run``. While it is set,
+    ManagedChatModel answers from the prompt's output schema instead of
+    calling the model (no limiter slot, no tenant budget), the LLM
+    accountant appends its records here instead of to the production sink
+    and totals, content caches are read but not written, and traces are
+    not sampled. Each record carries the agent and sub-agent that made the
+    call and the prompt tokens estimated from the real assembled prompt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: List["LLMCallRecord"] = []
+
+    def append(self, record: "LLMCallRecord"):
+        with self._lock:
+            self.calls.append(record)
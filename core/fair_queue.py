@@ -0,0 +1,124 @@
+import os
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Priority(str, Enum):
+    """Priority classes shared by the job scheduler and the LLM limiter"""
+
+    INTERACTIVE_CHAT = "interactive_chat"  # follow-up questions, seconds matter
+    INTERACTIVE_ANALYSIS = "interactive_analysis"  # a user waiting on /status
+    BATCH = "batch"  # bulk/cohort runs, throughput matters
+
+
+DEFAULT_WEIGHTS: Dict[Priority, float] = {
+    Priority.INTERACTIVE_CHAT: 8.0,
+    Priority.INTERACTIVE_ANALYSIS: 4.0,
+    Priority.BATCH: 1.0,
+}
+
+
+def weights_from_env() -> Dict[Priority, float]:
+    """
+    Read class weights from PRIORITY_WEIGHTS, e.g.
+    "interactive_chat=8,interactive_analysis=4,batch=1"
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    raw = os.getenv("PRIORITY_WEIGHTS", "")
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        if not value:
+            continue
+        weights[Priority(name.strip())] = max(float(value), 0.001)
+    return weights
+
+
+class WeightedFairQueue(Generic[T]):
+    """
+    Per-priority FIFOs served by start-time weighted fair queuing
+
+    Each class advances its own virtual clock by 1/weight per item served,
+    and the class with the earliest next finish time goes first. Higher
+    weights get proportionally more turns, but every non-empty class keeps
+    advancing, so batch work is slowed down rather than starved. A class
+    that was idle re-joins at the current virtual time, so it cannot bank
+    credit while it has nothing queued.
+    """
+
+    def __init__(self, weights: Optional[Dict[Priority, float]] = None):
+        self.weights = weights or dict(DEFAULT_WEIGHTS)
+        self._queues: Dict[Priority, Deque[T]] = {p: deque() for p in Priority}
+        self._virtual_time: Dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._global_time = 0.0
+
+    def push(self, priority: Priority, item: T):
+        queue = self._queues[priority]
+        if not queue:
+            self._virtual_time[priority] = max(
+                self._virtual_time[priority], self._global_time
+            )
+        queue.append(item)
+
+    def pop(self, eligible: Optional[Callable[[T], bool]] = None) -> Optional[T]:
+        """
+        Remove and return the next item to serve
+
+        Args:
+            eligible: optional filter; within a class the oldest eligible
+                item is taken, ineligible ones keep their place
+        """
+        best_priority = None
+        best_index = None
+        best_finish = None
+
+        for priority, queue in self._queues.items():
+            index = self._first_eligible(queue, eligible)
+            if index is None:
+                continue
+            finish = self._virtual_time[priority] + 1.0 / self.weights[priority]
+            if best_finish is None or finish < best_finish:
+                best_priority, best_index, best_finish = priority, index, finish
+
+        if best_priority is None:
+            return None
+
+        queue = self._queues[best_priority]
+        item = queue[best_index]
+        del queue[best_index]
+        self._virtual_time[best_priority] = best_finish
+        self._global_time = max(self._global_time, best_finish)
+        return item
+
+    def remove(self, predicate: Callable[[T], bool]) -> List[T]:
+        """Remove every queued item matching ``predicate``"""
+        removed = []
+        for priority, queue in self._queues.items():
+            kept = deque()
+            for item in queue:
+                (removed if predicate(item) else kept).append(item)
+            self._queues[priority] = kept
+        return removed
+
+    def count(self, priority: Optional[Priority] = None) -> int:
+        if priority is not None:
+            return len(self._queues[priority])
+        return sum(len(queue) for queue in self._queues.values())
+
+    def __len__(self) -> int:
+        return self.count()
+
+    @staticmethod
+    def _first_eligible(
+        queue: Deque[T], eligible: Optional[Callable[[T], bool]]
+    ) -> Optional[int]:
+        if not queue:
+            return None
+        if eligible is None:
+            return 0
+        for index, item in enumerate(queue):
+            if eligible(item):
+                return index
+        return None
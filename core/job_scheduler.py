@@ -0,0 +1,433 @@
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from core.cancellation import CancellationToken, OperationCancelled
+from core.fair_queue import Priority, WeightedFairQueue, weights_from_env
+from core.metrics import JOB_QUEUE_WAIT_SECONDS
+from core.request_context import bind_context
+from core.tenancy import DEFAULT_TENANT, TenantRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a vertical's queue is full and new work must be refused"""
+
+    def __init__(self, vertical: str, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.vertical = vertical
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+@dataclass
+class VerticalLimits:
+    """Admission limits for one vertical"""
+
+    max_running: int = 4
+    max_queued: int = 50
+
+    @classmethod
+    def from_env(cls, vertical: str) -> "VerticalLimits":
+        """
+        Read limits from JOB_MAX_RUNNING / JOB_MAX_QUEUED, with per-vertical
+        overrides such as JOB_MAX_RUNNING_SCHOOL_STUDENTS
+        """
+        suffix = vertical.upper()
+        return cls(
+            max_running=int(
+                os.getenv(
+                    f"JOB_MAX_RUNNING_{suffix}",
+                    os.getenv("JOB_MAX_RUNNING", str(cls.max_running)),
+                )
+            ),
+            max_queued=int(
+                os.getenv(
+                    f"JOB_MAX_QUEUED_{suffix}",
+                    os.getenv("JOB_MAX_QUEUED", str(cls.max_queued)),
+                )
+            ),
+        )
+
+
+@dataclass
+class Job:
+    """A unit of background work owned by the scheduler"""
+
+    job_id: str
+    vertical: str
+    fn: Callable[[], Any]
+    context: contextvars.Context
+    priority: Priority = Priority.INTERACTIVE_ANALYSIS
+    tenant_id: str = DEFAULT_TENANT
+    session_id: Optional[str] = None  # the session its LLM calls belong to
+    future: Future = field(default_factory=Future)
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+
+
+@dataclass
+class Admission:
+    """What the scheduler promised when it accepted a job"""
+
+    job_id: str
+    vertical: str
+    priority: Priority
+    future: Future  # resolves to the job's return value
+    started_immediately: bool
+    queue_position: int  # jobs of the same vertical ahead of this one
+    estimated_start_seconds: float
+    estimated_duration_seconds: float
+
+    @property
+    def estimated_completion_seconds(self) -> float:
+        return self.estimated_start_seconds + self.estimated_duration_seconds
+
+
+class JobScheduler:
+    """
+    Bounded, priority-aware job queue with per-vertical admission control
+
+    Jobs run on a shared thread pool. Each vertical may have at most
+    ``max_running`` jobs executing and ``max_queued`` waiting; anything
+    beyond that is rejected up front with a Retry-After estimate derived
+    from the observed job duration, instead of being accepted and left to
+    time out later.
+
+    When a worker frees up, the next job is chosen across priority classes
+    by weighted fair queuing. ``chat_reserved_workers`` slots are kept for
+    interactive chat, so a follow-up question never waits behind a pool
+    full of multi-minute fleet runs.
+
+    With a tenant registry, each tenant is also capped at its own
+    ``max_running`` / ``max_queued``. Jobs of a tenant at its cap are
+    skipped when dispatching, so one partner's bulk upload cannot hold
+    every worker while other tenants queue behind it.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        limits: Optional[Dict[str, VerticalLimits]] = None,
+        default_duration_seconds: Optional[float] = None,
+        smoothing: float = 0.2,
+        chat_reserved_workers: Optional[int] = None,
+        weights: Optional[Dict[Priority, float]] = None,
+        tenants: Optional[TenantRegistry] = None,
+    ):
+        self.limits = limits or {}
+        self.tenants = tenants
+        self.max_workers = max_workers or int(os.getenv("JOB_MAX_WORKERS", "8"))
+        self.chat_reserved_workers = min(
+            self.max_workers - 1,
+            (
+                chat_reserved_workers
+                if chat_reserved_workers is not None
+                else int(os.getenv("JOB_CHAT_RESERVED_WORKERS", "1"))
+            ),
+        )
+        self.default_duration_seconds = default_duration_seconds or float(
+            os.getenv("JOB_DEFAULT_DURATION_SECONDS", "180")
+        )
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._pending: WeightedFairQueue[Job] = WeightedFairQueue(
+            weights or weights_from_env()
+        )
+        self._running: Dict[str, Job] = {}
+        self._running_non_chat = 0
+        self._running_by_vertical: Counter = Counter()
+        self._queued_by_vertical: Counter = Counter()
+        self._running_by_tenant: Counter = Counter()
+        self._queued_by_tenant: Counter = Counter()
+        self._avg_duration: Dict[str, float] = {}
+        self._completed_by_vertical: Counter = Counter()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="analysis-job"
+        )
+
+    def limits_for(self, vertical: str) -> VerticalLimits:
+        if vertical not in self.limits:
+            self.limits[vertical] = VerticalLimits.from_env(vertical)
+        return self.limits[vertical]
+
+    def submit(
+        self,
+        job_id: str,
+        vertical: str,
+        fn: Callable[[], Any],
+        priority: Priority = Priority.INTERACTIVE_ANALYSIS,
+        tenant_id: str = DEFAULT_TENANT,
+        session_id: Optional[str] = None,
+    ) -> Admission:
+        """
+        Queue ``fn`` for execution or reject it
+
+        ``session_id`` is bound on the request context while the job runs, so
+        LLM accounting and traces land on the session the work is for; a job
+        that serves no session yet (resume pre-processing) leaves it None.
+
+        Raises:
+            AdmissionRejected: the vertical or the tenant already has
+                max_queued jobs waiting
+        """
+        limits = self.limits_for(vertical)
+        job = Job(
+            job_id=job_id,
+            vertical=vertical,
+            fn=fn,
+            context=contextvars.copy_context(),
+            priority=priority,
+            tenant_id=tenant_id,
+            session_id=session_id,
+        )
+        tenant = self.tenants.get(tenant_id) if self.tenants else None
+
+        with self._lock:
+            if not self._has_capacity_locked(job):
+                if self._queued_by_vertical[vertical] >= limits.max_queued:
+                    retry_after = self._retry_after_locked(vertical)
+                    raise AdmissionRejected(
+                        vertical,
+                        retry_after,
+                        f"Too many pending requests for {vertical}. "
+                        f"Please retry in {retry_after} seconds.",
+                    )
+                if (
+                    tenant is not None
+                    and tenant.max_queued is not None
+                    and self._queued_by_tenant[tenant_id] >= tenant.max_queued
+                ):
+                    retry_after = self._retry_after_locked(
+                        vertical, tenant.max_running
+                    )
+                    raise AdmissionRejected(
+                        vertical,
+                        retry_after,
+                        "Too many pending requests for this account. "
+                        f"Please retry in {retry_after} seconds.",
+                    )
+
+            queued_ahead = self._queued_by_vertical[vertical]
+            self._pending.push(priority, job)
+            self._queued_by_vertical[vertical] += 1
+            self._queued_by_tenant[tenant_id] += 1
+            self._dispatch_locked()
+
+            started = job.started_at is not None
+            admission = Admission(
+                job_id=job_id,
+                vertical=vertical,
+                priority=priority,
+                future=job.future,
+                started_immediately=started,
+                queue_position=0 if started else queued_ahead,
+                estimated_start_seconds=(
+                    0.0 if started else self._estimate_wait_locked(vertical, queued_ahead)
+                ),
+                estimated_duration_seconds=self._duration_locked(vertical),
+            )
+
+        return admission
+
+    def cancel(self, job_id: str, reason: str = "Cancelled by user") -> Optional[str]:
+        """
+        Cancel a queued or running job
+
+        A queued job is dropped without ever starting. A running job has its
+        cancellation token set; the fleet stops at its next checkpoint and
+        in-flight LLM calls are abandoned.
+
+        Returns:
+            "queued" or "running" for the state the job was cancelled in,
+            None if the scheduler does not know the job
+        """
+        if self.withdraw(job_id, reason):
+            logger.info(f"Cancelled queued job {job_id}")
+            return "queued"
+
+        with self._lock:
+            running = self._running.get(job_id)
+        if running is not None:
+            running.cancel_token.cancel(reason)
+            logger.info(f"Cancellation requested for running job {job_id}")
+            return "running"
+        return None
+
+    def withdraw(self, job_id: str, reason: str = "Withdrawn") -> bool:
+        """
+        Drop a job that has not started yet; its future gets OperationCancelled
+
+        Returns:
+            True if the job was still queued, False if it already started,
+            finished, or is unknown
+        """
+        with self._lock:
+            removed = self._pending.remove(lambda job: job.job_id == job_id)
+            for job in removed:
+                self._queued_by_vertical[job.vertical] -= 1
+                self._queued_by_tenant[job.tenant_id] -= 1
+
+        for job in removed:
+            job.cancel_token.cancel(reason)
+            job.future.set_exception(OperationCancelled(reason))
+        return bool(removed)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current queue depth, running jobs and throughput per vertical"""
+        with self._lock:
+            verticals = set(self.limits) | set(self._queued_by_vertical)
+            return {
+                vertical: {
+                    "running": self._running_by_vertical[vertical],
+                    "queued": self._queued_by_vertical[vertical],
+                    "completed": self._completed_by_vertical[vertical],
+                    "max_running": self.limits_for(vertical).max_running,
+                    "max_queued": self.limits_for(vertical).max_queued,
+                    "avg_duration_seconds": round(self._duration_locked(vertical), 2),
+                }
+                for vertical in sorted(verticals)
+            }
+
+    def tenant_snapshot(self, tenant_id: str) -> Dict[str, Any]:
+        """Running and queued jobs for one tenant"""
+        tenant = self.tenants.get(tenant_id) if self.tenants else None
+        with self._lock:
+            return {
+                "running": self._running_by_tenant[tenant_id],
+                "queued": self._queued_by_tenant[tenant_id],
+                "max_running": tenant.max_running if tenant else None,
+                "max_queued": tenant.max_queued if tenant else None,
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    # ------------------------------------------------------------------ internals
+
+    def _has_capacity_locked(self, job: Job) -> bool:
+        if len(self._running) >= self.max_workers:
+            return False
+        if self._running_by_vertical[job.vertical] >= self.limits_for(
+            job.vertical
+        ).max_running:
+            return False
+        if self.tenants is not None:
+            tenant = self.tenants.get(job.tenant_id)
+            if (
+                tenant is not None
+                and tenant.max_running is not None
+                and self._running_by_tenant[job.tenant_id] >= tenant.max_running
+            ):
+                return False
+        if job.priority != Priority.INTERACTIVE_CHAT:
+            return (
+                self._running_non_chat
+                < self.max_workers - self.chat_reserved_workers
+            )
+        return True
+
+    def _dispatch_locked(self):
+        """Start queued jobs, by weighted fair queuing, while slots are available"""
+        while len(self._running) < self.max_workers:
+            job = self._pending.pop(eligible=self._has_capacity_locked)
+            if job is None:
+                return
+            self._start_locked(job)
+
+    def _start_locked(self, job: Job):
+        job.started_at = time.monotonic()
+        JOB_QUEUE_WAIT_SECONDS.observe(job.started_at - job.enqueued_at, job.vertical)
+        self._queued_by_vertical[job.vertical] -= 1
+        self._running_by_vertical[job.vertical] += 1
+        self._queued_by_tenant[job.tenant_id] -= 1
+        self._running_by_tenant[job.tenant_id] += 1
+        if job.priority != Priority.INTERACTIVE_CHAT:
+            self._running_non_chat += 1
+        self._running[job.job_id] = job
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: Job):
+        try:
+            result = job.context.run(self._execute, job)
+            job.future.set_result(result)
+        except OperationCancelled as e:
+            logger.info(f"Job {job.job_id} stopped after cancellation")
+            job.future.set_exception(e)
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}", exc_info=True)
+            job.future.set_exception(e)
+        finally:
+            finished_at = time.monotonic()
+            with self._lock:
+                self._running.pop(job.job_id, None)
+                self._running_by_vertical[job.vertical] -= 1
+                self._running_by_tenant[job.tenant_id] -= 1
+                if job.priority != Priority.INTERACTIVE_CHAT:
+                    self._running_non_chat -= 1
+                self._completed_by_vertical[job.vertical] += 1
+                if not job.cancel_token.cancelled:
+                    # Cancelled runs would drag the duration estimate down
+                    self._record_duration_locked(
+                        job.vertical, finished_at - job.started_at
+                    )
+                self._dispatch_locked()
+
+    @staticmethod
+    def _execute(job: Job) -> Any:
+        # Runs inside the submitter's context copy; expose the job's session
+        # and priority to the LLM limiter and other request-scoped components
+        with bind_context(
+            session_id=job.session_id,
+            vertical=job.vertical,
+            priority=job.priority,
+            tenant_id=job.tenant_id,
+            cancel_token=job.cancel_token,
+        ):
+            job.cancel_token.raise_if_cancelled()
+            return job.fn()
+
+    def _record_duration_locked(self, vertical: str, duration: float):
+        previous = self._avg_duration.get(vertical)
+        if previous is None:
+            self._avg_duration[vertical] = duration
+        else:
+            self._avg_duration[vertical] = (
+                self.smoothing * duration + (1 - self.smoothing) * previous
+            )
+
+    def _duration_locked(self, vertical: str) -> float:
+        return self._avg_duration.get(vertical, self.default_duration_seconds)
+
+    def _parallelism(self, vertical: str, cap: Optional[int] = None) -> int:
+        parallelism = min(self.limits_for(vertical).max_running, self.max_workers)
+        if cap is not None:
+            parallelism = min(parallelism, cap)
+        return max(1, parallelism)
+
+    def _estimate_wait_locked(self, vertical: str, queue_position: int) -> float:
+        """Seconds until the job at ``queue_position`` should get a slot"""
+        parallelism = self._parallelism(vertical)
+        return math.ceil((queue_position + 1) / parallelism) * self._duration_locked(
+            vertical
+        )
+
+    def _retry_after_locked(self, vertical: str, cap: Optional[int] = None) -> int:
+        """Seconds until one queued job should have started, freeing a queue slot"""
+        return max(
+            1,
+            math.ceil(
+                self._duration_locked(vertical) / self._parallelism(vertical, cap)
+            ),
+        )
@@ -0,0 +1,228 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from core.metrics import LLM_CALL_SECONDS, LLM_CALLS, LLM_QUEUE_SECONDS, LLM_TOKENS
+from core.request_context import current_context
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMCallRecord:
+    """
+    One LLM call, or one LLM result served from a content cache
+
+    Latency is the provider call alone; time spent waiting for a limiter
+    slot is ``queued_seconds``. Agents call the model without streaming, so
+    the first token arrives with the whole response and
+    ``ttft_seconds`` equals ``latency_seconds``.
+    """
+
+    time: str
+    model: str
+    session_id: Optional[str] = None
+    vertical: Optional[str] = None
+    tenant_id: Optional[str] = None
+    agent: Optional[str] = None
+    sub_agent: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tokens_estimated: bool = False
+    latency_seconds: float = 0.0
+    ttft_seconds: float = 0.0
+    queued_seconds: float = 0.0
+    cached: bool = False
+    error: Optional[str] = None
+
+
+class AccountingSink(ABC):
+    """Append-only destination for call records"""
+
+    @abstractmethod
+    def append(self, record: LLMCallRecord):
+        """Store one call record"""
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonlAccountingSink(AccountingSink):
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, record: LLMCallRecord):
+        self._file.write(json.dumps(asdict(record)) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class SqliteAccountingSink(AccountingSink):
+    _COLUMN_TYPES = {bool: "INTEGER", int: "INTEGER", float: "REAL"}
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._columns = [f.name for f in fields(LLMCallRecord)]
+        declared = ", ".join(
+            f"{f.name} {self._COLUMN_TYPES.get(f.type, 'TEXT')}"
+            for f in fields(LLMCallRecord)
+        )
+        self._connection.execute(f"CREATE TABLE IF NOT EXISTS llm_calls ({declared})")
+        self._insert = (
+            f"INSERT INTO llm_calls ({', '.join(self._columns)}) "
+            f"VALUES ({', '.join('?' for _ in self._columns)})"
+        )
+
+    def append(self, record: LLMCallRecord):
+        values = asdict(record)
+        with self._connection:
+            self._connection.execute(
+                self._insert, [values[column] for column in self._columns]
+            )
+
+    def close(self):
+        self._connection.close()
+
+
+class LLMAccountant:
+    """
+    Records every LLM call with the session, vertical, agent and sub-agent
+    of the request that made it
+
+    Attribution comes from the request context, so call sites only pass
+    what the model wrapper measured. Records are appended to ``sink`` when
+    one is configured; running totals are kept either way for /health.
+    A failing sink is logged once and then left alone, never failing the
+    call being recorded.
+    """
+
+    def __init__(self, sink: Optional[AccountingSink] = None):
+        self.sink = sink
+        self._lock = threading.Lock()
+        self._sink_failed = False
+        self.totals = {
+            "calls": 0,
+            "cache_hits": 0,
+            "errors": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "LLMAccountant":
+        """
+        LLM_ACCOUNTING_PATH selects the sink: a .sqlite/.db path is a
+        database with an ``llm_calls`` table, anything else a JSONL file
+        """
+        path = os.getenv("LLM_ACCOUNTING_PATH")
+        if not path:
+            return cls()
+        if path.endswith((".sqlite", ".sqlite3", ".db")):
+            return cls(SqliteAccountingSink(path))
+        return cls(JsonlAccountingSink(path))
+
+    def record_call(
+        self,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        tokens_estimated: bool = False,
+        latency_seconds: float = 0.0,
+        ttft_seconds: float = 0.0,
+        queued_seconds: float = 0.0,
+        error: Optional[str] = None,
+    ):
+        self._record(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            tokens_estimated=tokens_estimated,
+            latency_seconds=latency_seconds,
+            ttft_seconds=ttft_seconds,
+            queued_seconds=queued_seconds,
+            error=error,
+        )
+
+    def record_cache_hit(self, model: str):
+        """An LLM result reused from a content cache instead of a new call"""
+        self._record(model=model, cached=True)
+
+    def _record(self, **measured):
+        context = current_context()
+        record = LLMCallRecord(
+            time=datetime.now(timezone.utc).isoformat(),
+            session_id=context.session_id,
+            vertical=context.vertical,
+            tenant_id=context.tenant_id,
+            agent=context.agent,
+            sub_agent=context.sub_agent,
+            **measured,
+        )
+        if context.dry_run is not None:
+            context.dry_run.append(record)
+            return
+        _export_metrics(record)
+        with self._lock:
+            self.totals["cache_hits" if record.cached else "calls"] += 1
+            self.totals["errors"] += record.error is not None
+            self.totals["prompt_tokens"] += record.prompt_tokens
+            self.totals["completion_tokens"] += record.completion_tokens
+            if self.sink is None or self._sink_failed:
+                return
+            try:
+                self.sink.append(record)
+            except Exception as e:
+                self._sink_failed = True
+                logger.warning(f"LLM accounting sink failed, no longer writing: {e}")
+
+    def close(self):
+        with self._lock:
+            if self.sink is not None:
+                self.sink.close()
+                self.sink = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sink": self.sink.path if self.sink else None,
+                "sink_failed": self._sink_failed,
+                **self.totals,
+            }
+
+
+def _export_metrics(record: LLMCallRecord):
+    if record.cached:
+        LLM_CALLS.inc(record.model, "cached")
+        return
+    LLM_CALLS.inc(record.model, "error" if record.error else "ok")
+    LLM_CALL_SECONDS.observe(record.latency_seconds, record.model)
+    LLM_QUEUE_SECONDS.observe(record.queued_seconds, record.model)
+    LLM_TOKENS.inc(record.model, "prompt", amount=record.prompt_tokens)
+    LLM_TOKENS.inc(record.model, "completion", amount=record.completion_tokens)
+
+
+_accountant: Optional[LLMAccountant] = None
+_accountant_lock = threading.Lock()
+
+
+def get_llm_accountant() -> LLMAccountant:
+    """The process-wide accountant, configured from the environment on first use"""
+    global _accountant
+    if _accountant is None:
+        with _accountant_lock:
+            if _accountant is None:
+                _accountant = LLMAccountant.from_env()
+    return _accountant
@@ -0,0 +1,411 @@
+"""
+Offline LLM backends selected by LLM_BACKEND, for reproducible runs without
+a Gemini key
+
+- ``gemini`` (default): the real model
+- ``record``: the real model, with every response also saved to the cassette
+- ``replay``: responses served from the cassette; a prompt that was never
+  recorded fails with CassetteMiss
+- ``synthetic``: schema-valid JSON generated from the output schema embedded
+  in the prompt by the agents' output parsers, or shaped like the JSON
+  example the prompt gives; a prompt with neither fails with
+  MissingOutputSchema
+
+Cassettes live under LLM_CASSETTE_DIR (default ``cassettes``), one JSON file
+per interaction keyed by model and normalized prompt, so recordings from
+separate runs merge by copying directories. Replay and synthetic responses
+can be slowed down and made to fail with LLM_FAKE_LATENCY_MS,
+LLM_FAKE_LATENCY_JITTER_MS and LLM_FAKE_ERROR_RATE (seeded by
+LLM_FAKE_SEED). Whatever the backend, it sits inside ManagedChatModel, so
+limiting, cancellation, budgets and accounting behave as in production.
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from core.content_cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("gemini", "record", "replay", "synthetic")
+
+# Values that differ between otherwise identical runs
+_VOLATILE = [
+    (
+        re.compile(
+            r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I
+        ),
+        "<uuid>",
+    ),
+    (
+        re.compile(
+            r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?"
+            r"(?:Z|[+-]\d\d:?\d\d)?"
+        ),
+        "<datetime>",
+    ),
+    (re.compile(r"\s+"), " "),
+]
+
+# Emitted by the Json/PydanticOutputParser format instructions
+_SCHEMA_BLOCK = re.compile(
+    r"Here is the output schema:\s*```(?:json)?\s*(\{.*?\})\s*```", re.S
+)
+
+# A JSON example the prompt asks the model to follow
+_JSON_EXAMPLE = re.compile(r"```json\s*([\[{].*?[\]}])\s*```", re.S)
+# JsonOutputParser's format instructions when it has no pydantic model
+_ANY_JSON_OBJECT = "Return a JSON object."
+
+
+class CassetteMiss(LookupError):
+    """Replay was asked for a prompt that was never recorded"""
+
+
+class InjectedLLMError(RuntimeError):
+    """Failure injected by LLM_FAKE_ERROR_RATE"""
+
+
+class MissingOutputSchema(ValueError):
+    """The synthetic backend found nothing in the prompt to shape a response on"""
+
+
+def normalize_prompt(messages: List[BaseMessage]) -> str:
+    """
+    The prompt as cassette keys see it: roles and contents with whitespace
+    collapsed and UUIDs and timestamps masked
+    """
+    text = "\n".join(
+        f"{message.type}: "
+        + (
+            message.content
+            if isinstance(message.content, str)
+            else json.dumps(message.content, sort_keys=True)
+        )
+        for message in messages
+    )
+    for pattern, replacement in _VOLATILE:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+class Cassette:
+    """Recorded responses in ``directory``, one JSON file per interaction"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def key(self, model: str, messages: List[BaseMessage]) -> str:
+        return content_hash([model, normalize_prompt(messages)])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent replays never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+
+class FaultInjector:
+    """Latency and errors added to fake responses"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "FaultInjector":
+        seed = os.getenv("LLM_FAKE_SEED")
+        return cls(
+            latency_ms=float(os.getenv("LLM_FAKE_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("LLM_FAKE_LATENCY_JITTER_MS", "0")),
+            error_rate=float(os.getenv("LLM_FAKE_ERROR_RATE", "0")),
+            seed=int(seed) if seed else None,
+        )
+
+    def apply(self):
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(-1, 1) * self.jitter_ms
+            fail = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if fail:
+            raise InjectedLLMError("Injected LLM failure")
+
+
+def _chat_result(text: str, usage: Optional[Dict[str, int]] = None) -> ChatResult:
+    message = AIMessage(content=text, usage_metadata=usage or None)
+    return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class RecordingChatModel(BaseChatModel):
+    """
+    Calls the real model and saves each response to the cassette, keyed by
+    the configured model name so replay finds it under the same name
+    """
+
+    inner: BaseChatModel
+    model: str
+    cassette: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return f"recording-{self.inner._llm_type}"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        started = time.perf_counter()
+        result = self.inner._generate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        generation = result.generations[0]
+        message = getattr(generation, "message", None)
+        self.cassette.put(
+            self.cassette.key(self.model, messages),
+            {
+                "model": self.model,
+                "prompt": normalize_prompt(messages),
+                "response": generation.text,
+                "usage": dict(getattr(message, "usage_metadata", None) or {}),
+                "latency_seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+        return result
+
+
+class ReplayChatModel(BaseChatModel):
+    """Serves responses recorded by RecordingChatModel"""
+
+    model: str
+    cassette: Any
+    faults: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        key = self.cassette.key(self.model, messages)
+        entry = self.cassette.get(key)
+        if entry is None:
+            raise CassetteMiss(
+                f"No recording for this {self.model} prompt (key {key[:12]}) in "
+                f"{self.cassette.directory}; record it with LLM_BACKEND=record"
+            )
+        if self.faults is not None:
+            self.faults.apply()
+        return _chat_result(entry["response"], entry.get("usage") or None)
+
+
+class SyntheticChatModel(BaseChatModel):
+    """
+    Answers with JSON that validates against the output schema found in the
+    prompt, generated deterministically from the prompt so reruns match
+
+    The schema comes from the format instructions the agent's output parser
+    put in the prompt: a Pydantic/JsonOutputParser schema block, else the
+    first JSON example the prompt gives, else an empty object for a plain
+    JsonOutputParser. Any other prompt raises MissingOutputSchema rather
+    than getting a reply no parser would accept.
+    """
+
+    model: str
+    faults: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "synthetic"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        prompt = normalize_prompt(messages)
+        if self.faults is not None:
+            self.faults.apply()
+        schema = output_schema(prompt)
+        rng = random.Random(content_hash(prompt))
+        value = synthesize(schema, rng, schema.get("$defs", {}))
+        return _chat_result(json.dumps(value, indent=2))
+
+
+def output_schema(prompt: str) -> Dict[str, Any]:
+    """
+    The JSON schema a response to ``prompt`` must follow
+
+    Raises:
+        MissingOutputSchema: the prompt has no format instructions to go by
+    """
+    match = _SCHEMA_BLOCK.search(prompt)
+    if match is not None:
+        return json.loads(match.group(1))
+    for example in _JSON_EXAMPLE.findall(prompt):
+        try:
+            return schema_from_example(json.loads(example))
+        except ValueError:
+            continue  # an illustration with comments or "...", not JSON
+    if _ANY_JSON_OBJECT in prompt:
+        return {"type": "object"}
+    raise MissingOutputSchema(
+        "No output schema in the prompt: the synthetic backend needs the "
+        "format instructions of a Pydantic/JsonOutputParser or a ```json "
+        f"example to shape its response. Prompt starts: {prompt[:200]!r}"
+    )
+
+
+def schema_from_example(example: Any) -> Dict[str, Any]:
+    """A JSON schema that ``example``, and values shaped like it, satisfy"""
+    if isinstance(example, dict):
+        return {
+            "type": "object",
+            "properties": {
+                key: schema_from_example(item) for key, item in example.items()
+            },
+        }
+    if isinstance(example, list):
+        return {
+            "type": "array",
+            "items": schema_from_example(example[0]) if example else {},
+            "minItems": len(example),
+            "maxItems": len(example),
+        }
+    if isinstance(example, bool):
+        return {"type": "boolean"}
+    if isinstance(example, int):
+        return {"type": "integer"}
+    if isinstance(example, float):
+        return {"type": "number"}
+    if isinstance(example, str):
+        return {"type": "string"}
+    return {"const": None}
+
+
+def synthesize(
+    schema: Dict[str, Any],
+    rng: random.Random,
+    definitions: Dict[str, Any],
+    name: str = "value",
+) -> Any:
+    """A value of ``schema`` (a JSON schema as pydantic emits it)"""
+    if "$ref" in schema:
+        schema = definitions[schema["$ref"].rsplit("/", 1)[-1]]
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        if combinator in schema:
+            options = [
+                option for option in schema[combinator] if option.get("type") != "null"
+            ]
+            return synthesize(options[0], rng, definitions, name) if options else None
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "const" in schema:
+        return schema["const"]
+
+    label = (schema.get("title") or name).replace("_", " ").lower()
+    kind = schema.get("type")
+    if kind == "object" or "properties" in schema:
+        value = {
+            field: synthesize(subschema, rng, definitions, field)
+            for field, subschema in schema.get("properties", {}).items()
+        }
+        extra = schema.get("additionalProperties")
+        if isinstance(extra, dict):
+            for index in range(1, 3):
+                value[f"{name}_{index}"] = synthesize(extra, rng, definitions, name)
+        return value
+    if kind == "array":
+        low = schema.get("minItems", 2)
+        high = max(schema.get("maxItems", 3), low)
+        return [
+            synthesize(schema.get("items", {}), rng, definitions, name)
+            for _ in range(rng.randint(low, high))
+        ]
+    if kind == "string":
+        if schema.get("format") == "date-time":
+            return "2025-01-01T00:00:00"
+        if schema.get("format") == "date":
+            return "2025-01-01"
+        return f"Sample {label} {rng.randint(1, 99)}"
+    if kind in ("integer", "number"):
+        low = schema.get("minimum", schema.get("exclusiveMinimum", 0))
+        high = schema.get("maximum", schema.get("exclusiveMaximum"))
+        if high is None:
+            high = 1 if "confidence" in name or "score" in name else low + 100
+        if kind == "integer":
+            return rng.randint(int(low), int(high))
+        return round(rng.uniform(low, high), 2)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return f"Sample {label}"
+
+
+def build_backend(model_name: str, make_real) -> BaseChatModel:
+    """
+    The chat model LLM_BACKEND asks for; ``make_real`` builds the real one
+    and is only called by the gemini and record backends
+    """
+    backend = os.getenv("LLM_BACKEND", "gemini").lower()
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown LLM_BACKEND {backend!r}; expected one of {', '.join(BACKENDS)}"
+        )
+    if backend == "gemini":
+        return make_real()
+
+    cassette = Cassette(os.getenv("LLM_CASSETTE_DIR", "cassettes"))
+    logger.info(f"Using the {backend} LLM backend")
+    if backend == "record":
+        return RecordingChatModel(
+            inner=make_real(), model=model_name, cassette=cassette
+        )
+    if backend == "replay":
+        return ReplayChatModel(
+            model=model_name, cassette=cassette, faults=FaultInjector.from_env()
+        )
+    return SyntheticChatModel(model=model_name, faults=FaultInjector.from_env())
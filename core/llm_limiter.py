@@ -0,0 +1,106 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from core.cancellation import CancellationToken
+from core.fair_queue import Priority, WeightedFairQueue, weights_from_env
+
+
+class LLMLimiter:
+    """
+    Caps concurrent LLM calls across the process and hands free slots to
+    waiters by priority class
+
+    When every slot is busy, callers queue per priority class; a released
+    slot goes straight to the next waiter chosen by weighted fair queuing,
+    so a chat follow-up overtakes queued batch calls without starving them.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        weights: Optional[Dict[Priority, float]] = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._waiters: WeightedFairQueue[threading.Event] = WeightedFairQueue(
+            weights
+        )
+
+    @classmethod
+    def from_env(cls) -> "LLMLimiter":
+        return cls(
+            max_concurrent=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+            weights=weights_from_env(),
+        )
+
+    def acquire(
+        self,
+        priority: Priority = Priority.INTERACTIVE_ANALYSIS,
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        """
+        Block until a slot is available for a call of ``priority``
+
+        Raises:
+            OperationCancelled: ``cancel_token`` fired while waiting
+        """
+        with self._lock:
+            if self._in_use < self.max_concurrent and not len(self._waiters):
+                self._in_use += 1
+                return
+            waiter = threading.Event()
+            self._waiters.push(priority, waiter)
+
+        if cancel_token is None:
+            # release() passes its slot to us directly, _in_use is unchanged
+            waiter.wait()
+            return
+
+        unregister = cancel_token.on_cancel(waiter.set)
+        waiter.wait()
+        unregister()
+        if cancel_token.cancelled:
+            with self._lock:
+                still_waiting = self._waiters.remove(lambda w: w is waiter)
+            if not still_waiting:
+                # A slot was handed over just before we gave up; pass it on
+                self.release()
+            cancel_token.raise_if_cancelled()
+
+    def release(self):
+        with self._lock:
+            waiter = self._waiters.pop()
+            if waiter is None:
+                self._in_use -= 1
+            else:
+                waiter.set()
+
+    @contextmanager
+    def slot(
+        self,
+        priority: Priority = Priority.INTERACTIVE_ANALYSIS,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[None]:
+        self.acquire(priority, cancel_token)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_use": self._in_use,
+                "max_concurrent": self.max_concurrent,
+                **{
+                    f"waiting_{priority.value}": self._waiters.count(priority)
+                    for priority in Priority
+                },
+            }
+
+
+# Process-wide limiter shared by every managed LLM instance
+llm_limiter = LLMLimiter.from_env()
@@ -0,0 +1,218 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+from core.llm_accounting import LLMAccountant, get_llm_accountant
+from core.llm_limiter import LLMLimiter, llm_limiter
+from core.request_context import RequestContext, current_context
+from core.tenancy import TenantRegistry, tenant_registry
+from core.timing import record_span
+
+# Calls made on behalf of cancellable jobs run here so the job can stop
+# waiting on them; the limiter already bounds how many are in flight
+_call_pool = ThreadPoolExecutor(
+    max_workers=llm_limiter.max_concurrent, thread_name_prefix="llm-call"
+)
+
+
+class ManagedChatModel(BaseChatModel):
+    """
+    Chat model wrapper that every agent LLM call goes through
+
+    Agents keep using ``llm.invoke(...)`` and ``prompt | llm | parser``
+    unchanged; the wrapper gates each call on the shared LLM limiter using
+    the priority of the request that issued it, and stops issuing or
+    waiting on calls once the request's job has been cancelled.
+
+    Calls are refused once the calling tenant has spent its LLM token
+    budget, and the tokens of every completed call are charged to it.
+    Every call is also recorded, with its latency and tokens, on the LLM
+    accountant.
+    """
+
+    inner: BaseChatModel
+    limiter: Any = None
+    tenants: Any = None
+    accountant: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return f"managed-{self.inner._llm_type}"
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.inner, "model", None) or self.inner._llm_type
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        accountant: LLMAccountant = self.accountant or get_llm_accountant()
+        context = current_context()
+        if context.dry_run is not None:
+            return self._generate_dry_run(messages, accountant)
+
+        tenants: TenantRegistry = self.tenants or tenant_registry
+        tenants.check_budget(context.tenant_id)
+
+        timing = {"requested": time.perf_counter()}
+        try:
+            result = self._generate_gated(messages, stop, run_manager, timing, **kwargs)
+        except BaseException as e:
+            finished = time.perf_counter()
+            started = timing.get("started", finished)
+            accountant.record_call(
+                self.model_name,
+                latency_seconds=finished - started,
+                queued_seconds=started - timing["requested"],
+                error=f"{type(e).__name__}: {e}",
+            )
+            _record_timing(context, timing, finished, error=type(e).__name__)
+            raise
+        finished = time.perf_counter()
+
+        input_tokens, output_tokens, reported = _token_usage(messages, result)
+        tenants.record_llm_usage(context.tenant_id, input_tokens, output_tokens)
+        accountant.record_call(
+            self.model_name,
+            prompt_tokens=input_tokens,
+            completion_tokens=output_tokens,
+            tokens_estimated=not reported,
+            latency_seconds=finished - timing["started"],
+            # Not streamed: the first token arrives with the whole response
+            ttft_seconds=finished - timing["started"],
+            queued_seconds=timing["started"] - timing["requested"],
+        )
+        _record_timing(
+            context,
+            timing,
+            finished,
+            prompt_tokens=input_tokens,
+            completion_tokens=output_tokens,
+        )
+        return result
+
+    def _generate_dry_run(
+        self, messages: List[BaseMessage], accountant: LLMAccountant
+    ) -> ChatResult:
+        """
+        Answer a dry-run call with schema-valid synthetic output, so the
+        rest of the session's prompts are assembled as in a real run, and
+        record the call with its estimated tokens (see core.dry_run)
+        """
+        from core.llm_backends import SyntheticChatModel
+
+        result = SyntheticChatModel(model=self.model_name)._generate(messages)
+        input_tokens, output_tokens, _ = _token_usage(messages, result)
+        accountant.record_call(
+            self.model_name,
+            prompt_tokens=input_tokens,
+            completion_tokens=output_tokens,
+            tokens_estimated=True,
+        )
+        return result
+
+    def _generate_gated(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]],
+        run_manager: Optional[CallbackManagerForLLMRun],
+        timing: Dict[str, float],
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        Run the inner call under the limiter, honouring cancellation; the
+        moment a slot was granted is stored as ``timing["started"]``
+        """
+        limiter: LLMLimiter = self.limiter or llm_limiter
+        context = current_context()
+        token = context.cancel_token
+
+        if token is None:
+            with limiter.slot(context.priority):
+                timing["started"] = time.perf_counter()
+                return self.inner._generate(
+                    messages, stop=stop, run_manager=run_manager, **kwargs
+                )
+
+        token.raise_if_cancelled()
+        limiter.acquire(context.priority, token)
+        timing["started"] = time.perf_counter()
+        try:
+            future = _call_pool.submit(
+                contextvars.copy_context().run,
+                self.inner._generate,
+                messages,
+                stop=stop,
+                run_manager=run_manager,
+                **kwargs,
+            )
+        except BaseException:
+            limiter.release()
+            raise
+        # The slot is held until the provider call really finishes, even if
+        # the job stops waiting on it earlier
+        future.add_done_callback(lambda _: limiter.release())
+
+        # The Gemini client cannot abort a request mid-flight; on cancel the
+        # job is released immediately and the response is discarded
+        finished = threading.Event()
+        future.add_done_callback(lambda _: finished.set())
+        unregister = token.on_cancel(finished.set)
+        finished.wait()
+        unregister()
+
+        if future.done():
+            return future.result()
+        token.raise_if_cancelled()
+
+
+def _record_timing(
+    context: RequestContext, timing: Dict[str, float], finished: float, **attributes
+):
+    """Add the call to the run's timing, its wait for a slot as overhead"""
+    started = timing.get("started", finished)
+    if context.sub_agent:
+        attributes["sub_agent"] = context.sub_agent
+    record_span(
+        "llm",
+        context.sub_agent or context.agent or "llm",
+        timing["requested"],
+        finished,
+        overhead={"llm_queue": started - timing["requested"]},
+        **attributes,
+    )
+
+
+def _token_usage(
+    messages: List[BaseMessage], result: ChatResult
+) -> Tuple[int, int, bool]:
+    """
+    Input/output tokens reported by the provider, falling back to a
+    4-characters-per-token estimate when the response carries no usage;
+    the flag tells which it was
+    """
+    input_tokens = output_tokens = 0
+    reported = False
+    for generation in result.generations:
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+        if usage:
+            input_tokens += usage.get("input_tokens", 0)
+            output_tokens += usage.get("output_tokens", 0)
+            reported = True
+    if reported:
+        return input_tokens, output_tokens, True
+
+    prompt_chars = sum(len(str(message.content)) for message in messages)
+    output_chars = sum(len(generation.text) for generation in result.generations)
+    return prompt_chars // 4, output_chars // 4, False
@@ -0,0 +1,318 @@
+"""
+Process metrics in the Prometheus text exposition format
+
+Counters and histograms are written to per-thread shards: recording a
+value touches only the calling thread's dictionary, with no lock, and a
+scrape sums the shards. Values that already live elsewhere (queue depth,
+session counts, cache statistics) are read at scrape time by collectors
+instead of being mirrored on every change.
+
+    from core.metrics import LLM_CALLS, render_metrics
+    LLM_CALLS.inc("gemini-1.5-flash", "ok")
+    render_metrics()  # the /metrics body
+"""
+
+import math
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# One metric family ready to render: name, type, help and its samples as
+# (sample name, labels, value); histograms add _bucket/_sum/_count samples
+Family = Tuple[str, str, str, List[Tuple[str, Dict[str, str], float]]]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STEP_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+
+class _ThreadShards:
+    """
+    Per-thread dictionaries; each is written by its own thread only
+
+    Once a thread has exited, its dictionary is folded into a base shard
+    with ``merge`` and dropped. This happens at the next scrape, or when
+    another thread adds its shard, so thread churn does not leave a shard
+    behind per thread.
+    """
+
+    def __init__(self, merge: Callable[[dict, dict], None]):
+        self._merge = merge
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._base: dict = {}
+        self._shards: List[Tuple["weakref.ref[threading.Thread]", dict]] = []
+
+    def mine(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values: dict = {}
+            owner = weakref.ref(threading.current_thread())
+            with self._lock:
+                self._sweep_locked()
+                self._shards.append((owner, values))
+            self._local.values = values
+            return values
+
+    def copies(self) -> List[dict]:
+        with self._lock:
+            self._sweep_locked()
+            shards = [self._base] + [values for _, values in self._shards]
+            # dict.copy does not release the GIL, so it never sees a half-done
+            # insert; a histogram's buckets and sum may be one observation apart
+            return [shard.copy() for shard in shards]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._shards)
+
+    def _sweep_locked(self):
+        live = []
+        for owner, values in self._shards:
+            thread = owner()
+            if thread is not None and thread.is_alive():
+                live.append((owner, values))
+            else:
+                self._merge(self._base, values)
+        self._shards = live
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._shards = _ThreadShards(_add_counts)
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        values = self._shards.mine()
+        values[label_values] = values.get(label_values, 0.0) + amount
+
+    def collect(self) -> Iterable[Family]:
+        totals: Dict[tuple, float] = {}
+        for shard in self._shards.copies():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        yield family(
+            self.name,
+            "counter",
+            self.help,
+            [(dict(zip(self.labels, key)), value) for key, value in totals.items()],
+        )
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = STEP_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _ThreadShards(_add_bucket_counts)
+
+    def observe(self, value: float, *label_values: str):
+        values = self._shards.mine()
+        # Per bucket counts (the last one is +Inf), then the sum
+        counts = values.get(label_values)
+        if counts is None:
+            counts = values[label_values] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def collect(self) -> Iterable[Family]:
+        totals: Dict[tuple, List[float]] = {}
+        for shard in self._shards.copies():
+            for key, counts in shard.items():
+                merged = totals.setdefault(key, [0.0] * len(counts))
+                for index, count in enumerate(list(counts)):
+                    merged[index] += count
+
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        samples = []
+        for key, counts in totals.items():
+            labels = dict(zip(self.labels, key))
+            cumulative = 0.0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                samples.append(
+                    (f"{self.name}_bucket", {**labels, "le": bound}, cumulative)
+                )
+            samples.append((f"{self.name}_sum", labels, counts[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        yield (self.name, "histogram", self.help, samples)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]):
+        """Add a callable that reads scrape-time values, as metric families"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            sources = [metric.collect for metric in self._metrics] + list(
+                self._collectors
+            )
+        lines = []
+        for source in sources:
+            for name, kind, help, samples in source():
+                lines.append(f"# HELP {name} {_escape_help(help)}")
+                lines.append(f"# TYPE {name} {kind}")
+                for sample_name, labels, value in samples:
+                    lines.append(
+                        f"{sample_name}{_format_labels(labels)} {_format_value(value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def family(
+    name: str,
+    kind: str,
+    help: str,
+    samples: Iterable[Tuple[Dict[str, str], float]],
+) -> Family:
+    """A family of plain (labels, value) samples, as collectors return them"""
+    return (name, kind, help, [(name, labels, value) for labels, value in samples])
+
+
+def _add_counts(base: dict, shard: dict):
+    for key, value in shard.items():
+        base[key] = base.get(key, 0.0) + value
+
+
+def _add_bucket_counts(base: dict, shard: dict):
+    # New lists, so a scrape reading the base's old ones is not disturbed
+    for key, counts in shard.items():
+        merged = base.get(key, [0.0] * len(counts))
+        base[key] = [total + count for total, count in zip(merged, counts)]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if not math.isfinite(value):
+        return "NaN" if math.isnan(value) else ("+Inf" if value > 0 else "-Inf")
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = MetricsRegistry()
+
+
+def render_metrics() -> str:
+    return registry.render()
+
+
+# ---- metrics recorded on the hot path ----
+
+HTTP_REQUESTS = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by route template, method and status code",
+        ("route", "method", "status"),
+    )
+)
+HTTP_REQUEST_SECONDS = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time to answer an HTTP request, by route template and method",
+        ("route", "method"),
+        REQUEST_BUCKETS,
+    )
+)
+JOB_QUEUE_WAIT_SECONDS = registry.register(
+    Histogram(
+        "job_queue_wait_seconds",
+        "Time a background job waited in the scheduler queue before starting",
+        ("vertical",),
+    )
+)
+AGENT_SECONDS = registry.register(
+    Histogram(
+        "agent_duration_seconds", "Duration of one agent's run", ("agent",)
+    )
+)
+AGENT_FAILURES = registry.register(
+    Counter("agent_failures_total", "Agent runs that failed", ("agent",))
+)
+SUB_AGENT_SECONDS = registry.register(
+    Histogram(
+        "sub_agent_duration_seconds", "Duration of one sub-agent step", ("sub_agent",)
+    )
+)
+SUB_AGENT_FAILURES = registry.register(
+    Counter(
+        "sub_agent_failures_total", "Sub-agent steps that raised", ("sub_agent",)
+    )
+)
+LLM_CALLS = registry.register(
+    Counter(
+        "llm_calls_total",
+        "LLM calls by model and outcome (ok, error, cached)",
+        ("model", "outcome"),
+    )
+)
+LLM_CALL_SECONDS = registry.register(
+    Histogram(
+        "llm_call_duration_seconds",
+        "Provider latency of an LLM call, without the limiter wait",
+        ("model",),
+    )
+)
+LLM_QUEUE_SECONDS = registry.register(
+    Histogram(
+        "llm_queue_wait_seconds",
+        "Time an LLM call waited for a limiter slot",
+        ("model",),
+        REQUEST_BUCKETS,
+    )
+)
+LLM_TOKENS = registry.register(
+    Counter(
+        "llm_tokens_total",
+        "LLM tokens by model and kind (prompt, completion)",
+        ("model", "kind"),
+    )
+)
+EVENT_LOOP_LAG_SECONDS = registry.register(
+    Histogram(
+        "event_loop_lag_seconds",
+        "How late the server's event loop woke a periodic timer",
+        buckets=LAG_BUCKETS,
+    )
+)
@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from core.fair_queue import Priority
+
+if TYPE_CHECKING:
+    from core.cancellation import CancellationToken
+    from core.dry_run import DryRunLog
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """
+    Per-request information that low-level components (LLM limiter,
+    tracing, accounting) need but that is not threaded through the
+    agent call signatures
+    """
+
+    session_id: Optional[str] = None
+    vertical: Optional[str] = None
+    priority: Priority = Priority.INTERACTIVE_ANALYSIS
+    tenant_id: Optional[str] = None
+    cancel_token: Optional["CancellationToken"] = None
+    # Innermost agent / sub-agent running, for per-agent LLM accounting
+    agent: Optional[str] = None
+    sub_agent: Optional[str] = None
+    # Set while a session is dry-run: LLM calls are collected here, not made
+    dry_run: Optional["DryRunLog"] = None
+
+
+_current: ContextVar[RequestContext] = ContextVar(
+    "request_context", default=RequestContext()
+)
+
+
+def current_context() -> RequestContext:
+    return _current.get()
+
+
+@contextmanager
+def bind_context(**fields) -> Iterator[RequestContext]:
+    """Overlay ``fields`` on the current context for the duration of the block"""
+    context = replace(_current.get(), **fields)
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
@@ -0,0 +1,305 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core.cancellation import OperationCancelled
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+
+
+class UnknownTenant(Exception):
+    """Raised when a request carries no API key, or one that matches no tenant"""
+
+
+class TenantRateLimited(Exception):
+    """Raised when a tenant exceeds its submission rate or token budget"""
+
+    def __init__(self, tenant_id: str, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.tenant_id = tenant_id
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class LLMBudgetExceeded(OperationCancelled):
+    """
+    Raised before an LLM call once the tenant's token budget is spent
+
+    Aborts the job like a cancellation, so agents cannot keep calling the
+    model through their ``except Exception`` fallbacks.
+    """
+
+    def __init__(self, tenant_id: str, retry_after: int):
+        super().__init__(f"LLM token budget exhausted for tenant {tenant_id}")
+        self.tenant_id = tenant_id
+        self.retry_after = retry_after
+
+
+@dataclass
+class TenantConfig:
+    """Limits for one partner deployment; None means unlimited"""
+
+    tenant_id: str
+    name: str = ""
+    api_keys: List[str] = field(default_factory=list)
+    api_key_hashes: List[str] = field(default_factory=list)  # sha256 hex digests
+    submissions_per_minute: Optional[float] = None
+    burst: Optional[int] = None
+    max_running: Optional[int] = None
+    max_queued: Optional[int] = None
+    llm_token_budget: Optional[int] = None
+    budget_window_seconds: float = 24 * 3600
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TenantConfig":
+        known = {name for name in cls.__dataclass_fields__}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(
+                f"Unknown tenant settings for {data.get('tenant_id')}: {sorted(unknown)}"
+            )
+        return cls(**data)
+
+    def key_digests(self) -> List[str]:
+        return [hash_api_key(key) for key in self.api_keys] + [
+            digest.lower() for digest in self.api_key_hashes
+        ]
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.strip().encode("utf-8")).hexdigest()
+
+
+class TokenBucket:
+    """Classic token bucket; refills continuously at ``rate`` tokens/second"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def try_take(self, now: Optional[float] = None) -> float:
+        """
+        Take one token if available
+
+        Returns:
+            0.0 on success, otherwise seconds until a token will be available
+        """
+        now = time.monotonic() if now is None else now
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    @property
+    def available(self) -> float:
+        return self._tokens
+
+
+@dataclass
+class TenantUsage:
+    """LLM token usage within the tenant's current budget window"""
+
+    window_started_at: float = field(default_factory=time.time)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    llm_calls: int = 0
+    submissions: int = 0
+    rejected_submissions: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+class TenantRegistry:
+    """
+    Resolves API keys to tenants and enforces per-tenant submission rates
+    and LLM token budgets
+
+    Tenants come from the JSON in TENANTS_FILE (path) or TENANTS_JSON
+    (inline), shaped as ``{"tenants": [{"tenant_id": ..., "api_keys": [...],
+    "submissions_per_minute": ..., ...}]}``. Without either, every request
+    belongs to a single unlimited ``default`` tenant and no key is needed.
+
+    Usage is kept in memory and resets with the process.
+    """
+
+    def __init__(self, tenants: Optional[List[TenantConfig]] = None):
+        self._lock = threading.Lock()
+        self.require_api_key = bool(tenants)
+        self._tenants: Dict[str, TenantConfig] = {}
+        self._by_key_digest: Dict[str, str] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._usage: Dict[str, TenantUsage] = {}
+
+        for tenant in tenants or [TenantConfig(tenant_id=DEFAULT_TENANT)]:
+            self.add(tenant)
+
+    @classmethod
+    def from_env(cls) -> "TenantRegistry":
+        raw = os.getenv("TENANTS_JSON")
+        path = os.getenv("TENANTS_FILE")
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = f.read()
+        if not raw:
+            return cls()
+
+        data = json.loads(raw)
+        tenants = [TenantConfig.from_dict(entry) for entry in data.get("tenants", [])]
+        logger.info(f"Loaded {len(tenants)} tenants")
+        return cls(tenants)
+
+    def add(self, tenant: TenantConfig):
+        with self._lock:
+            self._tenants[tenant.tenant_id] = tenant
+            for digest in tenant.key_digests():
+                self._by_key_digest[digest] = tenant.tenant_id
+            if tenant.submissions_per_minute:
+                rate = tenant.submissions_per_minute / 60
+                capacity = tenant.burst or max(1, math.ceil(tenant.submissions_per_minute))
+                self._buckets[tenant.tenant_id] = TokenBucket(rate, capacity)
+            self._usage.setdefault(tenant.tenant_id, TenantUsage())
+
+    def get(self, tenant_id: str) -> Optional[TenantConfig]:
+        return self._tenants.get(tenant_id)
+
+    def resolve(self, api_key: Optional[str]) -> TenantConfig:
+        """
+        Raises:
+            UnknownTenant: tenants are configured and the key is missing or unknown
+        """
+        if not self.require_api_key:
+            return self._tenants[DEFAULT_TENANT]
+        if not api_key:
+            raise UnknownTenant("Missing API key")
+        tenant_id = self._by_key_digest.get(hash_api_key(api_key))
+        if tenant_id is None:
+            raise UnknownTenant("Invalid API key")
+        return self._tenants[tenant_id]
+
+    def admit_submission(self, tenant_id: str):
+        """
+        Charge one submission against the tenant's rate limit
+
+        Raises:
+            TenantRateLimited: the bucket is empty or the token budget is spent
+        """
+        with self._lock:
+            usage = self._usage_locked(tenant_id)
+            retry_after = self._budget_retry_after_locked(tenant_id)
+            if retry_after:
+                usage.rejected_submissions += 1
+                raise TenantRateLimited(
+                    tenant_id,
+                    retry_after,
+                    f"LLM token budget exhausted. Please retry in {retry_after} seconds.",
+                )
+
+            bucket = self._buckets.get(tenant_id)
+            wait = bucket.try_take() if bucket else 0.0
+            if wait:
+                usage.rejected_submissions += 1
+                retry_after = max(1, math.ceil(wait))
+                raise TenantRateLimited(
+                    tenant_id,
+                    retry_after,
+                    f"Submission rate limit exceeded. Please retry in {retry_after} seconds.",
+                )
+            usage.submissions += 1
+
+    def check_budget(self, tenant_id: Optional[str]):
+        """
+        Raises:
+            LLMBudgetExceeded: the tenant has used up its token budget
+        """
+        with self._lock:
+            retry_after = self._budget_retry_after_locked(tenant_id or DEFAULT_TENANT)
+        if retry_after:
+            raise LLMBudgetExceeded(tenant_id, retry_after)
+
+    def record_llm_usage(
+        self, tenant_id: Optional[str], input_tokens: int, output_tokens: int
+    ):
+        with self._lock:
+            usage = self._usage_locked(tenant_id or DEFAULT_TENANT)
+            usage.input_tokens += input_tokens
+            usage.output_tokens += output_tokens
+            usage.llm_calls += 1
+
+    def usage(self, tenant_id: str) -> Dict[str, Any]:
+        """Usage report for the tenant's current budget window"""
+        with self._lock:
+            tenant = self._tenants.get(tenant_id) or TenantConfig(tenant_id=tenant_id)
+            usage = self._usage_locked(tenant_id)
+            bucket = self._buckets.get(tenant_id)
+            budget = tenant.llm_token_budget
+            return {
+                "tenant_id": tenant_id,
+                "name": tenant.name,
+                "window_started_at": usage.window_started_at,
+                "window_resets_in_seconds": round(
+                    usage.window_started_at
+                    + tenant.budget_window_seconds
+                    - time.time()
+                ),
+                "llm_calls": usage.llm_calls,
+                "input_tokens": usage.input_tokens,
+                "output_tokens": usage.output_tokens,
+                "total_tokens": usage.total_tokens,
+                "llm_token_budget": budget,
+                "llm_tokens_remaining": (
+                    max(0, budget - usage.total_tokens) if budget is not None else None
+                ),
+                "submissions": usage.submissions,
+                "rejected_submissions": usage.rejected_submissions,
+                "submissions_per_minute": tenant.submissions_per_minute,
+                "submission_tokens_available": (
+                    int(bucket.available) if bucket else None
+                ),
+            }
+
+    # ------------------------------------------------------------------ internals
+
+    def _usage_locked(self, tenant_id: str) -> TenantUsage:
+        """Current window's usage, starting a fresh window once the old one ends"""
+        tenant = self._tenants.get(tenant_id)
+        window = tenant.budget_window_seconds if tenant else 24 * 3600
+        usage = self._usage.get(tenant_id)
+        now = time.time()
+        if usage is None or now - usage.window_started_at >= window:
+            usage = self._usage[tenant_id] = TenantUsage(window_started_at=now)
+        return usage
+
+    def _budget_retry_after_locked(self, tenant_id: str) -> int:
+        """0 while within budget, otherwise seconds until the window resets"""
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None or tenant.llm_token_budget is None:
+            return 0
+        usage = self._usage_locked(tenant_id)
+        if usage.total_tokens < tenant.llm_token_budget:
+            return 0
+        return max(
+            1,
+            math.ceil(
+                usage.window_started_at + tenant.budget_window_seconds - time.time()
+            ),
+        )
+
+
+# Process-wide registry shared by the API and every managed LLM instance
+tenant_registry = TenantRegistry.from_env()
@@ -0,0 +1,276 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config.agent_config import critical_chain
+from core.metrics import SUB_AGENT_FAILURES, SUB_AGENT_SECONDS
+
+# Spans that only group others; their self time is agent code nobody timed
+STRUCTURAL_KINDS = ("run", "fleet", "agent", "sub_agent")
+
+
+@dataclass
+class TimingSpan:
+    """
+    One timed step of a run (fleet, agent, sub-agent, LLM call, parse, ...)
+
+    ``overhead`` holds time spent inside the span on work that gets no span
+    of its own, such as waiting for an LLM slot or recording trace events.
+    """
+
+    kind: str
+    name: str
+    start: float
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    children: List["TimingSpan"] = field(default_factory=list)
+    overhead: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def seconds(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def self_seconds(self) -> float:
+        return max(
+            self.seconds
+            - sum(child.seconds for child in self.children)
+            - sum(self.overhead.values()),
+            0.0,
+        )
+
+    def child(self, kind: str, name: str, **attributes) -> "TimingSpan":
+        span = TimingSpan(
+            kind=kind, name=name, start=time.perf_counter(), attributes=attributes
+        )
+        self.children.append(span)
+        return span
+
+
+_current: ContextVar[Optional[TimingSpan]] = ContextVar("timing_span", default=None)
+
+
+@contextmanager
+def timed(
+    kind: str, name: Optional[str] = None, **attributes
+) -> Iterator[Optional[TimingSpan]]:
+    """
+    Time the block as a child of the current span
+
+    Outside a ``RunTimer.measure`` block nothing is recorded and ``None``
+    is yielded, so instrumented code costs a context-variable lookup.
+    Sub-agent steps are also exported as metrics, measured or not.
+    """
+    parent = _current.get()
+    if kind == "sub_agent":
+        with _metered_sub_agent(name or kind):
+            with _span(parent, kind, name, attributes) as span:
+                yield span
+        return
+    with _span(parent, kind, name, attributes) as span:
+        yield span
+
+
+@contextmanager
+def _span(
+    parent: Optional[TimingSpan],
+    kind: str,
+    name: Optional[str],
+    attributes: Dict[str, Any],
+) -> Iterator[Optional[TimingSpan]]:
+    if parent is None:
+        yield None
+        return
+    span = parent.child(kind, name or kind, **attributes)
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+        span.end = time.perf_counter()
+
+
+@contextmanager
+def _metered_sub_agent(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        SUB_AGENT_FAILURES.inc(name)
+        raise
+    finally:
+        SUB_AGENT_SECONDS.observe(time.perf_counter() - started, name)
+
+
+def timed_step(kind: str, name: Optional[str] = None) -> Callable:
+    """
+    Time a method as a ``kind`` span called ``name`` (by default ``kind``)
+
+    Sub-agents pass the name they bind for LLM accounting, so timing, the
+    sub-agent metrics and the accounting records share one label.
+    """
+
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with timed(kind, name):
+                return method(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def record_span(
+    kind: str,
+    name: str,
+    start: float,
+    end: float,
+    overhead: Optional[Dict[str, float]] = None,
+    **attributes,
+) -> Optional[TimingSpan]:
+    """Add an already finished step, timed by the caller with perf_counter"""
+    parent = _current.get()
+    if parent is None:
+        return None
+    span = TimingSpan(
+        kind=kind,
+        name=name,
+        start=start,
+        end=end,
+        attributes=attributes,
+        overhead=overhead or {},
+    )
+    parent.children.append(span)
+    return span
+
+
+def add_overhead(kind: str, seconds: float):
+    """Charge ``seconds`` of ``kind`` overhead to the current span"""
+    span = _current.get()
+    if span is not None:
+        span.overhead[kind] = span.overhead.get(kind, 0.0) + seconds
+
+
+class RunTimer:
+    """
+    Hierarchical timing of one run: run → fleet → agent → sub-agent →
+    prompt / LLM call / parse
+
+    Fleets, agents and the steps inside them open spans with ``timed``;
+    they are recorded only while the run is inside ``measure``. The
+    breakdown totals time per kind of step, walks the critical path
+    through the agents' declared dependencies, and lists the slowest
+    steps with their path, so a slow run can be pinned on, say, one
+    sub-agent's LLM latency rather than on its response parsing.
+    """
+
+    def __init__(self, name: str = "run"):
+        self.root = TimingSpan(kind="run", name=name, start=time.perf_counter())
+
+    @contextmanager
+    def measure(self) -> Iterator["RunTimer"]:
+        self.root.start = time.perf_counter()
+        token = _current.set(self.root)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+            self.root.end = time.perf_counter()
+
+    def breakdown(self, slowest: int = 5) -> Dict[str, Any]:
+        by_kind: Dict[str, float] = {}
+        agents: Dict[str, Dict[str, Any]] = {}
+        steps: List[Dict[str, Any]] = []
+
+        def walk(span: TimingSpan, path: List[str], totals: List[Dict[str, float]]):
+            if span.kind in STRUCTURAL_KINDS:
+                path = path + [span.name]
+            if span.kind == "agent":
+                agent_kinds: Dict[str, float] = {}
+                agents[span.name] = {
+                    "seconds": round(span.seconds, 6),
+                    "depends_on": span.attributes.get("depends_on", []),
+                    "by_kind": agent_kinds,
+                }
+                totals = totals + [agent_kinds]
+
+            kind = "other" if span.kind in STRUCTURAL_KINDS else span.kind
+            charges = [(kind, span.self_seconds), *span.overhead.items()]
+            for charged_kind, seconds in charges:
+                for total in totals:
+                    total[charged_kind] = total.get(charged_kind, 0.0) + seconds
+            if not span.children:
+                # Leaves other than agents are named by their kind
+                leaf = [] if span.kind in STRUCTURAL_KINDS else [span.kind]
+                steps.append(
+                    {
+                        "path": "/".join(path[1:] + leaf),
+                        "seconds": round(span.seconds, 6),
+                        **span.attributes,
+                    }
+                )
+            for child in span.children:
+                walk(child, path, totals)
+
+        walk(self.root, [], [by_kind])
+        seconds, chain = critical_chain(
+            {agent_id: agent["seconds"] for agent_id, agent in agents.items()},
+            {agent_id: agent["depends_on"] for agent_id, agent in agents.items()},
+        )
+        steps.sort(key=lambda step: step["seconds"], reverse=True)
+        for agent in agents.values():
+            agent["by_kind"] = _rounded(agent["by_kind"])
+        return {
+            "total_seconds": round(self.root.seconds, 6),
+            "by_kind": _rounded(by_kind),
+            "agents": agents,
+            "critical_path": {"seconds": round(seconds, 6), "agents": chain},
+            "slowest": steps[:slowest],
+            "spans": _span_tree(self.root, self.root.start),
+        }
+
+
+def _rounded(seconds_by_kind: Dict[str, float]) -> Dict[str, float]:
+    """Largest first, to the microsecond"""
+    return {
+        kind: round(seconds, 6)
+        for kind, seconds in sorted(seconds_by_kind.items(), key=lambda item: -item[1])
+    }
+
+
+def _span_tree(span: TimingSpan, origin: float) -> Dict[str, Any]:
+    node = {
+        "kind": span.kind,
+        "name": span.name,
+        "offset": round(span.start - origin, 6),
+        "seconds": round(span.seconds, 6),
+    }
+    if span.attributes:
+        node["attributes"] = span.attributes
+    if span.overhead:
+        node["overhead"] = {
+            kind: round(seconds, 6) for kind, seconds in span.overhead.items()
+        }
+    if span.children:
+        node["children"] = [_span_tree(child, origin) for child in span.children]
+    return node
+
+
+def format_breakdown(breakdown: Dict[str, Any]) -> str:
+    """One log line: time per kind, the critical path and the slowest step"""
+    kinds = ", ".join(
+        f"{kind} {seconds:.3f}s" for kind, seconds in breakdown["by_kind"].items()
+    )
+    critical = breakdown["critical_path"]
+    line = (
+        f"{breakdown['total_seconds']:.3f}s total ({kinds}); critical path "
+        f"{critical['seconds']:.3f}s via {' -> '.join(critical['agents']) or '-'}"
+    )
+    if breakdown["slowest"]:
+        step = breakdown["slowest"][0]
+        line += f"; slowest {step['path']} {step['seconds']:.3f}s"
+    return line
@@ -0,0 +1,422 @@
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.request_context import current_context
+from core.timing import add_overhead
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """
+    One traced operation (fleet run, agent run, ...)
+
+    Spans of an unsampled trace are still handed out, so callers never
+    branch on sampling, but they emit no events.
+    """
+
+    name: str
+    trace_id: str
+    sampled: bool
+    parent_id: Optional[str] = None
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    start_time: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    dotted_order: str = ""
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set_outputs(self, **outputs):
+        self.outputs.update(outputs)
+
+
+class TraceExporter(ABC):
+    """Ships a batch of span events somewhere; runs on the tracer's thread"""
+
+    name = "none"
+
+    @abstractmethod
+    def export(self, events: List[Dict[str, Any]]):
+        """Send one batch of span events"""
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonlTraceExporter(TraceExporter):
+    """Appends span events to a local JSONL file, for fully offline tracing"""
+
+    name = "jsonl"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def export(self, events: List[Dict[str, Any]]):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(
+            "".join(json.dumps(event, default=str) + "\n" for event in events)
+        )
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class LangSmithTraceExporter(TraceExporter):
+    """
+    Sends span events to LangSmith with one ``batch_ingest_runs`` call per
+    batch
+
+    A span that starts and ends within one batch is posted as a single
+    finished run. The client is created on the first export, on the
+    tracer's thread, so nothing connects to LangSmith at startup.
+    """
+
+    name = "langsmith"
+
+    def __init__(self, project_name: Optional[str] = None):
+        self.project_name = project_name or os.getenv(
+            "LANGCHAIN_PROJECT", "career-counselor-system"
+        )
+        self._client = None
+
+    def export(self, events: List[Dict[str, Any]]):
+        if self._client is None:
+            from langsmith import Client
+
+            # Our thread already batches, so the client should send directly
+            self._client = Client(auto_batch_tracing=False)
+
+        creates: Dict[str, Dict[str, Any]] = {}
+        updates: List[Dict[str, Any]] = []
+        for event in events:
+            run = {
+                "id": event["id"],
+                "trace_id": event["trace_id"],
+                "dotted_order": event["dotted_order"],
+                "parent_run_id": event["parent_id"],
+            }
+            if event["event"] == "start":
+                creates[event["id"]] = {
+                    **run,
+                    "name": event["name"],
+                    "run_type": event["run_type"],
+                    "inputs": event["inputs"],
+                    "start_time": event["time"],
+                    "session_name": self.project_name,
+                    "extra": {"metadata": event["metadata"]},
+                    "tags": event["tags"],
+                }
+                continue
+            finished = {
+                "outputs": event["outputs"],
+                "error": event["error"],
+                "end_time": event["time"],
+            }
+            if event["id"] in creates:
+                creates[event["id"]].update(finished)
+            else:
+                updates.append({**run, **finished})
+        self._client.batch_ingest_runs(create=list(creates.values()), update=updates)
+
+
+class Tracer:
+    """
+    Process-wide span recorder with a non-blocking, batching export path
+
+    Starting or ending a span only puts an event on a bounded in-memory
+    queue; a background thread drains it in batches of ``batch_size`` (or
+    every ``flush_interval`` seconds) and hands them to the exporter. When
+    the queue is full, events are dropped and counted rather than making
+    the agent wait, and a failing exporter only costs the batch it failed
+    on. Sampling is decided once per trace, at its root span, so a trace
+    is either recorded whole or not at all.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[TraceExporter] = None,
+        sample_rate: float = 1.0,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._current: ContextVar[Optional[Span]] = ContextVar(
+            "current_span", default=None
+        )
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._failing = False
+        self._counter_lock = threading.Lock()
+        self.counters = {"emitted": 0, "exported": 0, "dropped": 0, "failed": 0}
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """
+        TRACING_EXPORTER is langsmith, jsonl or none; it defaults to
+        langsmith when LANGCHAIN_API_KEY is set, else none
+        """
+        kind = os.getenv("TRACING_EXPORTER") or (
+            "langsmith" if os.getenv("LANGCHAIN_API_KEY") else "none"
+        )
+        if kind == "langsmith":
+            exporter = LangSmithTraceExporter()
+        elif kind == "jsonl":
+            exporter = JsonlTraceExporter(
+                os.getenv("TRACING_JSONL_PATH", "traces.jsonl")
+            )
+        elif kind == "none":
+            exporter = None
+        else:
+            raise ValueError(f"Unknown TRACING_EXPORTER {kind!r}")
+        return cls(
+            exporter=exporter,
+            sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+            max_queue=int(os.getenv("TRACE_QUEUE_SIZE", "10000")),
+            batch_size=int(os.getenv("TRACE_BATCH_SIZE", "100")),
+            flush_interval=float(os.getenv("TRACE_FLUSH_INTERVAL_SECONDS", "1.0")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @property
+    def exporter_name(self) -> str:
+        return self.exporter.name if self.exporter else "none"
+
+    # ---- recording ----
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        run_type: str = "chain",
+        inputs: Optional[Dict[str, Any]] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Iterator[Span]:
+        """
+        Record the block as a child of the current span (or a new trace)
+
+        Outputs set on the yielded span are sent when it ends; an exception
+        escaping the block is recorded as the span's error and re-raised.
+        The time spent recording is charged to the run's timing as tracing.
+        """
+        began = time.perf_counter()
+        span = self.start(name, run_type, inputs, tags)
+        add_overhead("tracing", time.perf_counter() - began)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = span.error or f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._current.reset(token)
+            began = time.perf_counter()
+            self.end(span)
+            add_overhead("tracing", time.perf_counter() - began)
+
+    def start(
+        self,
+        name: str,
+        run_type: str = "chain",
+        inputs: Optional[Dict[str, Any]] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Span:
+        parent = self._current.get()
+        if parent is None:
+            sampled = (
+                self.enabled
+                and current_context().dry_run is None
+                and random.random() < self.sample_rate
+            )
+            span = Span(name=name, trace_id="", sampled=sampled)
+            span.trace_id = span.id
+        else:
+            span = Span(
+                name=name,
+                trace_id=parent.trace_id,
+                sampled=parent.sampled,
+                parent_id=parent.id,
+            )
+        # LangSmith's ordering key: the ancestors' keys, then this span's own
+        own_order = f"{span.start_time:%Y%m%dT%H%M%S%fZ}{span.id}"
+        span.dotted_order = (
+            f"{parent.dotted_order}.{own_order}" if parent else own_order
+        )
+
+        if span.sampled:
+            context = current_context()
+            self._emit(
+                {
+                    "event": "start",
+                    "id": span.id,
+                    "trace_id": span.trace_id,
+                    "parent_id": span.parent_id,
+                    "dotted_order": span.dotted_order,
+                    "name": name,
+                    "run_type": run_type,
+                    "inputs": inputs or {},
+                    "tags": tags or [],
+                    "metadata": {
+                        "session_id": context.session_id,
+                        "vertical": context.vertical,
+                        "tenant_id": context.tenant_id,
+                    },
+                    "time": span.start_time.isoformat(),
+                }
+            )
+        return span
+
+    def end(self, span: Span):
+        if not span.sampled:
+            return
+        self._emit(
+            {
+                "event": "end",
+                "id": span.id,
+                "trace_id": span.trace_id,
+                "parent_id": span.parent_id,
+                "dotted_order": span.dotted_order,
+                "outputs": span.outputs,
+                "error": span.error,
+                "time": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
+    def _emit(self, event: Dict[str, Any]):
+        if self._thread is None:
+            self._start_worker()
+        try:
+            self._queue.put_nowait(event)
+            outcome = "emitted"
+        except queue.Full:
+            outcome = "dropped"
+        with self._counter_lock:
+            self.counters[outcome] += 1
+
+    # ---- export ----
+
+    def _start_worker(self):
+        with self._lock:
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-export", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, dict):
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+            self._export(batch)
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            if isinstance(item, threading.Event):  # flush marker
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _export(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            with self._counter_lock:
+                self.counters["failed"] += len(batch)
+            # One line per failing stretch, not one per batch
+            if not self._failing:
+                self._failing = True
+                logger.warning(f"Trace export to {self.exporter.name} failed: {e}")
+            return
+        with self._counter_lock:
+            self.counters["exported"] += len(batch)
+        if self._failing:
+            self._failing = False
+            logger.info(f"Trace export to {self.exporter.name} recovered")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Export everything queued so far; False if that took too long"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Flush, stop the export thread and close the exporter"""
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        if thread is not None:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+                thread.join(timeout)
+            except queue.Full:
+                pass
+        if self.exporter is not None:
+            self.exporter.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "exporter": self.exporter_name,
+            "sample_rate": self.sample_rate,
+            "queued": self._queue.qsize(),
+            **self.counters,
+        }
+
+
+_STOP = object()
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer, configured from the environment on first use"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer.from_env()
+    return _tracer
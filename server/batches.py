@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from core.job_scheduler import AdmissionRejected
+
+logger = logging.getLogger(__name__)
+
+# Session statuses that mean an item will not change any more
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+@dataclass
+class BatchItem:
+    """
+    One student in a batch; items rejected at validation, or identical to
+    an earlier item, have no session
+    """
+
+    index: int
+    label: str  # e.g. the resume filename or roster row
+    session_id: Optional[str] = None
+    error: Optional[str] = None
+    duplicate_of: Optional[int] = None  # index of the item with identical input
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def describe(self) -> Dict[str, Any]:
+        entry = {"index": self.index, "label": self.label, **self.details}
+        if self.session_id:
+            entry["session_id"] = self.session_id
+        if self.error:
+            entry["error"] = self.error
+        if self.duplicate_of is not None:
+            entry["duplicate_of"] = self.duplicate_of
+        return entry
+
+
+class Batch:
+    """
+    A group of analyses submitted together, fed to the scheduler gradually
+
+    At most ``max_in_flight`` items are handed to the scheduler at once; the
+    next one is submitted as each finishes. Batch work runs at BATCH
+    priority and this window keeps it from filling the vertical's queue, so
+    interactive submissions are still admitted while a large batch drains.
+    When the scheduler rejects an item anyway, feeding pauses for the
+    suggested Retry-After.
+    """
+
+    def __init__(
+        self,
+        batch_id: str,
+        tenant_id: str,
+        vertical: str,
+        items: List[BatchItem],
+        max_in_flight: int = 8,
+    ):
+        self.batch_id = batch_id
+        self.tenant_id = tenant_id
+        self.vertical = vertical
+        self.items = items
+        self.max_in_flight = max(1, max_in_flight)
+        self.created_at = time.time()
+        self.cancelled = False
+        self._started = time.monotonic()
+        self._waiting: Deque[Tuple[BatchItem, Callable[[], Future]]] = deque()
+        self._in_flight = 0
+        self._retry_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def start(self, submissions: Iterable[Tuple[BatchItem, Callable[[], Future]]]):
+        """
+        Begin feeding items; each callable submits one item's job and
+        returns its future
+        """
+        with self._lock:
+            self._waiting.extend(submissions)
+        self._feed()
+
+    def cancel(self) -> List[BatchItem]:
+        """
+        Stop feeding the batch
+
+        Returns:
+            Items that were never submitted; in-flight items are left to the
+            caller to cancel through the scheduler
+        """
+        with self._lock:
+            self.cancelled = True
+            never_started = [item for item, _ in self._waiting]
+            self._waiting.clear()
+            if self._retry_timer is not None:
+                self._retry_timer.cancel()
+        return never_started
+
+    def progress(self, statuses: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Aggregate progress given each item session's current status
+
+        Throughput is measured over finished items since the batch started
+        and the ETA extrapolates it over the remaining ones.
+        """
+        counts: Counter = Counter()
+        for item in self.items:
+            if item.session_id is not None:
+                counts[statuses.get(item.session_id, "pending")] += 1
+            elif item.duplicate_of is not None:
+                counts["duplicate"] += 1
+            else:
+                counts["rejected"] += 1
+
+        submitted = len(self.items) - counts["rejected"] - counts["duplicate"]
+        finished = sum(counts[status] for status in FINISHED_STATUSES)
+        elapsed = time.monotonic() - self._started
+        per_minute = finished / elapsed * 60 if elapsed > 0 else 0.0
+        remaining = submitted - finished
+        if remaining == 0:
+            eta = 0.0
+        elif per_minute > 0:
+            eta = remaining / per_minute * 60
+        else:
+            eta = None
+
+        return {
+            "total": len(self.items),
+            "submitted": submitted,
+            "finished": finished,
+            "counts": dict(counts),
+            "percent_complete": (
+                round(100 * finished / submitted, 1) if submitted else 100.0
+            ),
+            "done": remaining == 0,
+            "elapsed_seconds": round(elapsed, 1),
+            "throughput_per_minute": round(per_minute, 2),
+            "eta_seconds": round(eta) if eta is not None else None,
+        }
+
+    # ------------------------------------------------------------------ internals
+
+    def _feed(self):
+        while True:
+            with self._lock:
+                if (
+                    self.cancelled
+                    or not self._waiting
+                    or self._in_flight >= self.max_in_flight
+                ):
+                    return
+                item, submit = self._waiting.popleft()
+                self._in_flight += 1
+
+            try:
+                future = submit()
+            except AdmissionRejected as e:
+                with self._lock:
+                    self._waiting.appendleft((item, submit))
+                    self._in_flight -= 1
+                    if self._retry_timer is None or not self._retry_timer.is_alive():
+                        self._retry_timer = threading.Timer(e.retry_after, self._feed)
+                        self._retry_timer.daemon = True
+                        self._retry_timer.start()
+                logger.info(
+                    f"Batch {self.batch_id} paused for {e.retry_after}s: {e.reason}"
+                )
+                return
+            except Exception as e:
+                logger.error(f"Batch {self.batch_id} failed to submit {item.label}: {e}")
+                with self._lock:
+                    self._in_flight -= 1
+                continue
+
+            future.add_done_callback(self._on_item_done)
+
+    def _on_item_done(self, _future: Future):
+        with self._lock:
+            self._in_flight -= 1
+        self._feed()
+
+
+class BatchRegistry:
+    """Batches by id, scoped to their tenant and kept for ``ttl_seconds``"""
+
+    def __init__(self, ttl_seconds: float = 24 * 3600, max_entries: int = 100):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._batches: "OrderedDict[str, Batch]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, batch: Batch):
+        with self._lock:
+            self._prune(time.time())
+            self._batches[batch.batch_id] = batch
+            while len(self._batches) > self.max_entries:
+                self._batches.popitem(last=False)
+
+    def get(self, tenant_id: str, batch_id: str) -> Optional[Batch]:
+        with self._lock:
+            self._prune(time.time())
+            batch = self._batches.get(batch_id)
+        if batch is None or batch.tenant_id != tenant_id:
+            return None
+        return batch
+
+    def _prune(self, now: float):
+        while self._batches:
+            batch_id, batch = next(iter(self._batches.items()))
+            if now - batch.created_at < self.ttl_seconds:
+                break
+            del self._batches[batch_id]
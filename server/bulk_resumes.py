@@ -0,0 +1,139 @@
+import csv
+import io
+import posixpath
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional
+
+from utils.resume_parser import PDF_CONTENT_TYPE
+
+# Archive members we accept, by extension
+ARCHIVE_CONTENT_TYPES = {
+    ".pdf": PDF_CONTENT_TYPE,
+    ".txt": "text/plain",
+    ".doc": "application/msword",
+}
+
+
+class BulkUploadError(Exception):
+    """The archive or student CSV as a whole cannot be used"""
+
+
+@dataclass
+class ArchiveResume:
+    """One resume file read from a bulk upload archive"""
+
+    name: str  # path inside the archive
+    content_type: str
+    content: bytes
+
+
+def read_resume_archive(
+    fileobj: BinaryIO, max_files: int, max_file_bytes: int, max_total_bytes: int
+) -> Dict[str, ArchiveResume]:
+    """
+    Read the resumes in a ZIP archive, member by member
+
+    ``fileobj`` is the upload's spooled file, so the archive itself is never
+    copied into memory: only the central directory and one member at a time
+    are read. Sizes are checked from the directory before decompressing and
+    again while reading, which also stops zip bombs. The resumes are kept
+    in memory until the batch is built, so their combined uncompressed size
+    is capped by ``max_total_bytes`` as well. Folders, hidden files and
+    unsupported extensions are skipped.
+
+    Raises:
+        BulkUploadError: not a ZIP, too many resumes, or an oversized member
+            or archive
+    """
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise BulkUploadError("Upload is not a valid ZIP archive")
+
+    resumes: Dict[str, ArchiveResume] = {}
+    total_bytes = 0
+    with archive:
+        for info in archive.infolist():
+            basename = posixpath.basename(info.filename)
+            content_type = ARCHIVE_CONTENT_TYPES.get(
+                posixpath.splitext(basename)[1].lower()
+            )
+            if (
+                info.is_dir()
+                or not basename
+                or basename.startswith(".")
+                or info.filename.startswith("__MACOSX/")
+                or content_type is None
+            ):
+                continue
+
+            if len(resumes) >= max_files:
+                raise BulkUploadError(
+                    f"Archive has more than {max_files} resumes; split it up"
+                )
+            if info.file_size > max_file_bytes:
+                raise BulkUploadError(
+                    f"{info.filename} is larger than the "
+                    f"{max_file_bytes // (1024 * 1024)} MB limit"
+                )
+            if total_bytes + info.file_size > max_total_bytes:
+                raise BulkUploadError(
+                    f"Archive unpacks to more than "
+                    f"{max_total_bytes // (1024 * 1024)} MB of resumes; split it up"
+                )
+            with archive.open(info) as member:
+                content = member.read(max_file_bytes + 1)
+            if len(content) > max_file_bytes:
+                raise BulkUploadError(f"{info.filename} is larger than declared")
+            total_bytes += len(content)
+            if total_bytes > max_total_bytes:
+                raise BulkUploadError("Archive is larger than declared")
+
+            resumes[info.filename] = ArchiveResume(
+                name=info.filename, content_type=content_type, content=content
+            )
+    return resumes
+
+
+def read_student_rows(fileobj: BinaryIO) -> List[Dict[str, str]]:
+    """
+    Read the per-student form fields CSV
+
+    Expects a header row; ``resume_file`` names each student's file in the
+    archive and the other columns match the /college-upskilling form fields.
+
+    Raises:
+        BulkUploadError: the CSV is unreadable or has no resume_file column
+    """
+    try:
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        if not reader.fieldnames or "resume_file" not in reader.fieldnames:
+            raise BulkUploadError("Student CSV needs a resume_file column")
+        rows = [
+            {key.strip(): (value or "").strip() for key, value in row.items() if key}
+            for row in reader
+        ]
+        text.detach()
+        return rows
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise BulkUploadError(f"Could not read student CSV: {e}")
+
+
+def match_resume(
+    resumes: Dict[str, ArchiveResume], reference: str
+) -> Optional[ArchiveResume]:
+    """
+    Find the archive member a CSV row refers to, by full path or, when it
+    is unambiguous, by file name alone
+    """
+    reference = reference.strip().lstrip("/")
+    if reference in resumes:
+        return resumes[reference]
+    matches = [
+        resume
+        for name, resume in resumes.items()
+        if posixpath.basename(name) == reference
+    ]
+    return matches[0] if len(matches) == 1 else None
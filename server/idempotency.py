@@ -0,0 +1,124 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+
+def submission_fingerprint(vertical: str, fields: Dict[str, Any]) -> str:
+    """
+    Hash a normalized submission so that retries map to the same key
+
+    None values and empty containers are dropped and keys are sorted, so
+    field order and "missing vs null" differences in the client payload do
+    not produce different fingerprints.
+    """
+    normalized = json.dumps(
+        {"vertical": vertical, "fields": _normalize(jsonable_encoder(fields))},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class IdempotencyConflict(Exception):
+    """Raised when a key is reused for a submission with a different payload"""
+
+
+class IdempotencyRegistry:
+    """
+    Maps submission keys to the session that is handling them
+
+    A key stays bound to its session for ``ttl_seconds``; callers decide
+    through ``is_live`` whether that session can still be reused (for
+    example a failed session should be retried, not returned again).
+    At most ``max_entries`` keys are kept; past that the least recently
+    used key is forgotten first.
+    """
+
+    def __init__(self, ttl_seconds: float = 24 * 3600, max_entries: int = 100_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (session id, claimed at, payload fingerprint), least recent first
+        self._entries: "OrderedDict[str, Tuple[str, float, Optional[str]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def claim(
+        self,
+        key: str,
+        session_id: str,
+        is_live: Callable[[str], bool],
+        fingerprint: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Bind ``key`` to ``session_id`` unless a live session already owns it
+
+        Returns:
+            The existing session id for a duplicate submission, else None
+
+        Raises:
+            IdempotencyConflict: a live session owns ``key`` and was claimed
+                with a different ``fingerprint``
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+
+            existing = self._entries.get(key)
+            if existing is not None and now - existing[1] >= self.ttl_seconds:
+                del self._entries[key]
+                existing = None
+            if existing is not None and is_live(existing[0]):
+                if fingerprint and existing[2] and fingerprint != existing[2]:
+                    raise IdempotencyConflict(
+                        "Idempotency key was already used for a different request"
+                    )
+                self._entries.move_to_end(key)
+                return existing[0]
+
+            self._entries[key] = (session_id, now, fingerprint)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return None
+
+    def release(self, key: str, session_id: str):
+        """Forget ``key`` if it is still bound to ``session_id``"""
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None and existing[0] == session_id:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _prune(self, now: float):
+        # Expired entries gather at the front; one reused since its claim can
+        # sit further back, so lookups check the TTL as well
+        while self._entries:
+            key, (_, claimed_at, _) = next(iter(self._entries.items()))
+            if now - claimed_at < self.ttl_seconds:
+                break
+            del self._entries[key]
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        normalized = {}
+        for key, item in value.items():
+            item = _normalize(item)
+            if item is None or item == {} or item == []:
+                continue
+            normalized[str(key)] = item
+        return normalized
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
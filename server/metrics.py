@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from core.metrics import EVENT_LOOP_LAG_SECONDS, HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+
+
+class MetricsMiddleware:
+    """
+    Counts and times every HTTP request by route template
+
+    A plain ASGI middleware, so it adds no task or body buffering to the
+    request. Requests that match no route are reported as ``unmatched``;
+    raw paths would give every session id its own series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(template, method, str(status))
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, template, method
+            )
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """
+    Measure how late the event loop wakes a sleeping task, until cancelled
+
+    Lag here means a handler is blocking the loop, and every in-flight
+    request waits on it.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(loop.time() - expected, 0.0))
@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+# Bodies smaller than this are served uncompressed - the framing overhead
+# outweighs the savings.
+MIN_COMPRESS_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class SerializedResponse:
+    """A response body serialized once, in every encoding we can serve"""
+
+    etag: str
+    bodies: Dict[str, bytes]  # content-coding -> bytes ("identity", "gzip", "br")
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Tuple[str, bytes]:
+        """Pick the best stored encoding for an Accept-Encoding header"""
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and accepted.get(
+                encoding, accepted.get("*", 0.0)
+            ) > 0:
+                return encoding, self.bodies[encoding]
+        return "identity", self.bodies["identity"]
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Weak comparison of an If-None-Match header against our ETag"""
+        if not if_none_match:
+            return False
+        own = _strip_weak(self.etag)
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*" or _strip_weak(candidate) == own:
+                return True
+        return False
+
+
+def serialize_response(payload: Dict[str, Any]) -> SerializedResponse:
+    """Encode a JSON payload once into identity/gzip/brotli bodies"""
+    # Same encoder and options as FastAPI's JSONResponse path, so a cached
+    # body matches the uncached one byte for byte
+    identity = json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    bodies = {"identity": identity}
+    if len(identity) >= MIN_COMPRESS_BYTES:
+        bodies["gzip"] = gzip.compress(identity, compresslevel=6)
+        if brotli is not None:
+            bodies["br"] = brotli.compress(identity, quality=5)
+
+    # The bodies are semantically equivalent, so one weak validator covers all
+    etag = f'W/"{hashlib.sha256(identity).hexdigest()[:32]}"'
+    return SerializedResponse(etag=etag, bodies=bodies)
+
+
+class CompletedResponseCache:
+    """Thread-safe LRU of pre-serialized responses for completed sessions"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, SerializedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[SerializedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, payload: Dict[str, Any]) -> SerializedResponse:
+        # Serialize outside the lock, it is the expensive part
+        entry = serialize_response(payload)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q-value}"""
+    accepted: Dict[str, float] = {}
+    if not header:
+        return accepted
+
+    for part in header.split(","):
+        pieces = part.strip().split(";")
+        coding = pieces[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in pieces[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
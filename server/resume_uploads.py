@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from core.cancellation import OperationCancelled
+
+
+@dataclass
+class ResumeUpload:
+    """A resume uploaded ahead of its college-upskilling submission"""
+
+    resume_id: str  # SHA-256 of the uploaded bytes
+    tenant_id: str
+    filename: Optional[str]
+    content_type: str
+    content: bytes
+    job_id: Optional[str] = None
+    future: Optional[Future] = None  # resolves when pre-processing finishes
+    uploaded_at: float = field(default_factory=time.time)
+
+    @property
+    def status(self) -> str:
+        if self.future is None:
+            # Not queued for pre-processing; the analysis will parse it
+            return "deferred"
+        if not self.future.done():
+            return "processing"
+        if self.future.cancelled():
+            return "failed"
+        exception = self.future.exception()
+        if isinstance(exception, OperationCancelled):
+            # An analysis picked the resume up before pre-processing started
+            return "superseded"
+        if exception is not None:
+            return "failed"
+        return "ready"
+
+    def error(self) -> Optional[str]:
+        if self.status != "failed" or self.future.cancelled():
+            return None
+        return str(self.future.exception())
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "resume_id": self.resume_id,
+            "filename": self.filename,
+            "size_bytes": len(self.content),
+            "status": self.status,
+            "error": self.error(),
+            "uploaded_at": self.uploaded_at,
+        }
+
+
+class ResumeUploadRegistry:
+    """
+    Holds uploaded resumes until the form that references them is submitted
+
+    Uploads are scoped to their tenant, expire after ``ttl_seconds`` and are
+    capped at ``max_entries`` (oldest dropped first), since each one keeps
+    the raw bytes in memory.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 200):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], ResumeUpload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, upload: ResumeUpload) -> Tuple[ResumeUpload, bool]:
+        """
+        Register ``upload`` unless the tenant already uploaded the same bytes
+
+        Returns:
+            (upload to use, whether it is new)
+        """
+        key = (upload.tenant_id, upload.resume_id)
+        with self._lock:
+            self._prune(time.time())
+            existing = self._entries.get(key)
+            if existing is not None and existing.status != "failed":
+                existing.uploaded_at = time.time()
+                self._entries.move_to_end(key)
+                return existing, False
+
+            self._entries[key] = upload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return upload, True
+
+    def get(self, tenant_id: str, resume_id: str) -> Optional[ResumeUpload]:
+        with self._lock:
+            self._prune(time.time())
+            return self._entries.get((tenant_id, resume_id))
+
+    def discard(self, tenant_id: str, resume_id: str):
+        with self._lock:
+            self._entries.pop((tenant_id, resume_id), None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _prune(self, now: float):
+        # Entries are kept in upload order, so expired ones sit at the front
+        while self._entries:
+            key, upload = next(iter(self._entries.items()))
+            if now - upload.uploaded_at < self.ttl_seconds:
+                break
+            del self._entries[key]
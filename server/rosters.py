@@ -0,0 +1,193 @@
+import csv
+import io
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from utils.sten_calculator import StenCalculator
+
+ABILITIES = ["CA", "CL", "MA", "NA", "PM", "RA", "SA", "VA"]
+CII_FIELDS = [
+    "artistic",
+    "scientific",
+    "social",
+    "conventional",
+    "enterprising",
+    "realistic",
+]
+GENDERS = {
+    "male": "male",
+    "m": "male",
+    "boy": "male",
+    "female": "female",
+    "f": "female",
+    "girl": "female",
+}
+
+
+class RosterError(Exception):
+    """The roster CSV as a whole cannot be used"""
+
+
+@dataclass
+class RosterRow:
+    """A validated roster row, shaped like a /school-students request"""
+
+    row_number: int  # line in the CSV, counting the header as line 1
+    name: str
+    request: Dict[str, Any]
+    stens: Dict[str, Optional[int]] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        if self.name:
+            return f"row {self.row_number}: {self.name}"
+        return f"row {self.row_number}"
+
+
+def read_roster(
+    fileobj: BinaryIO,
+    calculator: StenCalculator,
+    max_rows: int,
+    school_name: Optional[str] = None,
+) -> Tuple[List[RosterRow], List[Dict[str, Any]]]:
+    """
+    Validate a class roster and compute every student's stens
+
+    Expected columns: name, grade, gender, the eight ability scores (CA ...
+    VA, raw "achieved/total" or plain numbers, blank when not taken) and
+    the six CII scores (0-10). user_id, age, school_name and location are
+    optional. All rows are checked before anything is returned, so the
+    caller gets every problem at once; stens for the valid rows are then
+    computed in a single pass.
+
+    Returns:
+        (valid rows, row errors as {"row", "name", "errors"})
+
+    Raises:
+        RosterError: unreadable CSV, missing columns or too many rows
+    """
+    try:
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        columns = {column.strip() for column in reader.fieldnames or [] if column}
+        missing = [
+            column
+            for column in ["name", "grade", "gender", *ABILITIES, *CII_FIELDS]
+            if column not in columns
+        ]
+        if missing:
+            raise RosterError(f"Roster is missing columns: {', '.join(missing)}")
+
+        rows: List[RosterRow] = []
+        errors: List[Dict[str, Any]] = []
+        for row_number, raw in enumerate(reader, start=2):
+            if row_number - 1 > max_rows:
+                raise RosterError(
+                    f"Roster has more than {max_rows} students; split it up"
+                )
+            values = {
+                key.strip(): (value or "").strip() for key, value in raw.items() if key
+            }
+            if not any(values.values()):
+                continue  # blank line
+            row, row_errors = _validate_row(
+                row_number, values, calculator, school_name
+            )
+            if row_errors:
+                errors.append(
+                    {
+                        "row": row_number,
+                        "name": values.get("name"),
+                        "errors": row_errors,
+                    }
+                )
+            else:
+                rows.append(row)
+        text.detach()
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise RosterError(f"Could not read roster CSV: {e}")
+
+    stens = calculator.calculate_roster_stens(
+        (
+            row.request["dbda_scores"],
+            row.request["demographic_info"]["current_grade"],
+            row.request["demographic_info"]["gender"],
+        )
+        for row in rows
+    )
+    for row, results in zip(rows, stens):
+        row.stens = {
+            ability: result["sten_score"] for ability, result in results.items()
+        }
+    return rows, errors
+
+
+def _validate_row(
+    row_number: int,
+    values: Dict[str, str],
+    calculator: StenCalculator,
+    school_name: Optional[str],
+) -> Tuple[Optional[RosterRow], List[str]]:
+    errors = []
+
+    grade = _parse_int(values.get("grade"))
+    if grade not in calculator.norms:
+        errors.append(
+            f"grade must be one of {sorted(calculator.norms)}, got '{values.get('grade')}'"
+        )
+    gender = GENDERS.get(values.get("gender", "").lower())
+    if gender is None:
+        errors.append(f"gender must be male or female, got '{values.get('gender')}'")
+
+    dbda_scores = {}
+    for ability in ABILITIES:
+        score = values.get(ability, "")
+        dbda_scores[ability] = score or None
+        if not score:
+            continue
+        if calculator.parse_score_input(score) is None:
+            errors.append(
+                f"{ability} score '{score}' is not a number or 'achieved/total'"
+            )
+        elif "/" in score:
+            achieved, total = (_parse_int(part) for part in score.split("/"))
+            if total is None:
+                errors.append(f"{ability} score '{score}' has no valid total")
+            elif achieved > total:
+                errors.append(f"{ability} score '{score}' is more than its total")
+
+    cii_results = {}
+    for trait in CII_FIELDS:
+        score = _parse_int(values.get(trait))
+        if score is None or not 0 <= score <= 10:
+            errors.append(f"{trait} must be a whole number from 0 to 10")
+        cii_results[trait] = score
+
+    age = _parse_int(values.get("age"))
+    if values.get("age") and age is None:
+        errors.append(f"age '{values.get('age')}' is not a number")
+
+    if errors:
+        return None, errors
+
+    request = {
+        "demographic_info": {
+            "name": values.get("name") or None,
+            "age": age,
+            "current_grade": grade,
+            "school_name": values.get("school_name") or school_name,
+            "location": values.get("location") or None,
+            "gender": gender,
+        },
+        "dbda_scores": dbda_scores,
+        "cii_results": cii_results,
+        "user_id": values.get("user_id") or None,
+    }
+    return RosterRow(row_number, values.get("name", ""), request), []
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value.strip())
+    except (AttributeError, ValueError):
+        return None
@@ -8,12 +8,16 @@ import threading
 from typing import Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
-from datetime import datetime
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Union, Callable
+from datetime import datetime, timedelta
 import uuid
+import hashlib
 import asyncio
-import tempfile
 import io
+import csv
+import posixpath
+from collections import Counter
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
 
 from fastapi import (
@@ -30,13 +34,55 @@ from fastapi import (
     BackgroundTasks,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field, validator
 
 # Import your existing modules
-from agentic_layer.agent_orchestrator import MainOrchestrator, UserData
 from utils.sten_calculator import StenCalculator
+from utils.resume_parser import ResumeParseError, resume_parser
+from server.resume_uploads import ResumeUpload, ResumeUploadRegistry
+from server.batches import Batch, BatchItem, BatchRegistry
+from server.rosters import RosterError, read_roster
+from server.bulk_resumes import (
+    BulkUploadError,
+    match_resume,
+    read_resume_archive,
+    read_student_rows,
+)
 from config.llm_config import llm_manager
+from server.response_cache import CompletedResponseCache, SerializedResponse
+from server.idempotency import (
+    IdempotencyConflict,
+    IdempotencyRegistry,
+    submission_fingerprint,
+)
+from server.metrics import MetricsMiddleware, monitor_event_loop_lag
+from core.job_scheduler import Admission, AdmissionRejected, JobScheduler, VerticalLimits
+from core.fair_queue import Priority
+from core.llm_limiter import llm_limiter
+from core.content_cache import content_cache_snapshot
+from core.cancellation import OperationCancelled, raise_if_cancelled
+from core.request_context import current_context
+from core.timing import RunTimer, format_breakdown, timed
+from core.tracing import get_tracer
+from core.llm_accounting import get_llm_accountant
+from core.metrics import CONTENT_TYPE, family, registry, render_metrics
+from analytics.cohorts import cohort_analytics
+from analytics.session_facts import extract_session_facts
+from analytics.export import ExportSession, SqliteExporter
+from core.tenancy import (
+    DEFAULT_TENANT,
+    LLMBudgetExceeded,
+    TenantConfig,
+    TenantRateLimited,
+    UnknownTenant,
+    tenant_registry,
+)
+
+if TYPE_CHECKING:
+    # The orchestrator pulls in langgraph and the agent stack; it is imported
+    # when first needed (see get_orchestrator) to keep cold starts fast
+    from agentic_layer.agent_orchestrator import MainOrchestrator, UserData
 
 # Load environment variables
 load_dotenv()
@@ -181,6 +227,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so the timings include the other middleware
+app.add_middleware(MetricsMiddleware)
 
 # ========================== Session Status Management ==========================
 
@@ -190,23 +238,35 @@ class SessionStatus(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 # Global session storage (in production, use Redis or database)
 session_storage: Dict[str, Dict[str, Any]] = {}
 session_lock = threading.Lock()
 
+# Completed results never change, so their /status bodies are serialized once
+completed_responses = CompletedResponseCache(
+    max_entries=int(os.getenv("COMPLETED_RESPONSE_CACHE_SIZE", "1000"))
+)
+
 
 def update_session_status(
     session_id: str,
     status: SessionStatus,
     data: Optional[Dict] = None,
     error: Optional[str] = None,
+    tenant_id: Optional[str] = None,
 ):
     """Update session status and data"""
     with session_lock:
         if session_id not in session_storage:
             session_storage[session_id] = {}
+        elif session_storage[session_id].get("status") == SessionStatus.CANCELLED:
+            # A cancelled job may still finish its current step; keep it cancelled
+            return
+        if tenant_id is not None:
+            session_storage[session_id]["tenant_id"] = tenant_id
 
         session_storage[session_id].update(
             {
@@ -217,69 +277,180 @@ def update_session_status(
             }
         )
 
+    if status != SessionStatus.COMPLETED:
+        completed_responses.discard(session_id)
+
 
-def get_session_status(session_id: str) -> Dict[str, Any]:
-    """Get current session status and data"""
+def cancel_session(
+    session_id: str, tenant_id: Optional[str] = None
+) -> Optional[SessionStatus]:
+    """
+    Mark a pending or processing session as cancelled
+
+    Returns:
+        The status the session had before, or None if it does not exist
+        (or belongs to another tenant). Sessions that already finished keep
+        their status.
+    """
     with session_lock:
-        return session_storage.get(
-            session_id,
-            {
-                "status": SessionStatus.PENDING,
-                "updated_at": None,
-                "data": None,
-                "error": None,
-            },
-        )
+        session_info = session_storage.get(session_id)
+        if session_info is None or not _visible_to(session_info, tenant_id):
+            return None
+        previous = session_info["status"]
+        if previous in (SessionStatus.PENDING, SessionStatus.PROCESSING):
+            session_info.update(
+                {
+                    "status": SessionStatus.CANCELLED,
+                    "updated_at": datetime.now().isoformat(),
+                    "data": None,
+                    "error": "Cancelled by user",
+                }
+            )
+    return previous
+
+
+def discard_session(session_id: str):
+    """Drop all state for a session that was never started"""
+    with session_lock:
+        session_storage.pop(session_id, None)
+    completed_responses.discard(session_id)
+
+
+def get_session_status(
+    session_id: str, tenant_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get current session status and data
+
+    When ``tenant_id`` is given, another tenant's session looks exactly like
+    one that does not exist.
+    """
+    with session_lock:
+        session_info = session_storage.get(session_id)
+        if session_info is not None and _visible_to(session_info, tenant_id):
+            return session_info
+    return {
+        "status": SessionStatus.PENDING,
+        "updated_at": None,
+        "data": None,
+        "error": None,
+    }
+
+
+def _visible_to(session_info: Dict[str, Any], tenant_id: Optional[str]) -> bool:
+    return tenant_id is None or session_info.get("tenant_id") in (None, tenant_id)
+
+
+# Maps submission fingerprints / Idempotency-Key headers to their session
+submissions = IdempotencyRegistry(
+    ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600))),
+    max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "100000")),
+)
+
+
+def is_session_reusable(session_id: str) -> bool:
+    """A duplicate submission may attach to queued, running or finished work"""
+    with session_lock:
+        session_info = session_storage.get(session_id)
+    return session_info is not None and session_info["status"] in (
+        SessionStatus.PENDING,
+        SessionStatus.PROCESSING,
+        SessionStatus.COMPLETED,
+    )
+
+
+# ========================== Job Scheduling ==========================
+
+# Admission control: bounded running/queued jobs per vertical and per tenant,
+# with chat follow-ups scheduled ahead of analyses and analyses ahead of batch work
+job_scheduler = JobScheduler(
+    tenants=tenant_registry,
+    limits={
+        vertical: VerticalLimits.from_env(vertical)
+        for vertical in [
+            "school_students",
+            "college_upskilling",
+            "career_transition",
+            "chat",
+            "resumes",
+        ]
+    }
+)
+
+
+def resolve_tenant(x_api_key: Optional[str] = Header(None)) -> TenantConfig:
+    """Identify the calling partner from the X-API-Key header"""
+    try:
+        return tenant_registry.resolve(x_api_key)
+    except UnknownTenant as e:
+        raise HTTPException(status_code=401, detail=str(e))
 
 
 # ========================== Global Variables ==========================
 
 # Initialize orchestrator (singleton pattern)
 orchestrator = None
+# Scheduler workers reach get_orchestrator() at once on the first jobs
+orchestrator_lock = threading.Lock()
 
 
-def get_orchestrator():
+def get_orchestrator() -> "MainOrchestrator":
     global orchestrator
     if orchestrator is None:
-        try:
-            llm_model = llm_manager.initialize_gemini(
-                model_name="gemini-1.5-flash", temperature=0.1, max_tokens=4000
-            )
-            orchestrator = MainOrchestrator(llm_model=llm_model)
-            logger.info("Orchestrator initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize orchestrator: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to initialize counseling system: {str(e)}",
-            )
+        with orchestrator_lock:
+            if orchestrator is None:
+                try:
+                    from agentic_layer.agent_orchestrator import MainOrchestrator
+
+                    llm_model = llm_manager.initialize_gemini(
+                        model_name="gemini-1.5-flash", temperature=0.1, max_tokens=4000
+                    )
+                    orchestrator = MainOrchestrator(llm_model=llm_model)
+                    logger.info("Orchestrator initialized successfully")
+                except Exception as e:
+                    logger.error(f"Failed to initialize orchestrator: {e}")
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Failed to initialize counseling system: {str(e)}",
+                    )
     return orchestrator
 
 
 # ========================== Utility Functions ==========================
 
 
-def create_user_data_from_request(data: dict, vertical_type: str) -> UserData:
-    """Convert request data to UserData format"""
-    calculator = StenCalculator()
+def create_user_data_from_request(
+    data: dict,
+    vertical_type: str,
+    dbda_sten_scores: Optional[Dict[str, Optional[int]]] = None,
+) -> "UserData":
+    """
+    Convert request data to UserData format
+
+    ``dbda_sten_scores`` skips the sten calculation when the caller already
+    computed them (roster uploads do so for the whole class at once).
+    """
     user_id = data.get("user_id") or f"{vertical_type}_user_{uuid.uuid4().hex[:8]}"
     session_id = data.get("session_id") or f"session_{uuid.uuid4().hex[:8]}"
-    dbda_scores = data.get("dbda_scores")
-    dem_info = data.get("demographic_info", {})  # Add default empty dict
-    grade = dem_info.get("current_grade")
-    gender = dem_info.get("gender", "male")
 
-    # Calculate sten scores and extract only the sten_score values
-    dbda_sten_results = calculator.calculate_student_stens(
-        dbda_scores, grade=grade, gender=gender
-    )
+    if dbda_sten_scores is None:
+        calculator = StenCalculator()
+        dbda_scores = data.get("dbda_scores")
+        dem_info = data.get("demographic_info", {})  # Add default empty dict
+        grade = dem_info.get("current_grade")
+        gender = dem_info.get("gender", "male")
 
-    # Extract only the sten scores (integers) from the result dictionary
-    dbda_sten_scores = {}
-    for ability, result in dbda_sten_results.items():
-        dbda_sten_scores[ability] = result["sten_score"]
+        # Calculate sten scores and extract only the sten_score values
+        dbda_sten_results = calculator.calculate_student_stens(
+            dbda_scores, grade=grade, gender=gender
+        )
+
+        # Extract only the sten scores (integers) from the result dictionary
+        dbda_sten_scores = {}
+        for ability, result in dbda_sten_results.items():
+            dbda_sten_scores[ability] = result["sten_score"]
 
-    print("DBDA sten scores", dbda_sten_scores)
+        print("DBDA sten scores", dbda_sten_scores)
 
     user_data: UserData = {
         "user_id": user_id,
@@ -300,58 +471,317 @@ def create_user_data_from_request(data: dict, vertical_type: str) -> UserData:
     return user_data
 
 
-async def extract_resume_text(file: UploadFile) -> str:
-    """Extract text from uploaded resume file"""
+def create_college_user_data(
+    resume_data: Dict[str, Any],
+    academic_status: Optional[Dict[str, Any]] = None,
+    github_profile: Optional[Dict[str, Any]] = None,
+    linkedin_profile: Optional[Dict[str, Any]] = None,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+) -> "UserData":
+    """UserData for a college upskilling run; resume text is attached on the job"""
+    return {
+        "user_id": user_id or f"college_user_{uuid.uuid4().hex[:8]}",
+        "session_id": session_id or f"session_{uuid.uuid4().hex[:8]}",
+        "demographic_info": None,
+        "dbda_scores": None,
+        "cii_results": None,
+        "resume_data": resume_data,
+        "github_profile": github_profile,
+        "linkedin_profile": linkedin_profile,
+        "academic_status": academic_status,
+        "current_profession": None,
+        "financial_constraints": None,
+        "timeline_flexibility": None,
+        "family_obligations": None,
+    }
+
+
+async def read_resume_upload(file: UploadFile) -> bytes:
+    """
+    Read an uploaded resume into memory, enforcing type and size limits
+
+    Text extraction happens later, on the analysis job, so the request
+    returns without waiting on PDF parsing.
+    """
     try:
-        # Check file type
-        if file.content_type not in [
-            "application/pdf",
-            "text/plain",
-            "application/msword",
-        ]:
-            raise HTTPException(
-                status_code=400,
-                detail="Unsupported file type. Please upload PDF, TXT, or DOC files.",
-            )
+        resume_parser.check_upload(file.content_type, 0)
+    except ResumeParseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=os.path.splitext(file.filename)[1]
-        ) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
+    # Read at most one byte past the limit so oversized uploads are not buffered
+    content = await file.read(resume_parser.max_bytes + 1)
+    try:
+        resume_parser.check_upload(file.content_type, len(content))
+    except ResumeParseError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if not content:
+        raise HTTPException(status_code=400, detail="Uploaded resume is empty")
+    return content
+
+
+# Resumes uploaded through POST /resumes, waiting for their college form
+resume_uploads = ResumeUploadRegistry(
+    ttl_seconds=float(os.getenv("RESUME_UPLOAD_TTL_SECONDS", "3600")),
+    max_entries=int(os.getenv("RESUME_UPLOAD_MAX_ENTRIES", "200")),
+)
 
-        try:
-            if file.content_type == "application/pdf":
-                from langchain_community.document_loaders import PyMuPDFLoader
-
-                loader = PyMuPDFLoader(tmp_file_path)
-                pages = loader.load()
-                resume_text = "\n\n".join([page.page_content for page in pages])
-            else:
-                # Handle text files
-                with open(tmp_file_path, "r", encoding="utf-8") as f:
-                    resume_text = f.read()
-
-            if not resume_text.strip():
-                raise HTTPException(
-                    status_code=400, detail="No text content found in uploaded file"
-                )
 
-            return resume_text
+def preprocess_uploaded_resume(upload: ResumeUpload) -> Dict[str, Any]:
+    """
+    Parse an uploaded resume and run the resume-only profile analysis
+    (executes on a scheduler worker)
 
-        finally:
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
+    Both results land in the content caches, which is where the college
+    fleet picks them up once the form referencing the resume arrives.
+    """
+    logger.info(f"Pre-processing uploaded resume {upload.resume_id[:12]}")
+    text = resume_parser.parse(upload.content, upload.content_type)
+    return get_orchestrator().preprocess_resume(
+        {
+            "content": text,
+            "extracted_at": datetime.now().isoformat(),
+            "source": "api_upload",
+            "filename": upload.filename,
+        }
+    )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Resume extraction failed: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Failed to process resume: {str(e)}"
+
+def attach_uploaded_resume(user_data: "UserData", upload: ResumeUpload):
+    """
+    Fill user_data with a pre-uploaded resume (blocks the analysis job thread)
+
+    If pre-processing has not started yet it is withdrawn and the analysis
+    does the work itself, so analysis workers never wait on queued jobs. If
+    it is running, wait for it so the fleet reuses its cached results.
+    """
+    if upload.job_id and not job_scheduler.withdraw(
+        upload.job_id, "Resume picked up by an analysis"
+    ):
+        while True:
+            try:
+                upload.future.result(timeout=0.5)
+                break
+            except FutureTimeoutError:
+                raise_if_cancelled()
+            except ResumeParseError:
+                raise
+            except (Exception, OperationCancelled) as e:
+                # The fleet repeats whatever pre-processing did not finish
+                logger.warning(f"Resume pre-processing failed, continuing: {e}")
+                break
+
+    user_data["resume_data"]["content"] = resume_parser.parse(
+        upload.content, upload.content_type
+    )
+
+
+# Bulk submissions, fed to the scheduler a few items at a time
+batches = BatchRegistry(
+    ttl_seconds=float(os.getenv("BATCH_TTL_SECONDS", str(24 * 3600))),
+    max_entries=int(os.getenv("BATCH_MAX_ENTRIES", "100")),
+)
+BATCH_MAX_IN_FLIGHT = int(os.getenv("BATCH_MAX_IN_FLIGHT", "8"))
+BULK_MAX_RESUMES = int(os.getenv("BULK_MAX_RESUMES", "500"))
+BULK_MAX_ARCHIVE_BYTES = int(
+    os.getenv("BULK_MAX_ARCHIVE_BYTES", str(200 * 1024 * 1024))
+)
+ROSTER_MAX_ROWS = int(os.getenv("ROSTER_MAX_ROWS", "1000"))
+
+# Completed sessions are appended to this SQLite file (relational schema,
+# see analytics/export.py) so they can be analysed without the API
+results_exporter = (
+    SqliteExporter(os.environ["RESULTS_EXPORT_PATH"])
+    if os.getenv("RESULTS_EXPORT_PATH")
+    else None
+)
+
+
+def batch_job_submitter(
+    vertical: str,
+    user_data: "UserData",
+    initial_message: str,
+    session_id: str,
+    tenant_id: str,
+    prepare: Optional[Callable[[], None]] = None,
+) -> Callable[[], Any]:
+    """Callable that queues one batch item at BATCH priority and returns its future"""
+
+    def submit():
+        return job_scheduler.submit(
+            session_id,
+            vertical,
+            lambda: process_analysis_background(
+                vertical, user_data, initial_message, session_id, prepare
+            ),
+            priority=Priority.BATCH,
+            tenant_id=tenant_id,
+            session_id=session_id,
+        ).future
+
+    return submit
+
+
+def batch_statuses(batch: Batch) -> Dict[str, str]:
+    """Current session status of every submitted item in a batch"""
+    with session_lock:
+        return {
+            item.session_id: session_storage[item.session_id]["status"].value
+            for item in batch.items
+            if item.session_id in session_storage
+        }
+
+
+def parse_json_field(value: Optional[str], field_name: str) -> Optional[Any]:
+    """Decode an optional JSON column of a bulk upload row"""
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        raise ValueError(f"{field_name} is not valid JSON")
+
+
+def build_status_response(
+    session_id: str, session_info: Dict[str, Any]
+) -> APIResponse:
+    """Build the /status response for a session"""
+    return APIResponse(
+        success=True,
+        data={
+            "session_id": session_id,
+            "status": session_info["status"],
+            "updated_at": session_info["updated_at"],
+            "results": (
+                session_info["data"]
+                if session_info["status"] == SessionStatus.COMPLETED
+                else None
+            ),
+            "error": (
+                session_info["error"]
+                if session_info["status"]
+                in (SessionStatus.FAILED, SessionStatus.CANCELLED)
+                else None
+            ),
+            "can_chat": session_info["status"] == SessionStatus.COMPLETED,
+        },
+        session_id=session_id,
+    )
+
+
+def cache_completed_response(session_id: str) -> Optional[SerializedResponse]:
+    """Serialize a completed session's /status body once and keep it"""
+    session_info = get_session_status(session_id)
+    if session_info["status"] != SessionStatus.COMPLETED:
+        return None
+
+    payload = build_status_response(session_id, session_info).dict()
+    entry = completed_responses.put(session_id, payload)
+    with session_lock:
+        # Serialized size of the stored result, for the session-store metrics
+        session_info["bytes"] = len(entry.bodies["identity"])
+    return entry
+
+
+def serve_serialized_response(
+    entry: SerializedResponse, request: Request
+) -> Response:
+    """Serve a pre-serialized body, honouring If-None-Match and Accept-Encoding"""
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if entry.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    encoding, body = entry.negotiate(request.headers.get("accept-encoding"))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def submission_key(
+    tenant_id: str,
+    vertical: str,
+    fields: Dict[str, Any],
+    idempotency_key: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    Key used to detect repeated submissions of the same analysis, and the
+    payload fingerprint that a reused Idempotency-Key must match
+    """
+    fingerprint = submission_fingerprint(vertical, fields)
+    if idempotency_key:
+        return f"{tenant_id}:{vertical}:key:{idempotency_key.strip()}", fingerprint
+    return f"{tenant_id}:{vertical}:fp:{fingerprint}", fingerprint
+
+
+def claim_submission(
+    dedup_key: str, session_id: str, fingerprint: str
+) -> Optional[str]:
+    """
+    Bind a submission to its new session, or return the session already
+    handling it
+
+    Raises:
+        HTTPException: 422 when an Idempotency-Key comes back with a
+            different payload
+    """
+    try:
+        return submissions.claim(
+            dedup_key, session_id, is_session_reusable, fingerprint
         )
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def analysis_accepted_response(
+    session_id: str,
+    admission: Optional[Admission] = None,
+    deduplicated: bool = False,
+) -> APIResponse:
+    """Response returned once an analysis has been queued (or found queued)"""
+    data = {
+        "message": "Analysis started. Check status using the session_id.",
+        "session_id": session_id,
+        "status_endpoint": f"/status/{session_id}",
+    }
+    if admission is not None:
+        now = datetime.now()
+        data.update(
+            {
+                "queue_position": admission.queue_position,
+                "estimated_start_seconds": round(admission.estimated_start_seconds),
+                "estimated_start_time": (
+                    now + timedelta(seconds=admission.estimated_start_seconds)
+                ).isoformat(),
+                "estimated_completion_time": format_duration(
+                    admission.estimated_completion_seconds
+                ),
+            }
+        )
+    if deduplicated:
+        data["message"] = (
+            "An identical analysis is already in progress or complete. "
+            "Check status using the session_id."
+        )
+        data["deduplicated"] = True
+        data["status"] = get_session_status(session_id)["status"]
+
+    return APIResponse(success=True, data=data, session_id=session_id)
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable duration for ETA fields"""
+    minutes = seconds / 60
+    if minutes < 1:
+        return "less than a minute"
+    if minutes < 1.5:
+        return "about 1 minute"
+    return f"about {round(minutes)} minutes"
 
 
 # ========================== Routes ==========================
@@ -371,7 +801,11 @@ async def root():
                 "career_transition": "/career-transition",
             },
             "chat": "/chat",
-            "utilities": {"health": "/health", "verticals_info": "/verticals"},
+            "utilities": {
+                "health": "/health",
+                "metrics": "/metrics",
+                "verticals_info": "/verticals",
+            },
         },
     }
 
@@ -380,13 +814,18 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     try:
-        # Test orchestrator initialization
-        orch = get_orchestrator()
+        # Report, but do not force, orchestrator initialization: probes hit
+        # this endpoint and must not pay for building the agent stack
         return {
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
-            "orchestrator": "initialized",
+            "orchestrator": "initialized" if orchestrator else "deferred",
             "verticals": ["school_students", "college_upskilling", "career_transition"],
+            "queues": job_scheduler.snapshot(),
+            "llm": llm_limiter.snapshot(),
+            "content_caches": content_cache_snapshot(),
+            "tracing": get_tracer().snapshot(),
+            "llm_accounting": get_llm_accountant().snapshot(),
         }
     except Exception as e:
         return {
@@ -396,6 +835,117 @@ async def health_check():
         }
 
 
+def collect_server_metrics():
+    """Scrape-time values: queues, sessions, LLM slots, caches and tracing"""
+    queues = job_scheduler.snapshot()
+    for name, key in (("job_queue_depth", "queued"), ("jobs_running", "running")):
+        yield family(
+            name,
+            "gauge",
+            f"Background jobs {key} per vertical",
+            [({"vertical": v}, queue[key]) for v, queue in queues.items()],
+        )
+    yield family(
+        "jobs_completed_total",
+        "counter",
+        "Background jobs finished per vertical",
+        [({"vertical": v}, queue["completed"]) for v, queue in queues.items()],
+    )
+
+    with session_lock:
+        by_status = Counter(info["status"].value for info in session_storage.values())
+        stored_bytes = sum(info.get("bytes", 0) for info in session_storage.values())
+        stored = len(session_storage)
+    yield family(
+        "sessions",
+        "gauge",
+        "Sessions in the session store by status",
+        [
+            ({"status": status.value}, by_status[status.value])
+            for status in SessionStatus
+        ],
+    )
+    yield family(
+        "sessions_in_flight",
+        "gauge",
+        "Sessions pending or processing",
+        [({}, by_status["pending"] + by_status["processing"])],
+    )
+    yield family(
+        "session_store_sessions", "gauge", "Sessions held in memory", [({}, stored)]
+    )
+    yield family(
+        "session_store_bytes",
+        "gauge",
+        "Serialized size of the completed results held in memory",
+        [({}, stored_bytes)],
+    )
+    yield family(
+        "completed_response_cache_entries",
+        "gauge",
+        "Pre-serialized /status bodies cached",
+        [({}, len(completed_responses))],
+    )
+
+    llm = llm_limiter.snapshot()
+    yield family(
+        "llm_slots_in_use", "gauge", "LLM limiter slots held", [({}, llm["in_use"])]
+    )
+    yield family(
+        "llm_slot_waiters",
+        "gauge",
+        "LLM calls waiting for a limiter slot, by priority",
+        [
+            ({"priority": key[len("waiting_"):]}, value)
+            for key, value in llm.items()
+            if key.startswith("waiting_")
+        ],
+    )
+
+    caches = content_cache_snapshot()
+    for name, key, kind in (
+        ("content_cache_hits_total", "hits", "counter"),
+        ("content_cache_misses_total", "misses", "counter"),
+        ("content_cache_entries", "entries", "gauge"),
+    ):
+        yield family(
+            name,
+            kind,
+            f"Content cache {key} per cache",
+            [({"cache": cache}, stats[key]) for cache, stats in caches.items()],
+        )
+    yield family(
+        "content_cache_hit_ratio",
+        "gauge",
+        "Content cache hits over lookups since start, per cache",
+        [
+            ({"cache": cache}, stats["hits"] / (stats["hits"] + stats["misses"]))
+            for cache, stats in caches.items()
+            if stats["hits"] + stats["misses"]
+        ],
+    )
+
+    tracing = get_tracer().snapshot()
+    yield family(
+        "trace_events_total",
+        "counter",
+        "Trace events by outcome",
+        [
+            ({"outcome": outcome}, tracing[outcome])
+            for outcome in ("emitted", "exported", "dropped", "failed")
+        ],
+    )
+
+
+registry.register_collector(collect_server_metrics)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Counters, gauges and histograms in the Prometheus text format"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
 @app.get("/verticals")
 async def get_verticals_info():
     """Get information about available verticals"""
@@ -412,40 +962,144 @@ async def get_verticals_info():
         return APIResponse(success=False, error=str(e))
 
 
+@app.get("/usage", response_model=APIResponse)
+async def get_tenant_usage(tenant: TenantConfig = Depends(resolve_tenant)):
+    """LLM token usage, budget and job counts for the calling tenant"""
+    return APIResponse(
+        success=True,
+        data={
+            **tenant_registry.usage(tenant.tenant_id),
+            "jobs": job_scheduler.tenant_snapshot(tenant.tenant_id),
+        },
+    )
+
+
+@app.get("/analytics/cohorts", response_model=APIResponse)
+async def get_cohort_analytics(
+    vertical: Optional[str] = None,
+    grade: Optional[str] = None,
+    gender: Optional[str] = None,
+    program: Optional[str] = None,
+    year_of_study: Optional[str] = None,
+    period: Optional[str] = None,
+    period_from: Optional[str] = None,
+    period_to: Optional[str] = None,
+    top: int = Query(10, ge=1, le=100),
+    tenant: TenantConfig = Depends(resolve_tenant),
+):
+    """
+    Aggregate results for a cohort of the tenant's completed sessions
+
+    Filter by any of vertical, grade, gender, program (college major),
+    year_of_study and period ("YYYY-MM"), or a period_from/period_to range.
+    Returns recommended stream distribution, top careers, skill gaps,
+    salary bands and the cohort's sten profile. Aggregates are maintained
+    as sessions complete, so the cost of a query does not grow with the
+    cohort size.
+    """
+    filters = {
+        "vertical": vertical,
+        "grade": grade,
+        "gender": gender,
+        "program": program,
+        "year_of_study": year_of_study,
+        "period": period,
+    }
+    return APIResponse(
+        success=True,
+        data={
+            "filters": {name: value for name, value in filters.items() if value},
+            **cohort_analytics.query(
+                tenant.tenant_id,
+                filters,
+                period_from=period_from,
+                period_to=period_to,
+                top=top,
+            ),
+        },
+    )
+
+
+@app.get("/analytics/cohorts/dimensions", response_model=APIResponse)
+async def get_cohort_dimensions(tenant: TenantConfig = Depends(resolve_tenant)):
+    """Values available for each cohort filter, with session counts"""
+    return APIResponse(
+        success=True, data=cohort_analytics.dimension_values(tenant.tenant_id)
+    )
+
+
 # ========================== Background Task Functions ==========================
 
 
-async def process_school_student_background(
-    user_data: UserData, initial_message: str, session_id: str
+def process_analysis_background(
+    vertical: str,
+    user_data: "UserData",
+    initial_message: str,
+    session_id: str,
+    prepare: Optional[Callable[[], None]] = None,
 ):
-    """Background task for processing school student analysis"""
+    """
+    Background job that runs a vertical's fleet (executes on a scheduler worker)
+
+    ``prepare`` runs first on the job thread, for input work (such as resume
+    parsing) that should not hold up the request that submitted the job.
+    The run is timed step by step (see core.timing); the breakdown is logged
+    and kept for ``/status/{session_id}?debug=true``. Sessions cancelled
+    before their job starts (e.g. batch items not yet fed) are skipped.
+    """
+    with session_lock:
+        session_info = session_storage.get(session_id)
+        if session_info is None or session_info["status"] == SessionStatus.CANCELLED:
+            # Cancelled while still waiting in its batch: never start the run
+            logger.info(f"Skipping cancelled {vertical} session: {session_id}")
+            return
+
+    timer = RunTimer(session_id)
     try:
-        logger.info(
-            f"Starting background processing for school student session: {session_id}"
-        )
+        logger.info(f"Starting background processing for {vertical} session: {session_id}")
         update_session_status(session_id, SessionStatus.PROCESSING)
 
-        # Get orchestrator
-        orch = get_orchestrator()
-
-        # Execute workflow
-        result = orch.start_counseling_session(
-            vertical="school_students",
-            user_data=user_data,
-            initial_message=initial_message,
-        )
+        try:
+            with timer.measure():
+                if prepare is not None:
+                    with timed("prepare"):
+                        prepare()
+
+                # Get orchestrator (built on the first run)
+                with timed("setup"):
+                    orch = get_orchestrator()
+
+                # Execute workflow
+                result = orch.start_counseling_session(
+                    vertical=vertical,
+                    user_data=user_data,
+                    initial_message=initial_message,
+                )
+        finally:
+            record_run_timing(session_id, timer)
 
         if result.get("success"):
-            logger.info(f"School student analysis completed for session: {session_id}")
+            logger.info(f"{vertical} analysis completed for session: {session_id}")
             update_session_status(session_id, SessionStatus.COMPLETED, data=result)
+            cache_completed_response(session_id)
+            record_cohort_facts(session_id, vertical, user_data, result)
+            export_session_result(session_id, vertical, user_data, result)
         else:
-            logger.warning(f"School student analysis failed: {result.get('error')}")
+            logger.warning(f"{vertical} analysis failed: {result.get('error')}")
             update_session_status(
                 session_id,
                 SessionStatus.FAILED,
                 error=result.get("error", "Analysis failed"),
             )
 
+    except LLMBudgetExceeded as e:
+        logger.warning(f"Session {session_id} stopped: {e.reason}")
+        update_session_status(session_id, SessionStatus.FAILED, error=e.reason)
+
+    except ResumeParseError as e:
+        logger.warning(f"Resume for session {session_id} could not be parsed: {e}")
+        update_session_status(session_id, SessionStatus.FAILED, error=str(e))
+
     except Exception as e:
         logger.error(
             f"Background task error for session {session_id}: {e}", exc_info=True
@@ -453,84 +1107,112 @@ async def process_school_student_background(
         update_session_status(session_id, SessionStatus.FAILED, error=str(e))
 
 
-async def process_college_upskilling_background(
-    user_data: UserData, initial_message: str, session_id: str
-):
-    """Background task for processing college upskilling analysis"""
+def record_run_timing(session_id: str, timer: RunTimer):
+    """Log a run's timing breakdown and keep it with the session"""
     try:
-        logger.info(
-            f"Starting background processing for college upskilling session: {session_id}"
-        )
-        update_session_status(session_id, SessionStatus.PROCESSING)
-
-        # Get orchestrator
-        orch = get_orchestrator()
+        breakdown = timer.breakdown()
+    except Exception as e:
+        logger.warning(f"Could not compute timing for {session_id}: {e}")
+        return
+    logger.info(f"Timing for session {session_id}: {format_breakdown(breakdown)}")
+    with session_lock:
+        if session_id in session_storage:
+            session_storage[session_id]["timing"] = breakdown
 
-        # Execute workflow
-        result = orch.start_counseling_session(
-            vertical="college_upskilling",
-            user_data=user_data,
-            initial_message=initial_message,
-        )
 
-        if result.get("success"):
-            logger.info(
-                f"College upskilling analysis completed for session: {session_id}"
-            )
-            update_session_status(session_id, SessionStatus.COMPLETED, data=result)
-        else:
-            logger.warning(f"College upskilling analysis failed: {result.get('error')}")
-            update_session_status(
+def record_cohort_facts(
+    session_id: str, vertical: str, user_data: "UserData", result: Dict[str, Any]
+):
+    """Fold a completed session into the cohort analytics aggregates"""
+    try:
+        cohort_analytics.record(
+            extract_session_facts(
                 session_id,
-                SessionStatus.FAILED,
-                error=result.get("error", "Analysis failed"),
+                vertical,
+                current_context().tenant_id or DEFAULT_TENANT,
+                user_data,
+                result,
             )
-
-    except Exception as e:
-        logger.error(
-            f"Background task error for session {session_id}: {e}", exc_info=True
         )
-        update_session_status(session_id, SessionStatus.FAILED, error=str(e))
+    except Exception as e:
+        # Analytics must never fail the analysis itself
+        logger.warning(f"Could not record cohort facts for {session_id}: {e}")
 
 
-async def process_career_transition_background(
-    user_data: UserData, initial_message: str, session_id: str
+def export_session_result(
+    session_id: str, vertical: str, user_data: "UserData", result: Dict[str, Any]
 ):
-    """Background task for processing career transition analysis"""
+    """Append a completed session to the results export, when one is configured"""
+    if results_exporter is None:
+        return
     try:
-        logger.info(
-            f"Starting background processing for career transition session: {session_id}"
+        results_exporter.write(
+            [
+                ExportSession(
+                    session_id=session_id,
+                    vertical=vertical,
+                    status="completed",
+                    result=result,
+                    user_data=user_data,
+                    tenant_id=current_context().tenant_id or DEFAULT_TENANT,
+                    completed_at=datetime.now().isoformat(),
+                )
+            ]
         )
-        update_session_status(session_id, SessionStatus.PROCESSING)
+    except Exception as e:
+        logger.warning(f"Could not export results for {session_id}: {e}")
 
-        # Get orchestrator
-        orch = get_orchestrator()
 
-        # Execute workflow
-        result = orch.start_counseling_session(
-            vertical="career_transition",
-            user_data=user_data,
-            initial_message=initial_message,
-        )
+def submit_analysis_job(
+    vertical: str,
+    user_data: "UserData",
+    initial_message: str,
+    session_id: str,
+    dedup_key: str,
+    tenant_id: str,
+    priority: Priority = Priority.INTERACTIVE_ANALYSIS,
+    prepare: Optional[Callable[[], None]] = None,
+) -> Admission:
+    """
+    Queue an analysis through tenant quotas and admission control
 
-        if result.get("success"):
-            logger.info(
-                f"Career transition analysis completed for session: {session_id}"
-            )
-            update_session_status(session_id, SessionStatus.COMPLETED, data=result)
-        else:
-            logger.warning(f"Career transition analysis failed: {result.get('error')}")
-            update_session_status(
-                session_id,
-                SessionStatus.FAILED,
-                error=result.get("error", "Analysis failed"),
-            )
+    Raises:
+        HTTPException: 429 with Retry-After when the tenant is over its
+            submission rate or token budget, or the queue is full
+    """
+    try:
+        tenant_registry.admit_submission(tenant_id)
+    except TenantRateLimited as e:
+        logger.warning(f"Rate limited tenant {tenant_id}: {e.reason}")
+        submissions.release(dedup_key, session_id)
+        raise HTTPException(
+            status_code=429,
+            detail=e.reason,
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
-    except Exception as e:
-        logger.error(
-            f"Background task error for session {session_id}: {e}", exc_info=True
+    # Mark pending before the job can start so PROCESSING is never overwritten
+    update_session_status(session_id, SessionStatus.PENDING, tenant_id=tenant_id)
+    try:
+        return job_scheduler.submit(
+            session_id,
+            vertical,
+            lambda: process_analysis_background(
+                vertical, user_data, initial_message, session_id, prepare
+            ),
+            priority=priority,
+            tenant_id=tenant_id,
+            session_id=session_id,
+        )
+    except AdmissionRejected as e:
+        logger.warning(f"Rejected {vertical} session {session_id}: {e.reason}")
+        discard_session(session_id)
+        submissions.release(dedup_key, session_id)
+        raise HTTPException(
+            status_code=429,
+            detail=e.reason,
+            headers={"Retry-After": str(e.retry_after)},
         )
-        update_session_status(session_id, SessionStatus.FAILED, error=str(e))
 
 
 # ========================== Modified Vertical Endpoints ==========================
@@ -538,12 +1220,16 @@ async def process_career_transition_background(
 
 @app.post("/school-students", response_model=APIResponse)
 async def analyze_school_student(
-    request: SchoolStudentRequest, background_tasks: BackgroundTasks
+    request: SchoolStudentRequest,
+    idempotency_key: Optional[str] = Header(None),
+    tenant: TenantConfig = Depends(resolve_tenant),
 ):
     """
     Analyze school student profile and provide career guidance (Background Processing)
 
     Returns immediately with session_id. Use /status/{session_id} to check progress.
+    Repeated submissions (same Idempotency-Key header, or the same normalized
+    payload) return the existing session instead of starting a new run.
     """
     try:
         logger.info("Processing school student request (background)")
@@ -554,8 +1240,21 @@ async def analyze_school_student(
 
         session_id = user_data["session_id"]
 
-        # Initialize session status
-        update_session_status(session_id, SessionStatus.PENDING)
+        # Fingerprint on the computed stens so "5/20" and 5 dedupe together
+        dedup_key, fingerprint = submission_key(
+            tenant.tenant_id,
+            "school_students",
+            {
+                **request_dict,
+                "session_id": None,
+                "dbda_scores": user_data["dbda_scores"],
+            },
+            idempotency_key,
+        )
+        existing_session = claim_submission(dedup_key, session_id, fingerprint)
+        if existing_session:
+            logger.info(f"Duplicate school student submission -> {existing_session}")
+            return analysis_accepted_response(existing_session, deduplicated=True)
 
         # Set default message if not provided
         initial_message = (
@@ -563,22 +1262,19 @@ async def analyze_school_student(
             or "I need comprehensive academic and career guidance based on my assessment results."
         )
 
-        # Add background task
-        background_tasks.add_task(
-            process_school_student_background, user_data, initial_message, session_id
+        admission = submit_analysis_job(
+            "school_students",
+            user_data,
+            initial_message,
+            session_id,
+            dedup_key,
+            tenant.tenant_id,
         )
 
-        return APIResponse(
-            success=True,
-            data={
-                "message": "Analysis started. Check status using the session_id.",
-                "session_id": session_id,
-                "status_endpoint": f"/status/{session_id}",
-                "estimated_completion_time": "2-5 minutes",
-            },
-            session_id=session_id,
-        )
+        return analysis_accepted_response(session_id, admission=admission)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"School student endpoint error: {e}", exc_info=True)
         return APIResponse(success=False, error=f"Internal server error: {str(e)}")
@@ -586,25 +1282,51 @@ async def analyze_school_student(
 
 @app.post("/college-upskilling", response_model=APIResponse)
 async def analyze_college_student_with_resume(
-    background_tasks: BackgroundTasks,
-    resume: UploadFile = File(...),
+    resume: Optional[UploadFile] = File(None),
+    resume_id: Optional[str] = Form(None),
     academic_status: Optional[str] = Form(None),
     github_profile: Optional[str] = Form(None),
     linkedin_profile: Optional[str] = Form(None),
     initial_message: Optional[str] = Form(None),
     session_id: Optional[str] = Form(None),
     user_id: Optional[str] = Form(None),
+    idempotency_key: Optional[str] = Header(None),
+    tenant: TenantConfig = Depends(resolve_tenant),
 ):
     """
     Analyze college student profile with resume upload (Background Processing)
 
     Returns immediately with session_id. Use /status/{session_id} to check progress.
+    Send either the ``resume`` file or the ``resume_id`` returned by
+    POST /resumes, which lets resume parsing and analysis start while the
+    rest of the form is being filled in.
+    Repeated submissions (same Idempotency-Key header, or the same resume and
+    form fields) return the existing session instead of starting a new run.
     """
     try:
         logger.info("Processing college upskilling request with resume (background)")
 
-        # Extract resume text
-        resume_text = await extract_resume_text(resume)
+        if resume_id:
+            upload = resume_uploads.get(tenant.tenant_id, resume_id)
+            if upload is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Unknown or expired resume_id. Please upload the resume again.",
+                )
+        elif resume is not None:
+            # Read the upload; text extraction runs on the analysis job
+            resume_bytes = await read_resume_upload(resume)
+            upload = ResumeUpload(
+                resume_id=hashlib.sha256(resume_bytes).hexdigest(),
+                tenant_id=tenant.tenant_id,
+                filename=resume.filename,
+                content_type=resume.content_type,
+                content=resume_bytes,
+            )
+        else:
+            raise HTTPException(
+                status_code=400, detail="Provide either a resume file or a resume_id"
+            )
 
         # Parse optional JSON fields
         parsed_academic_status = None
@@ -629,34 +1351,21 @@ async def analyze_college_student_with_resume(
                 logger.warning("Invalid linkedin_profile JSON, ignoring")
 
         # Create user data
-        user_id_final = user_id or f"college_user_{uuid.uuid4().hex[:8]}"
-        session_id_final = session_id or f"session_{uuid.uuid4().hex[:8]}"
-
         resume_data = {
-            "content": resume_text,
+            "content": None,  # filled in by attach_uploaded_resume on the job
             "extracted_at": datetime.now().isoformat(),
             "source": "api_upload",
-            "filename": resume.filename,
+            "filename": upload.filename,
         }
-
-        user_data: UserData = {
-            "user_id": user_id_final,
-            "session_id": session_id_final,
-            "demographic_info": None,
-            "dbda_scores": None,
-            "cii_results": None,
-            "resume_data": resume_data,
-            "github_profile": parsed_github,
-            "linkedin_profile": parsed_linkedin,
-            "academic_status": parsed_academic_status,
-            "current_profession": None,
-            "financial_constraints": None,
-            "timeline_flexibility": None,
-            "family_obligations": None,
-        }
-
-        # Initialize session status
-        update_session_status(session_id_final, SessionStatus.PENDING)
+        user_data = create_college_user_data(
+            resume_data,
+            academic_status=parsed_academic_status,
+            github_profile=parsed_github,
+            linkedin_profile=parsed_linkedin,
+            user_id=user_id,
+            session_id=session_id,
+        )
+        session_id_final = user_data["session_id"]
 
         # Set default message
         initial_message_final = (
@@ -664,6 +1373,24 @@ async def analyze_college_student_with_resume(
             or "I want comprehensive career guidance and skill development recommendations based on my profile."
         )
 
+        dedup_key, fingerprint = submission_key(
+            tenant.tenant_id,
+            "college_upskilling",
+            {
+                "resume_sha256": upload.resume_id,
+                "academic_status": parsed_academic_status,
+                "github_profile": parsed_github,
+                "linkedin_profile": parsed_linkedin,
+                "initial_message": initial_message_final,
+                "user_id": user_id,
+            },
+            idempotency_key,
+        )
+        existing_session = claim_submission(dedup_key, session_id_final, fingerprint)
+        if existing_session:
+            logger.info(f"Duplicate college submission -> {existing_session}")
+            return analysis_accepted_response(existing_session, deduplicated=True)
+
         logger.info(
             {
                 "user_data": user_data,
@@ -671,24 +1398,17 @@ async def analyze_college_student_with_resume(
                 "session_id": session_id_final,
             }
         )
-        # Add background task
-        background_tasks.add_task(
-            process_college_upskilling_background,
+        admission = submit_analysis_job(
+            "college_upskilling",
             user_data,
             initial_message_final,
             session_id_final,
+            dedup_key,
+            tenant.tenant_id,
+            prepare=lambda: attach_uploaded_resume(user_data, upload),
         )
 
-        return APIResponse(
-            success=True,
-            data={
-                "message": "Analysis started. Check status using the session_id.",
-                "session_id": session_id_final,
-                "status_endpoint": f"/status/{session_id_final}",
-                "estimated_completion_time": "2-5 minutes",
-            },
-            session_id=session_id_final,
-        )
+        return analysis_accepted_response(session_id_final, admission=admission)
 
     except HTTPException:
         raise
@@ -697,14 +1417,79 @@ async def analyze_college_student_with_resume(
         return APIResponse(success=False, error=f"Internal server error: {str(e)}")
 
 
+@app.post("/resumes", response_model=APIResponse)
+async def upload_resume(
+    resume: UploadFile = File(...),
+    tenant: TenantConfig = Depends(resolve_tenant),
+):
+    """
+    Upload a resume ahead of the college-upskilling form
+
+    Parsing and the resume part of profile analysis start right away in the
+    background. Pass the returned resume_id to /college-upskilling instead
+    of the file; uploading the same file again returns the same resume_id.
+    """
+    resume_bytes = await read_resume_upload(resume)
+    upload, is_new = resume_uploads.add(
+        ResumeUpload(
+            resume_id=hashlib.sha256(resume_bytes).hexdigest(),
+            tenant_id=tenant.tenant_id,
+            filename=resume.filename,
+            content_type=resume.content_type,
+            content=resume_bytes,
+        )
+    )
+
+    if is_new:
+        try:
+            tenant_registry.admit_submission(tenant.tenant_id)
+            upload.job_id = f"resume_{upload.resume_id[:12]}_{uuid.uuid4().hex[:8]}"
+            admission = job_scheduler.submit(
+                upload.job_id,
+                "resumes",
+                lambda: preprocess_uploaded_resume(upload),
+                priority=Priority.INTERACTIVE_ANALYSIS,
+                tenant_id=tenant.tenant_id,
+            )
+            upload.future = admission.future
+        except (TenantRateLimited, AdmissionRejected) as e:
+            # Keep the bytes: the form can still reference the resume and
+            # the analysis will process it itself
+            logger.warning(f"Resume pre-processing not queued: {e.reason}")
+            upload.job_id = None
+
+    return APIResponse(
+        success=True,
+        data={
+            **upload.describe(),
+            "status_endpoint": f"/resumes/{upload.resume_id}",
+        },
+    )
+
+
+@app.get("/resumes/{resume_id}", response_model=APIResponse)
+async def get_resume_status(
+    resume_id: str, tenant: TenantConfig = Depends(resolve_tenant)
+):
+    """Pre-processing status of an uploaded resume"""
+    upload = resume_uploads.get(tenant.tenant_id, resume_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return APIResponse(success=True, data=upload.describe())
+
+
 @app.post("/career-transition", response_model=APIResponse)
 async def analyze_career_transition(
-    request: CareerTransitionRequest, background_tasks: BackgroundTasks
+    request: CareerTransitionRequest,
+    idempotency_key: Optional[str] = Header(None),
+    tenant: TenantConfig = Depends(resolve_tenant),
 ):
     """
     Analyze career transition feasibility and planning (Background Processing)
 
     Returns immediately with session_id. Use /status/{session_id} to check progress.
+    Repeated submissions (same Idempotency-Key header, or the same normalized
+    payload) return the existing session instead of starting a new run.
     """
     try:
         logger.info("Processing career transition request (background)")
@@ -715,8 +1500,20 @@ async def analyze_career_transition(
 
         session_id = user_data["session_id"]
 
-        # Initialize session status
-        update_session_status(session_id, SessionStatus.PENDING)
+        dedup_key, fingerprint = submission_key(
+            tenant.tenant_id,
+            "career_transition",
+            {
+                **request_dict,
+                "session_id": None,
+                "dbda_scores": user_data["dbda_scores"],
+            },
+            idempotency_key,
+        )
+        existing_session = claim_submission(dedup_key, session_id, fingerprint)
+        if existing_session:
+            logger.info(f"Duplicate career transition submission -> {existing_session}")
+            return analysis_accepted_response(existing_session, deduplicated=True)
 
         # Set default message
         initial_message = (
@@ -724,32 +1521,451 @@ async def analyze_career_transition(
             or "I want to explore career transition options and get a detailed transition plan."
         )
 
-        # Add background task
-        background_tasks.add_task(
-            process_career_transition_background, user_data, initial_message, session_id
+        admission = submit_analysis_job(
+            "career_transition",
+            user_data,
+            initial_message,
+            session_id,
+            dedup_key,
+            tenant.tenant_id,
         )
 
-        return APIResponse(
-            success=True,
-            data={
-                "message": "Analysis started. Check status using the session_id.",
-                "session_id": session_id,
-                "status_endpoint": f"/status/{session_id}",
-                "estimated_completion_time": "2-5 minutes",
-            },
-            session_id=session_id,
-        )
+        return analysis_accepted_response(session_id, admission=admission)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Career transition endpoint error: {e}", exc_info=True)
         return APIResponse(success=False, error=f"Internal server error: {str(e)}")
 
 
+# ========================== Batch Endpoints ==========================
+
+
+@app.post("/college-upskilling/batch", response_model=APIResponse)
+async def submit_college_batch(
+    resumes: UploadFile = File(...),
+    students: Optional[UploadFile] = File(None),
+    initial_message: Optional[str] = Form(None),
+    tenant: TenantConfig = Depends(resolve_tenant),
+):
+    """
+    Analyze many college students from a ZIP of resumes (Background Processing)
+
+    ``students`` is an optional CSV with a ``resume_file`` column naming each
+    student's file in the archive, plus any of academic_status,
+    github_profile, linkedin_profile (JSON), user_id and initial_message.
+    Without it every resume in the archive is one student.
+
+    Rows that cannot be used are reported back and skipped; identical files
+    are parsed once, and identical submissions run once. Every other row
+    gets its own session, run at batch priority. Track the whole batch with
+    /batches/{batch_id}.
+    """
+    try:
+        tenant_registry.admit_submission(tenant.tenant_id)
+    except TenantRateLimited as e:
+        raise HTTPException(
+            status_code=429, detail=e.reason, headers={"Retry-After": str(e.retry_after)}
+        )
+
+    try:
+        archive = await asyncio.to_thread(
+            read_resume_archive,
+            resumes.file,
+            BULK_MAX_RESUMES,
+            resume_parser.max_bytes,
+            BULK_MAX_ARCHIVE_BYTES,
+        )
+        if students is not None:
+            rows = await asyncio.to_thread(read_student_rows, students.file)
+        else:
+            rows = [{"resume_file": name} for name in archive]
+    except BulkUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not rows:
+        raise HTTPException(status_code=400, detail="No resumes found in the upload")
+    if len(rows) > BULK_MAX_RESUMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"More than {BULK_MAX_RESUMES} students in one batch; split it up",
+        )
+
+    batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+    default_message = (
+        initial_message
+        or "I want comprehensive career guidance and skill development recommendations based on my profile."
+    )
+    items: List[BatchItem] = []
+    submissions_to_feed = []
+    uploads: Dict[str, ResumeUpload] = {}  # resume sha256 -> shared upload
+    first_item_for: Dict[str, int] = {}  # submission fingerprint -> item index
+
+    for index, row in enumerate(rows):
+        item = BatchItem(index=index, label=row.get("resume_file", ""))
+        items.append(item)
+
+        resume_file = match_resume(archive, row.get("resume_file", ""))
+        if resume_file is None:
+            item.error = "resume_file not found in the archive"
+            continue
+        try:
+            academic = parse_json_field(row.get("academic_status"), "academic_status")
+            github = parse_json_field(row.get("github_profile"), "github_profile")
+            linkedin = parse_json_field(row.get("linkedin_profile"), "linkedin_profile")
+        except ValueError as e:
+            item.error = str(e)
+            continue
+
+        resume_id = hashlib.sha256(resume_file.content).hexdigest()
+        message = row.get("initial_message") or default_message
+        fingerprint = submission_fingerprint(
+            "college_upskilling",
+            {
+                "resume_sha256": resume_id,
+                "academic_status": academic,
+                "github_profile": github,
+                "linkedin_profile": linkedin,
+                "initial_message": message,
+                "user_id": row.get("user_id"),
+            },
+        )
+        if fingerprint in first_item_for:
+            item.duplicate_of = first_item_for[fingerprint]
+            continue
+        first_item_for[fingerprint] = index
+
+        upload = uploads.setdefault(
+            resume_id,
+            ResumeUpload(
+                resume_id=resume_id,
+                tenant_id=tenant.tenant_id,
+                filename=posixpath.basename(resume_file.name),
+                content_type=resume_file.content_type,
+                content=resume_file.content,
+            ),
+        )
+        user_data = create_college_user_data(
+            {
+                "content": None,  # filled in by attach_uploaded_resume on the job
+                "extracted_at": datetime.now().isoformat(),
+                "source": "bulk_upload",
+                "filename": upload.filename,
+                "batch_id": batch_id,
+            },
+            academic_status=academic,
+            github_profile=github,
+            linkedin_profile=linkedin,
+            user_id=row.get("user_id") or None,
+        )
+        item.session_id = user_data["session_id"]
+        item.details["user_id"] = user_data["user_id"]
+        update_session_status(
+            item.session_id, SessionStatus.PENDING, tenant_id=tenant.tenant_id
+        )
+        submissions_to_feed.append(
+            (
+                item,
+                batch_job_submitter(
+                    "college_upskilling",
+                    user_data,
+                    message,
+                    item.session_id,
+                    tenant.tenant_id,
+                    prepare=lambda user_data=user_data, upload=upload: (
+                        attach_uploaded_resume(user_data, upload)
+                    ),
+                ),
+            )
+        )
+
+    batch = Batch(
+        batch_id,
+        tenant.tenant_id,
+        "college_upskilling",
+        items,
+        max_in_flight=BATCH_MAX_IN_FLIGHT,
+    )
+    batches.add(batch)
+    # Parse every distinct file up front, in parallel, while analyses queue
+    resume_parser.prefetch(
+        (upload.content, upload.content_type) for upload in uploads.values()
+    )
+    batch.start(submissions_to_feed)
+    logger.info(
+        f"Batch {batch_id}: {len(submissions_to_feed)} analyses from "
+        f"{len(uploads)} distinct resumes"
+    )
+
+    return APIResponse(
+        success=True,
+        data={
+            "message": "Batch accepted. Track progress using the batch_id.",
+            "batch_id": batch_id,
+            "status_endpoint": f"/batches/{batch_id}",
+            "distinct_resumes": len(uploads),
+            "progress": batch.progress(batch_statuses(batch)),
+            "rejected": [item.describe() for item in items if item.error],
+            "duplicates": [
+                item.describe() for item in items if item.duplicate_of is not None
+            ],
+        },
+    )
+
+
+@app.post("/school-students/batch", response_model=APIResponse)
+async def submit_school_roster(
+    roster: UploadFile = File(...),
+    school_name: Optional[str] = Form(None),
+    initial_message: Optional[str] = Form(None),
+    skip_invalid: bool = Form(False),
+    tenant: TenantConfig = Depends(resolve_tenant),
+):
+    """
+    Analyze a whole class from a roster CSV (Background Processing)
+
+    Columns: name, grade, gender, CA, CL, MA, NA, PM, RA, SA, VA (raw
+    "achieved/total" scores), artistic, scientific, social, conventional,
+    enterprising, realistic (CII, 0-10); optionally user_id, age,
+    school_name, location.
+
+    Every row is validated first. If any row is invalid nothing is queued
+    and the response (422) lists each problem by row, unless skip_invalid
+    is set, in which case the valid rows go ahead. Track the batch with
+    /batches/{batch_id} and download everything from
+    /batches/{batch_id}/results.
+    """
+    calculator = StenCalculator()
+    try:
+        rows, row_errors = await asyncio.to_thread(
+            read_roster, roster.file, calculator, ROSTER_MAX_ROWS, school_name
+        )
+    except RosterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if row_errors and not skip_invalid:
+        return JSONResponse(
+            status_code=422,
+            content=APIResponse(
+                success=False,
+                error=(
+                    f"{len(row_errors)} roster rows failed validation; "
+                    "nothing was queued"
+                ),
+                data={"valid_rows": len(rows), "errors": row_errors},
+                timestamp=datetime.now().isoformat(),
+            ).dict(),
+        )
+    if not rows:
+        raise HTTPException(status_code=400, detail="Roster has no valid students")
+
+    try:
+        tenant_registry.admit_submission(tenant.tenant_id)
+    except TenantRateLimited as e:
+        raise HTTPException(
+            status_code=429, detail=e.reason, headers={"Retry-After": str(e.retry_after)}
+        )
+
+    batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+    message = (
+        initial_message
+        or "I need comprehensive academic and career guidance based on my assessment results."
+    )
+    items: List[BatchItem] = []
+    submissions_to_feed = []
+    for index, row in enumerate(rows):
+        user_data = create_user_data_from_request(
+            row.request, "school_student", dbda_sten_scores=row.stens
+        )
+        item = BatchItem(
+            index=index,
+            label=row.label,
+            session_id=user_data["session_id"],
+            details={
+                "row": row.row_number,
+                "name": row.name,
+                "user_id": user_data["user_id"],
+                "stens": row.stens,
+            },
+        )
+        items.append(item)
+        update_session_status(
+            item.session_id, SessionStatus.PENDING, tenant_id=tenant.tenant_id
+        )
+        submissions_to_feed.append(
+            (
+                item,
+                batch_job_submitter(
+                    "school_students",
+                    user_data,
+                    message,
+                    item.session_id,
+                    tenant.tenant_id,
+                ),
+            )
+        )
+
+    batch = Batch(
+        batch_id,
+        tenant.tenant_id,
+        "school_students",
+        items,
+        max_in_flight=BATCH_MAX_IN_FLIGHT,
+    )
+    batches.add(batch)
+    batch.start(submissions_to_feed)
+    logger.info(f"Batch {batch_id}: {len(items)} school students from roster")
+
+    return APIResponse(
+        success=True,
+        data={
+            "message": "Roster accepted. Track progress using the batch_id.",
+            "batch_id": batch_id,
+            "status_endpoint": f"/batches/{batch_id}",
+            "results_endpoint": f"/batches/{batch_id}/results",
+            "progress": batch.progress(batch_statuses(batch)),
+            "skipped_rows": row_errors,
+        },
+    )
+
+
+@app.get("/batches/{batch_id}", response_model=APIResponse)
+async def get_batch_status(
+    batch_id: str, tenant: TenantConfig = Depends(resolve_tenant)
+):
+    """Aggregate progress of a batch, with each item's session and status"""
+    batch = batches.get(tenant.tenant_id, batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    statuses = batch_statuses(batch)
+    return APIResponse(
+        success=True,
+        data={
+            "batch_id": batch_id,
+            "vertical": batch.vertical,
+            "cancelled": batch.cancelled,
+            "progress": batch.progress(statuses),
+            "items": [
+                {**item.describe(), "status": statuses.get(item.session_id)}
+                for item in batch.items
+            ],
+        },
+    )
+
+
+@app.get("/batches/{batch_id}/results")
+async def download_batch_results(
+    batch_id: str,
+    format: str = "jsonl",
+    tenant: TenantConfig = Depends(resolve_tenant),
+):
+    """
+    Download a batch's consolidated results
+
+    ``jsonl`` (default) gives one line per student with the full analysis;
+    ``csv`` gives one summary row per student (status, error, stens). Items
+    that are still running appear with their current status, so the
+    download can be repeated until the batch is done.
+    """
+    batch = batches.get(tenant.tenant_id, batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    if format not in ("jsonl", "csv"):
+        raise HTTPException(status_code=400, detail="format must be jsonl or csv")
+
+    def records():
+        for item in batch.items:
+            session_info = (
+                get_session_status(item.session_id, tenant.tenant_id)
+                if item.session_id
+                else {}
+            )
+            status = session_info.get("status")
+            yield {
+                **item.describe(),
+                "status": status.value if status else None,
+                "error": item.error or session_info.get("error"),
+                "updated_at": session_info.get("updated_at"),
+                "result": session_info.get("data"),
+            }
+
+    filename = f"{batch_id}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "jsonl":
+        lines = (json.dumps(record, default=str) + "\n" for record in records())
+        return StreamingResponse(
+            lines, media_type="application/x-ndjson", headers=headers
+        )
+
+    def csv_lines():
+        stens = sorted(
+            {key for item in batch.items for key in item.details.get("stens", {})}
+        )
+        columns = [
+            "index",
+            "label",
+            "user_id",
+            "session_id",
+            "status",
+            "error",
+            "updated_at",
+        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns + [f"sten_{ability}" for ability in stens])
+        for record in records():
+            writer.writerow(
+                [record.get(column) for column in columns]
+                + [record.get("stens", {}).get(ability) for ability in stens]
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    return StreamingResponse(csv_lines(), media_type="text/csv", headers=headers)
+
+
+@app.delete("/batches/{batch_id}", response_model=APIResponse)
+async def cancel_batch(batch_id: str, tenant: TenantConfig = Depends(resolve_tenant)):
+    """Cancel every unfinished item of a batch"""
+    batch = batches.get(tenant.tenant_id, batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    never_started = {item.index for item in batch.cancel()}
+    cancelled = 0
+    for item in batch.items:
+        if item.session_id is None:
+            continue
+        previous = cancel_session(item.session_id, tenant.tenant_id)
+        if previous in (SessionStatus.PENDING, SessionStatus.PROCESSING):
+            cancelled += 1
+            if item.index not in never_started:
+                job_scheduler.cancel(item.session_id)
+
+    logger.info(f"Cancelled batch {batch_id} ({cancelled} unfinished items)")
+    return APIResponse(
+        success=True,
+        data={
+            "batch_id": batch_id,
+            "cancelled_items": cancelled,
+            "progress": batch.progress(batch_statuses(batch)),
+        },
+    )
+
+
 # ========================== Status Checking Endpoints ==========================
 
 
 @app.get("/status/{session_id}", response_model=APIResponse)
-async def get_analysis_status(session_id: str):
+async def get_analysis_status(
+    session_id: str,
+    request: Request,
+    debug: bool = False,
+    tenant: TenantConfig = Depends(resolve_tenant),
+):
     """
     Check the status of a background analysis task
 
@@ -758,41 +1974,80 @@ async def get_analysis_status(session_id: str):
     - processing: Analysis is in progress
     - completed: Analysis is complete with results
     - failed: Analysis failed with error message
+    - cancelled: Analysis was cancelled via DELETE /sessions/{session_id}
+
+    Completed results are served pre-serialized with an ETag; send it back
+    in If-None-Match to get a 304 instead of the full body.
+
+    With ``debug=true`` the response also carries ``debug.timing``: the
+    finished run's time per kind of step (LLM call, LLM queue, prompt,
+    parse, tracing, other), per agent, along the critical path and for the
+    slowest steps, plus the full span tree. Debug responses are built
+    fresh and never cached.
     """
     try:
-        session_info = get_session_status(session_id)
+        session_info = get_session_status(session_id, tenant.tenant_id)
+        if debug:
+            response = build_status_response(session_id, session_info)
+            response.data["debug"] = {"timing": session_info.get("timing")}
+            return response
+        if session_info["status"] != SessionStatus.COMPLETED:
+            return build_status_response(session_id, session_info)
 
-        return APIResponse(
-            success=True,
-            data={
-                "session_id": session_id,
-                "status": session_info["status"],
-                "updated_at": session_info["updated_at"],
-                "results": (
-                    session_info["data"]
-                    if session_info["status"] == SessionStatus.COMPLETED
-                    else None
-                ),
-                "error": (
-                    session_info["error"]
-                    if session_info["status"] == SessionStatus.FAILED
-                    else None
-                ),
-                "can_chat": session_info["status"] == SessionStatus.COMPLETED,
-            },
-            session_id=session_id,
+        cached = completed_responses.get(session_id) or cache_completed_response(
+            session_id
         )
+        if cached is None:
+            return build_status_response(session_id, get_session_status(session_id))
+
+        return serve_serialized_response(cached, request)
 
     except Exception as e:
         logger.error(f"Status check error: {e}")
         return APIResponse(success=False, error=str(e), session_id=session_id)
 
 
+@app.delete("/sessions/{session_id}", response_model=APIResponse)
+async def cancel_analysis(
+    session_id: str, tenant: TenantConfig = Depends(resolve_tenant)
+):
+    """
+    Cancel a pending or processing analysis
+
+    A queued analysis is dropped before it starts. A running one stops at
+    the next agent or sub-agent step and abandons its in-flight LLM call,
+    so its worker and LLM capacity are freed right away.
+    """
+    previous = cancel_session(session_id, tenant.tenant_id)
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if previous not in (SessionStatus.PENDING, SessionStatus.PROCESSING):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Session is already {previous.value} and cannot be cancelled",
+        )
+
+    job_state = job_scheduler.cancel(session_id)
+    logger.info(f"Cancelled session {session_id} (job {job_state or 'not found'})")
+
+    return APIResponse(
+        success=True,
+        data={
+            "session_id": session_id,
+            "status": SessionStatus.CANCELLED,
+            "previous_status": previous,
+        },
+        session_id=session_id,
+    )
+
+
 # ========================== Modified Chat Endpoint ==========================
 
 
 @app.post("/chat", response_model=APIResponse)
-async def chat_with_counselor(request: ChatMessage):
+async def chat_with_counselor(
+    request: ChatMessage, tenant: TenantConfig = Depends(resolve_tenant)
+):
     """
     Continue conversation with the counselor in an existing session
 
@@ -802,7 +2057,7 @@ async def chat_with_counselor(request: ChatMessage):
         logger.info(f"Processing chat message for session: {request.session_id}")
 
         # Check if session is completed
-        session_info = get_session_status(request.session_id)
+        session_info = get_session_status(request.session_id, tenant.tenant_id)
         if session_info["status"] != SessionStatus.COMPLETED:
             return APIResponse(
                 success=False,
@@ -813,12 +2068,34 @@ async def chat_with_counselor(request: ChatMessage):
         # Get orchestrator
         orch = get_orchestrator()
 
-        # Handle follow-up question
-        result = orch.ask_follow_up_question(
-            session_id=request.session_id,
-            question=request.message,
-            user_id=request.user_id,
-        )
+        # Handle follow-up question on the scheduler's interactive lane so it
+        # overtakes queued analyses and does not block the event loop
+        try:
+            admission = job_scheduler.submit(
+                f"chat_{uuid.uuid4().hex[:8]}",
+                "chat",
+                lambda: orch.ask_follow_up_question(
+                    session_id=request.session_id,
+                    question=request.message,
+                    user_id=request.user_id,
+                ),
+                priority=Priority.INTERACTIVE_CHAT,
+                tenant_id=tenant.tenant_id,
+                session_id=request.session_id,
+            )
+            result = await asyncio.wrap_future(admission.future)
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=429,
+                detail=e.reason,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        except LLMBudgetExceeded as e:
+            raise HTTPException(
+                status_code=429,
+                detail=e.reason,
+                headers={"Retry-After": str(e.retry_after)},
+            )
 
         if result.get("success"):
             logger.info(f"Chat response generated for session: {request.session_id}")
@@ -833,6 +2110,8 @@ async def chat_with_counselor(request: ChatMessage):
                 session_id=request.session_id,
             )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Chat endpoint error: {e}", exc_info=True)
         return APIResponse(
@@ -852,6 +2131,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         content=APIResponse(
             success=False, error=exc.detail, timestamp=datetime.now().isoformat()
         ).dict(),
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -871,17 +2151,29 @@ async def general_exception_handler(request: Request, exc: Exception):
 # ========================== Startup/Shutdown Events ==========================
 
 
+# Samples event-loop lag for /metrics while the server runs
+event_loop_monitor: Optional[asyncio.Task] = None
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
     logger.info("Starting Virtual Counselor API...")
+    global event_loop_monitor
+    event_loop_monitor = asyncio.create_task(
+        monitor_event_loop_lag(
+            float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+        )
+    )
 
-    # Pre-initialize orchestrator to catch any startup issues
-    try:
-        get_orchestrator()
-        logger.info("Orchestrator pre-initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to pre-initialize orchestrator: {e}")
+    # The orchestrator and the fleets are built on first use. Deployments
+    # that keep warm instances can build everything up front instead.
+    if os.getenv("PREWARM_ON_STARTUP", "false").lower() in ("1", "true", "yes"):
+        try:
+            get_orchestrator().warm_up()
+            logger.info("Orchestrator and agent fleets pre-initialized")
+        except Exception as e:
+            logger.error(f"Failed to pre-initialize orchestrator: {e}")
 
     logger.info("Virtual Counselor API started successfully")
 
@@ -890,5 +2182,10 @@ async def startup_event():
 async def shutdown_event():
     """Clean up on shutdown"""
     logger.info("Shutting down Virtual Counselor API...")
-    # Add any cleanup code here
+    if event_loop_monitor is not None:
+        event_loop_monitor.cancel()
+    job_scheduler.shutdown()
+    resume_parser.shutdown()
+    get_tracer().shutdown()
+    get_llm_accountant().close()
     logger.info("Virtual Counselor API shut down complete")
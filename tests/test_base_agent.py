@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agentic_layer.base_agent import BaseAgent
+from config.agent_config import AgentType, ProcessingStatus
+
+
+class SleepyAgent(BaseAgent):
+    """Sleeps for the requested time, noting each step"""
+
+    def _define_required_inputs(self):
+        return ["seconds"]
+
+    def _define_optional_inputs(self):
+        return []
+
+    def _define_output_schema(self):
+        return {}
+
+    def _initialize_agent(self):
+        pass
+
+    def _process_core_logic(self, validated_input):
+        seconds = validated_input["required_data"]["seconds"]
+        self._add_processing_note(f"start {seconds}")
+        time.sleep(seconds)
+        self._add_processing_note(f"end {seconds}")
+        return {"slept": seconds}
+
+
+def run(agent, seconds):
+    return agent.execute(
+        {
+            "user_data": {"seconds": seconds},
+            "conversation_context": {},
+            "previous_agent_outputs": {},
+            "session_metadata": {},
+        }
+    )
+
+
+def test_concurrent_runs_keep_their_own_time_and_notes():
+    agent = SleepyAgent("sleepy", "Sleepy Agent", AgentType.UTILITY)
+    results = {}
+
+    def work(seconds):
+        results[seconds] = run(agent, seconds)
+
+    threads = [threading.Thread(target=work, args=(s,)) for s in (0.3, 0.05)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for seconds, result in results.items():
+        assert result.status == ProcessingStatus.COMPLETED
+        assert seconds <= result.processing_time < seconds + 0.2
+        notes = [note["note"] for note in result.metadata["processing_notes"]]
+        assert notes == [f"start {seconds}", f"end {seconds}"]
+
+
+def test_notes_do_not_carry_over_between_runs():
+    agent = SleepyAgent("sleepy", "Sleepy Agent", AgentType.UTILITY)
+    run(agent, 0)
+
+    assert len(run(agent, 0).metadata["processing_notes"]) == 2
@@ -0,0 +1,144 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import server.run as run
+from core.cancellation import raise_if_cancelled
+from core.job_scheduler import JobScheduler, VerticalLimits
+from core.tenancy import TenantConfig, TenantRegistry
+
+SCHOOL_STUDENT = {
+    "demographic_info": {"name": "Asha", "current_grade": 10, "gender": "female"},
+    "dbda_scores": {"CA": "5/20", "VA": "9/24"},
+    "cii_results": {
+        "artistic": 7,
+        "scientific": 8,
+        "social": 5,
+        "conventional": 4,
+        "enterprising": 6,
+        "realistic": 3,
+    },
+}
+HEADERS = {"X-API-Key": "key-a"}
+process_analysis_background = run.process_analysis_background
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """The app with a one-worker scheduler whose analyses run until cancelled"""
+    tenants = TenantRegistry(
+        [
+            TenantConfig(tenant_id="a", api_keys=["key-a"]),
+            TenantConfig(tenant_id="b", api_keys=["key-b"]),
+        ]
+    )
+    scheduler = JobScheduler(
+        max_workers=1,
+        chat_reserved_workers=0,
+        limits={"school_students": VerticalLimits(max_running=1, max_queued=1)},
+        tenants=tenants,
+    )
+    started = threading.Event()
+
+    def analysis(vertical, user_data, initial_message, session_id, prepare=None):
+        run.update_session_status(session_id, run.SessionStatus.PROCESSING)
+        started.set()
+        while True:
+            raise_if_cancelled()
+            time.sleep(0.01)
+
+    monkeypatch.setattr(run, "tenant_registry", tenants)
+    monkeypatch.setattr(run, "job_scheduler", scheduler)
+    monkeypatch.setattr(run, "process_analysis_background", analysis)
+    client = TestClient(run.app)
+    client.started = started
+    yield client
+    for job_id in list(scheduler._running):
+        scheduler.cancel(job_id)
+    scheduler.shutdown()
+
+
+def submit(api, name, headers=HEADERS):
+    body = {
+        **SCHOOL_STUDENT,
+        "demographic_info": {**SCHOOL_STUDENT["demographic_info"], "name": name},
+    }
+    return api.post("/school-students", json=body, headers=headers)
+
+
+def session_of(response):
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["session_id"]
+
+
+def test_cancel_running_and_queued_sessions(api):
+    running = session_of(submit(api, "Running"))
+    assert api.started.wait(5)
+    queued = session_of(submit(api, "Queued"))
+    assert run.session_storage[queued]["status"] == run.SessionStatus.PENDING
+
+    response = api.delete(f"/sessions/{queued}", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["data"]["previous_status"] == "pending"
+    assert run.job_scheduler.tenant_snapshot("a")["queued"] == 0
+
+    response = api.delete(f"/sessions/{running}", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["data"]["previous_status"] == "processing"
+    for _ in range(500):
+        if not run.job_scheduler._running:
+            break
+        time.sleep(0.01)
+    assert not run.job_scheduler._running
+    assert run.session_storage[running]["status"] == run.SessionStatus.CANCELLED
+
+
+def test_cancel_finished_session_conflicts(api):
+    session_id = session_of(submit(api, "Finished"))
+    assert api.started.wait(5)
+    with run.session_lock:
+        run.session_storage[session_id]["status"] = run.SessionStatus.COMPLETED
+
+    response = api.delete(f"/sessions/{session_id}", headers=HEADERS)
+
+    assert response.status_code == 409
+    assert run.session_storage[session_id]["status"] == run.SessionStatus.COMPLETED
+
+
+def test_cancel_unknown_or_foreign_session_is_not_found(api):
+    session_id = session_of(submit(api, "Foreign"))
+
+    assert api.delete("/sessions/session_missing", headers=HEADERS).status_code == 404
+    response = api.delete(f"/sessions/{session_id}", headers={"X-API-Key": "key-b"})
+    assert response.status_code == 404
+    assert run.session_storage[session_id]["status"] != run.SessionStatus.CANCELLED
+
+
+def test_full_queue_answers_429_with_retry_after(api):
+    session_of(submit(api, "First"))
+    assert api.started.wait(5)
+    session_of(submit(api, "Second"))
+    sessions = len(run.session_storage)
+
+    response = submit(api, "Third")
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert "Too many pending requests" in response.json()["error"]
+    assert len(run.session_storage) == sessions
+
+
+def test_session_cancelled_before_its_job_starts_is_skipped(monkeypatch):
+    monkeypatch.setattr(run, "get_orchestrator", pytest.fail)
+    run.update_session_status("session_skip", run.SessionStatus.PENDING)
+    run.cancel_session("session_skip")
+
+    process_analysis_background("college_upskilling", {}, "", "session_skip")
+
+    assert run.session_storage["session_skip"]["status"] == run.SessionStatus.CANCELLED
@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analytics.cohorts import OTHER, CohortAnalytics
+from analytics.session_facts import SessionFacts
+
+
+def facts(session_id, careers=(), stream=None):
+    return SessionFacts(
+        session_id=session_id,
+        vertical="school_students",
+        tenant_id="a",
+        period="2026-10",
+        recommended_stream=stream,
+        top_careers=list(careers),
+    )
+
+
+def test_recorded_sessions_are_bounded():
+    cohorts = CohortAnalytics(max_recorded=2)
+
+    assert cohorts.record(facts("s1"))
+    assert cohorts.record(facts("s2"))
+    assert not cohorts.record(facts("s2"))
+    assert cohorts.record(facts("s3"))
+
+    assert len(cohorts._recorded) == 2
+    assert cohorts.snapshot()["sessions"] == 3
+
+
+def test_free_text_values_are_normalized_and_capped():
+    cohorts = CohortAnalytics(max_values_per_cell=2)
+    cohorts.record(facts("s1", ["Data Scientist", "  data   scientist. "]))
+    cohorts.record(facts("s2", ["Doctor", "Pilot", "Chef"], stream="Science"))
+
+    careers = {
+        row["value"]: row["sessions"]
+        for row in cohorts.query("a")["top_careers"]
+    }
+
+    assert careers == {"Data Scientist": 1, "Doctor": 1, OTHER: 1}
+    assert cohorts.query("a")["recommended_streams"][0]["value"] == "Science"
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.fair_queue import Priority, WeightedFairQueue
+
+
+def drain(queue, eligible=None):
+    items = []
+    while True:
+        item = queue.pop(eligible)
+        if item is None:
+            return items
+        items.append(item)
+
+
+def test_fifo_within_a_class():
+    queue = WeightedFairQueue()
+    for item in ["a", "b", "c"]:
+        queue.push(Priority.BATCH, item)
+
+    assert drain(queue) == ["a", "b", "c"]
+
+
+def test_classes_are_served_in_proportion_to_weight():
+    queue = WeightedFairQueue(
+        {
+            Priority.INTERACTIVE_CHAT: 4.0,
+            Priority.INTERACTIVE_ANALYSIS: 2.0,
+            Priority.BATCH: 1.0,
+        }
+    )
+    for index in range(8):
+        queue.push(Priority.BATCH, f"batch-{index}")
+        queue.push(Priority.INTERACTIVE_ANALYSIS, f"analysis-{index}")
+        queue.push(Priority.INTERACTIVE_CHAT, f"chat-{index}")
+
+    first = [item.split("-")[0] for item in drain(queue)[:7]]
+
+    assert first.count("chat") == 4
+    assert first.count("analysis") == 2
+    assert first.count("batch") == 1
+    assert first[0] == "chat"
+
+
+def test_batch_is_not_starved():
+    queue = WeightedFairQueue()
+    queue.push(Priority.BATCH, "batch")
+    for index in range(20):
+        queue.push(Priority.INTERACTIVE_CHAT, f"chat-{index}")
+
+    assert "batch" in drain(queue)[:10]
+
+
+def test_idle_class_does_not_bank_credit():
+    queue = WeightedFairQueue(
+        {
+            Priority.INTERACTIVE_CHAT: 1.0,
+            Priority.INTERACTIVE_ANALYSIS: 1.0,
+            Priority.BATCH: 1.0,
+        }
+    )
+    for index in range(10):
+        queue.push(Priority.BATCH, f"batch-{index}")
+    assert [queue.pop() for _ in range(6)] == [f"batch-{index}" for index in range(6)]
+
+    for index in range(3):
+        queue.push(Priority.INTERACTIVE_CHAT, f"chat-{index}")
+
+    # Equal weights: chat alternates with batch instead of catching up
+    assert [queue.pop() for _ in range(4)] == [
+        "chat-0",
+        "batch-6",
+        "chat-1",
+        "batch-7",
+    ]
+
+
+def test_pop_skips_ineligible_items_without_reordering():
+    queue = WeightedFairQueue()
+    for item in ["a", "b", "c"]:
+        queue.push(Priority.BATCH, item)
+
+    assert queue.pop(lambda item: item != "a") == "b"
+    assert drain(queue) == ["a", "c"]
+    assert queue.pop(lambda item: False) is None
+
+
+def test_remove_and_count():
+    queue = WeightedFairQueue()
+    queue.push(Priority.BATCH, "a")
+    queue.push(Priority.INTERACTIVE_CHAT, "b")
+    queue.push(Priority.BATCH, "c")
+
+    assert sorted(queue.remove(lambda item: item in ("a", "b"))) == ["a", "b"]
+    assert queue.count(Priority.BATCH) == 1
+    assert queue.count(Priority.INTERACTIVE_CHAT) == 0
+    assert len(queue) == 1
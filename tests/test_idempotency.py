@@ -0,0 +1,104 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from server import idempotency
+from server.idempotency import (
+    IdempotencyConflict,
+    IdempotencyRegistry,
+    submission_fingerprint,
+)
+
+
+def always_live(session_id):
+    return True
+
+
+def test_fingerprint_ignores_field_order_nulls_and_whitespace():
+    fingerprint = submission_fingerprint(
+        "school_students", {"name": "Asha", "grade": 10, "school": None}
+    )
+
+    assert fingerprint == submission_fingerprint(
+        "school_students", {"grade": 10, "name": " Asha ", "notes": []}
+    )
+    assert fingerprint != submission_fingerprint(
+        "school_students", {"name": "Asha", "grade": 11}
+    )
+    assert fingerprint != submission_fingerprint(
+        "college_students", {"name": "Asha", "grade": 10}
+    )
+
+
+def test_fingerprint_encodes_values_like_the_api():
+    assert submission_fingerprint(
+        "college_upskilling", {"graduation": date(2026, 5, 1)}
+    ) == submission_fingerprint("college_upskilling", {"graduation": "2026-05-01"})
+
+
+def test_duplicate_claim_returns_existing_session():
+    registry = IdempotencyRegistry()
+
+    assert registry.claim("key", "session-1", always_live) is None
+    assert registry.claim("key", "session-2", always_live) == "session-1"
+    assert len(registry) == 1
+
+
+def test_dead_session_is_replaced():
+    registry = IdempotencyRegistry()
+    registry.claim("key", "session-1", always_live)
+
+    assert registry.claim("key", "session-2", lambda session_id: False) is None
+    assert registry.claim("key", "session-3", always_live) == "session-2"
+
+
+def test_release_only_forgets_own_session():
+    registry = IdempotencyRegistry()
+    registry.claim("key", "session-1", always_live)
+
+    registry.release("key", "session-2")
+    assert len(registry) == 1
+    registry.release("key", "session-1")
+    assert len(registry) == 0
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(idempotency.time, "monotonic", lambda: now[0])
+    registry = IdempotencyRegistry(ttl_seconds=60)
+    registry.claim("old", "session-1", always_live)
+    now[0] += 30
+    registry.claim("new", "session-2", always_live)
+
+    now[0] += 31
+    assert registry.claim("old", "session-3", always_live) is None
+    assert registry.claim("new", "session-4", always_live) == "session-2"
+
+
+def test_reused_key_with_a_different_payload_conflicts():
+    registry = IdempotencyRegistry()
+    registry.claim("key", "session-1", always_live, fingerprint="a")
+
+    assert registry.claim("key", "session-2", always_live, fingerprint="a") == (
+        "session-1"
+    )
+    with pytest.raises(IdempotencyConflict):
+        registry.claim("key", "session-3", always_live, fingerprint="b")
+    # A failed session does not hold on to its payload
+    assert registry.claim("key", "session-4", lambda s: False, fingerprint="b") is None
+
+
+def test_least_recently_used_key_is_evicted():
+    registry = IdempotencyRegistry(max_entries=2)
+    registry.claim("a", "session-1", always_live)
+    registry.claim("b", "session-2", always_live)
+    registry.claim("a", "session-3", always_live)
+    registry.claim("c", "session-4", always_live)
+
+    assert len(registry) == 2
+    assert registry.claim("a", "session-5", always_live) == "session-1"
+    assert registry.claim("b", "session-6", always_live) is None
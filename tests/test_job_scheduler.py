@@ -0,0 +1,121 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.cancellation import OperationCancelled, raise_if_cancelled
+from core.fair_queue import Priority
+from core.job_scheduler import AdmissionRejected, JobScheduler, VerticalLimits
+from core.request_context import current_context
+from core.tenancy import TenantConfig, TenantRegistry
+
+
+def scheduler(**kwargs):
+    kwargs.setdefault("max_workers", 2)
+    kwargs.setdefault("chat_reserved_workers", 0)
+    return JobScheduler(**kwargs)
+
+
+def test_jobs_run_under_their_session():
+    jobs = scheduler()
+
+    def context():
+        bound = current_context()
+        return bound.session_id, bound.vertical, bound.priority, bound.tenant_id
+
+    chat = jobs.submit(
+        "chat_1234",
+        "chat",
+        context,
+        priority=Priority.INTERACTIVE_CHAT,
+        tenant_id="school-a",
+        session_id="session_abcd",
+    )
+    resume = jobs.submit("resume_5678", "resumes", context)
+
+    assert chat.future.result(timeout=5) == (
+        "session_abcd",
+        "chat",
+        Priority.INTERACTIVE_CHAT,
+        "school-a",
+    )
+    assert resume.future.result(timeout=5)[0] is None
+    jobs.shutdown()
+
+
+def block_until_cancelled(started: threading.Event):
+    def run():
+        started.set()
+        while True:
+            raise_if_cancelled()
+            time.sleep(0.01)
+
+    return run
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    jobs = scheduler(
+        max_workers=1,
+        limits={"school_students": VerticalLimits(max_running=1, max_queued=1)},
+        default_duration_seconds=60,
+    )
+    started = threading.Event()
+    running = jobs.submit("a", "school_students", block_until_cancelled(started))
+    queued = jobs.submit("b", "school_students", lambda: "b")
+
+    assert running.started_immediately
+    assert not queued.started_immediately
+    assert queued.queue_position == 0
+    with pytest.raises(AdmissionRejected) as rejected:
+        jobs.submit("c", "school_students", lambda: "c")
+    assert rejected.value.retry_after == 60
+
+    started.wait(5)
+    jobs.cancel("a")
+    assert queued.future.result(timeout=5) == "b"
+    jobs.shutdown()
+
+
+def test_tenant_queue_cap_is_enforced():
+    tenants = TenantRegistry(
+        [TenantConfig(tenant_id="a", api_keys=["k"], max_running=1, max_queued=0)]
+    )
+    jobs = scheduler(tenants=tenants)
+    started = threading.Event()
+    jobs.submit("a-1", "school_students", block_until_cancelled(started), tenant_id="a")
+
+    with pytest.raises(AdmissionRejected):
+        jobs.submit("a-2", "school_students", lambda: None, tenant_id="a")
+    # Other tenants still get the free worker
+    assert jobs.submit("b-1", "school_students", lambda: "b").future.result(5) == "b"
+
+    started.wait(5)
+    jobs.cancel("a-1")
+    jobs.shutdown()
+
+
+def test_cancel_queued_running_and_unknown_jobs():
+    jobs = scheduler(max_workers=1)
+    started = threading.Event()
+    running = jobs.submit("a", "school_students", block_until_cancelled(started))
+    ran = []
+    queued = jobs.submit("b", "school_students", lambda: ran.append("b"))
+    started.wait(5)
+
+    assert jobs.cancel("b") == "queued"
+    with pytest.raises(OperationCancelled):
+        queued.future.result(timeout=5)
+
+    assert jobs.cancel("a") == "running"
+    with pytest.raises(OperationCancelled):
+        running.future.result(timeout=5)
+
+    assert jobs.cancel("a") is None
+    assert jobs.cancel("unknown") is None
+    assert ran == []
+    assert jobs.snapshot()["school_students"]["running"] == 0
+    jobs.shutdown()
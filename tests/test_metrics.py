@@ -0,0 +1,107 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.metrics import Counter, Histogram, MetricsRegistry, family
+
+
+def test_counter_exposition():
+    registry = MetricsRegistry()
+    calls = registry.register(
+        Counter("llm_calls_total", "LLM calls\nby outcome", ("model", "outcome"))
+    )
+    calls.inc("flash", "ok")
+    calls.inc("flash", "ok", amount=2)
+    calls.inc('we"ird\\', "error", amount=0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP llm_calls_total LLM calls\\nby outcome",
+        "# TYPE llm_calls_total counter",
+        'llm_calls_total{model="flash",outcome="ok"} 3',
+        'llm_calls_total{model="we\\"ird\\\\",outcome="error"} 0.5',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    seconds = registry.register(
+        Histogram("step_seconds", "Step time", ("step",), buckets=(1, 0.25))
+    )
+    for value in (0.1, 0.25, 0.5, 3):
+        seconds.observe(value, "parse")
+
+    assert registry.render().splitlines() == [
+        "# HELP step_seconds Step time",
+        "# TYPE step_seconds histogram",
+        'step_seconds_bucket{step="parse",le="0.25"} 2',
+        'step_seconds_bucket{step="parse",le="1"} 3',
+        'step_seconds_bucket{step="parse",le="+Inf"} 4',
+        'step_seconds_sum{step="parse"} 3.85',
+        'step_seconds_count{step="parse"} 4',
+    ]
+
+
+def test_shards_from_every_thread_are_summed():
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("requests_total", "Requests"))
+
+    def work():
+        for _ in range(1000):
+            requests.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    requests.inc()
+
+    assert "requests_total 4001" in registry.render().splitlines()
+
+
+def test_exited_threads_are_folded_into_the_base_shard():
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("requests_total", "Requests"))
+    seconds = registry.register(Histogram("seconds", "Time", buckets=(1,)))
+
+    def work():
+        requests.inc()
+        seconds.observe(0.5)
+
+    for _ in range(50):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    seconds.observe(2)
+
+    lines = registry.render().splitlines()
+
+    assert "requests_total 50" in lines
+    assert 'seconds_bucket{le="1"} 50' in lines
+    assert "seconds_count 51" in lines
+    assert len(requests._shards) == 0
+    assert len(seconds._shards) == 1
+
+
+def test_collectors_and_special_values():
+    registry = MetricsRegistry()
+    registry.register_collector(
+        lambda: [
+            family("queue_depth", "gauge", "Queued jobs", [({}, 3)]),
+            family(
+                "ratio",
+                "gauge",
+                "Hit ratio",
+                [({"cache": "a"}, float("nan")), ({"cache": "b"}, float("inf"))],
+            ),
+        ]
+    )
+
+    lines = registry.render().splitlines()
+
+    assert "queue_depth 3" in lines
+    assert 'ratio{cache="a"} NaN' in lines
+    assert 'ratio{cache="b"} +Inf' in lines
+    assert registry.render().endswith("\n")
@@ -0,0 +1,93 @@
+import gzip
+import sys
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from server.response_cache import (
+    MIN_COMPRESS_BYTES,
+    CompletedResponseCache,
+    serialize_response,
+)
+
+
+def test_etag_is_weak_and_stable():
+    first = serialize_response({"status": "completed", "result": {"a": 1}})
+    second = serialize_response({"status": "completed", "result": {"a": 1}})
+    changed = serialize_response({"status": "completed", "result": {"a": 2}})
+
+    assert first.etag.startswith('W/"')
+    assert first.etag == second.etag
+    assert first.etag != changed.etag
+
+
+def test_if_none_match_decides_304():
+    entry = serialize_response({"status": "completed"})
+    strong = entry.etag[2:]
+
+    assert entry.matches(entry.etag)
+    assert entry.matches(strong)
+    assert entry.matches(f'"other", {entry.etag}')
+    assert entry.matches("*")
+    assert not entry.matches('W/"other"')
+    assert not entry.matches(None)
+    assert not entry.matches("")
+
+
+def test_small_bodies_are_not_compressed():
+    entry = serialize_response({"status": "completed"})
+
+    assert set(entry.bodies) == {"identity"}
+    assert entry.negotiate("gzip, br") == ("identity", entry.bodies["identity"])
+
+
+def test_negotiate_honours_accept_encoding():
+    entry = serialize_response({"text": "x" * MIN_COMPRESS_BYTES})
+
+    assert gzip.decompress(entry.bodies["gzip"]) == entry.bodies["identity"]
+    assert entry.negotiate("gzip")[0] == "gzip"
+    assert entry.negotiate("gzip;q=0, deflate")[0] == "identity"
+    assert entry.negotiate(None)[0] == "identity"
+    if "br" in entry.bodies:
+        assert entry.negotiate("gzip, br")[0] == "br"
+        assert entry.negotiate("br;q=0, *")[0] == "gzip"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CompletedResponseCache(max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert len(cache) == 2
+
+
+class Status(str, Enum):
+    COMPLETED = "completed"
+
+
+class Result(BaseModel):
+    finished_at: datetime
+    status: Status
+
+
+def test_body_matches_fastapi_encoding():
+    payload = {
+        "result": Result(finished_at=datetime(2026, 1, 2, 3, 4, 5), status="completed"),
+        "created_at": datetime(2026, 1, 2, 3, 4, 5, 600),
+        "status": Status.COMPLETED,
+        "name": "Aarav Kumār",
+    }
+
+    expected = JSONResponse(jsonable_encoder(payload)).body
+    assert serialize_response(payload).bodies["identity"] == expected
@@ -0,0 +1,101 @@
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from server.rosters import ABILITIES, CII_FIELDS, RosterError, read_roster
+from utils.sten_calculator import StenCalculator
+
+HEADER = ["name", "grade", "gender", *ABILITIES, *CII_FIELDS]
+
+
+def roster(*rows, header=HEADER):
+    lines = [",".join(header)] + [",".join(row) for row in rows]
+    return io.BytesIO("\n".join(lines).encode("utf-8"))
+
+
+def student(name="Asha", grade="10", gender="F", scores=None, cii=None):
+    scores = scores or ["5/20", "30/72", "", "8", "20/50", "6/20", "30/72", "9/24"]
+    cii = cii or ["7", "8", "5", "4", "6", "3"]
+    return [name, grade, gender, *scores, *cii]
+
+
+def test_valid_rows_become_requests_with_stens():
+    calculator = StenCalculator()
+    rows, errors = read_roster(
+        roster(student(), student(name="Ravi", gender="boy")),
+        calculator,
+        max_rows=10,
+        school_name="Central School",
+    )
+
+    assert errors == []
+    assert [row.label for row in rows] == ["row 2: Asha", "row 3: Ravi"]
+    request = rows[0].request
+    assert request["demographic_info"]["gender"] == "female"
+    assert request["demographic_info"]["school_name"] == "Central School"
+    assert request["dbda_scores"]["MA"] is None
+    assert request["cii_results"]["artistic"] == 7
+    assert rows[0].stens["MA"] is None
+    assert rows[0].stens["CA"] == calculator.get_sten_score(5, "CA", 10, "female")
+    assert rows[1].stens["CA"] == calculator.get_sten_score(5, "CA", 10, "male")
+
+
+def test_every_row_error_is_reported():
+    bad_scores = ["25/20", "x", "", "8", "20/", "6/20", "30/72", "9/24"]
+    rows, errors = read_roster(
+        roster(
+            student(),
+            student(name="Bad", grade="8", gender="other", scores=bad_scores),
+            student(name="Cii", cii=["11", "8", "5", "4", "6", ""]),
+        ),
+        StenCalculator(),
+        max_rows=10,
+    )
+
+    assert [row.name for row in rows] == ["Asha"]
+    assert [(error["row"], error["name"]) for error in errors] == [
+        (3, "Bad"),
+        (4, "Cii"),
+    ]
+    messages = " | ".join(errors[0]["errors"])
+    for fragment in ["grade", "gender", "CA", "CL", "PM"]:
+        assert fragment in messages
+    assert len(errors[1]["errors"]) == 2
+
+
+def test_blank_lines_are_skipped():
+    rows, errors = read_roster(
+        roster(student(), [""] * len(HEADER)), StenCalculator(), max_rows=10
+    )
+
+    assert len(rows) == 1
+    assert errors == []
+
+
+def test_missing_columns_and_row_limit():
+    with pytest.raises(RosterError, match="missing columns: VA"):
+        read_roster(roster(header=HEADER[:-7]), StenCalculator(), max_rows=10)
+    with pytest.raises(RosterError, match="more than 1"):
+        read_roster(roster(student(), student()), StenCalculator(), max_rows=1)
+
+
+def test_roster_stens_match_single_lookup():
+    calculator = StenCalculator()
+    students = []
+    for grade in calculator.norms:
+        for gender in ("male", "female"):
+            for raw_score in range(-1, 70):
+                students.append(
+                    ({ability: raw_score for ability in ABILITIES}, grade, gender)
+                )
+    students.append(({"CA": "", "NA": "7/20", "VA": None}, 12, "female"))
+
+    results = calculator.calculate_roster_stens(students)
+
+    assert len(results) == len(students)
+    for (scores, grade, gender), result in zip(students, results):
+        assert result == calculator.calculate_student_stens(scores, grade, gender)
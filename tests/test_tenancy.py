@@ -0,0 +1,115 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.tenancy import (
+    DEFAULT_TENANT,
+    LLMBudgetExceeded,
+    TenantConfig,
+    TenantRateLimited,
+    TenantRegistry,
+    TokenBucket,
+    UnknownTenant,
+    hash_api_key,
+)
+
+
+def test_token_bucket_allows_burst_then_refills():
+    bucket = TokenBucket(rate=0.5, capacity=2)
+    start = bucket._updated
+
+    assert bucket.try_take(start) == 0.0
+    assert bucket.try_take(start) == 0.0
+    assert bucket.try_take(start) == pytest.approx(2.0)
+    assert bucket.try_take(start + 1) == pytest.approx(1.0)
+    assert bucket.try_take(start + 2) == 0.0
+
+
+def test_token_bucket_never_exceeds_capacity():
+    bucket = TokenBucket(rate=1, capacity=2)
+    start = bucket._updated
+
+    bucket.try_take(start + 3600)
+    assert bucket.available == pytest.approx(1)
+
+
+def test_without_tenants_everyone_is_default():
+    registry = TenantRegistry()
+
+    assert registry.resolve(None).tenant_id == DEFAULT_TENANT
+    assert registry.resolve("anything").tenant_id == DEFAULT_TENANT
+
+
+def test_api_keys_resolve_by_plain_key_or_hash():
+    registry = TenantRegistry(
+        [
+            TenantConfig(tenant_id="school-a", api_keys=["key-a"]),
+            TenantConfig(tenant_id="school-b", api_key_hashes=[hash_api_key("key-b")]),
+        ]
+    )
+
+    assert registry.resolve("key-a").tenant_id == "school-a"
+    assert registry.resolve(" key-b ").tenant_id == "school-b"
+    with pytest.raises(UnknownTenant):
+        registry.resolve(None)
+    with pytest.raises(UnknownTenant):
+        registry.resolve("key-c")
+
+
+def test_unknown_settings_are_rejected():
+    with pytest.raises(ValueError):
+        TenantConfig.from_dict({"tenant_id": "a", "submissions_per_hour": 5})
+
+
+def test_submission_rate_limit():
+    registry = TenantRegistry(
+        [TenantConfig(tenant_id="a", api_keys=["k"], submissions_per_minute=2)]
+    )
+    registry.admit_submission("a")
+    registry.admit_submission("a")
+
+    with pytest.raises(TenantRateLimited) as raised:
+        registry.admit_submission("a")
+    assert raised.value.retry_after >= 1
+    usage = registry.usage("a")
+    assert usage["submissions"] == 2
+    assert usage["rejected_submissions"] == 1
+
+
+def test_token_budget_blocks_calls_and_submissions():
+    registry = TenantRegistry(
+        [TenantConfig(tenant_id="a", api_keys=["k"], llm_token_budget=100)]
+    )
+    registry.record_llm_usage("a", 60, 30)
+    registry.check_budget("a")
+
+    registry.record_llm_usage("a", 5, 5)
+    with pytest.raises(LLMBudgetExceeded):
+        registry.check_budget("a")
+    with pytest.raises(TenantRateLimited):
+        registry.admit_submission("a")
+    usage = registry.usage("a")
+    assert usage["total_tokens"] == 100
+    assert usage["llm_tokens_remaining"] == 0
+    assert usage["llm_calls"] == 2
+
+
+def test_budget_window_resets():
+    registry = TenantRegistry(
+        [
+            TenantConfig(
+                tenant_id="a",
+                api_keys=["k"],
+                llm_token_budget=10,
+                budget_window_seconds=60,
+            )
+        ]
+    )
+    registry.record_llm_usage("a", 10, 0)
+    registry._usage["a"].window_started_at -= 61
+
+    registry.check_budget("a")
+    assert registry.usage("a")["total_tokens"] == 0
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.agent_config import critical_chain
+from core import timing
+from core.timing import RunTimer, add_overhead, format_breakdown, record_span, timed
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(timing, "time", clock)
+    return clock
+
+
+def test_critical_chain_follows_slowest_dependencies():
+    seconds, chain = critical_chain(
+        {"profile": 2.0, "market": 5.0, "skills": 1.0, "report": 1.5},
+        {
+            "skills": ["profile"],
+            "report": ["skills", "market"],
+            "market": ["unknown"],
+        },
+    )
+
+    assert seconds == pytest.approx(6.5)
+    assert chain == ["market", "report"]
+    assert critical_chain({}, {}) == (0.0, [])
+
+
+def test_breakdown_walks_the_agent_critical_path(clock):
+    timer = RunTimer("analysis")
+    with timer.measure():
+        with timed("fleet", "college_fleet"):
+            with timed("agent", "profile"):
+                clock.advance(2)
+            with timed("agent", "market"):
+                with timed("sub_agent", "salary_benchmarking"):
+                    with timed("prompt"):
+                        clock.advance(0.5)
+                    record_span(
+                        "llm",
+                        "llm",
+                        clock.now,
+                        clock.now + 3,
+                        overhead={"llm_queue": 1},
+                    )
+                    clock.advance(3)
+                    add_overhead("tracing", 0.25)
+                    clock.advance(0.25)
+            with timed("agent", "report", depends_on=["profile", "market"]):
+                clock.advance(1)
+
+    breakdown = timer.breakdown()
+
+    assert breakdown["total_seconds"] == pytest.approx(6.75)
+    assert breakdown["critical_path"] == {
+        "seconds": pytest.approx(4.75),
+        "agents": ["market", "report"],
+    }
+    assert breakdown["by_kind"] == {
+        "other": pytest.approx(3),
+        "llm": pytest.approx(2),
+        "llm_queue": pytest.approx(1),
+        "prompt": pytest.approx(0.5),
+        "tracing": pytest.approx(0.25),
+    }
+    assert breakdown["agents"]["market"]["by_kind"]["llm"] == pytest.approx(2)
+    assert breakdown["slowest"][0]["path"] == (
+        "college_fleet/market/salary_benchmarking/llm"
+    )
+    assert "critical path 4.750s via market -> report" in format_breakdown(breakdown)
+
+
+def test_nothing_is_recorded_outside_measure(clock):
+    with timed("agent", "profile") as span:
+        assert span is None
+    assert record_span("llm", "llm", 0.0, 1.0) is None
+
+
+def test_timed_step_names_the_span():
+    class SalaryBenchmarkingSubAgent:
+        @timing.timed_step("sub_agent", "salary_benchmarking")
+        def benchmark(self):
+            return self.parse()
+
+        @timing.timed_step("parse")
+        def parse(self):
+            return "parsed"
+
+    timer = RunTimer()
+    with timer.measure():
+        assert SalaryBenchmarkingSubAgent().benchmark() == "parsed"
+
+    (step,) = timer.root.children
+    assert (step.kind, step.name) == ("sub_agent", "salary_benchmarking")
+    assert [(child.kind, child.name) for child in step.children] == [
+        ("parse", "parse")
+    ]
@@ -0,0 +1,480 @@
+"""
+Offline batch runner: drives MainOrchestrator over a JSONL file of students
+
+Each input line is either a full record::
+
+    {"record_id": "...", "vertical": "school_students",
+     "user_data": {...}, "initial_message": "..."}
+
+or a bare ``user_data`` object when ``--vertical`` is given. ``user_data`` is
+what the orchestrator takes (stens already computed). Records are keyed by
+``record_id``, else ``user_data.user_id``, else a hash of the line, so keys
+are stable across runs.
+
+Results are appended to the output (``.jsonl`` or ``.sqlite``/``.db``) as
+each record finishes, and the output doubles as the progress log: rerunning
+the same command skips records that already finished with the same input,
+so a killed run picks up where it stopped. ``--only-failed`` replays just
+the records whose last attempt failed.
+
+    python -m tools.batch_runner students.jsonl -o results.sqlite -c 8
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from core.cancellation import CancellationToken, OperationCancelled
+from core.fair_queue import Priority
+from core.llm_accounting import get_llm_accountant
+from core.request_context import bind_context
+from core.tracing import get_tracer
+
+logger = logging.getLogger("batch_runner")
+
+DEFAULT_MESSAGES = {
+    "school_students": "I need comprehensive academic and career guidance based on my assessment results.",
+    "college_upskilling": "I want comprehensive career guidance and skill development recommendations based on my profile.",
+    "career_transition": "I want to explore career transition options and get a detailed transition plan.",
+}
+
+
+@dataclass
+class BatchRecord:
+    """One input line, ready to run"""
+
+    record_id: str
+    vertical: str
+    user_data: Dict[str, Any]
+    initial_message: str
+    input_sha256: str
+
+
+def read_records(path: str, default_vertical: Optional[str]) -> Iterator[BatchRecord]:
+    """
+    Parse the input JSONL
+
+    Raises:
+        ValueError: a line is not JSON, has no vertical, or repeats another
+            line's record id
+    """
+    first_line_for: Dict[str, int] = {}  # record_id -> line it was read from
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON ({e})")
+
+            if "user_data" not in data:
+                data = {"user_data": data}
+            vertical = data.get("vertical") or default_vertical
+            if vertical not in DEFAULT_MESSAGES:
+                raise ValueError(
+                    f"{path}:{line_number}: unknown vertical {vertical!r} "
+                    "(set it per record or pass --vertical)"
+                )
+
+            input_sha256 = hashlib.sha256(
+                json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            user_data = dict(data["user_data"])
+            record_id = str(
+                data.get("record_id") or user_data.get("user_id") or input_sha256[:16]
+            )
+            if record_id in first_line_for:
+                # Results are keyed by record id, so one would shadow the other
+                raise ValueError(
+                    f"{path}:{line_number}: duplicate record_id {record_id!r} "
+                    f"(first seen on line {first_line_for[record_id]})"
+                )
+            first_line_for[record_id] = line_number
+            # Stable ids, so a replay reuses the same session and user ids
+            user_data.setdefault("user_id", f"batch_user_{record_id}")
+            user_data.setdefault("session_id", f"batch_{record_id}")
+
+            yield BatchRecord(
+                record_id=record_id,
+                vertical=vertical,
+                user_data=user_data,
+                initial_message=data.get("initial_message")
+                or DEFAULT_MESSAGES[vertical],
+                input_sha256=input_sha256,
+            )
+
+
+# ========================== Result sinks ==========================
+
+
+class JsonlSink:
+    """Appends one JSON line per finished record; the last line per id wins"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._repair_tail()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def load(self) -> Dict[str, Tuple[str, str]]:
+        """record_id -> (status, input_sha256) of the latest attempt"""
+        latest: Dict[str, Tuple[str, str]] = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                latest[result["record_id"]] = (
+                    result["status"],
+                    result["input_sha256"],
+                )
+        return latest
+
+    def write(self, result: Dict[str, Any]):
+        self._file.write(json.dumps(result, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def _repair_tail(self):
+        """Drop a partial last line left by a run killed mid-write"""
+        if not os.path.exists(self.path):
+            open(self.path, "a").close()
+            return
+        with open(self.path, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+
+
+class SqliteSink:
+    """Keeps every attempt in a ``batch_results`` table"""
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS batch_results (
+                attempt_id TEXT PRIMARY KEY,
+                record_id TEXT NOT NULL,
+                vertical TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                input_sha256 TEXT NOT NULL,
+                session_id TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                duration_seconds REAL,
+                result_json TEXT
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS batch_results_record "
+            "ON batch_results (record_id, finished_at)"
+        )
+        self.connection.commit()
+
+    def load(self) -> Dict[str, Tuple[str, str]]:
+        latest: Dict[str, Tuple[str, str]] = {}
+        rows = self.connection.execute(
+            "SELECT record_id, status, input_sha256 FROM batch_results "
+            "ORDER BY finished_at"
+        )
+        for record_id, status, input_sha256 in rows:
+            latest[record_id] = (status, input_sha256)
+        return latest
+
+    def write(self, result: Dict[str, Any]):
+        self.connection.execute(
+            "INSERT INTO batch_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                uuid.uuid4().hex,
+                result["record_id"],
+                result["vertical"],
+                result["status"],
+                result["error"],
+                result["input_sha256"],
+                result["session_id"],
+                result["started_at"],
+                result["finished_at"],
+                result["duration_seconds"],
+                json.dumps(result["result"], default=str),
+            ),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def open_sink(path: str):
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        return SqliteSink(path)
+    return JsonlSink(path)
+
+
+# ========================== Runner ==========================
+
+
+class Progress:
+    """Counts finished records and prints throughput / ETA every few seconds"""
+
+    def __init__(self, total: int, interval: float):
+        self.total = total
+        self.interval = interval
+        self.completed = 0
+        self.failed = 0
+        self._started = time.monotonic()
+        self._last_report = 0.0
+
+    def record(self, status: str):
+        if status == "completed":
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.tick()
+
+    def tick(self):
+        """Report if the interval has passed, whether or not records finished"""
+        if time.monotonic() - self._last_report >= self.interval:
+            self.report()
+
+    def report(self):
+        self._last_report = time.monotonic()
+        done = self.completed + self.failed
+        elapsed = self._last_report - self._started
+        per_minute = done / elapsed * 60 if elapsed > 0 else 0.0
+        remaining = self.total - done
+        eta = _format_seconds(remaining / per_minute * 60) if per_minute else "-"
+        print(
+            f"[batch] {done}/{self.total} done, {self.failed} failed | "
+            f"{per_minute:.1f}/min | ETA {eta}",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def run_record(
+    orchestrator, record: BatchRecord, token: CancellationToken
+) -> Dict[str, Any]:
+    """Run one record on a worker thread and build its result row"""
+    started = time.monotonic()
+    started_at = datetime.now().isoformat()
+    with bind_context(
+        session_id=record.user_data["session_id"],
+        vertical=record.vertical,
+        priority=Priority.BATCH,
+        cancel_token=token,
+    ):
+        try:
+            result = orchestrator.start_counseling_session(
+                vertical=record.vertical,
+                user_data=record.user_data,
+                initial_message=record.initial_message,
+            )
+            error = (
+                None if result.get("success") else result.get("error", "Analysis failed")
+            )
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Record {record.record_id} failed: {e}", exc_info=True)
+            result, error = None, str(e)
+
+    return {
+        "record_id": record.record_id,
+        "vertical": record.vertical,
+        "status": "failed" if error else "completed",
+        "error": error,
+        "input_sha256": record.input_sha256,
+        "session_id": record.user_data["session_id"],
+        "started_at": started_at,
+        "finished_at": datetime.now().isoformat(),
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "result": result,
+    }
+
+
+def select_records(
+    records: List[BatchRecord],
+    previous: Dict[str, Tuple[str, str]],
+    only_failed: bool,
+    record_ids: Optional[Set[str]],
+) -> List[BatchRecord]:
+    """
+    Records still to run: not finished with this input yet, or (with
+    ``only_failed``) whose latest attempt failed
+    """
+    selected = []
+    for record in records:
+        if record_ids is not None and record.record_id not in record_ids:
+            continue
+        status, input_sha256 = previous.get(record.record_id, (None, None))
+        unchanged = input_sha256 == record.input_sha256
+        if only_failed:
+            if status == "failed" and unchanged:
+                selected.append(record)
+        elif status is None or not unchanged:
+            selected.append(record)
+    return selected
+
+
+def run_batch(
+    orchestrator,
+    records: List[BatchRecord],
+    sink,
+    concurrency: int,
+    progress: Progress,
+) -> bool:
+    """
+    Run ``records`` with at most ``concurrency`` in flight, writing each
+    result as it lands
+
+    Returns:
+        False if the run was interrupted
+    """
+    tokens: Dict[Future, CancellationToken] = {}
+    pending = iter(records)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+    try:
+        while True:
+            while len(tokens) < concurrency:
+                record = next(pending, None)
+                if record is None:
+                    break
+                token = CancellationToken()
+                tokens[executor.submit(run_record, orchestrator, record, token)] = token
+            if not tokens:
+                return True
+
+            # Wake up every interval so slow records still show progress
+            done, _ = wait(
+                list(tokens),
+                timeout=progress.interval or None,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                del tokens[future]
+                result = future.result()
+                sink.write(result)
+                progress.record(result["status"])
+            if not done:
+                progress.tick()
+    except KeyboardInterrupt:
+        # Abort in-flight records at their next checkpoint; they are not
+        # written, so the next run picks them up again
+        print("[batch] interrupted, stopping in-flight records", file=sys.stderr)
+        for token in tokens.values():
+            token.cancel("Batch run interrupted")
+        return False
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def build_orchestrator(model_name: str):
+    from agentic_layer.agent_orchestrator import MainOrchestrator
+    from config.llm_config import llm_manager
+
+    llm_model = llm_manager.initialize_gemini(
+        model_name=model_name, temperature=0.1, max_tokens=4000
+    )
+    return MainOrchestrator(llm_model=llm_model)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run counselling analyses for a JSONL file of students"
+    )
+    parser.add_argument("input", help="JSONL file of records or user_data objects")
+    parser.add_argument(
+        "-o", "--output", required=True, help="results file (.jsonl, or .sqlite/.db)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=4, help="records in flight (default 4)"
+    )
+    parser.add_argument(
+        "--vertical",
+        choices=sorted(DEFAULT_MESSAGES),
+        help="vertical for records that do not name one",
+    )
+    parser.add_argument(
+        "--only-failed",
+        action="store_true",
+        help="replay only records whose latest attempt failed",
+    )
+    parser.add_argument(
+        "--record-ids", help="comma-separated record ids to restrict the run to"
+    )
+    parser.add_argument("--model", default="gemini-1.5-flash", help="Gemini model name")
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=5.0,
+        help="seconds between progress lines (default 5)",
+    )
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    try:
+        records = list(read_records(args.input, args.vertical))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    sink = open_sink(args.output)
+    try:
+        record_ids = set(args.record_ids.split(",")) if args.record_ids else None
+        todo = select_records(records, sink.load(), args.only_failed, record_ids)
+        print(
+            f"[batch] {len(records)} records, {len(records) - len(todo)} already "
+            f"done, {len(todo)} to run",
+            file=sys.stderr,
+        )
+        if not todo:
+            return 0
+
+        progress = Progress(len(todo), args.progress_interval)
+        finished = run_batch(
+            build_orchestrator(args.model), todo, sink, args.concurrency, progress
+        )
+        progress.report()
+    finally:
+        sink.close()
+        # Traces are exported in the background; send what is left
+        get_tracer().shutdown()
+        get_llm_accountant().close()
+
+    if not finished:
+        return 130
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
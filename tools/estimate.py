@@ -0,0 +1,310 @@
+"""
+Estimate what counselling sessions will cost and how long they will take,
+without calling the LLM
+
+Each session's user data is dry-run through its vertical's fleet
+(``MainOrchestrator.dry_run``): the agents, sub-agents and optional chains
+that would run are the ones a real session would pick for that data, and
+prompt tokens are estimated from the prompts they really assemble. LLM
+latency and completion tokens come from past calls of the same agent and
+sub-agent in the accounting records (``LLM_ACCOUNTING_PATH``, see
+``core/llm_accounting.py``); without history, ``--default-latency`` and the
+dry run's own completion estimate are used and marked with ``~``.
+
+    python -m tools.estimate cohort.json --vertical school_students \\
+        --history llm_calls.jsonl --input-price 0.075 --output-price 0.30
+    python -m tools.estimate student.json --vertical college_upskilling \\
+        --history llm_calls.sqlite --json estimate.json
+
+The input is a UserData object, a list of them, or JSONL. Per agent, the
+report gives the calls and tokens of an average session and its p50/p95
+LLM time. Per session it gives the time as the fleet runs today (agents
+one after another) and the critical path through the agent dependencies.
+The cohort's wall-clock time assumes ``--llm-concurrency`` calls in
+flight, as the shared LLM limiter allows.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.agent_config import critical_path
+from tools.llm_usage import percentile, read_calls
+
+VERTICALS = ("school_students", "college_upskilling")
+
+
+def load_user_data(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        document = json.loads(text)
+    except json.JSONDecodeError:
+        document = [json.loads(line) for line in text.splitlines() if line.strip()]
+    sessions = document if isinstance(document, list) else [document]
+    for index, user_data in enumerate(sessions):
+        user_data.setdefault("session_id", f"dryrun_{index}")
+        user_data.setdefault("user_id", f"dryrun_user_{index}")
+    return sessions
+
+
+def call_stats(
+    calls: List[Dict[str, Any]]
+) -> Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]]:
+    """
+    Latency and completion tokens of past calls per (agent, sub_agent),
+    plus (agent, "*") for an agent's calls overall
+    """
+    groups: Dict[Tuple[Optional[str], Optional[str]], List[Dict[str, Any]]] = {}
+    for call in calls:
+        if call.get("cached") or call.get("error"):
+            continue
+        groups.setdefault((call.get("agent"), call.get("sub_agent")), []).append(call)
+        groups.setdefault((call.get("agent"), "*"), []).append(call)
+    return {
+        key: {
+            "calls": len(members),
+            "latency_p50": percentile([c["latency_seconds"] for c in members], 0.5),
+            "latency_p95": percentile([c["latency_seconds"] for c in members], 0.95),
+            "completion_tokens": statistics.median(
+                c["completion_tokens"] for c in members
+            ),
+        }
+        for key, members in groups.items()
+    }
+
+
+def estimate_session(
+    plan: Dict[str, Any],
+    stats: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]],
+    default_latency: float,
+    input_price: float = 0.0,
+    output_price: float = 0.0,
+) -> Dict[str, Any]:
+    """Per-agent and session totals for one dry-run plan"""
+    agents = {}
+    for agent_id, planned in plan["agents"].items():
+        totals = {
+            "calls": 0,
+            "cache_hits": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "latency_p50": 0.0,
+            "latency_p95": 0.0,
+            "without_history": 0,
+        }
+        for call in planned["calls"]:
+            if call["cached"]:
+                totals["cache_hits"] += 1
+                continue
+            history = stats.get((agent_id, call["sub_agent"])) or stats.get(
+                (agent_id, "*")
+            )
+            totals["calls"] += 1
+            totals["prompt_tokens"] += call["prompt_tokens"]
+            if history is None:
+                totals["without_history"] += 1
+                totals["completion_tokens"] += call["completion_tokens"]
+                totals["latency_p50"] += default_latency
+                totals["latency_p95"] += default_latency
+            else:
+                totals["completion_tokens"] += history["completion_tokens"]
+                totals["latency_p50"] += history["latency_p50"]
+                totals["latency_p95"] += history["latency_p95"]
+        agents[agent_id] = totals
+
+    prompt_tokens = sum(agent["prompt_tokens"] for agent in agents.values())
+    completion_tokens = sum(agent["completion_tokens"] for agent in agents.values())
+    dependencies = {
+        agent_id: planned["depends_on"] for agent_id, planned in plan["agents"].items()
+    }
+    return {
+        "agents": agents,
+        "calls": sum(agent["calls"] for agent in agents.values()),
+        "cache_hits": sum(agent["cache_hits"] for agent in agents.values()),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost": (prompt_tokens * input_price + completion_tokens * output_price) / 1e6,
+        # Agents call the LLM one after another, and the fleet runs agents
+        # in sequence, so a session takes the sum of its call latencies
+        "sequential_p50": sum(agent["latency_p50"] for agent in agents.values()),
+        "sequential_p95": sum(agent["latency_p95"] for agent in agents.values()),
+        "critical_path_p50": critical_path(
+            {agent_id: agent["latency_p50"] for agent_id, agent in agents.items()},
+            dependencies,
+        ),
+        "without_history": sum(agent["without_history"] for agent in agents.values()),
+    }
+
+
+def summarize_cohort(
+    estimates: List[Dict[str, Any]], llm_concurrency: int
+) -> Dict[str, Any]:
+    sessions = len(estimates)
+    agents: Dict[str, Dict[str, float]] = {}
+    for estimate in estimates:
+        for agent_id, totals in estimate["agents"].items():
+            summary = agents.setdefault(agent_id, dict.fromkeys(totals, 0.0))
+            for name, value in totals.items():
+                summary[name] += value / sessions
+
+    llm_seconds = sum(estimate["sequential_p50"] for estimate in estimates)
+    longest = max((estimate["sequential_p50"] for estimate in estimates), default=0)
+    return {
+        "sessions": sessions,
+        "agents_per_session": agents,
+        "calls": sum(estimate["calls"] for estimate in estimates),
+        "cache_hits": sum(estimate["cache_hits"] for estimate in estimates),
+        "prompt_tokens": sum(estimate["prompt_tokens"] for estimate in estimates),
+        "completion_tokens": sum(
+            estimate["completion_tokens"] for estimate in estimates
+        ),
+        "cost": sum(estimate["cost"] for estimate in estimates),
+        "session_p50": percentile(
+            [estimate["sequential_p50"] for estimate in estimates], 0.5
+        ),
+        "session_p95": percentile(
+            [estimate["sequential_p95"] for estimate in estimates], 0.95
+        ),
+        "critical_path_p50": percentile(
+            [estimate["critical_path_p50"] for estimate in estimates], 0.5
+        ),
+        # Bounded by the LLM slots, and by no session finishing early
+        "cohort_seconds": max(llm_seconds / llm_concurrency, longest),
+        "without_history": sum(estimate["without_history"] for estimate in estimates),
+    }
+
+
+def print_report(vertical: str, summary: Dict[str, Any], priced: bool):
+    print(f"{vertical}: {summary['sessions']} session(s), dry run\n")
+    print(
+        f"{'agent':32} {'calls':>6} {'cached':>6} {'prompt tok':>10} "
+        f"{'compl tok':>10} {'p50 s':>7} {'p95 s':>7}"
+    )
+    for agent_id, agent in summary["agents_per_session"].items():
+        marker = "~" if agent["without_history"] else ""
+        print(
+            f"{agent_id:32} {agent['calls']:>6.1f} {agent['cache_hits']:>6.1f} "
+            f"{agent['prompt_tokens']:>10.0f} {agent['completion_tokens']:>10.0f} "
+            f"{agent['latency_p50']:>6.1f}{marker:1} "
+            f"{agent['latency_p95']:>6.1f}{marker}"
+        )
+
+    sessions = summary["sessions"]
+    print(
+        f"\nper session: {summary['calls'] / sessions:.1f} LLM calls, "
+        f"{summary['prompt_tokens'] / sessions:,.0f} prompt + "
+        f"{summary['completion_tokens'] / sessions:,.0f} completion tokens"
+        + (f", {summary['cost'] / sessions:.4f} cost" if priced else "")
+    )
+    print(
+        f"session time: p50 {summary['session_p50']:.1f}s, "
+        f"p95 {summary['session_p95']:.1f}s as run today; "
+        f"critical path p50 {summary['critical_path_p50']:.1f}s"
+    )
+    print(
+        f"cohort: {summary['calls']} LLM calls, "
+        f"{summary['prompt_tokens'] + summary['completion_tokens']:,.0f} tokens"
+        + (f", {summary['cost']:.2f} cost" if priced else "")
+        + f", about {summary['cohort_seconds'] / 60:.1f} min"
+    )
+    if summary["without_history"]:
+        print(
+            f"\n~ {summary['without_history']} call(s) have no history; their "
+            "latency is --default-latency and completion tokens are guessed"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Dry-run sessions to estimate their LLM cost and latency"
+    )
+    parser.add_argument("user_data", help="UserData JSON (object, list or JSONL)")
+    parser.add_argument("--vertical", required=True, choices=VERTICALS)
+    parser.add_argument(
+        "--history",
+        default=os.getenv("LLM_ACCOUNTING_PATH"),
+        help="past accounting records (default LLM_ACCOUNTING_PATH)",
+    )
+    parser.add_argument(
+        "--model",
+        default="gemini-1.5-flash",
+        help="model name the sessions would use (default gemini-1.5-flash)",
+    )
+    parser.add_argument(
+        "--input-price", type=float, help="price per million prompt tokens"
+    )
+    parser.add_argument(
+        "--output-price", type=float, help="price per million completion tokens"
+    )
+    parser.add_argument(
+        "--default-latency",
+        type=float,
+        default=5.0,
+        help="seconds per call without history (default 5)",
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+        help="LLM calls in flight for the cohort (default LLM_MAX_CONCURRENCY or 8)",
+    )
+    parser.add_argument("--json", help="also write the estimate to this file")
+    args = parser.parse_args(argv)
+    # Agents log their construction at INFO; keep the report readable
+    logging.disable(logging.INFO)
+
+    try:
+        sessions = load_user_data(args.user_data)
+        history = list(read_calls(args.history)) if args.history else []
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    stats = call_stats(history)
+
+    # Imported here: the agent stack is slow to import
+    from agentic_layer.agent_orchestrator import MainOrchestrator
+    from core.llm_backends import SyntheticChatModel
+    from core.managed_llm import ManagedChatModel
+
+    # Dry runs never reach the inner model; it only names the model
+    orchestrator = MainOrchestrator(
+        llm_model=ManagedChatModel(inner=SyntheticChatModel(model=args.model))
+    )
+    estimates = []
+    for user_data in sessions:
+        plan = orchestrator.dry_run(args.vertical, user_data)
+        if not plan["success"]:
+            print(f"{user_data['session_id']}: {plan['error']}", file=sys.stderr)
+            return 1
+        estimates.append(
+            estimate_session(
+                plan,
+                stats,
+                args.default_latency,
+                args.input_price or 0.0,
+                args.output_price or 0.0,
+            )
+        )
+
+    summary = summarize_cohort(estimates, args.llm_concurrency)
+    print(
+        f"[estimate] {len(history)} history records from {args.history or '-'}\n",
+        file=sys.stderr,
+    )
+    print_report(
+        args.vertical,
+        summary,
+        args.input_price is not None or args.output_price is not None,
+    )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "sessions": estimates}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
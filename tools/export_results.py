@@ -0,0 +1,139 @@
+"""
+Export batch runner results to a relational SQLite database or Parquet files
+
+Reads the output of ``tools.batch_runner`` (``.jsonl`` or ``.sqlite``/``.db``)
+and flattens the latest attempt of every session into the tables described
+in ``analytics/export.py``: sessions, agent_results, recommendations, skills,
+colleges and scholarships.
+
+    python -m tools.export_results results.sqlite -o export.sqlite
+    python -m tools.export_results results.jsonl -o export/ --inputs students.jsonl
+
+A ``.sqlite``/``.db`` output gets one table each; any other path is a
+directory with one Parquet dataset per table (needs pyarrow). Exports are
+incremental, so rerunning after the batch grows only adds the new sessions.
+Pass the batch input with ``--inputs`` to fill in the demographic columns
+(grade, gender, program, year of study), which the results do not carry.
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+from analytics.export import ExportSchemaError, ExportSession, open_exporter
+from tools.batch_runner import read_records
+
+
+def read_attempts(path: str) -> Iterator[Dict[str, Any]]:
+    """Every attempt in a batch runner output, oldest first"""
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        connection = sqlite3.connect(path)
+        try:
+            rows = connection.execute(
+                "SELECT record_id, vertical, status, error, session_id, "
+                "finished_at, result_json FROM batch_results ORDER BY finished_at"
+            )
+            columns = [column[0] for column in rows.description]
+            for row in rows:
+                attempt = dict(zip(columns, row))
+                result = attempt.pop("result_json")
+                attempt["result"] = json.loads(result) if result else None
+                yield attempt
+        finally:
+            connection.close()
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partial line from a killed run
+
+
+def latest_sessions(
+    attempts: Iterator[Dict[str, Any]], user_data: Dict[str, Dict[str, Any]]
+) -> List[ExportSession]:
+    """The last attempt per session, as exportable sessions"""
+    latest: Dict[str, Dict[str, Any]] = {}
+    for attempt in attempts:
+        latest[attempt["session_id"] or attempt["record_id"]] = attempt
+    return [
+        ExportSession(
+            session_id=session_id,
+            vertical=attempt["vertical"],
+            status=attempt["status"],
+            result=attempt.get("result"),
+            user_data=user_data.get(attempt["record_id"], {}),
+            error=attempt.get("error"),
+            completed_at=attempt.get("finished_at"),
+        )
+        for session_id, attempt in latest.items()
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Export batch runner results to SQLite or Parquet"
+    )
+    parser.add_argument("results", help="batch runner output (.jsonl or .sqlite/.db)")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="export database (.sqlite/.db) or Parquet directory",
+    )
+    parser.add_argument(
+        "--inputs", help="the batch input JSONL, for the demographic columns"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="rewrite sessions that are already exported (SQLite only)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="sessions per write transaction / Parquet part (default 500)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        user_data = (
+            {
+                record.record_id: record.user_data
+                for record in read_records(args.inputs, "school_students")
+            }
+            if args.inputs
+            else {}
+        )
+        sessions = latest_sessions(read_attempts(args.results), user_data)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        parser.error(str(e))
+
+    try:
+        exporter = open_exporter(args.output)
+    except (ExportSchemaError, RuntimeError) as e:
+        parser.error(str(e))
+    try:
+        written = 0
+        for start in range(0, len(sessions), args.chunk_size):
+            written += exporter.write(
+                sessions[start : start + args.chunk_size], refresh=args.refresh
+            )
+    finally:
+        exporter.close()
+
+    print(
+        f"[export] {len(sessions)} sessions, {written} written, "
+        f"{len(sessions) - written} already up to date",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
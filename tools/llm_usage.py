@@ -0,0 +1,180 @@
+"""
+Summarize LLM call accounting: latency and token usage per agent and vertical
+
+Reads the records written under ``LLM_ACCOUNTING_PATH`` (``.jsonl`` or
+``.sqlite``/``.db``, see ``core/llm_accounting.py``) and reports, per group,
+the number of calls and cache hits, p50/p95 latency, time-to-first-token and
+limiter wait, and prompt/completion tokens.
+
+    python -m tools.llm_usage llm_calls.jsonl
+    python -m tools.llm_usage llm_calls.sqlite --by vertical,agent,sub_agent
+    python -m tools.llm_usage llm_calls.jsonl --session 1b2c... --json usage.json
+
+Pass ``--input-price``/``--output-price`` (per million tokens) to add an
+estimated cost column; cache hits cost nothing.
+"""
+
+import argparse
+import json
+import math
+import sqlite3
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+GROUP_FIELDS = ("vertical", "agent", "sub_agent", "model", "session_id", "tenant_id")
+
+
+def read_calls(path: str) -> Iterator[Dict[str, Any]]:
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        connection = sqlite3.connect(path)
+        connection.row_factory = sqlite3.Row
+        try:
+            for row in connection.execute("SELECT * FROM llm_calls"):
+                yield dict(row)
+        finally:
+            connection.close()
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partial line from a killed process
+
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile; None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)), 1) - 1]
+
+
+def summarize(
+    calls: Iterator[Dict[str, Any]],
+    by: Sequence[str],
+    input_price: Optional[float] = None,
+    output_price: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """One row per group, heaviest token users first"""
+    groups: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+    for call in calls:
+        groups.setdefault(tuple(call.get(name) for name in by), []).append(call)
+
+    rows = []
+    for key, members in groups.items():
+        made = [call for call in members if not call.get("cached")]
+        succeeded = [call for call in made if not call.get("error")]
+        latencies = [call["latency_seconds"] for call in succeeded]
+        ttfts = [call["ttft_seconds"] for call in succeeded]
+        queued = [call["queued_seconds"] for call in made]
+        prompt_tokens = sum(call["prompt_tokens"] for call in made)
+        completion_tokens = sum(call["completion_tokens"] for call in made)
+        row = {
+            **{name: value for name, value in zip(by, key)},
+            "calls": len(made),
+            "cache_hits": len(members) - len(made),
+            "errors": len(made) - len(succeeded),
+            "latency_p50": percentile(latencies, 0.5),
+            "latency_p95": percentile(latencies, 0.95),
+            "ttft_p50": percentile(ttfts, 0.5),
+            "ttft_p95": percentile(ttfts, 0.95),
+            "queued_p95": percentile(queued, 0.95),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "estimated_tokens": any(call.get("tokens_estimated") for call in made),
+        }
+        if input_price is not None or output_price is not None:
+            row["cost"] = (
+                prompt_tokens * (input_price or 0.0)
+                + completion_tokens * (output_price or 0.0)
+            ) / 1e6
+        rows.append(row)
+    rows.sort(key=lambda row: row["prompt_tokens"] + row["completion_tokens"])
+    rows.reverse()
+    return rows
+
+
+def print_table(rows: List[Dict[str, Any]], by: Sequence[str]):
+    def seconds(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.2f}"
+
+    columns = [
+        *[(name, lambda row, name=name: str(row[name] or "-")) for name in by],
+        ("calls", lambda row: str(row["calls"])),
+        ("cached", lambda row: str(row["cache_hits"])),
+        ("errors", lambda row: str(row["errors"])),
+        ("p50 s", lambda row: seconds(row["latency_p50"])),
+        ("p95 s", lambda row: seconds(row["latency_p95"])),
+        ("ttft p95", lambda row: seconds(row["ttft_p95"])),
+        ("wait p95", lambda row: seconds(row["queued_p95"])),
+        (
+            "prompt tok",
+            lambda row: f"{row['prompt_tokens']}{'~' * row['estimated_tokens']}",
+        ),
+        ("compl tok", lambda row: str(row["completion_tokens"])),
+    ]
+    if rows and "cost" in rows[0]:
+        columns.append(("cost", lambda row: f"{row['cost']:.4f}"))
+
+    cells = [[render(row) for _, render in columns] for row in rows]
+    widths = [
+        max([len(title)] + [len(line[index]) for line in cells])
+        for index, (title, _) in enumerate(columns)
+    ]
+    print("  ".join(title.ljust(width) for (title, _), width in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+    if any(row["estimated_tokens"] for row in rows):
+        print("\n~ includes calls whose tokens were estimated from text length")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Summarize LLM latency and token usage per agent and vertical"
+    )
+    parser.add_argument("calls", help="accounting records (.jsonl or .sqlite/.db)")
+    parser.add_argument(
+        "--by",
+        default="vertical,agent",
+        help=f"comma-separated grouping from {', '.join(GROUP_FIELDS)} "
+        "(default vertical,agent)",
+    )
+    parser.add_argument("--session", help="only calls of this session")
+    parser.add_argument("--vertical", help="only calls of this vertical")
+    parser.add_argument(
+        "--input-price", type=float, help="price per million prompt tokens"
+    )
+    parser.add_argument(
+        "--output-price", type=float, help="price per million completion tokens"
+    )
+    parser.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args(argv)
+
+    by = [name.strip() for name in args.by.split(",") if name.strip()]
+    unknown = set(by) - set(GROUP_FIELDS)
+    if unknown:
+        parser.error(f"cannot group by {', '.join(sorted(unknown))}")
+
+    try:
+        calls = [
+            call
+            for call in read_calls(args.calls)
+            if (args.session is None or call.get("session_id") == args.session)
+            and (args.vertical is None or call.get("vertical") == args.vertical)
+        ]
+    except (OSError, sqlite3.Error) as e:
+        parser.error(str(e))
+
+    rows = summarize(calls, by, args.input_price, args.output_price)
+    print(f"[llm_usage] {len(calls)} records\n", file=sys.stderr)
+    print_table(rows, by)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
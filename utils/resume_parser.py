@@ -0,0 +1,236 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Optional, Tuple
+
+from core.content_cache import content_hash, get_content_cache
+
+logger = logging.getLogger(__name__)
+
+PDF_CONTENT_TYPE = "application/pdf"
+SUPPORTED_CONTENT_TYPES = [PDF_CONTENT_TYPE, "text/plain", "application/msword"]
+
+# Bump when extraction output changes so cached texts are re-parsed
+PARSER_VERSION = "pymupdf-text-1"
+
+
+class ResumeParseError(Exception):
+    """The uploaded resume cannot be turned into text (bad file or over limits)"""
+
+
+def _extract_pdf_text(content: bytes, max_pages: int) -> str:
+    """
+    Extract page text from an in-memory PDF (runs in a parser process)
+
+    Mirrors what PyMuPDFLoader produced from a temp file: each page's
+    plain text, trimmed, with pages joined by blank lines.
+    """
+    import pymupdf
+
+    try:
+        document = pymupdf.open(stream=content, filetype="pdf")
+    except Exception as e:
+        raise ResumeParseError(f"Could not read PDF: {e}")
+
+    with document:
+        if document.page_count > max_pages:
+            raise ResumeParseError(
+                f"Resume has {document.page_count} pages; the limit is {max_pages}."
+            )
+        return "\n\n".join(page.get_text().strip() for page in document)
+
+
+class ResumeParser:
+    """
+    Turns uploaded resume bytes into text without touching the filesystem
+
+    PDFs are opened from memory and parsed in a small process pool, so a
+    large or malformed file costs a worker process instead of stalling the
+    event loop or the analysis threads. Byte size, page count and parse
+    time are bounded. Extracted text is cached by the SHA-256 of the bytes,
+    so re-uploading the same file skips parsing, and concurrent requests for
+    the same bytes share a single parse.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+    ):
+        self.max_bytes = max_bytes or int(
+            os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024))
+        )
+        self.max_pages = max_pages or int(os.getenv("RESUME_MAX_PAGES", "20"))
+        self.max_workers = max_workers or int(os.getenv("RESUME_PARSER_WORKERS", "2"))
+        self.timeout_seconds = timeout_seconds or float(
+            os.getenv("RESUME_PARSE_TIMEOUT_SECONDS", "30")
+        )
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # One per worker, held from submitting a PDF until its result is in
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+
+    def check_upload(self, content_type: Optional[str], size: int):
+        """
+        Validate an upload before accepting it
+
+        Raises:
+            ResumeParseError: unsupported type or over the byte limit
+        """
+        if content_type not in SUPPORTED_CONTENT_TYPES:
+            raise ResumeParseError(
+                "Unsupported file type. Please upload PDF, TXT, or DOC files."
+            )
+        if size > self.max_bytes:
+            raise ResumeParseError(
+                f"Resume is larger than the {self.max_bytes // (1024 * 1024)} MB limit."
+            )
+
+    def parse(self, content: bytes, content_type: Optional[str]) -> str:
+        """
+        Extract resume text; blocks the calling (worker) thread
+
+        Raises:
+            ResumeParseError: the file is unsupported, over limits, unreadable
+                or contains no text
+        """
+        self.check_upload(content_type, len(content))
+
+        cache = get_content_cache("resume_text")
+        cache_key = content_hash(content)
+        cache_version = f"{PARSER_VERSION}:{content_type}"
+        cached = cache.get(cache_key, cache_version)
+        if cached is not None:
+            return cached
+
+        # Identical bytes already being parsed: wait for that result instead
+        result: Future = Future()
+        with self._lock:
+            shared = self._in_flight.setdefault((cache_key, cache_version), result)
+        if shared is not result:
+            return shared.result()
+
+        try:
+            text = self._extract(content, content_type)
+            cache.put(cache_key, cache_version, text)
+            result.set_result(text)
+            return text
+        except BaseException as e:
+            result.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop((cache_key, cache_version), None)
+
+    def prefetch(self, files: Iterable[Tuple[bytes, Optional[str]]]):
+        """
+        Start parsing ``(content, content_type)`` pairs in the background
+
+        Used by bulk ingestion so every file is parsed, in parallel, before
+        its analysis needs the text. Errors are left for the analysis that
+        parses the file again to report.
+        """
+        with self._lock:
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="resume-prefetch"
+                )
+            pool = self._prefetch_pool
+        for content, content_type in files:
+            pool.submit(self._parse_quietly, content, content_type)
+
+    def _parse_quietly(self, content: bytes, content_type: Optional[str]):
+        try:
+            self.parse(content, content_type)
+        except ResumeParseError:
+            pass
+        except Exception as e:
+            logger.warning(f"Resume prefetch failed: {e}")
+
+    def _extract(self, content: bytes, content_type: Optional[str]) -> str:
+        if content_type == PDF_CONTENT_TYPE:
+            text = self._parse_pdf(content)
+        else:
+            try:
+                text = content.decode("utf-8")
+            except UnicodeDecodeError:
+                raise ResumeParseError("Resume text is not valid UTF-8.")
+
+        if not text.strip():
+            raise ResumeParseError("No text content found in uploaded file")
+        return text
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._prefetch_pool is not None:
+                self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+                self._prefetch_pool = None
+
+    def _parse_pdf(self, content: bytes) -> str:
+        """
+        Parse a PDF in the process pool
+
+        Waits for a free worker before submitting, so the timeout covers the
+        parse itself rather than time spent queued behind other files. A
+        parse that times out is killed together with its pool, because
+        Future.cancel cannot stop a task that is already running.
+        """
+        with self._slots:
+            for attempt in range(2):
+                pool, future = self._submit_pdf(content)
+                try:
+                    return future.result(timeout=self.timeout_seconds)
+                except FutureTimeoutError:
+                    logger.error("Resume PDF parse timed out, restarting pool")
+                    self._discard_pool(pool)
+                    raise ResumeParseError("Timed out while reading the resume PDF.")
+                except BrokenProcessPool:
+                    if not self._discard_pool(pool) and attempt == 0:
+                        continue  # restarted under us for another file; retry
+                    # A parser process died (e.g. on a malformed PDF)
+                    logger.error("Resume parser process crashed, restarting pool")
+                    raise ResumeParseError("Could not read the resume PDF.")
+
+    def _submit_pdf(self, content: bytes) -> Tuple[ProcessPoolExecutor, Future]:
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the server process is multi-threaded
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            future = self._pool.submit(_extract_pdf_text, content, self.max_pages)
+            return self._pool, future
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> bool:
+        """
+        Stop ``pool`` now, killing its workers; the next parse starts a new one
+
+        Returns:
+            False if another parse already replaced the pool
+        """
+        with self._lock:
+            if self._pool is not pool:
+                return False
+            self._pool = None
+        # ProcessPoolExecutor has no public way to kill its workers before 3.14
+        processes = list((pool._processes or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        return True
+
+
+# Shared parser; its process pool starts on the first PDF
+resume_parser = ResumeParser()
@@ -1,3 +1,6 @@
+import bisect
+
+
 class StenCalculator:
     """
     A class to calculate sten scores based on norm tables for different grades and genders.
@@ -112,6 +115,17 @@ class StenCalculator:
         if raw_score is None:
             return None
 
+        cutoffs = self._cutoffs(ability, grade, gender)
+
+        # Find the appropriate sten score
+        for sten in range(10, 0, -1):  # Start from sten 10 and work down
+            if raw_score >= cutoffs[sten - 1]:
+                return sten
+
+        return 1  # If below all cutoffs, assign sten 1
+
+    def _cutoffs(self, ability, grade, gender):
+        """Norm cutoffs for sten 1-10, validating grade, gender and ability"""
         if grade not in self.norms:
             raise ValueError(
                 f"Grade {grade} not supported. Available grades: {list(self.norms.keys())}"
@@ -127,14 +141,7 @@ class StenCalculator:
                 f"Ability '{ability}' not supported. Available: {list(self.norms[grade][gender].keys())}"
             )
 
-        cutoffs = self.norms[grade][gender][ability]
-
-        # Find the appropriate sten score
-        for sten in range(10, 0, -1):  # Start from sten 10 and work down
-            if raw_score >= cutoffs[sten - 1]:
-                return sten
-
-        return 1  # If below all cutoffs, assign sten 1
+        return self.norms[grade][gender][ability]
 
     def format_results(self, results):
         """
@@ -188,6 +195,32 @@ class StenCalculator:
             results[ability] = {"raw_score": raw_score, "sten_score": sten_score}
         return results
 
+    def calculate_roster_stens(self, students):
+        """
+        Calculate sten scores for a whole roster in one pass
+
+        Args:
+            students: iterable of (scores_dict, grade, gender) tuples
+
+        Returns:
+            A list with one calculate_student_stens-style result per student,
+            in input order. Cutoffs are ascending, so each lookup is a binary
+            search instead of a scan of all ten stens.
+        """
+        roster_results = []
+        for scores_dict, grade, gender in students:
+            results = {}
+            for ability, score_string in scores_dict.items():
+                raw_score = self.parse_score_input(score_string)
+                if raw_score is None:
+                    sten_score = None
+                else:
+                    cutoffs = self._cutoffs(ability, grade, gender)
+                    sten_score = max(1, bisect.bisect_right(cutoffs, raw_score))
+                results[ability] = {"raw_score": raw_score, "sten_score": sten_score}
+            roster_results.append(results)
+        return roster_results
+
 
 # Example usage and testing
 if __name__ == "__main__":